@@ -0,0 +1,154 @@
+#!/usr/bin/env python3
+"""
+Almacenamiento en memoria con la misma interfaz que SupabaseClient
+Usado por los benchmarks y pruebas para ejecutar el pipeline completo sin red
+"""
+
+import json
+import threading
+import time
+import uuid
+from datetime import datetime, timezone
+from typing import Any, Dict, List, Optional, Tuple
+
+class TransporteMemoria:
+    """Contadores por operación con el formato de TransporteSupabase"""
+
+    def __init__(self):
+        self._estadisticas = {}
+        self._lock = threading.Lock()
+
+    def registrar(self, endpoint: str, latencia: float, enviados: int = 0, recibidos: int = 0):
+        with self._lock:
+            stats = self._estadisticas.setdefault(endpoint, {
+                'llamadas': 0,
+                'errores': 0,
+                'reintentos': 0,
+                'latencia_total': 0.0,
+                'latencia_max': 0.0,
+                'bytes_enviados': 0,
+                'bytes_recibidos': 0
+            })
+            stats['llamadas'] += 1
+            stats['latencia_total'] += latencia
+            stats['latencia_max'] = max(stats['latencia_max'], latencia)
+            stats['bytes_enviados'] += enviados
+            stats['bytes_recibidos'] += recibidos
+
+    def get_estadisticas(self) -> Dict[str, Dict]:
+        with self._lock:
+            return {
+                endpoint: dict(stats, latencia_media=stats['latencia_total'] / stats['llamadas'])
+                for endpoint, stats in self._estadisticas.items()
+            }
+
+    def reset_estadisticas(self):
+        with self._lock:
+            self._estadisticas.clear()
+
+class AlmacenamientoMemoria:
+    """Sustituto de SupabaseClient que guarda las filas en diccionarios"""
+
+    def __init__(self):
+        self.transporte = TransporteMemoria()
+        self.noticias = {}  # url_origen -> fila
+        self.resumenes = []
+        self.logs = []
+        self._lock = threading.Lock()
+
+    def test_connection(self) -> bool:
+        return True
+
+    @staticmethod
+    def _serializar(datos: Any) -> bytes:
+        """Serializar como lo haría el transporte HTTP"""
+        return json.dumps(datos, ensure_ascii=False, default=str).encode('utf-8')
+
+    # ========================================
+    # OPERACIONES DE NOTICIAS
+    # ========================================
+
+    def get_noticia_by_url(self, url_origen: str) -> Optional[Dict]:
+        with self._lock:
+            fila = self.noticias.get(url_origen)
+        return dict(fila) if fila else None
+
+    def get_noticias_by_urls(self, urls: List[str], columnas: str = 'id,url_origen,fecha_publicacion,fecha_actualizacion',
+                             tamano_lote: int = 50) -> Optional[Dict[str, Dict]]:
+        inicio = time.perf_counter()
+        campos = columnas.split(',')
+        with self._lock:
+            existentes = {
+                url: {campo: self.noticias[url].get(campo) for campo in campos}
+                for url in urls if url in self.noticias
+            }
+        self.transporte.registrar('GET noticias_juridicas', time.perf_counter() - inicio)
+        return existentes
+
+    def upsert_noticias(self, filas: List[Dict], resumenes: Dict[str, Dict] = None,
+                        tamano_lote: int = 50) -> List[Dict]:
+        """Insertar o actualizar por url_origen; un resultado por fila como SupabaseClient"""
+        resumenes = resumenes or {}
+        inicio = time.perf_counter()
+        cuerpo = self._serializar(filas)
+        resultados = []
+
+        with self._lock:
+            for fila in json.loads(cuerpo):
+                url = fila.get('url_origen')
+                if not url:
+                    resultados.append({'url_origen': url, 'id': None, 'ok': False, 'error': 'Sin url_origen'})
+                    continue
+
+                existente = self.noticias.get(url)
+                fila['id'] = existente['id'] if existente else str(uuid.uuid4())
+                fila.setdefault('created_at', datetime.now(timezone.utc).isoformat())
+                self.noticias[url] = dict(existente or {}, **fila)
+                resultados.append({'url_origen': url, 'id': fila['id'], 'ok': True, 'error': None})
+
+                if url in resumenes:
+                    self.resumenes.append(dict(resumenes[url], noticia_id=fila['id']))
+                    resultados[-1]['resumen_ok'] = True
+
+        self.transporte.registrar('POST noticias_juridicas', time.perf_counter() - inicio, enviados=len(cuerpo))
+        return resultados
+
+    def get_urls_conocidas(self, desde: str = None, tamano_pagina: int = 1000) -> Optional[List[Dict]]:
+        return self._filas_desde(('url_origen', 'fuente', 'hash_contenido', 'fecha_publicacion', 'created_at'), desde)
+
+    def get_cuerpos_noticias(self, desde: str = None, tamano_pagina: int = 200) -> Optional[List[Dict]]:
+        return self._filas_desde(('url_origen', 'fuente', 'cuerpo_completo', 'created_at'), desde)
+
+    def _filas_desde(self, campos: Tuple[str, ...], desde: str = None) -> List[Dict]:
+        with self._lock:
+            filas = [{campo: fila.get(campo) for campo in campos} for fila in self.noticias.values()]
+        filas.sort(key=lambda fila: (fila['created_at'] or '', fila['url_origen'] or ''))
+        return [fila for fila in filas if not desde or (fila['created_at'] or '') > desde]
+
+    def count_noticias(self) -> int:
+        return len(self.noticias)
+
+    def count_noticias_hoy(self) -> int:
+        hoy = datetime.now(timezone.utc).strftime('%Y-%m-%d')
+        return sum(1 for fila in self.noticias.values() if str(fila.get('fecha_publicacion') or '') >= hoy)
+
+    def get_ultima_actualizacion(self) -> Optional[str]:
+        fechas = [fila.get('created_at') for fila in self.noticias.values() if fila.get('created_at')]
+        return max(fechas, default=None)
+
+    # ========================================
+    # RESÚMENES Y LOGS
+    # ========================================
+
+    def count_resumenes(self) -> int:
+        return len(self.resumenes)
+
+    def insert_log(self, datos: Dict) -> Optional[str]:
+        with self._lock:
+            self.logs.append(dict(datos, id=str(uuid.uuid4())))
+            self.logs[-1].setdefault('created_at', datetime.now(timezone.utc).isoformat())
+            return self.logs[-1]['id']
+
+    def get_logs_recientes(self, limit: int = 50) -> List[Dict]:
+        with self._lock:
+            return sorted(self.logs, key=lambda log: log['created_at'], reverse=True)[:limit]
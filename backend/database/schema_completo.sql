@@ -25,7 +25,7 @@ CREATE TABLE IF NOT EXISTS noticias_juridicas (
     -- Fuente y origen
     fuente TEXT NOT NULL,
     fuente_nombre_completo TEXT,
-    url_origen TEXT NOT NULL,
+    url_origen TEXT NOT NULL UNIQUE, -- Requerido por el upsert on_conflict=url_origen
     url_imagen TEXT,
     
     -- Clasificación
@@ -48,7 +48,7 @@ CREATE TABLE IF NOT EXISTS noticias_juridicas (
     region TEXT,
     
     -- Control de duplicados y versiones
-    hash_contenido TEXT UNIQUE,
+    hash_contenido TEXT, -- Indexado; la unicidad la da url_origen
     hash_titulo TEXT,
     version INTEGER DEFAULT 1,
     es_actualizacion BOOLEAN DEFAULT false,
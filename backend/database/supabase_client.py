@@ -5,18 +5,28 @@ Maneja todas las operaciones de base de datos
 """
 
 import os
-import requests
 import json
 from datetime import datetime, timezone
-from typing import Dict, List, Optional, Any
+from typing import Dict, List, Optional, Any, Tuple
 import time
 
+from .transporte_http import TransporteSupabase
+
 class SupabaseClient:
     """Cliente para interactuar con Supabase"""
     
-    def __init__(self, url: str, key: str):
+    def __init__(self, url: str, key: str, transporte: TransporteSupabase = None):
         self.url = url.rstrip('/')
         self.key = key
+        
+        # Todas las operaciones pasan por un transporte con pool de conexiones,
+        # timeouts, reintentos y métricas por endpoint
+        self.transporte = transporte or TransporteSupabase(
+            timeout_conexion=float(os.getenv('SUPABASE_TIMEOUT_CONEXION', '5')),
+            timeout_lectura=float(os.getenv('SUPABASE_TIMEOUT_LECTURA', '30')),
+            max_reintentos=int(os.getenv('SUPABASE_MAX_REINTENTOS', '3')),
+            comprimir_desde=int(os.getenv('SUPABASE_GZIP_DESDE', '0'))
+        )
         self.headers = {
             'apikey': key,
             'Authorization': f'Bearer {key}',
@@ -27,7 +37,7 @@ class SupabaseClient:
     def test_connection(self) -> bool:
         """Probar conexión a Supabase"""
         try:
-            response = requests.get(f'{self.url}/rest/v1/', headers=self.headers, timeout=10)
+            response = self.transporte.get(f'{self.url}/rest/v1/', headers=self.headers, timeout=10)
             return response.status_code == 200
         except Exception as e:
             print(f"❌ Error de conexión: {e}")
@@ -59,7 +69,7 @@ class SupabaseClient:
                 # Ya es un dict
                 datos_dict = datos
             
-            response = requests.post(
+            response = self.transporte.post(
                 f'{self.url}/rest/v1/noticias_juridicas',
                 headers=self.headers,
                 json=datos_dict
@@ -82,7 +92,7 @@ class SupabaseClient:
     def update_noticia(self, noticia_id: str, datos: Dict) -> bool:
         """Actualizar noticia existente"""
         try:
-            response = requests.patch(
+            response = self.transporte.patch(
                 f'{self.url}/rest/v1/noticias_juridicas?id=eq.{noticia_id}',
                 headers=self.headers,
                 json=datos
@@ -94,10 +104,116 @@ class SupabaseClient:
             print(f"❌ Error en update_noticia: {e}")
             return False
     
+    def upsert_noticias(self, filas: List[Dict], resumenes: Dict[str, Dict] = None,
+                        tamano_lote: int = 50) -> List[Dict]:
+        """Insertar o actualizar noticias en lote (on_conflict=url_origen)
+        
+        `resumenes` asocia url_origen -> fila de noticias_resumenes_juridicos
+        (sin noticia_id); se escriben en el mismo lote que sus noticias.
+        Devuelve un resultado por fila: {'url_origen', 'id', 'ok', 'error'}.
+        """
+        resumenes = resumenes or {}
+        resultados = []
+        
+        # PostgREST exige que todos los objetos de un arreglo tengan las mismas claves
+        grupos = {}
+        for fila in filas:
+            grupos.setdefault(tuple(sorted(fila.keys())), []).append(fila)
+        
+        for grupo in grupos.values():
+            for i in range(0, len(grupo), tamano_lote):
+                lote = grupo[i:i + tamano_lote]
+                resultados_lote, _ = self._upsert_lote_noticias(lote)
+                
+                # Reintentar fila a fila para aislar las que fallan
+                if resultados_lote is None:
+                    resultados_lote = []
+                    for fila in lote:
+                        resultado, error = self._upsert_lote_noticias([fila])
+                        if resultado is None:
+                            resultado = [{
+                                'url_origen': fila.get('url_origen'),
+                                'id': None,
+                                'ok': False,
+                                'error': error
+                            }]
+                        resultados_lote.extend(resultado)
+                
+                self._insert_resumenes_lote(resultados_lote, resumenes)
+                resultados.extend(resultados_lote)
+        
+        return resultados
+    
+    def _upsert_lote_noticias(self, lote: List[Dict]) -> Tuple[Optional[List[Dict]], Optional[str]]:
+        """Enviar un lote de noticias; (None, error) si PostgREST rechaza el lote"""
+        try:
+            headers = dict(self.headers)
+            headers['Prefer'] = 'resolution=merge-duplicates,return=representation'
+            
+            response = self.transporte.post(
+                f'{self.url}/rest/v1/noticias_juridicas',
+                headers=headers,
+                params={'on_conflict': 'url_origen', 'select': 'id,url_origen'},
+                json=lote
+            )
+            
+            if response.status_code not in (200, 201):
+                error = f"{response.status_code} - {response.text}"
+                print(f"❌ Error en upsert de {len(lote)} noticias: {error}")
+                return None, error
+            
+            ids = {fila['url_origen']: fila['id'] for fila in response.json()}
+            return [
+                {
+                    'url_origen': fila.get('url_origen'),
+                    'id': ids.get(fila.get('url_origen')),
+                    'ok': fila.get('url_origen') in ids,
+                    'error': None if fila.get('url_origen') in ids else 'Sin fila devuelta'
+                }
+                for fila in lote
+            ], None
+            
+        except Exception as e:
+            print(f"❌ Error en upsert_noticias: {e}")
+            return None, str(e)
+    
+    def _insert_resumenes_lote(self, resultados: List[Dict], resumenes: Dict[str, Dict]):
+        """Insertar en un solo request los resúmenes de las noticias guardadas"""
+        filas = []
+        for resultado in resultados:
+            resumen = resumenes.get(resultado['url_origen'])
+            if resultado['ok'] and resumen:
+                filas.append(dict(resumen, noticia_id=resultado['id']))
+        
+        if not filas:
+            return
+        
+        try:
+            headers = dict(self.headers)
+            headers['Prefer'] = 'return=minimal'
+            
+            response = self.transporte.post(
+                f'{self.url}/rest/v1/noticias_resumenes_juridicos',
+                headers=headers,
+                json=filas
+            )
+            
+            ok = response.status_code in (200, 201, 204)
+            if not ok:
+                print(f"❌ Error insertando {len(filas)} resúmenes: {response.status_code} - {response.text}")
+            
+        except Exception as e:
+            ok = False
+            print(f"❌ Error en _insert_resumenes_lote: {e}")
+        
+        for resultado in resultados:
+            if resultado['ok'] and resultado['url_origen'] in resumenes:
+                resultado['resumen_ok'] = ok
+    
     def get_noticia_by_hash(self, hash_contenido: str) -> Optional[Dict]:
         """Obtener noticia por hash de contenido"""
         try:
-            response = requests.get(
+            response = self.transporte.get(
                 f'{self.url}/rest/v1/noticias_juridicas?hash_contenido=eq.{hash_contenido}&limit=1',
                 headers=self.headers
             )
@@ -116,7 +232,7 @@ class SupabaseClient:
     def get_noticia_by_url(self, url_origen: str) -> Optional[Dict]:
         """Obtener noticia por URL (más confiable para evitar duplicados)"""
         try:
-            response = requests.get(
+            response = self.transporte.get(
                 f'{self.url}/rest/v1/noticias_juridicas?url_origen=eq.{url_origen}&limit=1',
                 headers=self.headers
             )
@@ -132,6 +248,102 @@ class SupabaseClient:
             print(f"❌ Error en get_noticia_by_url: {e}")
             return None
     
+    def get_noticias_by_urls(self, urls: List[str], columnas: str = 'id,url_origen,fecha_publicacion,fecha_actualizacion',
+                             tamano_lote: int = 50) -> Optional[Dict[str, Dict]]:
+        """Obtener en lote las noticias existentes para una lista de URLs
+        
+        Devuelve un diccionario url_origen -> fila (solo con `columnas`),
+        o None si alguna consulta falla.
+        """
+        try:
+            urls_unicas = list(dict.fromkeys(url for url in urls if url))
+            existentes = {}
+            
+            for i in range(0, len(urls_unicas), tamano_lote):
+                lote = urls_unicas[i:i + tamano_lote]
+                
+                response = self.transporte.get(
+                    f'{self.url}/rest/v1/noticias_juridicas',
+                    headers=self.headers,
+                    params={
+                        'select': columnas,
+                        'url_origen': f'in.({",".join(self._quote_postgrest(url) for url in lote)})'
+                    }
+                )
+                
+                if response.status_code != 200:
+                    print(f"❌ Error consultando URLs existentes: {response.status_code} - {response.text}")
+                    return None
+                
+                for fila in response.json():
+                    existentes[fila['url_origen']] = fila
+            
+            return existentes
+            
+        except Exception as e:
+            print(f"❌ Error en get_noticias_by_urls: {e}")
+            return None
+    
+    def get_urls_conocidas(self, desde: str = None, tamano_pagina: int = 1000) -> Optional[List[Dict]]:
+        """Obtener url_origen y huellas de las noticias creadas después de `desde`
+        
+        Usado para sincronizar el índice local de URLs; None si falla.
+        """
+        return self._paginar_desde(
+            'url_origen,fuente,hash_contenido,fecha_publicacion,created_at', desde, tamano_pagina, 'get_urls_conocidas'
+        )
+    
+    def get_cuerpos_noticias(self, desde: str = None, tamano_pagina: int = 200) -> Optional[List[Dict]]:
+        """Obtener fuente y cuerpo_completo de las noticias creadas después de `desde`
+        
+        Usado para entrenar el modelo de boilerplate por fuente; None si falla.
+        """
+        return self._paginar_desde(
+            'url_origen,fuente,cuerpo_completo,created_at', desde, tamano_pagina, 'get_cuerpos_noticias'
+        )
+    
+    def _paginar_desde(self, columnas: str, desde: str, tamano_pagina: int, operacion: str) -> Optional[List[Dict]]:
+        """Leer todas las noticias creadas después de `desde`, por páginas en orden de creación"""
+        try:
+            filas = []
+            offset = 0
+            
+            while True:
+                params = {
+                    'select': columnas,
+                    'order': 'created_at.asc,url_origen.asc',
+                    'limit': tamano_pagina,
+                    'offset': offset
+                }
+                if desde:
+                    params['created_at'] = f'gt.{desde}'
+                
+                response = self.transporte.get(
+                    f'{self.url}/rest/v1/noticias_juridicas',
+                    headers=self.headers,
+                    params=params
+                )
+                
+                if response.status_code != 200:
+                    print(f"❌ Error en {operacion}: {response.status_code} - {response.text}")
+                    return None
+                
+                pagina = response.json()
+                filas.extend(pagina)
+                
+                if len(pagina) < tamano_pagina:
+                    return filas
+                offset += tamano_pagina
+            
+        except Exception as e:
+            print(f"❌ Error en {operacion}: {e}")
+            return None
+    
+    @staticmethod
+    def _quote_postgrest(valor: str) -> str:
+        """Citar un valor para filtros in.(...) de PostgREST"""
+        return '"' + valor.replace('\\', '\\\\').replace('"', '\\"') + '"'
+    
     def get_noticias_recientes(self, limit: int = 10, offset: int = 0, fuente: str = None) -> List[Dict]:
         """Obtener noticias recientes"""
         try:
@@ -140,7 +352,7 @@ class SupabaseClient:
             if fuente:
                 url += f'&fuente=eq.{fuente}'
             
-            response = requests.get(url, headers=self.headers)
+            response = self.transporte.get(url, headers=self.headers)
             
             if response.status_code == 200:
                 return response.json()
@@ -154,7 +366,7 @@ class SupabaseClient:
     def count_noticias(self) -> int:
         """Contar total de noticias"""
         try:
-            response = requests.get(
+            response = self.transporte.get(
                 f'{self.url}/rest/v1/noticias_juridicas?select=count',
                 headers=self.headers
             )
@@ -174,7 +386,7 @@ class SupabaseClient:
         """Contar noticias de hoy"""
         try:
             hoy = datetime.now(timezone.utc).strftime('%Y-%m-%d')
-            response = requests.get(
+            response = self.transporte.get(
                 f'{self.url}/rest/v1/noticias_juridicas?fecha_publicacion=gte.{hoy}&select=count',
                 headers=self.headers
             )
@@ -197,7 +409,7 @@ class SupabaseClient:
     def insert_resumen(self, datos: Dict) -> Optional[str]:
         """Insertar nuevo resumen"""
         try:
-            response = requests.post(
+            response = self.transporte.post(
                 f'{self.url}/rest/v1/noticias_resumenes_juridicos',
                 headers=self.headers,
                 json=datos
@@ -220,7 +432,7 @@ class SupabaseClient:
     def get_resumenes_noticia(self, noticia_id: str) -> List[Dict]:
         """Obtener resúmenes de una noticia"""
         try:
-            response = requests.get(
+            response = self.transporte.get(
                 f'{self.url}/rest/v1/noticias_resumenes_juridicos?noticia_id=eq.{noticia_id}&order=fecha_generacion.desc',
                 headers=self.headers
             )
@@ -237,7 +449,7 @@ class SupabaseClient:
     def count_resumenes(self) -> int:
         """Contar total de resúmenes"""
         try:
-            response = requests.get(
+            response = self.transporte.get(
                 f'{self.url}/rest/v1/noticias_resumenes_juridicos?select=count',
                 headers=self.headers
             )
@@ -260,7 +472,7 @@ class SupabaseClient:
     def insert_log(self, datos: Dict) -> Optional[str]:
         """Insertar log de scraping"""
         try:
-            response = requests.post(
+            response = self.transporte.post(
                 f'{self.url}/rest/v1/noticias_logs_scraping',
                 headers=self.headers,
                 json=datos
@@ -282,7 +494,7 @@ class SupabaseClient:
     def get_logs_recientes(self, limit: int = 50) -> List[Dict]:
         """Obtener logs recientes"""
         try:
-            response = requests.get(
+            response = self.transporte.get(
                 f'{self.url}/rest/v1/noticias_logs_scraping?order=created_at.desc&limit={limit}',
                 headers=self.headers
             )
@@ -303,7 +515,7 @@ class SupabaseClient:
     def get_fuentes_activas(self) -> List[Dict]:
         """Obtener fuentes activas"""
         try:
-            response = requests.get(
+            response = self.transporte.get(
                 f'{self.url}/rest/v1/noticias_fuentes?activa=eq.true',
                 headers=self.headers
             )
@@ -325,7 +537,7 @@ class SupabaseClient:
                 'proxima_actualizacion': None  # Se calculará automáticamente
             }
             
-            response = requests.patch(
+            response = self.transporte.patch(
                 f'{self.url}/rest/v1/noticias_fuentes?id=eq.{fuente_id}',
                 headers=self.headers,
                 json=datos
@@ -344,7 +556,7 @@ class SupabaseClient:
     def get_ultima_actualizacion(self) -> Optional[str]:
         """Obtener fecha de última actualización"""
         try:
-            response = requests.get(
+            response = self.transporte.get(
                 f'{self.url}/rest/v1/noticias_juridicas?order=fecha_scraping.desc&limit=1&select=fecha_scraping',
                 headers=self.headers
             )
@@ -363,7 +575,7 @@ class SupabaseClient:
     def get_estadisticas_fuentes(self) -> Dict[str, int]:
         """Obtener estadísticas por fuente"""
         try:
-            response = requests.get(
+            response = self.transporte.get(
                 f'{self.url}/rest/v1/noticias_juridicas?select=fuente,count&group=fuente',
                 headers=self.headers
             )
@@ -381,7 +593,7 @@ class SupabaseClient:
     def get_estadisticas_categorias(self) -> Dict[str, int]:
         """Obtener estadísticas por categoría"""
         try:
-            response = requests.get(
+            response = self.transporte.get(
                 f'{self.url}/rest/v1/noticias_juridicas?select=categoria,count&group=categoria&categoria=not.is.null',
                 headers=self.headers
             )
@@ -406,7 +618,7 @@ class SupabaseClient:
             # Búsqueda en título y contenido
             url = f'{self.url}/rest/v1/noticias_juridicas?or=(titulo.ilike.%{query}%,cuerpo_completo.ilike.%{query}%,resumen_ejecutivo.ilike.%{query}%)&order=fecha_publicacion.desc&limit={limit}&offset={offset}'
             
-            response = requests.get(url, headers=self.headers)
+            response = self.transporte.get(url, headers=self.headers)
             
             if response.status_code == 200:
                 return response.json()
@@ -420,7 +632,7 @@ class SupabaseClient:
     def buscar_por_fuente(self, fuente: str, limit: int = 20, offset: int = 0) -> List[Dict]:
         """Buscar noticias por fuente"""
         try:
-            response = requests.get(
+            response = self.transporte.get(
                 f'{self.url}/rest/v1/noticias_juridicas?fuente=eq.{fuente}&order=fecha_publicacion.desc&limit={limit}&offset={offset}',
                 headers=self.headers
             )
@@ -437,7 +649,7 @@ class SupabaseClient:
     def buscar_por_categoria(self, categoria: str, limit: int = 20, offset: int = 0) -> List[Dict]:
         """Buscar noticias por categoría"""
         try:
-            response = requests.get(
+            response = self.transporte.get(
                 f'{self.url}/rest/v1/noticias_juridicas?categoria=eq.{categoria}&order=fecha_publicacion.desc&limit={limit}&offset={offset}',
                 headers=self.headers
             )
@@ -459,7 +671,7 @@ class SupabaseClient:
         """Limpiar noticias duplicadas por hash"""
         try:
             # Obtener hashes duplicados
-            response = requests.get(
+            response = self.transporte.get(
                 f'{self.url}/rest/v1/noticias_juridicas?select=hash_contenido,count&group=hash_contenido&count=gt.1',
                 headers=self.headers
             )
@@ -474,7 +686,7 @@ class SupabaseClient:
                 hash_contenido = item['hash_contenido']
                 
                 # Obtener todas las noticias con ese hash
-                response = requests.get(
+                response = self.transporte.get(
                     f'{self.url}/rest/v1/noticias_juridicas?hash_contenido=eq.{hash_contenido}&order=created_at.asc',
                     headers=self.headers
                 )
@@ -484,7 +696,7 @@ class SupabaseClient:
                     
                     # Mantener la más antigua, eliminar las demás
                     for noticia in noticias[1:]:
-                        delete_response = requests.delete(
+                        delete_response = self.transporte.delete(
                             f'{self.url}/rest/v1/noticias_juridicas?id=eq.{noticia["id"]}',
                             headers=self.headers
                         )
@@ -505,7 +717,7 @@ class SupabaseClient:
             fecha_limite = fecha_limite.replace(day=fecha_limite.day - dias)
             
             # Obtener noticias antiguas
-            response = requests.get(
+            response = self.transporte.get(
                 f'{self.url}/rest/v1/noticias_juridicas?fecha_publicacion=lt.{fecha_limite.isoformat()}&select=id',
                 headers=self.headers
             )
@@ -517,7 +729,7 @@ class SupabaseClient:
             eliminadas = 0
             
             for noticia in noticias_antiguas:
-                delete_response = requests.delete(
+                delete_response = self.transporte.delete(
                     f'{self.url}/rest/v1/noticias_juridicas?id=eq.{noticia["id"]}',
                     headers=self.headers
                 )
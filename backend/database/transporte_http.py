@@ -0,0 +1,151 @@
+#!/usr/bin/env python3
+"""
+Transporte HTTP para Supabase
+Sesión persistente con pool de conexiones, timeouts, reintentos con jitter,
+compresión gzip y contadores de latencia y bytes por endpoint
+"""
+
+import gzip
+import json
+import random
+import threading
+import time
+from typing import Dict, Optional
+from urllib.parse import urlparse
+
+import requests
+from requests.adapters import HTTPAdapter
+
+# Métodos que se pueden repetir sin efectos duplicados
+METODOS_IDEMPOTENTES = ('GET', 'HEAD', 'OPTIONS', 'PUT', 'PATCH', 'DELETE')
+
+class TransporteSupabase:
+    """Sesión HTTP instrumentada usada por SupabaseClient"""
+
+    def __init__(self, timeout_conexion: float = 5.0, timeout_lectura: float = 30.0,
+                 max_reintentos: int = 3, espera_base: float = 0.5, espera_maxima: float = 8.0,
+                 pool_maxsize: int = 10, comprimir_desde: int = 0):
+        self.timeout = (timeout_conexion, timeout_lectura)
+        self.max_reintentos = max_reintentos
+        self.espera_base = espera_base
+        self.espera_maxima = espera_maxima
+        # Tamaño mínimo (bytes) para comprimir el cuerpo con gzip; 0 desactiva
+        self.comprimir_desde = comprimir_desde
+
+        self.session = requests.Session()
+        adaptador = HTTPAdapter(pool_connections=4, pool_maxsize=pool_maxsize)
+        self.session.mount('https://', adaptador)
+        self.session.mount('http://', adaptador)
+        self.session.headers.update({'Accept-Encoding': 'gzip, deflate'})
+
+        self._estadisticas = {}
+        self._lock = threading.Lock()
+
+    def get(self, url: str, **kwargs) -> requests.Response:
+        return self.request('GET', url, **kwargs)
+
+    def post(self, url: str, **kwargs) -> requests.Response:
+        return self.request('POST', url, **kwargs)
+
+    def patch(self, url: str, **kwargs) -> requests.Response:
+        return self.request('PATCH', url, **kwargs)
+
+    def delete(self, url: str, **kwargs) -> requests.Response:
+        return self.request('DELETE', url, **kwargs)
+
+    def request(self, metodo: str, url: str, headers: Dict = None, json: object = None,
+                params: Dict = None, timeout=None, idempotente: Optional[bool] = None) -> requests.Response:
+        """Ejecutar una petición con reintentos ante 5xx y errores de conexión
+
+        Un POST solo se reintenta si es un upsert (Prefer: resolution=...)
+        o si se indica explícitamente con `idempotente=True`.
+        """
+        headers = dict(headers or {})
+        cuerpo = self._serializar(json, headers)
+
+        if idempotente is None:
+            idempotente = metodo in METODOS_IDEMPOTENTES or 'resolution=' in headers.get('Prefer', '')
+        intentos = 1 + (self.max_reintentos if idempotente else 0)
+        endpoint = f"{metodo} {urlparse(url).path}"
+
+        for intento in range(intentos):
+            inicio = time.monotonic()
+            try:
+                response = self.session.request(
+                    metodo, url,
+                    headers=headers,
+                    data=cuerpo,
+                    params=params,
+                    timeout=timeout or self.timeout
+                )
+            except (requests.ConnectionError, requests.Timeout) as e:
+                self._registrar(endpoint, time.monotonic() - inicio, len(cuerpo or b''), 0,
+                                error=True, reintento=intento > 0)
+                if intento + 1 >= intentos:
+                    raise
+                print(f"⚠️  {endpoint}: {e.__class__.__name__}, reintentando ({intento + 1}/{self.max_reintentos})")
+                self._esperar(intento)
+                continue
+
+            self._registrar(endpoint, time.monotonic() - inicio, len(cuerpo or b''), len(response.content),
+                            error=response.status_code >= 500, reintento=intento > 0)
+
+            if response.status_code >= 500 and intento + 1 < intentos:
+                print(f"⚠️  {endpoint}: HTTP {response.status_code}, reintentando ({intento + 1}/{self.max_reintentos})")
+                self._esperar(intento)
+                continue
+
+            return response
+
+    def _serializar(self, datos: object, headers: Dict) -> Optional[bytes]:
+        """Serializar el cuerpo JSON y comprimirlo si supera el umbral"""
+        if datos is None:
+            return None
+
+        cuerpo = json.dumps(datos, ensure_ascii=False, default=str).encode('utf-8')
+        headers.setdefault('Content-Type', 'application/json')
+
+        if self.comprimir_desde and len(cuerpo) >= self.comprimir_desde:
+            cuerpo = gzip.compress(cuerpo)
+            headers['Content-Encoding'] = 'gzip'
+
+        return cuerpo
+
+    def _esperar(self, intento: int):
+        """Backoff exponencial con jitter completo"""
+        tope = min(self.espera_maxima, self.espera_base * (2 ** intento))
+        time.sleep(random.uniform(0, tope))
+
+    def _registrar(self, endpoint: str, latencia: float, enviados: int, recibidos: int,
+                   error: bool = False, reintento: bool = False):
+        """Acumular contadores por endpoint"""
+        with self._lock:
+            stats = self._estadisticas.setdefault(endpoint, {
+                'llamadas': 0,
+                'errores': 0,
+                'reintentos': 0,
+                'latencia_total': 0.0,
+                'latencia_max': 0.0,
+                'bytes_enviados': 0,
+                'bytes_recibidos': 0
+            })
+            stats['llamadas'] += 1
+            stats['errores'] += int(error)
+            stats['reintentos'] += int(reintento)
+            stats['latencia_total'] += latencia
+            stats['latencia_max'] = max(stats['latencia_max'], latencia)
+            stats['bytes_enviados'] += enviados
+            stats['bytes_recibidos'] += recibidos
+
+    def get_estadisticas(self) -> Dict[str, Dict]:
+        """Contadores por endpoint ('METODO /ruta') con latencia media"""
+        with self._lock:
+            return {
+                endpoint: dict(stats, latencia_media=stats['latencia_total'] / stats['llamadas'])
+                for endpoint, stats in self._estadisticas.items()
+            }
+
+    def reset_estadisticas(self):
+        """Reiniciar contadores"""
+        with self._lock:
+            self._estadisticas.clear()
@@ -7,10 +7,10 @@ Ejecuta scraping, procesamiento y almacenamiento en Supabase
 import os
 import sys
 import time
-import schedule
 from datetime import datetime, timezone
-from typing import List, Dict
+from typing import List, Dict, Optional, Tuple
 import json
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from dotenv import load_dotenv
 
 # Cargar variables de entorno
@@ -20,86 +20,53 @@ load_dotenv('APIS_Y_CREDENCIALES.env')
 sys.path.append(os.path.dirname(os.path.dirname(__file__)))
 
 from backend.database.supabase_client import SupabaseClient
-from backend.processors.content_processor import ContentProcessor
+from backend.database.memoria_client import AlmacenamientoMemoria
 
-# Importar scrapers desde la estructura modular
-from backend.scrapers.fuentes import (
-    PoderJudicialScraper,
-    ContraloriaScraper,
-    CDEScraper,
-    TDLScraper,
-    PrimerTribunalAmbientalScraper,
-    TercerTribunalAmbientalScraper,
-    TribunalAmbientalScraper,
-    SIIScraper,
-    TTAScraper,
-    INAPIScraper,
-    DTScraper
-)
+# Los scrapers se importan y construyen al usarlos por primera vez
+from backend.scrapers.fuentes.registro_scrapers import RegistroScrapers
+from backend.scrapers.fuentes.contexto_ejecucion import ContextoEjecucion
+from backend.scrapers.fuentes.planificador_fuentes import PlanificadorFuentes
+from backend.scrapers.fuentes.plazo_ejecucion import PlazoEjecucion, ordenar_fuentes
+from backend.scrapers.fuentes.salud_fuentes import SaludFuentes, ABIERTO, PRUEBA
+from backend.scrapers.fuentes.config import SCRAPING_CONFIG
+from backend.scrapers.fuentes.limitador_peticiones import PlazoAgotado
 
-# Importar scrapers adicionales
-from backend.scrapers.fuentes.tdpi.tdpi_scraper import TDPScraper as TDPIScraper
-from backend.scrapers.fuentes.ministerio_justicia.ministerio_justicia_scraper import MinisterioJusticiaScraper
+# Fuentes que recorre el sistema, en orden
+FUENTES_SISTEMA = (
+    'poder_judicial', 'contraloria', 'cde', 'tdlc', '1ta', '3ta', 'tribunal_ambiental',
+    'sii', 'tta', 'inapi', 'dt', 'tdpi', 'ministerio_justicia'
+)
 
 class NoticiasJuridicasSystem:
     """Sistema principal de noticias jurídicas"""
     
-    def __init__(self):
+    def __init__(self, almacenamiento=None):
         # Cargar configuración
         self.config = self._load_config()
         
-        # Inicializar clientes
-        self.supabase = SupabaseClient(
+        # Inicializar clientes (`almacenamiento` permite sustituir Supabase, p. ej. en benchmarks)
+        self.supabase = almacenamiento or SupabaseClient(
             url=self.config['supabase_url'],
             key=self.config['supabase_service_key']
         )
         
-        self.content_processor = ContentProcessor(
-            openai_api_key=self.config.get('openai_api_key')
+        # Procesador, cachés y conexiones HTTP compartidos por todos los scrapers
+        self.contexto = ContextoEjecucion(openai_api_key=self.config.get('openai_api_key'))
+        self.content_processor = self.contexto.content_processor
+        
+        # Scrapers de las fuentes que funcionan, construidos a pedido
+        self.scrapers = RegistroScrapers(
+            FUENTES_SISTEMA, openai_api_key=self.config.get('openai_api_key'), contexto=self.contexto
         )
         
-        # Inicializar scrapers (solo los que funcionan)
-        self.scrapers = {
-            'poder_judicial': PoderJudicialScraper(
-                openai_api_key=self.config.get('openai_api_key')
-            ),
-            'contraloria': ContraloriaScraper(
-                openai_api_key=self.config.get('openai_api_key')
-            ),
-            'cde': CDEScraper(
-                openai_api_key=self.config.get('openai_api_key')
-            ),
-            'tdlc': TDLScraper(
-                openai_api_key=self.config.get('openai_api_key')
-            ),
-            '1ta': PrimerTribunalAmbientalScraper(
-                openai_api_key=self.config.get('openai_api_key')
-            ),
-            '3ta': TercerTribunalAmbientalScraper(
-                openai_api_key=self.config.get('openai_api_key')
-            ),
-            'tribunal_ambiental': TribunalAmbientalScraper(
-                openai_api_key=self.config.get('openai_api_key')
-            ),
-            'sii': SIIScraper(
-                openai_api_key=self.config.get('openai_api_key')
-            ),
-            'tta': TTAScraper(
-                openai_api_key=self.config.get('openai_api_key')
-            ),
-            'inapi': INAPIScraper(
-                openai_api_key=self.config.get('openai_api_key')
-            ),
-            'dt': DTScraper(
-                openai_api_key=self.config.get('openai_api_key')
-            ),
-            'tdpi': TDPIScraper(
-                openai_api_key=self.config.get('openai_api_key')
-            ),
-            'ministerio_justicia': MinisterioJusticiaScraper(
-                openai_api_key=self.config.get('openai_api_key')
-            )
-        }
+        # Próxima visita de cada fuente según su ritmo de publicación
+        self.planificador = PlanificadorFuentes(intervalo_sin_historial=self.config['intervalo_actualizacion'])
+        
+        # Fallos, tasa de error y latencia de cada fuente, con su cortacircuitos
+        self.salud = SaludFuentes()
+        
+        # En replay (ver configurar_cache_http) la ejecución no modifica estado persistente
+        self.persistir = True
         
         print("🚀 Sistema de noticias jurídicas inicializado")
         print(f"📊 Scrapers disponibles: {len(self.scrapers)}")
@@ -112,93 +79,403 @@ class NoticiasJuridicasSystem:
             'openai_api_key': os.getenv('OPENAI_API_KEY'),
             'max_noticias_por_fuente': int(os.getenv('MAX_NOTICIAS_POR_FUENTE', '20')),
             'intervalo_actualizacion': int(os.getenv('INTERVALO_ACTUALIZACION', '900')),  # 15 minutos
+            'max_workers': int(os.getenv('MAX_WORKERS_SCRAPING', '4')),  # Fuentes en paralelo
+            'tamano_lote': int(os.getenv('TAMANO_LOTE_GUARDADO', '5')),  # Noticias por escritura en la base
+            'plazo_ejecucion': float(os.getenv('PLAZO_EJECUCION', '0')),  # Segundos por ejecución (0: sin plazo)
         }
     
-    def run_scraping_completo(self):
-        """Ejecutar scraping completo de todas las fuentes"""
+    def run_scraping_completo(self, fuentes: List[str] = None) -> List[Dict]:
+        """Ejecutar scraping completo de todas las fuentes (o solo de `fuentes`)
+        
+        Devuelve los contadores de cada fuente y agenda su próxima visita. Con
+        config['plazo_ejecucion'] las fuentes se recorren por prioridad y costo
+        esperado, cada una dentro de su franja de tiempo (ver PlazoEjecucion).
+        """
         print(f"\n🔄 Iniciando scraping completo - {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}")
+        fuentes = list(self.scrapers) if fuentes is None else [fuente for fuente in self.scrapers if fuente in fuentes]
+        
+        inicio = time.time()
+        self.supabase.transporte.reset_estadisticas()
+        self.contexto.reset_estadisticas()
+        
+        # Traer al índice local las URLs almacenadas desde la última ejecución
+        self.contexto.indice_urls.calentar(self.supabase)
+        # y al modelo de boilerplate los cuerpos guardados desde entonces
+        self.contexto.modelo_boilerplate.aprender_desde(self.supabase)
         
         total_noticias_nuevas = 0
         total_noticias_actualizadas = 0
         errores = []
         
-        # Procesar cada fuente
-        for fuente_nombre, scraper in self.scrapers.items():
-            try:
-                print(f"\n📰 Procesando fuente: {fuente_nombre}")
-                
-                # Obtener noticias de la fuente
-                noticias = scraper.scrape_noticias_recientes(
-                    max_noticias=self.config['max_noticias_por_fuente']
-                )
-                
-                if not noticias:
-                    print(f"⚠️  No se encontraron noticias en {fuente_nombre}")
-                    continue
-                
-                # Procesar cada noticia
-                for noticia in noticias:
-                    try:
-                        # Usar método específico para Contraloría
-                        if fuente_nombre == 'contraloria':
-                            # Convertir NoticiaEstandarizada a diccionario para el método específico
-                            if hasattr(noticia, 'to_dict'):
-                                noticia_dict = noticia.to_dict()
-                            else:
-                                noticia_dict = noticia
-                            
-                            resultado = scraper.procesar_noticia_contraloria(noticia_dict)
-                            if resultado:
-                                total_noticias_nuevas += 1
-                            else:
-                                total_noticias_actualizadas += 1
-                        else:
-                            # Usar método genérico para otras fuentes
-                            resultado = self._procesar_noticia(noticia)
-                            
-                            if resultado['tipo'] == 'nueva':
-                                total_noticias_nuevas += 1
-                            elif resultado['tipo'] == 'actualizada':
-                                total_noticias_actualizadas += 1
-                            
-                    except Exception as e:
-                        error_msg = f"Error procesando noticia de {fuente_nombre}: {e}"
-                        print(f"❌ {error_msg}")
-                        errores.append(error_msg)
-                
-                # Registrar log de la fuente
-                self._registrar_log_fuente(fuente_nombre, len(noticias), len(errores))
-                
-            except Exception as e:
-                error_msg = f"Error procesando fuente {fuente_nombre}: {e}"
-                print(f"❌ {error_msg}")
-                errores.append(error_msg)
+        # Las fuentes son independientes: se procesan en paralelo y el tiempo
+        # total queda acotado por la fuente más lenta
+        max_workers = max(1, min(self.config.get('max_workers', 1), len(fuentes)))
+        print(f"⚙️  Workers: {max_workers}")
+        
+        plazo = None
+        if self.config.get('plazo_ejecucion'):
+            plazo = self._preparar_plazo(fuentes, inicio + self.config['plazo_ejecucion'], max_workers)
+            fuentes = list(plazo.pendientes)
+        
+        if max_workers == 1:
+            resultados = [
+                self._procesar_fuente(fuente_nombre, self.scrapers[fuente_nombre], plazo)
+                for fuente_nombre in fuentes
+            ]
+        else:
+            resultados = []
+            # El pool atiende las fuentes en el orden en que se envían
+            with ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix='fuente') as executor:
+                futuros = {
+                    executor.submit(self._procesar_fuente, fuente_nombre, self.scrapers[fuente_nombre], plazo): fuente_nombre
+                    for fuente_nombre in fuentes
+                }
+                for futuro in as_completed(futuros):
+                    resultados.append(futuro.result())
+        
+        # Consolidar resultados por fuente
+        for resultado in resultados:
+            total_noticias_nuevas += resultado['nuevas']
+            total_noticias_actualizadas += resultado['actualizadas']
+            errores.extend(resultado['errores'])
         
         # Resumen final
         print(f"\n📊 Resumen del scraping:")
         print(f"   ✅ Noticias nuevas: {total_noticias_nuevas}")
         print(f"   🔄 Noticias actualizadas: {total_noticias_actualizadas}")
         print(f"   ❌ Errores: {len(errores)}")
+        truncadas = [resultado['fuente'] for resultado in resultados if resultado.get('truncada')]
+        if truncadas:
+            print(f"   ✂️  Fuentes cortadas por el plazo: {', '.join(truncadas)}")
+        if plazo is not None and plazo.sin_tiempo:
+            print(f"   ⏭️  Fuentes sin tiempo (quedan vencidas): {', '.join(plazo.sin_tiempo)}")
+        self._imprimir_estadisticas_contexto()
+        print(f"   ⏱️  Duración: {time.time() - inicio:.1f}s")
+        self._imprimir_estadisticas_supabase()
+        self.contexto.modelo_boilerplate.guardar()
+        
+        # El ritmo de cada fuente se recalcula con lo recién almacenado
+        visitadas = [resultado for resultado in resultados if not resultado.get('sin_tiempo')]
+        if self.persistir:
+            self.planificador.aprender_desde(self.contexto.indice_urls, self.supabase, fuentes)
+            self.planificador.registrar_visitas(visitadas)
+            for fuente, circuito in self.salud.registrar_visitas(visitadas).items():
+                if circuito == ABIERTO:
+                    print(f"🔴 Circuito abierto para {fuente}: se omite hasta una visita de prueba")
+                else:
+                    print(f"🟢 Circuito cerrado para {fuente}: vuelve a recorrerse")
         
         if errores:
             print(f"\n⚠️  Errores encontrados:")
             for error in errores[:5]:  # Mostrar solo los primeros 5
                 print(f"   - {error}")
+        
+        return resultados
+    
+    def _preparar_plazo(self, fuentes: List[str], limite: float, workers: int) -> PlazoEjecucion:
+        """Ordenar las fuentes por prioridad y costo esperado y repartir el tiempo hasta `limite`"""
+        self.planificador.aprender_duraciones(self.supabase, fuentes)
+        sin_historial = SCRAPING_CONFIG['plazo']['duracion_sin_historial']
+        costos = {}
+        for fuente in fuentes:
+            duracion = self.planificador.duracion_esperada(fuente)
+            costos[fuente] = sin_historial if duracion is None else duracion
+        
+        fuentes = ordenar_fuentes(fuentes, costos)
+        print(f"⏳ Plazo: {max(0, limite - time.time()) / 60:.1f} min para {len(fuentes)} fuentes "
+              f"(~{sum(costos.values()) / 60 / workers:.1f} min esperados): {', '.join(fuentes)}")
+        return PlazoEjecucion(limite, {fuente: costos[fuente] for fuente in fuentes}, workers)
+    
+    def _imprimir_estadisticas_contexto(self):
+        """Cachés y conexiones de la ejecución (ver ContextoEjecucion)"""
+        estadisticas = self.contexto.get_estadisticas()
+        validadores = estadisticas['validadores_http']
+        print(f"   📍 Noticias bajo la marca de agua (no recorridas): {estadisticas['marcas_agua']['recortadas']}")
+        print(f"   🗂️  Descargas omitidas (ya almacenadas): {estadisticas['indice_urls']['omitidas']}")
+        print(f"   🏷️  Listados condicionales: {validadores['sin_cambios']} sin cambios (304), "
+              f"{validadores['con_cambios']} con cambios")
+        if self.contexto.cache.activa:
+            cache_http = estadisticas['cache_http']
+            print(f"   💾 Caché HTTP ({self.contexto.cache.modo}): {cache_http['aciertos']} aciertos, "
+                  f"{cache_http['fallos']} fallos, {cache_http['grabadas']} grabadas")
+        conexiones = estadisticas['conexiones'].values()
+        peticiones = sum(host['peticiones'] for host in conexiones)
+        if peticiones:
+            print(f"   🔌 Conexiones HTTP: {peticiones} peticiones en "
+                  f"{sum(host['conexiones'] for host in conexiones)} conexiones ({len(conexiones)} hosts)")
+        # Aciertos sobre consultas de cada caché en memoria
+        memorias = {
+            'fechas': (estadisticas['fechas']['aciertos'], estadisticas['fechas']['fallos']),
+            'contenido': (estadisticas['contenido']['cache'], estadisticas['contenido']['documentos']),
+            'limpieza': (estadisticas['limpieza'].get('memo', 0), estadisticas['limpieza'].get('documentos', 0)),
+            'resúmenes': (estadisticas['resumenes']['aciertos'], estadisticas['resumenes']['fallos'])
+        }
+        print(f"   🧠 Cachés en memoria (aciertos/consultas): " + ", ".join(
+            f"{nombre} {aciertos}/{aciertos + fallos}" for nombre, (aciertos, fallos) in memorias.items()
+        ))
+        boilerplate = estadisticas['boilerplate']
+        print(f"   🧹 Boilerplate aprendido: {boilerplate['frases_eliminadas']} frases eliminadas en "
+              f"{boilerplate['documentos_limpiados']} noticias, {boilerplate['aprendidos']} documentos aprendidos")
+        estrategias_fecha = {
+            estrategia: paginas for estrategia, paginas in estadisticas['fechas_pagina'].items() if paginas
+        }
+        if estrategias_fecha:
+            print(f"   📅 Fechas por estrategia: " + ", ".join(
+                f"{estrategia} {paginas}" for estrategia, paginas in estrategias_fecha.items()
+            ))
     
-    def _procesar_noticia(self, noticia) -> Dict:
-        """Procesar una noticia individual"""
-        # Verificar duplicados por URL (más confiable que hash)
-        noticia_existente = self.supabase.get_noticia_by_url(noticia.url_origen)
-        
-        if noticia_existente:
-            # Verificar si necesita actualización
-            if self._necesita_actualizacion(noticia_existente, noticia):
-                return self._actualizar_noticia(noticia_existente['id'], noticia)
+    def seleccionar_fuentes(self, codigos: List[str]):
+        """Limitar la ejecución a esas fuentes; las demás no se importan ni se construyen"""
+        self.scrapers = self.scrapers.seleccionar(codigos)
+        print(f"🎯 Fuentes seleccionadas: {', '.join(self.scrapers)}")
+    
+    def configurar_cache_http(self, modo: str):
+        """Activar la caché de respuestas ('grabar') o el modo replay"""
+        self.contexto.cache.configurar(modo)
+        
+        if modo == 'replay':
+            # Replay determinista: se recorre todo lo grabado, sin estado incremental
+            self.contexto.indice_urls.omitir_conocidas = False
+            self.contexto.marcas_agua.activas = False
+            self.contexto.validadores.activos = False
+            self.contexto.modelo_boilerplate.activo = False
+            
+            # y sin dejar rastro: las noticias y logs van a memoria, y ni la planificación,
+            # ni la salud de las fuentes, ni el índice local registran lo recorrido
+            self.persistir = False
+            if isinstance(self.supabase, SupabaseClient):
+                self.supabase = AlmacenamientoMemoria()
+        
+        print(f"💾 Caché HTTP en modo '{modo}': {self.contexto.cache.directorio}")
+    
+    def _imprimir_estadisticas_supabase(self):
+        """Mostrar requests, latencia y bytes por endpoint de Supabase"""
+        estadisticas = self.supabase.transporte.get_estadisticas()
+        if not estadisticas:
+            return
+        
+        llamadas = sum(stats['llamadas'] for stats in estadisticas.values())
+        reintentos = sum(stats['reintentos'] for stats in estadisticas.values())
+        print(f"   📡 Supabase: {llamadas} requests ({reintentos} reintentos)")
+        
+        for endpoint, stats in sorted(estadisticas.items()):
+            print(f"      {endpoint}: {stats['llamadas']} x {stats['latencia_media'] * 1000:.0f}ms, "
+                  f"↑{stats['bytes_enviados'] / 1024:.1f}KB ↓{stats['bytes_recibidos'] / 1024:.1f}KB")
+    
+    def _procesar_fuente(self, fuente_nombre: str, scraper, plazo: PlazoEjecucion = None) -> Dict:
+        """Procesar una fuente completa y devolver sus contadores
+        
+        Con `plazo`, la fuente se corta al vencer su franja: se guarda lo ya
+        descargado y el resultado queda marcado como truncado.
+        """
+        inicio = time.time()
+        resultado = {
+            'fuente': fuente_nombre,
+            'encontradas': 0,
+            'nuevas': 0,
+            'actualizadas': 0,
+            'errores': [],
+            'truncada': False
+        }
+        fechas = []
+        noticias = None
+        
+        limite = None
+        if plazo is not None:
+            limite = plazo.asignar(fuente_nombre, inicio)
+            if limite is None:
+                print(f"⏭️  Sin tiempo para {fuente_nombre}")
+                return dict(resultado, sin_tiempo=True, duracion=0.0)
+        
+        # Las peticiones de la fuente no pueden extenderse más allá de su franja
+        sesion = getattr(scraper, 'session', None)
+        if limite is not None and hasattr(sesion, 'plazo'):
+            sesion.plazo = limite
+        if hasattr(sesion, 'reset_estadisticas'):
+            sesion.reset_estadisticas()
+        
+        # Tras un circuito abierto, la visita de prueba trae solo unas pocas noticias
+        max_noticias = self.config['max_noticias_por_fuente']
+        if self.salud.estado(fuente_nombre) == PRUEBA:
+            max_noticias = min(max_noticias, self.salud.config['noticias_sonda'])
+            print(f"🩺 Visita de prueba a {fuente_nombre}")
+        
+        try:
+            if limite is None:
+                print(f"\n📰 Procesando fuente: {fuente_nombre}")
             else:
-                return {'tipo': 'duplicada', 'id': noticia_existente['id']}
+                print(f"\n📰 Procesando fuente: {fuente_nombre} (franja de {limite - inicio:.0f}s)")
+            
+            # Las noticias llegan a medida que se descargan y se guardan por lotes
+            # mientras el scraper sigue con las siguientes
+            noticias = scraper.iter_noticias(max_noticias=max_noticias)
+            lote = []
+            for noticia in noticias:
+                resultado['encontradas'] += 1
+                if isinstance(getattr(noticia, 'fecha_publicacion', None), datetime):
+                    fechas.append(noticia.fecha_publicacion)
+                lote.append(noticia)
+                if len(lote) >= self.config.get('tamano_lote', 5):
+                    self._guardar_lote(fuente_nombre, scraper, lote, resultado)
+                    lote = []
+                if limite is not None and time.time() >= limite:
+                    break
+            resultado['truncada'] = limite is not None and time.time() >= limite
+            # Lo descargado se guarda aunque la franja haya vencido
+            if lote:
+                self._guardar_lote(fuente_nombre, scraper, lote, resultado)
+            if resultado['truncada']:
+                print(f"✂️  {fuente_nombre} cortada al vencer su franja ({resultado['encontradas']} noticias)")
+            
+            # Sin `return`: la visita vacía también queda en el log, del que el
+            # planificador aprende el ritmo de las fuentes sin historial
+            if not resultado['encontradas']:
+                print(f"⚠️  No se encontraron noticias en {fuente_nombre}")
+            
+        except PlazoAgotado:
+            resultado['truncada'] = True
+            print(f"✂️  {fuente_nombre} cortada al vencer su franja ({resultado['encontradas']} noticias)")
+        
+        except Exception as e:
+            error_msg = f"Error procesando fuente {fuente_nombre}: {e}"
+            print(f"❌ {error_msg}")
+            resultado['errores'].append(error_msg)
+        
+        finally:
+            # Detener las descargas pendientes si la fuente se cortó antes de terminar
+            if hasattr(noticias, 'close'):
+                noticias.close()
+            if limite is not None and hasattr(sesion, 'plazo'):
+                sesion.plazo = None
+            if hasattr(sesion, 'get_estadisticas'):
+                resultado['peticiones'] = sesion.get_estadisticas()
+            
+            # Avanzar la marca de agua hasta donde el listado quedó almacenado
+            completa = self.persistir and self.contexto.marcas_agua.confirmar(
+                getattr(scraper, 'base_url', ''),
+                self.contexto.indice_urls.conocidas,
+                fecha=max(fechas, key=lambda f: f if f.tzinfo else f.replace(tzinfo=timezone.utc), default=None)
+            )
+            
+            # Un 304 en la próxima ejecución solo es seguro si no quedó nada pendiente
+            if hasattr(sesion, 'confirmar_validadores'):
+                if completa and not resultado['errores'] and not resultado['truncada']:
+                    sesion.confirmar_validadores()
+                else:
+                    sesion.descartar_validadores()
+            resultado['duracion'] = time.time() - inicio
+        
+        # Registrar log de la fuente con sus propios contadores
+        if self.persistir:
+            self._registrar_log_fuente(
+                fuente_nombre,
+                resultado['encontradas'],
+                len(resultado['errores']),
+                noticias_nuevas=resultado['nuevas'],
+                duracion_segundos=resultado['duracion'],
+                truncada=resultado['truncada']
+            )
+        
+        return resultado
+    
+    def _guardar_lote(self, fuente_nombre: str, scraper, noticias: List, resultado: Dict):
+        """Guardar un lote de noticias de una fuente"""
+        if fuente_nombre == 'contraloria' and isinstance(self.supabase, SupabaseClient):
+            # Usar método específico para Contraloría (escribe directo en Supabase)
+            for noticia in noticias:
+                try:
+                    # Convertir NoticiaEstandarizada a diccionario para el método específico
+                    if hasattr(noticia, 'to_dict'):
+                        noticia_dict = noticia.to_dict()
+                    else:
+                        noticia_dict = noticia
+                    
+                    if scraper.procesar_noticia_contraloria(noticia_dict):
+                        resultado['nuevas'] += 1
+                    else:
+                        resultado['actualizadas'] += 1
+                    if self.persistir:
+                        self.contexto.indice_urls.registrar(noticia_dict.get('url_origen'), fuente=noticia_dict.get('fuente'))
+                        
+                except Exception as e:
+                    error_msg = f"Error procesando noticia de {fuente_nombre}: {e}"
+                    print(f"❌ {error_msg}")
+                    resultado['errores'].append(error_msg)
         else:
-            # Nueva noticia
-            return self._insertar_noticia(noticia)
+            # Usar guardado en lote para otras fuentes
+            self._guardar_noticias(fuente_nombre, noticias, resultado)
+    
+    def _guardar_noticias(self, fuente_nombre: str, noticias: List, resultado: Dict):
+        """Clasificar y guardar en lote las noticias de una fuente"""
+        # Resolver en lote qué URLs ya existen (None: se consulta una a una)
+        existentes = self.supabase.get_noticias_by_urls([noticia.url_origen for noticia in noticias])
+        
+        filas = []
+        resumenes = {}
+        tipos = {}
+        conocidas = []
+        filas_por_url = {}
+        crudos = {}
+        
+        for noticia in noticias:
+            try:
+                # Verificar duplicados por URL (más confiable que hash)
+                if existentes is None:
+                    noticia_existente = self.supabase.get_noticia_by_url(noticia.url_origen)
+                else:
+                    noticia_existente = existentes.get(noticia.url_origen)
+                
+                tipo = self._clasificar_noticia(noticia_existente, noticia)
+                if tipo == 'duplicada':
+                    conocidas.append(noticia.to_dict())
+                    continue
+                if noticia.url_origen in tipos:
+                    continue
+                
+                datos_noticia, datos_resumen = self._preparar_noticia(noticia, actualizacion=(tipo == 'actualizada'))
+                filas.append(datos_noticia)
+                filas_por_url[noticia.url_origen] = datos_noticia
+                crudos[noticia.url_origen] = noticia.cuerpo_completo
+                tipos[noticia.url_origen] = tipo
+                if datos_resumen:
+                    resumenes[noticia.url_origen] = datos_resumen
+                    
+            except Exception as e:
+                error_msg = f"Error procesando noticia de {fuente_nombre}: {e}"
+                print(f"❌ {error_msg}")
+                resultado['errores'].append(error_msg)
+        
+        # Un request por lote en lugar de uno por noticia
+        for guardada in self.supabase.upsert_noticias(filas, resumenes) if filas else []:
+            url = guardada['url_origen']
+            
+            if not guardada['ok']:
+                error_msg = f"Error guardando noticia de {fuente_nombre} ({url}): {guardada['error']}"
+                print(f"❌ {error_msg}")
+                resultado['errores'].append(error_msg)
+                continue
+            
+            conocidas.append(filas_por_url[url])
+            if tipos[url] == 'nueva':
+                # El modelo aprende del cuerpo original, antes de quitarle el boilerplate
+                self.contexto.modelo_boilerplate.aprender(filas_por_url[url].get('fuente'), crudos.get(url), url)
+                resultado['nuevas'] += 1
+                print(f"✅ Nueva noticia insertada: {url}")
+            else:
+                resultado['actualizadas'] += 1
+                print(f"🔄 Noticia actualizada: {url}")
+        
+        # Lo ya almacenado no se vuelve a descargar en la próxima ejecución
+        if self.persistir:
+            self.contexto.indice_urls.registrar_lote(conocidas)
+    
+    def _clasificar_noticia(self, noticia_existente: Optional[Dict], noticia_nueva) -> str:
+        """Clasificar una noticia como 'nueva', 'actualizada' o 'duplicada'"""
+        if not noticia_existente:
+            return 'nueva'
+        if self._necesita_actualizacion(noticia_existente, noticia_nueva):
+            return 'actualizada'
+        return 'duplicada'
     
     def _necesita_actualizacion(self, noticia_existente: Dict, noticia_nueva) -> bool:
         """Verificar si una noticia necesita actualización"""
@@ -216,87 +493,61 @@ class NoticiasJuridicasSystem:
         
         return fecha_nueva > fecha_existente
     
-    def _insertar_noticia(self, noticia) -> Dict:
-        """Insertar nueva noticia en Supabase"""
-        try:
-            # Generar resumen ejecutivo
-            resumen = self.content_processor.generar_resumen_ejecutivo(noticia.titulo, noticia.cuerpo_completo, noticia.fuente)
-            
-            # Preparar datos para inserción
-            if hasattr(noticia, 'to_dict'):
-                datos_noticia = noticia.to_dict()
-            else:
-                # Si ya es un diccionario, usarlo directamente
-                datos_noticia = noticia
-            
-            # Agregar resumen ejecutivo y palabras clave
-            datos_noticia['resumen_ejecutivo'] = resumen.get('resumen_contenido', '')
-            datos_noticia['palabras_clave'] = resumen.get('palabras_clave', [])
-            
-            # Asegurar que los campos requeridos estén presentes
-            if 'autor' not in datos_noticia or datos_noticia['autor'] is None:
-                datos_noticia['autor'] = None
-            
-            # Insertar noticia
-            noticia_id = self.supabase.insert_noticia(datos_noticia)
-            
-            if noticia_id:
-                print(f"✅ Nueva noticia insertada: {noticia.titulo[:50]}...")
-                return {'tipo': 'nueva', 'id': noticia_id}
-            
-        except Exception as e:
-            print(f"❌ Error insertando noticia: {e}")
-            raise
-    
-    def _actualizar_noticia(self, noticia_id: str, noticia) -> Dict:
-        """Actualizar noticia existente"""
-        try:
-            # Generar nuevo resumen
-            resumen = self.content_processor.generar_resumen_ejecutivo(noticia.titulo, noticia.cuerpo_completo, noticia.fuente)
-            
-            # Actualizar datos
-            datos_actualizacion = noticia.to_dict()
-            datos_actualizacion['resumen_ejecutivo'] = resumen.get('resumen_contenido', '')
-            datos_actualizacion['palabras_clave'] = resumen.get('palabras_clave', [])
-            datos_actualizacion['es_actualizacion'] = True
-            datos_actualizacion['version'] = 2  # Incrementar versión
-            
-            self.supabase.update_noticia(noticia_id, datos_actualizacion)
-            
-            # Actualizar resumen
-            datos_resumen = {
-                'noticia_id': noticia_id,
-                'titulo_resumen': resumen.get('titulo_resumen', ''),
-                'subtitulo_resumen': resumen.get('subtitulo', ''),
-                'resumen_contenido': resumen.get('resumen_contenido', ''),
-                'puntos_clave': resumen.get('puntos_clave', []),
-                'implicaciones_juridicas': resumen.get('implicaciones_juridicas', ''),
-                'tipo_resumen': 'ejecutivo',
-                'nivel_tecnico': 'intermedio',
-                'modelo_ia': 'gpt-4',
-                'version': 2
-            }
-            
-            self.supabase.insert_resumen(datos_resumen)
-            
-            print(f"🔄 Noticia actualizada: {noticia.titulo[:50]}...")
-            return {'tipo': 'actualizada', 'id': noticia_id}
-            
-        except Exception as e:
-            print(f"❌ Error actualizando noticia: {e}")
-            raise
+    def _preparar_noticia(self, noticia, actualizacion: bool = False) -> Tuple[Dict, Optional[Dict]]:
+        """Preparar la fila de noticias_juridicas y, si es actualización, la de su resumen"""
+        # Quitar las frases que se repiten en las páginas de la fuente
+        cuerpo = self.contexto.modelo_boilerplate.limpiar(noticia.cuerpo_completo, noticia.fuente)
+        
+        # Generar resumen ejecutivo
+        resumen = self.content_processor.generar_resumen_ejecutivo(noticia.titulo, cuerpo, noticia.fuente)
+        
+        if hasattr(noticia, 'to_dict'):
+            datos_noticia = noticia.to_dict()
+        else:
+            # Si ya es un diccionario, usarlo directamente
+            datos_noticia = noticia
+        datos_noticia['cuerpo_completo'] = cuerpo
+        
+        # Agregar resumen ejecutivo y palabras clave
+        datos_noticia['resumen_ejecutivo'] = resumen.get('resumen_contenido', '')
+        datos_noticia['palabras_clave'] = resumen.get('palabras_clave', [])
+        
+        # Asegurar que los campos requeridos estén presentes
+        if 'autor' not in datos_noticia or datos_noticia['autor'] is None:
+            datos_noticia['autor'] = None
+        
+        if not actualizacion:
+            return datos_noticia, None
+        
+        datos_noticia['es_actualizacion'] = True
+        datos_noticia['version'] = 2  # Incrementar versión
+        
+        datos_resumen = {
+            'titulo_resumen': resumen.get('titulo_resumen', ''),
+            'subtitulo_resumen': resumen.get('subtitulo', ''),
+            'resumen_contenido': resumen.get('resumen_contenido', ''),
+            'puntos_clave': resumen.get('puntos_clave', []),
+            'implicaciones_juridicas': resumen.get('implicaciones_juridicas', ''),
+            'tipo_resumen': 'ejecutivo',
+            'nivel_tecnico': 'intermedio',
+            'modelo_ia': 'gpt-4',
+            'version': 2
+        }
+        
+        return datos_noticia, datos_resumen
     
-    def _registrar_log_fuente(self, fuente: str, noticias_procesadas: int, errores: int):
-        """Registrar log de procesamiento de fuente"""
+    def _registrar_log_fuente(self, fuente: str, noticias_procesadas: int, errores: int,
+                              noticias_nuevas: int = None, duracion_segundos: float = 0, truncada: bool = False):
+        """Registrar log de procesamiento de fuente (estado 'timeout' si se cortó por el plazo)"""
         try:
             log_data = {
                 'fuente_nombre': fuente,
-                'estado': 'completado' if errores == 0 else 'error',
+                'estado': 'timeout' if truncada else 'completado' if errores == 0 else 'error',
                 'tipo_operacion': 'scraping',
                 'noticias_encontradas': noticias_procesadas,
-                'noticias_nuevas': noticias_procesadas,  # Simplificado
+                'noticias_nuevas': noticias_procesadas if noticias_nuevas is None else noticias_nuevas,
                 'errores': errores,
-                'duracion_segundos': 0,  # Se podría calcular
+                'duracion_segundos': int(round(duracion_segundos)),
                 'requests_realizados': noticias_procesadas
             }
             
@@ -305,26 +556,39 @@ class NoticiasJuridicasSystem:
         except Exception as e:
             print(f"⚠️  Error registrando log: {e}")
     
-    def run_once(self):
-        """Ejecutar una vez"""
+    def run_once(self, solo_vencidas: bool = False, modo: str = 'completo'):
+        """Ejecutar una vez las fuentes que permite su salud (ver SaludFuentes.seleccionar)
+        
+        Con `solo_vencidas`, solo las fuentes cuya visita ya corresponde.
+        """
         print("🎯 Ejecutando scraping una vez...")
-        self.run_scraping_completo()
+        fuentes = list(self.scrapers)
+        if solo_vencidas:
+            fuentes = self.planificador.vencidas(fuentes)
+            print(f"🗓️  Fuentes con visita pendiente: {len(fuentes)} de {len(self.scrapers)}")
+        fuentes = self._seleccionar_por_salud(fuentes, modo)
+        if not fuentes:
+            self._imprimir_planificacion()
+            return
+        self.run_scraping_completo(fuentes)
+        self._imprimir_planificacion()
     
-    def run_scheduled(self):
-        """Ejecutar en modo programado"""
-        print(f"⏰ Iniciando modo programado - Intervalo: {self.config['intervalo_actualizacion']} segundos")
-        
-        # Programar ejecución
-        schedule.every(self.config['intervalo_actualizacion']).seconds.do(self.run_scraping_completo)
-        
-        # Ejecutar inmediatamente la primera vez
-        self.run_scraping_completo()
+    def run_scheduled(self, modo: str = 'completo'):
+        """Ejecutar en modo programado: cada fuente cuando corresponde según su ritmo de publicación"""
+        print(f"⏰ Iniciando modo programado - Fuentes sin historial cada {self.config['intervalo_actualizacion']} segundos")
         
         # Mantener ejecutando
         while True:
             try:
-                schedule.run_pending()
-                time.sleep(60)  # Verificar cada minuto
+                # Las fuentes nunca visitadas vencen de inmediato
+                vencidas = self.planificador.vencidas(self.scrapers, holgura=0)
+                vencidas = self._seleccionar_por_salud(vencidas, modo) if vencidas else []
+                if vencidas:
+                    self.run_scraping_completo(vencidas)
+                    self._imprimir_planificacion()
+                
+                espera = self.planificador.segundos_hasta_proxima(self.scrapers)
+                time.sleep(min(max(espera, 1), 60))  # Verificar al menos cada minuto
             except KeyboardInterrupt:
                 print("\n🛑 Deteniendo sistema...")
                 break
@@ -332,6 +596,53 @@ class NoticiasJuridicasSystem:
                 print(f"❌ Error en ejecución programada: {e}")
                 time.sleep(300)  # Esperar 5 minutos antes de reintentar
     
+    def _seleccionar_por_salud(self, fuentes: List[str], modo: str) -> List[str]:
+        """Filtrar las fuentes según su salud
+        
+        Las omitidas se agendan para su visita de prueba si tienen el circuito
+        abierto, o para dentro de su intervalo habitual si no.
+        """
+        seleccion = self.salud.seleccionar(fuentes, modo)
+        omitidas = [fuente for fuente in fuentes if fuente not in seleccion]
+        if omitidas:
+            print(f"🩺 Fuentes omitidas por su salud ({modo}): {', '.join(omitidas)}")
+        
+        ahora = time.time()
+        proximas = {}
+        for fuente in omitidas:
+            resumen = self.salud.resumen(fuente, ahora)
+            if resumen['circuito'] == ABIERTO:
+                proximas[fuente] = resumen['abierto_hasta']
+            else:
+                proximas[fuente] = ahora + self.planificador.intervalo(fuente)
+        if self.persistir:
+            self.planificador.posponer(proximas)
+        return seleccion
+    
+    def _imprimir_planificacion(self):
+        """Próxima visita de cada fuente"""
+        ahora = time.time()
+        proximas = sorted((self.planificador.proxima(fuente), fuente) for fuente in self.scrapers)
+        print("🗓️  Próximas visitas: " + ", ".join(
+            f"{fuente} {max(0, proxima - ahora) / 60:.0f}min" for proxima, fuente in proximas
+        ))
+    
+    def _imprimir_salud(self):
+        """Circuito, fallos seguidos, tasa de error y latencia mediana de cada fuente"""
+        ahora = time.time()
+        print("\n🩺 Salud de las fuentes:")
+        for fuente, resumen in self.salud.get_estadisticas(self.scrapers, ahora).items():
+            if not resumen['visitas']:
+                print(f"   {fuente}: sin visitas registradas")
+                continue
+            detalle = (f"{resumen['fallos_consecutivos']} fallos seguidos, "
+                       f"{resumen['tasa_error']:.0%} de error en {resumen['visitas']} visitas")
+            if resumen['latencia_mediana'] is not None:
+                detalle += f", latencia mediana {resumen['latencia_mediana'] * 1000:.0f}ms"
+            if resumen['circuito'] == ABIERTO:
+                detalle += f", prueba en {(resumen['abierto_hasta'] - ahora) / 60:.0f}min"
+            print(f"   {fuente}: circuito {resumen['circuito']}, {detalle}")
+    
     def get_estadisticas(self) -> Dict:
         """Obtener estadísticas del sistema"""
         try:
@@ -357,44 +668,89 @@ def main():
     parser.add_argument('--once', action='store_true', help='Ejecutar una sola vez')
     parser.add_argument('--scheduled', action='store_true', help='Ejecutar en modo programado')
     parser.add_argument('--stats', action='store_true', help='Mostrar estadísticas')
-    parser.add_argument('--test-mode', action='store_true', help='Ejecutar en modo prueba')
-    parser.add_argument('--working-only', action='store_true', help='Solo fuentes que funcionan')
-    parser.add_argument('--max-noticias', type=int, default=20, help='Máximo número de noticias por fuente')
-    parser.add_argument('--quick', action='store_true', help='Ejecución rápida')
+    parser.add_argument('--test-mode', action='store_true',
+                        help='Ejecutar en modo prueba: solo las fuentes más sanas y rápidas')
+    parser.add_argument('--working-only', action='store_true',
+                        help='Solo fuentes que funcionan: sin circuito abierto ni tasa de error alta')
+    parser.add_argument('--max-noticias', type=int, default=None, help='Máximo número de noticias por fuente')
+    parser.add_argument('--workers', type=int, default=None, help='Número de fuentes procesadas en paralelo')
+    parser.add_argument('--quick', action='store_true',
+                        help='Ejecución rápida: fuentes sanas de baja latencia; con --stats, solo la salud local')
+    parser.add_argument('--fuente', type=lambda valor: [codigo.strip() for codigo in valor.split(',') if codigo.strip()],
+                        default=None, help=f"Fuentes a recorrer, separadas por coma ({', '.join(FUENTES_SISTEMA)})")
+    parser.add_argument('--vencidas', action='store_true',
+                        help='Con --once, recorrer solo las fuentes cuya próxima visita ya corresponde')
+    parser.add_argument('--deadline', type=float, default=None, metavar='MINUTOS',
+                        help='Plazo de cada ejecución: fuentes por prioridad y costo, cada una con su franja de tiempo')
+    parser.add_argument('--cache', action='store_true', help='Usar y grabar la caché de respuestas HTTP (TTL por fuente)')
+    parser.add_argument('--replay', action='store_true', help='Servir solo desde la caché HTTP, sin escribir en Supabase ni en el estado local; '
+                             'falla ante peticiones no grabadas')
     
     args = parser.parse_args()
+    desconocidas = [codigo for codigo in args.fuente or [] if codigo not in FUENTES_SISTEMA]
+    if desconocidas:
+        parser.error(f"fuentes desconocidas: {', '.join(desconocidas)}")
     
     try:
         system = NoticiasJuridicasSystem()
         
+        if args.max_noticias is not None:
+            system.config['max_noticias_por_fuente'] = args.max_noticias
+        if args.workers is not None:
+            system.config['max_workers'] = args.workers
+        if args.deadline is not None:
+            system.config['plazo_ejecucion'] = args.deadline * 60
+        if args.fuente:
+            system.seleccionar_fuentes(args.fuente)
+        
+        # Fuentes según su salud; las pedidas con --fuente se recorren aunque tengan el circuito abierto
+        if args.fuente:
+            modo = 'todas'
+        elif args.test_mode:
+            modo = 'prueba'
+        elif args.quick:
+            modo = 'rapido'
+        elif args.working_only:
+            modo = 'funcionando'
+        else:
+            modo = 'completo'
+        
+        modo_cache = 'replay' if args.replay else 'grabar' if args.cache else system.contexto.cache.modo
+        if modo_cache:
+            system.configurar_cache_http(modo_cache)
+        
         if args.stats:
-            stats = system.get_estadisticas()
-            print("\n📊 Estadísticas del sistema:")
-            for key, value in stats.items():
-                print(f"   {key}: {value}")
+            if not args.quick:
+                stats = system.get_estadisticas()
+                print("\n📊 Estadísticas del sistema:")
+                for key, value in stats.items():
+                    print(f"   {key}: {value}")
+            system._imprimir_salud()
         
         elif args.once:
-            print(f"🎯 Ejecutando scraping una vez (max: {args.max_noticias} noticias por fuente)")
+            print(f"🎯 Ejecutando scraping una vez (max: {system.config['max_noticias_por_fuente']} noticias por fuente)")
             
             # Configurar modo de ejecución basado en argumentos
-            if args.test_mode:
-                print("🧪 MODO PRUEBA: Solo fuentes funcionando")
-                # Aquí podrías filtrar solo ciertas fuentes para pruebas
-                system.run_once()
-            elif args.working_only:
+            if modo == 'prueba':
+                print("🧪 MODO PRUEBA: Solo las fuentes más sanas")
+            elif modo == 'rapido':
+                print("🏃 MODO RÁPIDO: Solo fuentes sanas y de baja latencia")
+            elif modo == 'funcionando':
                 print("⚡ MODO OPTIMIZADO: Solo fuentes funcionando")
-                # Aquí podrías filtrar solo fuentes que funcionan
-                system.run_once()
             else:
-                print("🏭 MODO COMPLETO: Todas las fuentes")
-                system.run_once()
+                print("🏭 MODO COMPLETO: Todas las fuentes sin circuito abierto")
+            system.run_once(args.vencidas, modo)
         
         elif args.scheduled:
-            system.run_scheduled()
+            system.run_scheduled(modo)
         
         else:
             # Modo por defecto: ejecutar una vez
-            system.run_once()
+            system.run_once(modo=modo)
+        
+        if system.contexto.cache.modo == 'replay' and system.contexto.cache.estadisticas['fallos']:
+            print(f"❌ Replay incompleto: {system.contexto.cache.estadisticas['fallos']} peticiones sin respuesta grabada")
+            sys.exit(1)
     
     except Exception as e:
         print(f"❌ Error en el sistema: {e}")
@@ -8,15 +8,57 @@ import os
 import sys
 import re
 import hashlib
+import threading
+from collections import OrderedDict
 from typing import Dict, List, Optional, Tuple
 from datetime import datetime, timezone
 from dataclasses import dataclass
-import openai
 from dotenv import load_dotenv
 
 # Agregar el directorio padre al path
 sys.path.append(os.path.dirname(os.path.dirname(os.path.dirname(__file__))))
 
+from backend.processors.motor_limpieza import MotorLimpieza
+from backend.processors.reglas_limpieza import crear_grupos_contenido, crear_grupos_titulo
+
+ESPACIOS = re.compile(r'\s+')
+LETRA = re.compile(r'[a-zA-ZáéíóúñÁÉÍÓÚÑ]')
+
+def _finalizar_contenido(contenido: str) -> str:
+    """Normalizar espacios y descartar restos sin letras"""
+    contenido = ESPACIOS.sub(' ', contenido).strip()
+    if len(contenido) > 3 and LETRA.search(contenido):
+        return contenido
+    return ""
+
+# Motores compartidos por todas las instancias de ContentProcessor
+_motores_contenido = {}
+
+def motor_contenido_para(fuente: str = None) -> MotorLimpieza:
+    """Motor con las reglas base más las de la fuente (todas las reglas si no hay fuente)"""
+    clave = fuente.lower() if fuente else ''
+    motor = _motores_contenido.get(clave)
+    if motor is None:
+        motor = _motores_contenido.setdefault(
+            clave, MotorLimpieza(crear_grupos_contenido(clave or None), finalizar=_finalizar_contenido)
+        )
+    return motor
+
+motor_contenido = motor_contenido_para()
+motor_titulos = MotorLimpieza(crear_grupos_titulo())
+
+def estadisticas_limpieza() -> Dict[str, int]:
+    """Estadísticas sumadas de todos los motores de limpieza (contenido y títulos)"""
+    total = {}
+    for motor in list(_motores_contenido.values()) + [motor_titulos]:
+        for clave, valor in motor.get_estadisticas().items():
+            total[clave] = total.get(clave, 0) + valor
+    return total
+
+def reset_estadisticas_limpieza():
+    for motor in list(_motores_contenido.values()) + [motor_titulos]:
+        motor.reset_estadisticas()
+
 @dataclass
 class NoticiaCompleta:
     """Estructura completa de una noticia jurídica"""
@@ -100,12 +142,36 @@ class NoticiaCompleta:
 class ContentProcessor:
     """Procesador de contenido para noticias jurídicas"""
     
-    def __init__(self, openai_api_key: str = None):
+    def __init__(self, openai_api_key: str = None, tamano_cache: int = 1024):
         self.openai_api_key = openai_api_key
-        self.resumen_cache = {}  # Cache para evitar llamadas repetidas or os.getenv('OPENAI_API_KEY')
+        # Resúmenes ya generados (título + fuente), los menos usados se descartan primero;
+        # la instancia se comparte entre hilos (ver ContextoEjecucion)
+        self.tamano_cache = tamano_cache
+        self.resumen_cache = OrderedDict()
+        self._lock = threading.Lock()
+        self.estadisticas = {'aciertos': 0, 'fallos': 0}
+    
+    def cliente_openai(self):
+        """Módulo openai configurado con la clave
+        
+        Los resúmenes son manuales: openai tarda más en importarse que el resto del
+        sistema, así que solo se carga si alguien lo usa.
+        """
+        import openai
         if self.openai_api_key:
             openai.api_key = self.openai_api_key
-    
+        return openai
+
+    def get_estadisticas(self) -> Dict[str, int]:
+        """Aciertos de la caché de resúmenes y tamaño actual"""
+        with self._lock:
+            return dict(self.estadisticas, en_cache=len(self.resumen_cache))
+
+    def reset_estadisticas(self):
+        with self._lock:
+            for clave in self.estadisticas:
+                self.estadisticas[clave] = 0
+
     def generar_resumen_ejecutivo(self, titulo: str, contenido: str, fuente: str) -> Dict[str, str]:
         """
         Genera un resumen ejecutivo usando solo el primer párrafo (200 caracteres)
@@ -116,18 +182,26 @@ class ContentProcessor:
         try:
             # Limpiar título y contenido
             titulo_limpio = self._limpiar_titulo(titulo)
-            contenido_limpio = self._limpiar_contenido(contenido)
+            contenido_limpio = self._limpiar_contenido(contenido, fuente)
             
             # Verificar cache
             cache_key = f"{titulo_limpio[:100]}_{fuente}"
-            if cache_key in self.resumen_cache:
-                return self.resumen_cache[cache_key]
+            with self._lock:
+                resultado = self.resumen_cache.get(cache_key)
+                if resultado is not None:
+                    self.resumen_cache.move_to_end(cache_key)
+                    self.estadisticas['aciertos'] += 1
+                    return resultado
+                self.estadisticas['fallos'] += 1
             
             # Siempre usar resumen manual (sin IA)
             resultado = self._generar_resumen_manual(titulo_limpio, contenido_limpio, fuente)
             
             # Guardar en cache
-            self.resumen_cache[cache_key] = resultado
+            with self._lock:
+                self.resumen_cache[cache_key] = resultado
+                while len(self.resumen_cache) > self.tamano_cache:
+                    self.resumen_cache.popitem(last=False)
             
             return resultado
             
@@ -167,7 +241,7 @@ class ContentProcessor:
                 palabras_clave = palabras_clave[:3]
             
             # Generar resumen
-            resumen_contenido = resumen_match.group(1).strip() if resumen_match else self._generar_resumen_basico(contenido)
+            resumen_contenido = resumen_match.group(1).strip() if resumen_match else self._generar_resumen_basico(contenido, fuente)
             
             return {
                 'titulo_resumen': titulo,  # Mantener título original
@@ -187,7 +261,7 @@ class ContentProcessor:
         """Generar resumen manual usando solo el primer párrafo (400 caracteres) sin repetir título"""
         # Limpiar título y contenido
         titulo_limpio = self._limpiar_titulo(titulo)
-        contenido_limpio = self._limpiar_contenido(contenido)
+        contenido_limpio = self._limpiar_contenido(contenido, fuente)
         
         # Extraer el primer párrafo
         primer_parrafo = self._extraer_primer_parrafo(contenido_limpio)
@@ -260,10 +334,10 @@ class ContentProcessor:
         palabras = contenido.split()[:200]
         return ' '.join(palabras)
     
-    def _generar_resumen_basico(self, contenido: str) -> str:
+    def _generar_resumen_basico(self, contenido: str, fuente: str = None) -> str:
         """Generar resumen básico del contenido"""
         # Limpiar contenido de información irrelevante
-        contenido_limpio = self._limpiar_contenido(contenido)
+        contenido_limpio = self._limpiar_contenido(contenido, fuente)
         
         # Tomar las primeras 150 palabras y limpiar
         palabras = contenido_limpio.split()[:150]
@@ -279,182 +353,22 @@ class ContentProcessor:
         
         return resumen
     
-    def _limpiar_contenido(self, contenido: str) -> str:
-        """Limpiar contenido de información irrelevante"""
-        if not contenido:
-            return ""
-        
-        # Patrones a eliminar
-        patrones_a_eliminar = [
-            # Información del Tribunal Ambiental (texto problemático)
-            r'Acceder al expediente de la causa[A-Z0-9\-]+.*?contacto@tribunalambiental\.cl\.',
-            r'Acceder al expediente[A-Z0-9\-]+.*?contacto@tribunalambiental\.cl\.',
-            r'Morandé 360, Piso 8, Santiago.*?contacto@tribunalambiental\.cl\.',
-            r'Piso 8, Santiago\([0-9\s\+]+\)contacto@tribunalambiental\.cl\.',
-            r'\([0-9\s\+]+\)contacto@tribunalambiental\.cl\.',
-            r'contacto@tribunalambiental\.cl\.',
-            r'R-[0-9\-]+ Morandé 360, Piso 8, Santiago',
-            r'Piso 8, Santiago\([0-9\s\+]+\), Piso 8, Santiago',
-            
-            # Información del Poder Judicial
-            r'Poder Judicial Radio.*?Compartir',
-            r'Los horarios de atención son.*?horas\.',
-            r'Atención por teléfonos.*?\d+',
-            r'Licitaciones del Poder Judicial.*?Licitaciones adjudicadas',
-            r'Prensa y Comunicaciones.*?Proyectos de Ley',
-            r'Consulta Ciudadana.*?Sistema de traducción',
-            r'Canal preferencial.*?creole\.',
-            
-            # Fechas y horas
-            r'\d{2}-\d{2}-\d{4}\s+\d{2}:\d{2}',  # Fechas con hora
-            r'\d{2}:\d{2}',  # Horas sueltas
-            
-            # Elementos de navegación
-            r'Compartir\s+Compartir',
-            r'Compartir\s*',  # Solo "Compartir"
-            r'×\s*',  # Símbolos de multiplicación
-            r'Volver\s*',  # "Volver"
-            r'Cerrar\s*',  # "Cerrar"
-            
-            # Portales y sistemas
-            r'Portal Unificado de Sentencias.*?Compartir',
-            r'Fiscalía.*?Compartir',
-            r'Corte de Apelaciones.*?Compartir',
-            r'Corte Suprema.*?Compartir',
-            r'TOP.*?Compartir',
-            r'Juzgado.*?Compartir',
-            
-            # Información de contacto y navegación
-            r'Please ensure Javascript is enabled for purposes of website accessibility',
-            r'Sistema de traducción en línea.*?\d+',
-            r'Atención por Chat Messenger',
-            r'Portal Unificado de Sentencias en línea',
-            r'Orientación e información digital',
-            r'Plataformas digitales destinadas a orientar.*?usuarios',
-            r'Canal preferencial para personas en situación de discapacidad',
-            r'Traducción automática.*?creole',
-            
-            # Números de teléfono y contacto
-            r'\d{6,}',  # Números largos (teléfonos)
-            r'Teléfono.*?\d+',
-            r'Contacto.*?\d+',
-            
-            # Enlaces y URLs
-            r'https?://[^\s]+',
-            r'www\.[^\s]+',
-            
-            # Información de navegación
-            r'Tabla Primera Sala',
-            r'Tabla Segunda Sala',
-            r'Compendio Tercera Sala Corte Suprema',
-            r'Muestra representativa de sentencias.*?alto volumen',
-            r'Materias a consultar.*?licencias médicas',
-            r'Buscador Unificado de Sentencias',
-            r'Contiene una.*?sentencias',
-            
-            # Información administrativa
-            r'Los horarios de atención.*?horas',
-            r'Horario de atención.*?horas',
-            r'Días hábiles.*?viernes',
-            r'Lunes a viernes.*?horas',
-        ]
-        
-        contenido_limpio = contenido
-        
-        # Aplicar cada patrón de limpieza
-        for patron in patrones_a_eliminar:
-            contenido_limpio = re.sub(patron, '', contenido_limpio, flags=re.IGNORECASE | re.DOTALL)
-        
-        # Limpiar espacios múltiples y líneas vacías
-        contenido_limpio = re.sub(r'\s+', ' ', contenido_limpio)
-        contenido_limpio = re.sub(r'\n\s*\n', '\n', contenido_limpio)
-        
-        # Eliminar líneas que solo contengan espacios o caracteres especiales
-        lineas = contenido_limpio.split('\n')
-        lineas_limpias = []
-        for linea in lineas:
-            linea_limpia = linea.strip()
-            if linea_limpia and len(linea_limpia) > 3:  # Al menos 3 caracteres
-                # Verificar que no sea solo caracteres especiales
-                if re.search(r'[a-zA-ZáéíóúñÁÉÍÓÚÑ]', linea_limpia):
-                    lineas_limpias.append(linea_limpia)
-        
-        contenido_limpio = '\n'.join(lineas_limpias)
-        
-        # Limpiar espacios al inicio y final
-        contenido_limpio = contenido_limpio.strip()
-        
-        return contenido_limpio
+    def _limpiar_contenido(self, contenido: str, fuente: str = None) -> str:
+        """Limpiar contenido de información irrelevante
+
+        Se aplican las reglas base y las de la fuente (código de FUENTES_CONFIG);
+        sin fuente se aplican todas. Cada cuerpo se limpia una sola vez: el
+        resultado queda memorizado y limpiar de nuevo un texto limpio no lo modifica.
+        """
+        return motor_contenido_para(fuente).limpiar(contenido)
     
     def _limpiar_titulo(self, titulo: str) -> str:
         """Limpiar título de fechas, horas y información duplicada"""
         if not titulo:
             return ""
         
-        titulo_limpio = titulo
-        
-        # Eliminar fechas y horas del título (más agresivo)
-        patrones_fecha_hora = [
-            # Patrones específicos para el ejemplo dado (fechas pegadas al final)
-            r'\d{2}-\d{2}-\d{4}\s+\d{2}:\d{2}$',  # 01-08-2025 04:08
-            r'\d{1,2}-\d{1,2}-\d{4}\s+\d{1,2}:\d{2}$',  # 1-8-2025 4:08
-            r'\d{2}-\d{2}-\d{4}\s+\d{2}:\d{2}\s*$',  # Con espacios al final
-            r'\d{1,2}-\d{1,2}-\d{4}\s+\d{1,2}:\d{2}\s*$',  # Con espacios al final
-            
-            # Patrones generales de fecha y hora
-            r'\d{2}-\d{2}-\d{4}\s+\d{2}:\d{2}',  # DD-MM-YYYY HH:MM
-            r'\d{2}/\d{2}/\d{4}\s+\d{2}:\d{2}',  # DD/MM/YYYY HH:MM
-            r'\d{2}:\d{2}',  # Solo hora
-            r'\d{2}-\d{2}-\d{4}',  # Solo fecha DD-MM-YYYY
-            r'\d{2}/\d{2}/\d{4}',  # Solo fecha DD/MM/YYYY
-            r'\d{4}-\d{2}-\d{2}',  # Solo fecha YYYY-MM-DD
-            r'\d{1,2}-\d{1,2}-\d{4}\s+\d{1,2}:\d{2}',  # D-M-YYYY H:MM
-            r'\d{1,2}/\d{1,2}/\d{4}\s+\d{1,2}:\d{2}',  # D/M/YYYY H:MM
-            r'\d{1,2}-\d{1,2}-\d{4}',  # D-M-YYYY
-            r'\d{1,2}/\d{1,2}/\d{4}',  # D/M/YYYY
-            
-            # Patrones específicos del Poder Judicial
-            r'\d{2}-\d{2}-\d{4}\s+\d{2}:\d{2}\s*$',  # Fecha y hora al final
-            r'\d{2}/\d{2}/\d{4}\s+\d{2}:\d{2}\s*$',  # Fecha y hora al final
-            r'\d{1,2}-\d{1,2}-\d{4}\s+\d{1,2}:\d{2}\s*$',  # Fecha y hora al final
-            r'\d{1,2}/\d{1,2}/\d{4}\s+\d{1,2}:\d{2}\s*$',  # Fecha y hora al final
-            
-            # Patrones específicos para el ejemplo dado
-            r'\d{2}-\d{2}-\d{4}\s+\d{2}:\d{2}$',  # 26-07-2025 04:07
-            r'\d{2}-\d{2}-\d{4}\s+\d{1,2}:\d{2}$',  # 26-07-2025 4:07
-            r'\d{1,2}-\d{1,2}-\d{4}\s+\d{2}:\d{2}$',  # 6-07-2025 04:07
-            r'\d{1,2}-\d{1,2}-\d{4}\s+\d{1,2}:\d{2}$',  # 6-7-2025 4:07
-        ]
-        
-        for patron in patrones_fecha_hora:
-            titulo_limpio = re.sub(patron, '', titulo_limpio)
-        
-        # Eliminar información duplicada y irrelevante
-        patrones_duplicados = [
-            r'\s+del\s+Corte\s+de\s+Apelaciones\.?\s*$',  # "del Corte de Apelaciones" al final
-            r'\s+del\s+Fiscalía\.?\s*$',  # "del Fiscalía" al final
-            r'\s+del\s+Corte\s+Suprema\.?\s*$',  # "del Corte Suprema" al final
-            r'\s+del\s+TOP\.?\s*$',  # "del TOP" al final
-            r'\s+del\s+Juzgado\.?\s*$',  # "del Juzgado" al final
-            r'\s+Video\s*$',  # "Video" al final
-            r'\s+Compartir\s*$',  # "Compartir" al final
-            r'\s+×\s*$',  # Símbolo de multiplicación al final
-            r'\s+Portal\s+Unificado\s+de\s+Sentencias\s*$',  # "Portal Unificado de Sentencias" al final
-            r'\s+Poder\s+Judicial\s+Radio\s*$',  # "Poder Judicial Radio" al final
-            r'\s+Poder\s+Judicial\s+TV\s*$',  # "Poder Judicial TV" al final
-            r'\s+Orientación\s+e\s+información\s+digital\s*$',  # "Orientación e información digital" al final
-            r'\s+Plataformas\s+digitales\s*$',  # "Plataformas digitales" al final
-            r'\s+Atención\s+por\s+Chat\s*$',  # "Atención por Chat" al final
-            r'\s+Sistema\s+de\s+traducción\s*$',  # "Sistema de traducción" al final
-            r'\s+\d{6,}\s*$',  # Números largos al final (teléfonos)
-            r'\s+creole\.\s*$',  # "creole." al final
-            r'\s+Volver\s*$',  # "Volver" al final
-            r'\s+Please\s+ensure\s+Javascript\s+is\s+enabled\s*$',  # "Please ensure Javascript is enabled" al final
-            r'\s+Cerrar\s*$',  # "Cerrar" al final
-        ]
-        
-        for patron in patrones_duplicados:
-            titulo_limpio = re.sub(patron, '', titulo_limpio, flags=re.IGNORECASE)
+        # Eliminar fechas, horas e información duplicada (ver reglas_limpieza)
+        titulo_limpio = motor_titulos.aplicar(titulo)
         
         # Eliminar repeticiones del mismo título
         # Si el título se repite más de una vez, tomar solo la primera parte
@@ -470,7 +384,7 @@ class ContentProcessor:
                 titulo_limpio = primera_mitad
         
         # Limpiar espacios múltiples y líneas vacías
-        titulo_limpio = re.sub(r'\s+', ' ', titulo_limpio)
+        titulo_limpio = ESPACIOS.sub(' ', titulo_limpio)
         titulo_limpio = titulo_limpio.strip()
         
         # Asegurar que no termine con punto si es muy corto
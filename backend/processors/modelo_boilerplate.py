@@ -0,0 +1,213 @@
+#!/usr/bin/env python3
+"""
+Modelo de boilerplate aprendido por fuente
+Cuenta en cuántos documentos de cada fuente aparece cada frase (por su huella)
+y elimina de los cuerpos las frases que se repiten en buena parte de ellos:
+pies de página, datos de contacto y textos de navegación. El aprendizaje es
+incremental y se persiste en el directorio de estado.
+"""
+
+import hashlib
+import json
+import os
+import re
+import threading
+from typing import Dict, List, Set
+
+from backend.scrapers.fuentes.config import SCRAPING_CONFIG
+
+# Fin de oración seguido de espacio, o saltos de línea (se conservan al separar)
+SEPARADOR_FRASES = re.compile(r'((?<=[.!?])\s+|\s*\n\s*)')
+
+def huella(texto: str) -> str:
+    """Huella corta de una frase o URL, sin distinguir mayúsculas ni espacios"""
+    normalizado = ' '.join(texto.lower().split())
+    return hashlib.blake2b(normalizado.encode('utf-8'), digest_size=8).hexdigest()
+
+def segmentar(texto: str) -> List[str]:
+    """Frases no vacías de un texto"""
+    return [frase for frase in SEPARADOR_FRASES.split(texto)[::2] if frase.strip()]
+
+class ModeloBoilerplate:
+    """Frecuencia documental de frases por fuente, persistida en JSON"""
+
+    def __init__(self, ruta: str = None, min_documentos: int = None, proporcion_minima: float = None,
+                 max_frases: int = None):
+        config = SCRAPING_CONFIG['boilerplate']
+        self.ruta = ruta or os.path.join(SCRAPING_CONFIG['directorio_estado'], 'boilerplate.json')
+        self.min_documentos = min_documentos or config['min_documentos']
+        self.proporcion_minima = proporcion_minima or config['proporcion_minima']
+        self.max_frases = max_frases or config['max_frases']
+        # Desactivado (p. ej. en replay) no se aprende ni se limpia
+        self.activo = True
+        self._datos = None
+        self._boilerplate = {}
+        self._modificado = False
+        self._lock = threading.RLock()
+        self.estadisticas = {'aprendidos': 0, 'documentos_limpiados': 0, 'frases_eliminadas': 0}
+
+    # ========================================
+    # PERSISTENCIA
+    # ========================================
+
+    def _cargar(self) -> Dict:
+        """Leer el archivo la primera vez que se usa"""
+        if self._datos is None:
+            try:
+                with open(self.ruta, encoding='utf-8') as archivo:
+                    datos = json.load(archivo)
+                for fuente in datos['fuentes'].values():
+                    fuente['vistos'] = set(fuente['vistos'])
+                self._datos = datos
+            except (OSError, ValueError, KeyError):
+                self._datos = {'sincronizado_hasta': None, 'fuentes': {}}
+        return self._datos
+
+    def guardar(self):
+        """Escribir el modelo de forma atómica si cambió"""
+        with self._lock:
+            if not self._modificado:
+                return
+            datos = dict(self._cargar(), fuentes={
+                fuente: dict(modelo, vistos=sorted(modelo['vistos']))
+                for fuente, modelo in self._cargar()['fuentes'].items()
+            })
+            try:
+                os.makedirs(os.path.dirname(self.ruta), exist_ok=True)
+                temporal = f"{self.ruta}.tmp"
+                with open(temporal, 'w', encoding='utf-8') as archivo:
+                    json.dump(datos, archivo)
+                os.replace(temporal, self.ruta)
+                self._modificado = False
+            except OSError as e:
+                print(f"⚠️  No se pudo guardar el modelo de boilerplate: {e}")
+
+    def _modelo(self, fuente: str) -> Dict:
+        return self._cargar()['fuentes'].setdefault(fuente, {'documentos': 0, 'frases': {}, 'vistos': set()})
+
+    # ========================================
+    # APRENDIZAJE
+    # ========================================
+
+    def aprender(self, fuente: str, cuerpo: str, url: str = None) -> bool:
+        """Contar las frases de un documento; cada URL se cuenta una sola vez"""
+        if not self.activo or not fuente or not cuerpo:
+            return False
+        fuente = fuente.lower()
+        huellas = {huella(frase) for frase in segmentar(cuerpo)}
+
+        with self._lock:
+            modelo = self._modelo(fuente)
+            if url:
+                huella_url = huella(url)
+                if huella_url in modelo['vistos']:
+                    return False
+                modelo['vistos'].add(huella_url)
+
+            modelo['documentos'] += 1
+            frases = modelo['frases']
+            for clave in huellas:
+                frases[clave] = frases.get(clave, 0) + 1
+
+            # Descartar frases vistas una sola vez cuando la tabla crece demasiado
+            if len(frases) > self.max_frases:
+                modelo['frases'] = {clave: veces for clave, veces in frases.items() if veces > 1}
+
+            self._boilerplate.pop(fuente, None)
+            self._modificado = True
+            self.estadisticas['aprendidos'] += 1
+        return True
+
+    def aprender_desde(self, supabase) -> int:
+        """Aprender de los cuerpos almacenados desde la última sincronización"""
+        obtener = getattr(supabase, 'get_cuerpos_noticias', None)
+        if not self.activo or obtener is None:
+            return 0
+
+        with self._lock:
+            desde = self._cargar()['sincronizado_hasta']
+
+        filas = obtener(desde=desde)
+        if filas is None:
+            print("⚠️  No se pudo sincronizar el modelo de boilerplate")
+            return 0
+
+        aprendidos = sum(
+            1 for fila in filas
+            if self.aprender(fila.get('fuente'), fila.get('cuerpo_completo'), fila.get('url_origen'))
+        )
+
+        fechas = [fila['created_at'] for fila in filas if fila.get('created_at')]
+        if fechas:
+            with self._lock:
+                self._cargar()['sincronizado_hasta'] = max(fechas)
+                self._modificado = True
+        self.guardar()
+
+        if aprendidos:
+            print(f"🧹 Modelo de boilerplate: {aprendidos} documentos nuevos desde Supabase")
+        return aprendidos
+
+    # ========================================
+    # LIMPIEZA
+    # ========================================
+
+    def boilerplate(self, fuente: str) -> Set[str]:
+        """Huellas de las frases que se consideran boilerplate en una fuente"""
+        fuente = (fuente or '').lower()
+        with self._lock:
+            conjunto = self._boilerplate.get(fuente)
+            if conjunto is None:
+                modelo = self._cargar()['fuentes'].get(fuente)
+                minimo = 0
+                if modelo and modelo['documentos'] >= self.min_documentos:
+                    minimo = max(self.min_documentos, self.proporcion_minima * modelo['documentos'])
+                conjunto = {
+                    clave for clave, veces in modelo['frases'].items() if veces >= minimo
+                } if minimo else set()
+                self._boilerplate[fuente] = conjunto
+            return conjunto
+
+    def limpiar(self, cuerpo: str, fuente: str) -> str:
+        """Eliminar del cuerpo las frases de boilerplate de la fuente
+
+        Si todas las frases fueran boilerplate se devuelve el cuerpo intacto.
+        """
+        if not self.activo or not cuerpo:
+            return cuerpo
+        conjunto = self.boilerplate(fuente)
+        if not conjunto:
+            return cuerpo
+
+        partes = SEPARADOR_FRASES.split(cuerpo)
+        conservadas = []
+        eliminadas = 0
+        for i in range(0, len(partes), 2):
+            frase = partes[i]
+            if frase.strip() and huella(frase) in conjunto:
+                eliminadas += 1
+                continue
+            conservadas.append(frase)
+            if i + 1 < len(partes):
+                conservadas.append(partes[i + 1])
+
+        limpio = ''.join(conservadas).strip()
+        if not eliminadas or not limpio:
+            return cuerpo
+
+        with self._lock:
+            self.estadisticas['documentos_limpiados'] += 1
+            self.estadisticas['frases_eliminadas'] += eliminadas
+        return limpio
+
+    def get_estadisticas(self) -> Dict[str, int]:
+        with self._lock:
+            return dict(self.estadisticas)
+
+    def reset_estadisticas(self):
+        with self._lock:
+            for clave in self.estadisticas:
+                self.estadisticas[clave] = 0
+
+# Instancia global
+modelo_boilerplate = ModeloBoilerplate()
@@ -0,0 +1,194 @@
+#!/usr/bin/env python3
+"""
+Motor de reglas de limpieza precompiladas
+Las reglas se compilan una sola vez y se agrupan en alternancias que recorren
+el texto en una sola pasada. Antes de ejecutar un grupo se comprueba que los
+literales obligatorios de sus reglas aparezcan en el texto, de modo que solo
+corren las reglas que pueden coincidir. El resultado de cada documento se
+memoriza para no limpiar dos veces el mismo cuerpo.
+"""
+
+import re
+import threading
+from collections import OrderedDict
+from typing import Callable, Dict, Iterable, Sequence, Tuple
+
+def literales_requeridos(patron: str) -> Tuple[str, ...]:
+    """Literales (en minúsculas) que deben aparecer en un texto para que el patrón coincida
+
+    Solo se analiza el nivel superior del patrón: lo que sigue al primer grupo
+    no se considera, y un patrón con alternancia no tiene literales obligatorios.
+    """
+    if re.search(r'(?<!\\)\|', patron):
+        return ()
+    grupo = re.search(r'(?<!\\)\(', patron)
+    if grupo:
+        patron = patron[:grupo.start()]
+
+    literales = []
+    actual = ''
+    i = 0
+    while i < len(patron):
+        caracter = patron[i]
+
+        if caracter == '\\':
+            siguiente = patron[i + 1:i + 2]
+            i += 2
+            if siguiente and not siguiente.isalnum():
+                actual += siguiente  # \. \- \( ... son literales
+                continue
+            # \d \s \w \b ... no son literales
+        elif caracter == '[':
+            fin = i + 1
+            if patron[fin:fin + 1] == '^':
+                fin += 1
+            if patron[fin:fin + 1] == ']':
+                fin += 1
+            while fin < len(patron) and patron[fin] != ']':
+                fin += 2 if patron[fin] == '\\' else 1
+            i = fin + 1
+        elif caracter in '*+?{':
+            if caracter == '{':
+                fin = patron.find('}', i)
+                fin = len(patron) - 1 if fin == -1 else fin
+                opcional = patron[i + 1:fin].split(',')[0] in ('', '0')
+                i = fin + 1
+            else:
+                opcional = caracter in '*?'
+                i += 1
+            if patron[i:i + 1] == '?':
+                i += 1  # cuantificador perezoso
+            if opcional:
+                actual = actual[:-1]
+        elif caracter in '.^$':
+            i += 1
+        else:
+            actual += caracter
+            i += 1
+            continue
+
+        if actual:
+            literales.append(actual.lower())
+        actual = ''
+
+    if actual:
+        literales.append(actual.lower())
+    return tuple(literales)
+
+class GrupoReglas:
+    """Reglas que se aplican juntas, en una sola pasada, como alternancia
+
+    Dentro de una alternancia gana la coincidencia que empieza más a la
+    izquierda, así que solo deben agruparse reglas cuyo resultado no dependa
+    del orden en que se apliquen: nada de tramos '.*?' que puedan empezar en
+    distintos literales. Tampoco se vuelve a buscar en el texto que queda
+    unido tras eliminar una coincidencia.
+    """
+
+    def __init__(self, nombre: str, patrones: Sequence[str], flags: int = 0):
+        self.nombre = nombre
+        self.patrones = tuple(patrones)
+        self.flags = flags
+        self.literales = tuple(literales_requeridos(patron) for patron in self.patrones)
+        self._compiladas = {}
+        # La alternancia completa se compila de inmediato: es la que corre casi siempre
+        self.regex(tuple(range(len(self.patrones))))
+
+    def activas(self, minusculas: str) -> Tuple[int, ...]:
+        """Índices de las reglas cuyos literales aparecen en el texto (ya en minúsculas)"""
+        return tuple(
+            indice for indice, literales in enumerate(self.literales)
+            if all(literal in minusculas for literal in literales)
+        )
+
+    def regex(self, activas: Tuple[int, ...]):
+        """Alternancia compilada con solo las reglas activas"""
+        compilada = self._compiladas.get(activas)
+        if compilada is None:
+            if len(activas) == 1:
+                fuente = self.patrones[activas[0]]
+            else:
+                fuente = '|'.join(f"(?:{self.patrones[indice]})" for indice in activas)
+            compilada = re.compile(fuente, self.flags)
+            self._compiladas[activas] = compilada
+        return compilada
+
+class MotorLimpieza:
+    """Aplica grupos de reglas en orden, con prefiltro por literales y memo por documento"""
+
+    def __init__(self, grupos: Iterable[GrupoReglas], finalizar: Callable[[str], str] = None,
+                 reemplazo: str = '', tamano_memo: int = 256):
+        self.grupos = list(grupos)
+        self.finalizar = finalizar
+        self.reemplazo = reemplazo
+        self.tamano_memo = tamano_memo
+        self._memo = OrderedDict()
+        self._lock = threading.Lock()
+        self.estadisticas = {'documentos': 0, 'memo': 0, 'grupos_ejecutados': 0, 'grupos_omitidos': 0}
+
+    @property
+    def patrones(self) -> Tuple[Tuple[str, int], ...]:
+        """Todas las reglas en orden de aplicación, como (patrón, flags)"""
+        return tuple((patron, grupo.flags) for grupo in self.grupos for patron in grupo.patrones)
+
+    def aplicar(self, texto: str) -> str:
+        """Aplicar las reglas en orden, sin memo ni finalización"""
+        minusculas = texto.lower()
+        ejecutados = omitidos = 0
+
+        for grupo in self.grupos:
+            activas = grupo.activas(minusculas)
+            if not activas:
+                omitidos += 1
+                continue
+
+            ejecutados += 1
+            texto, cambios = grupo.regex(activas).subn(self.reemplazo, texto)
+            if cambios:
+                minusculas = texto.lower()
+
+        with self._lock:
+            self.estadisticas['grupos_ejecutados'] += ejecutados
+            self.estadisticas['grupos_omitidos'] += omitidos
+        return texto
+
+    def limpiar(self, texto: str) -> str:
+        """Limpiar un documento completo, una sola vez por contenido
+
+        El resultado también se memoriza como limpio, así que volver a limpiar
+        un texto ya limpio lo devuelve sin cambios.
+        """
+        if not texto:
+            return ""
+
+        with self._lock:
+            limpio = self._memo.get(texto)
+            if limpio is not None:
+                self._memo.move_to_end(texto)
+                self.estadisticas['memo'] += 1
+                return limpio
+
+        limpio = self.aplicar(texto)
+        if self.finalizar:
+            limpio = self.finalizar(limpio)
+
+        with self._lock:
+            self.estadisticas['documentos'] += 1
+            self._memo[texto] = limpio
+            self._memo[limpio] = limpio
+            while len(self._memo) > self.tamano_memo:
+                self._memo.popitem(last=False)
+        return limpio
+
+    def get_estadisticas(self) -> Dict[str, int]:
+        with self._lock:
+            return dict(self.estadisticas)
+
+    def reset_estadisticas(self):
+        with self._lock:
+            for clave in self.estadisticas:
+                self.estadisticas[clave] = 0
+
+    def vaciar_memo(self):
+        with self._lock:
+            self._memo.clear()
@@ -0,0 +1,199 @@
+#!/usr/bin/env python3
+"""
+Reglas de limpieza de contenido y títulos de noticias
+Cada tupla es un grupo que se aplica en una sola pasada; los grupos se
+aplican en el orden en que aparecen. Solo se agrupan reglas cuyo resultado no
+depende del orden (ver GrupoReglas).
+
+Los grupos de contenido indican a qué fuentes (códigos de FUENTES_CONFIG) se
+aplican; los del conjunto base se aplican a todas.
+"""
+
+import re
+
+from backend.processors.motor_limpieza import GrupoReglas
+
+# ========================================
+# CONTENIDO
+# ========================================
+
+FLAGS_CONTENIDO = re.IGNORECASE | re.DOTALL
+
+BASE = ()
+TRIBUNALES_AMBIENTALES = ('1ta', '3ta', 'tribunal_ambiental')
+PODER_JUDICIAL = ('poder_judicial',)
+
+# (nombre, fuentes, patrones)
+GRUPOS_CONTENIDO = (
+    # Información del Tribunal Ambiental (texto problemático)
+    ('tribunal_ambiental_causa', TRIBUNALES_AMBIENTALES, (r'Acceder al expediente de la causa[A-Z0-9\-]+.*?contacto@tribunalambiental\.cl\.',)),
+    ('tribunal_ambiental_expediente', TRIBUNALES_AMBIENTALES, (r'Acceder al expediente[A-Z0-9\-]+.*?contacto@tribunalambiental\.cl\.',)),
+    ('tribunal_ambiental_direccion', TRIBUNALES_AMBIENTALES, (r'Morandé 360, Piso 8, Santiago.*?contacto@tribunalambiental\.cl\.',)),
+    ('tribunal_ambiental_contacto', TRIBUNALES_AMBIENTALES, (
+        r'Piso 8, Santiago\([0-9\s\+]+\)contacto@tribunalambiental\.cl\.',
+        r'\([0-9\s\+]+\)contacto@tribunalambiental\.cl\.',
+        r'contacto@tribunalambiental\.cl\.',
+    )),
+    ('tribunal_ambiental_rol', TRIBUNALES_AMBIENTALES, (r'R-[0-9\-]+ Morandé 360, Piso 8, Santiago',)),
+    ('tribunal_ambiental_piso', TRIBUNALES_AMBIENTALES, (r'Piso 8, Santiago\([0-9\s\+]+\), Piso 8, Santiago',)),
+
+    # Información del Poder Judicial
+    ('poder_judicial_radio', PODER_JUDICIAL, (r'Poder Judicial Radio.*?Compartir',)),
+    ('poder_judicial_horarios', PODER_JUDICIAL, (r'Los horarios de atención son.*?horas\.',)),
+    ('poder_judicial_telefonos', PODER_JUDICIAL, (r'Atención por teléfonos.*?\d+',)),
+    ('poder_judicial_licitaciones', PODER_JUDICIAL, (r'Licitaciones del Poder Judicial.*?Licitaciones adjudicadas',)),
+    ('poder_judicial_prensa', PODER_JUDICIAL, (r'Prensa y Comunicaciones.*?Proyectos de Ley',)),
+    ('poder_judicial_consulta', PODER_JUDICIAL, (r'Consulta Ciudadana.*?Sistema de traducción',)),
+    ('poder_judicial_canal', PODER_JUDICIAL, (r'Canal preferencial.*?creole\.',)),
+
+    # Fechas y horas
+    ('fecha_hora', BASE, (r'\d{2}-\d{2}-\d{4}\s+\d{2}:\d{2}',)),  # Fechas con hora
+    ('hora', BASE, (r'\d{2}:\d{2}',)),  # Horas sueltas
+
+    # Elementos de navegación
+    ('compartir_doble', BASE, (r'Compartir\s+Compartir',)),
+    ('navegacion', BASE, (
+        r'Compartir\s*',  # Solo "Compartir"
+        r'×\s*',  # Símbolos de multiplicación
+        r'Volver\s*',  # "Volver"
+        r'Cerrar\s*',  # "Cerrar"
+    )),
+
+    # Portales y sistemas
+    ('portal_sentencias', PODER_JUDICIAL, (r'Portal Unificado de Sentencias.*?Compartir',)),
+    ('fiscalia', PODER_JUDICIAL, (r'Fiscalía.*?Compartir',)),
+    ('corte_apelaciones', PODER_JUDICIAL, (r'Corte de Apelaciones.*?Compartir',)),
+    ('corte_suprema', PODER_JUDICIAL, (r'Corte Suprema.*?Compartir',)),
+    ('top', PODER_JUDICIAL, (r'TOP.*?Compartir',)),
+    ('juzgado', PODER_JUDICIAL, (r'Juzgado.*?Compartir',)),
+
+    # Información de contacto y navegación
+    ('accesibilidad', BASE, (r'Please ensure Javascript is enabled for purposes of website accessibility',)),
+    ('sistema_traduccion', PODER_JUDICIAL, (r'Sistema de traducción en línea.*?\d+',)),
+    ('orientacion', PODER_JUDICIAL, (
+        r'Atención por Chat Messenger',
+        r'Portal Unificado de Sentencias en línea',
+        r'Orientación e información digital',
+    )),
+    ('plataformas_digitales', PODER_JUDICIAL, (r'Plataformas digitales destinadas a orientar.*?usuarios',)),
+    ('canal_preferencial', PODER_JUDICIAL, (r'Canal preferencial para personas en situación de discapacidad',)),
+    ('traduccion_automatica', PODER_JUDICIAL, (r'Traducción automática.*?creole',)),
+
+    # Números de teléfono y contacto
+    ('numeros_largos', BASE, (r'\d{6,}',)),  # Números largos (teléfonos)
+    ('telefono', BASE, (r'Teléfono.*?\d+',)),
+    ('contacto', BASE, (r'Contacto.*?\d+',)),
+
+    # Enlaces y URLs
+    ('urls', BASE, (
+        r'https?://[^\s]+',
+        r'www\.[^\s]+',
+    )),
+
+    # Información de navegación
+    ('tablas_salas', PODER_JUDICIAL, (
+        r'Tabla Primera Sala',
+        r'Tabla Segunda Sala',
+        r'Compendio Tercera Sala Corte Suprema',
+    )),
+    ('muestra_sentencias', PODER_JUDICIAL, (r'Muestra representativa de sentencias.*?alto volumen',)),
+    ('materias', PODER_JUDICIAL, (r'Materias a consultar.*?licencias médicas',)),
+    ('buscador_sentencias', PODER_JUDICIAL, (r'Buscador Unificado de Sentencias',)),
+    ('contiene_sentencias', PODER_JUDICIAL, (r'Contiene una.*?sentencias',)),
+
+    # Información administrativa
+    ('horarios', BASE, (r'Los horarios de atención.*?horas',)),
+    ('horario', BASE, (r'Horario de atención.*?horas',)),
+    ('dias_habiles', BASE, (r'Días hábiles.*?viernes',)),
+    ('lunes_viernes', BASE, (r'Lunes a viernes.*?horas',)),
+)
+
+# ========================================
+# TÍTULOS
+# ========================================
+
+# Las reglas ancladas al final del título pueden dejar al descubierto otra
+# coincidencia para una regla posterior, así que cada una es su propio grupo
+PATRONES_TITULO_FECHA_HORA = (
+    # Patrones específicos para el ejemplo dado (fechas pegadas al final)
+    r'\d{2}-\d{2}-\d{4}\s+\d{2}:\d{2}$',  # 01-08-2025 04:08
+    r'\d{1,2}-\d{1,2}-\d{4}\s+\d{1,2}:\d{2}$',  # 1-8-2025 4:08
+    r'\d{2}-\d{2}-\d{4}\s+\d{2}:\d{2}\s*$',  # Con espacios al final
+    r'\d{1,2}-\d{1,2}-\d{4}\s+\d{1,2}:\d{2}\s*$',  # Con espacios al final
+
+    # Patrones generales de fecha y hora
+    r'\d{2}-\d{2}-\d{4}\s+\d{2}:\d{2}',  # DD-MM-YYYY HH:MM
+    r'\d{2}/\d{2}/\d{4}\s+\d{2}:\d{2}',  # DD/MM/YYYY HH:MM
+    r'\d{2}:\d{2}',  # Solo hora
+    r'\d{2}-\d{2}-\d{4}',  # Solo fecha DD-MM-YYYY
+    r'\d{2}/\d{2}/\d{4}',  # Solo fecha DD/MM/YYYY
+    r'\d{4}-\d{2}-\d{2}',  # Solo fecha YYYY-MM-DD
+    r'\d{1,2}-\d{1,2}-\d{4}\s+\d{1,2}:\d{2}',  # D-M-YYYY H:MM
+    r'\d{1,2}/\d{1,2}/\d{4}\s+\d{1,2}:\d{2}',  # D/M/YYYY H:MM
+    r'\d{1,2}-\d{1,2}-\d{4}',  # D-M-YYYY
+    r'\d{1,2}/\d{1,2}/\d{4}',  # D/M/YYYY
+
+    # Patrones específicos del Poder Judicial
+    r'\d{2}-\d{2}-\d{4}\s+\d{2}:\d{2}\s*$',  # Fecha y hora al final
+    r'\d{2}/\d{2}/\d{4}\s+\d{2}:\d{2}\s*$',  # Fecha y hora al final
+    r'\d{1,2}-\d{1,2}-\d{4}\s+\d{1,2}:\d{2}\s*$',  # Fecha y hora al final
+    r'\d{1,2}/\d{1,2}/\d{4}\s+\d{1,2}:\d{2}\s*$',  # Fecha y hora al final
+
+    # Patrones específicos para el ejemplo dado
+    r'\d{2}-\d{2}-\d{4}\s+\d{2}:\d{2}$',  # 26-07-2025 04:07
+    r'\d{2}-\d{2}-\d{4}\s+\d{1,2}:\d{2}$',  # 26-07-2025 4:07
+    r'\d{1,2}-\d{1,2}-\d{4}\s+\d{2}:\d{2}$',  # 6-07-2025 04:07
+    r'\d{1,2}-\d{1,2}-\d{4}\s+\d{1,2}:\d{2}$',  # 6-7-2025 4:07
+)
+
+# Información duplicada e irrelevante al final del título
+PATRONES_TITULO_DUPLICADOS = (
+    r'\s+del\s+Corte\s+de\s+Apelaciones\.?\s*$',  # "del Corte de Apelaciones" al final
+    r'\s+del\s+Fiscalía\.?\s*$',  # "del Fiscalía" al final
+    r'\s+del\s+Corte\s+Suprema\.?\s*$',  # "del Corte Suprema" al final
+    r'\s+del\s+TOP\.?\s*$',  # "del TOP" al final
+    r'\s+del\s+Juzgado\.?\s*$',  # "del Juzgado" al final
+    r'\s+Video\s*$',  # "Video" al final
+    r'\s+Compartir\s*$',  # "Compartir" al final
+    r'\s+×\s*$',  # Símbolo de multiplicación al final
+    r'\s+Portal\s+Unificado\s+de\s+Sentencias\s*$',  # "Portal Unificado de Sentencias" al final
+    r'\s+Poder\s+Judicial\s+Radio\s*$',  # "Poder Judicial Radio" al final
+    r'\s+Poder\s+Judicial\s+TV\s*$',  # "Poder Judicial TV" al final
+    r'\s+Orientación\s+e\s+información\s+digital\s*$',  # "Orientación e información digital" al final
+    r'\s+Plataformas\s+digitales\s*$',  # "Plataformas digitales" al final
+    r'\s+Atención\s+por\s+Chat\s*$',  # "Atención por Chat" al final
+    r'\s+Sistema\s+de\s+traducción\s*$',  # "Sistema de traducción" al final
+    r'\s+\d{6,}\s*$',  # Números largos al final (teléfonos)
+    r'\s+creole\.\s*$',  # "creole." al final
+    r'\s+Volver\s*$',  # "Volver" al final
+    r'\s+Please\s+ensure\s+Javascript\s+is\s+enabled\s*$',  # "Please ensure Javascript is enabled" al final
+    r'\s+Cerrar\s*$',  # "Cerrar" al final
+)
+
+def crear_grupos_contenido(fuente: str = None, flags: int = FLAGS_CONTENIDO):
+    """Grupos del conjunto base más los de la fuente, en orden
+
+    Sin fuente se devuelven todos los grupos.
+    """
+    fuente = fuente.lower() if fuente else None
+    return [
+        GrupoReglas(nombre, patrones, flags)
+        for nombre, fuentes, patrones in GRUPOS_CONTENIDO
+        if fuente is None or not fuentes or fuente in fuentes
+    ]
+
+def crear_grupos_fuente(fuentes: tuple, flags: int = FLAGS_CONTENIDO):
+    """Solo los grupos propios de un conjunto de fuentes (sin el conjunto base)"""
+    return [
+        GrupoReglas(nombre, patrones, flags)
+        for nombre, fuentes_grupo, patrones in GRUPOS_CONTENIDO
+        if fuentes_grupo == fuentes
+    ]
+
+def crear_grupos_titulo():
+    grupos = [GrupoReglas(f'titulo_fecha_{i}', (patron,)) for i, patron in enumerate(PATRONES_TITULO_FECHA_HORA)]
+    grupos += [
+        GrupoReglas(f'titulo_duplicado_{i}', (patron,), re.IGNORECASE)
+        for i, patron in enumerate(PATRONES_TITULO_DUPLICADOS)
+    ]
+    return grupos
@@ -18,6 +18,7 @@ from urllib.parse import urljoin, urlparse
 sys.path.append(os.path.dirname(os.path.dirname(os.path.dirname(__file__))))
 
 from backend.processors.content_processor import ContentProcessor, NoticiaCompleta
+from backend.scrapers.fuentes.fechas import parsear_fecha
 
 class DiarioOficialScraper:
     """Scraper para el Diario Oficial de Chile"""
@@ -165,47 +166,7 @@ class DiarioOficialScraper:
     
     def _parse_fecha_diario_oficial(self, fecha_texto: str) -> Optional[datetime]:
         """Parsear fecha del Diario Oficial"""
-        try:
-            # Patrones de fecha comunes en el Diario Oficial
-            patrones = [
-                r'(\d{1,2})/(\d{1,2})/(\d{4})',
-                r'(\d{1,2})-(\d{1,2})-(\d{4})',
-                r'(\d{4})-(\d{1,2})-(\d{1,2})',
-                r'(\d{1,2})\s+de\s+(\w+)\s+de\s+(\d{4})'
-            ]
-            
-            for patron in patrones:
-                match = re.search(patron, fecha_texto)
-                if match:
-                    if len(match.groups()) == 3:
-                        if patron == r'(\d{1,2})\s+de\s+(\w+)\s+de\s+(\d{4})':
-                            # Formato: "15 de julio de 2024"
-                            dia = int(match.group(1))
-                            mes_texto = match.group(2).lower()
-                            año = int(match.group(3))
-                            
-                            meses = {
-                                'enero': 1, 'febrero': 2, 'marzo': 3, 'abril': 4,
-                                'mayo': 5, 'junio': 6, 'julio': 7, 'agosto': 8,
-                                'septiembre': 9, 'octubre': 10, 'noviembre': 11, 'diciembre': 12
-                            }
-                            
-                            if mes_texto in meses:
-                                return datetime(año, meses[mes_texto], dia, tzinfo=timezone.utc)
-                        else:
-                            # Formato numérico
-                            if patron == r'(\d{4})-(\d{1,2})-(\d{1,2})':
-                                año, mes, dia = match.groups()
-                            else:
-                                dia, mes, año = match.groups()
-                            
-                            return datetime(int(año), int(mes), int(dia), tzinfo=timezone.utc)
-            
-            return None
-            
-        except Exception as e:
-            print(f"⚠️  Error parseando fecha: {e}")
-            return None
+        return parsear_fecha(fecha_texto)
     
     def _extract_contenido_diario_oficial(self, soup: BeautifulSoup) -> str:
         """Extraer contenido de noticia del Diario Oficial"""
@@ -6,7 +6,6 @@ import sys
 import os
 from typing import List, Dict, Optional
 from datetime import datetime, timezone
-from bs4 import BeautifulSoup
 import re
 sys.path.append(os.path.dirname(os.path.dirname(os.path.dirname(os.path.dirname(__file__)))))
 from backend.scrapers.fuentes.base_scraper import BaseScraper
@@ -42,7 +41,7 @@ class TercerTribunalAmbientalScraper(BaseScraper):
             response = self.session.get(self.noticias_url, timeout=30)
             response.raise_for_status()
             
-            soup = BeautifulSoup(response.content, 'html.parser')
+            soup = self._parsear_listado(response.content)
             noticias = []
             
             # Buscar artículos de noticias
@@ -106,7 +105,7 @@ class TercerTribunalAmbientalScraper(BaseScraper):
             response = self.session.get(url, timeout=30)
             response.raise_for_status()
             
-            soup = BeautifulSoup(response.content, 'html.parser')
+            soup = self._parsear(response.content)
             
             # Buscar contenido principal
             contenido_selectors = [
@@ -176,35 +175,8 @@ class TercerTribunalAmbientalScraper(BaseScraper):
             return None
 
     def normalizar_fecha(self, fecha_str: str) -> datetime:
-        """Normaliza diferentes formatos de fecha del 3TA"""
-        try:
-            if not fecha_str:
-                return datetime.now(timezone.utc)
-            
-            # Formato: DD/MM/YYYY
-            if re.match(r'\d{2}/\d{2}/\d{4}', fecha_str):
-                return datetime.strptime(fecha_str, '%d/%m/%Y').replace(tzinfo=timezone.utc)
-            
-            # Otros formatos comunes
-            formatos = [
-                '%Y-%m-%d',
-                '%d-%m-%Y',
-                '%Y/%m/%d',
-                '%d/%m/%Y %H:%M',
-                '%Y-%m-%d %H:%M:%S'
-            ]
-            
-            for formato in formatos:
-                try:
-                    return datetime.strptime(fecha_str, formato).replace(tzinfo=timezone.utc)
-                except:
-                    continue
-            
-            # Si no se puede parsear, usar fecha actual
-            return datetime.now(timezone.utc)
-            
-        except Exception:
-            return datetime.now(timezone.utc)
+        """Normaliza diferentes formatos de fecha del 3TA (fecha actual si no se reconoce)"""
+        return self.contexto.normalizar_fecha(fecha_str)
 
     def extraer_palabras_clave(self, texto: str) -> List[str]:
         """Extrae palabras clave relevantes del texto"""
@@ -3,6 +3,8 @@ Módulo principal de scrapers de noticias jurídicas
 Organizado por fuentes para mejor mantenimiento
 """
 
+from importlib import import_module
+
 from .config import (
     FUENTES_CONFIG,
     get_fuentes_activas,
@@ -15,68 +17,48 @@ from .config import (
     get_fuente_exclusiones
 )
 
-# Importar scrapers específicos
-try:
-    from .poder_judicial import PoderJudicialScraper
-except ImportError:
-    PoderJudicialScraper = None
-
-try:
-    from .ministerio_justicia import MinisterioJusticiaScraper
-except ImportError:
-    MinisterioJusticiaScraper = None
-
-try:
-    from .dpp import DPPScraper
-except ImportError:
-    DPPScraper = None
-
-try:
-    from .contraloria import ContraloriaScraper
-except ImportError:
-    ContraloriaScraper = None
-
-try:
-    from .tdpi import TDPScraper
-except ImportError:
-    TDPScraper = None
+# Scrapers por código de fuente: (módulo, clase). Se importan al pedirlos por
+# primera vez, de modo que un proceso que usa una sola fuente (o ninguna, como
+# --stats) no carga los demás ni sus dependencias
+SCRAPERS_POR_FUENTE = {
+    'poder_judicial': ('.poder_judicial', 'PoderJudicialScraper'),
+    'ministerio_justicia': ('.ministerio_justicia', 'MinisterioJusticiaScraper'),
+    'dpp': ('.dpp', 'DPPScraper'),
+    'contraloria': ('.contraloria', 'ContraloriaScraper'),
+    'tdpi': ('.tdpi', 'TDPScraper'),
+    'cde': ('.cde', 'CDEScraper'),
+    'tdlc': ('.tdlc', 'TDLScraper'),
+    '1ta': ('.primer_tribunal_ambiental', 'PrimerTribunalAmbientalScraper'),
+    '3ta': ('.tercer_tribunal_ambiental', 'TercerTribunalAmbientalScraper'),
+    'tribunal_ambiental': ('.tribunal_ambiental', 'TribunalAmbientalScraper'),
+    'sii': ('.sii', 'SIIScraper'),
+    'tta': ('.tta', 'TTAScraper'),
+    'inapi': ('.inapi', 'INAPIScraper'),
+    'dt': ('.dt', 'DTScraper')
+}
 
-try:
-    from .cde import CDEScraper
-except ImportError:
-    CDEScraper = None
+_MODULO_POR_CLASE = {clase: modulo for modulo, clase in SCRAPERS_POR_FUENTE.values()}
 
-# Nuevos scrapers de tribunales ambientales y TDLC
-from .tdlc import TDLScraper
-from .primer_tribunal_ambiental import PrimerTribunalAmbientalScraper
-from .tercer_tribunal_ambiental import TercerTribunalAmbientalScraper
-from .tribunal_ambiental import TribunalAmbientalScraper
-from .sii import SIIScraper
-from .tta import TTAScraper
-from .inapi import INAPIScraper
-from .dt import DTScraper
+def _importar_clase(modulo: str, clase: str):
+    """Clase de scraper, o None si su módulo no se puede importar"""
+    try:
+        return getattr(import_module(modulo, __name__), clase)
+    except ImportError:
+        return None
 
-# Diccionario de scrapers disponibles
-SCRAPERS_DISPONIBLES = {
-    'poder_judicial': PoderJudicialScraper,
-    'ministerio_justicia': MinisterioJusticiaScraper,
-    'dpp': DPPScraper,
-    'contraloria': ContraloriaScraper,
-    'tdpi': TDPScraper,
-    'cde': CDEScraper,
-    'tdlc': TDLScraper,
-    '1ta': PrimerTribunalAmbientalScraper,
-    '3ta': TercerTribunalAmbientalScraper,
-    'tribunal_ambiental': TribunalAmbientalScraper,
-    'sii': SIIScraper,
-    'tta': TTAScraper,
-    'inapi': INAPIScraper,
-    'dt': DTScraper
-}
+def __getattr__(nombre: str):
+    """Importación diferida de las clases de scraper y de SCRAPERS_DISPONIBLES"""
+    if nombre in _MODULO_POR_CLASE:
+        return _importar_clase(_MODULO_POR_CLASE[nombre], nombre)
+    if nombre == 'SCRAPERS_DISPONIBLES':
+        return {codigo: get_scraper(codigo) for codigo in SCRAPERS_POR_FUENTE}
+    raise AttributeError(f"module {__name__!r} has no attribute {nombre!r}")
 
 def get_scraper(fuente: str):
-    """Obtener scraper para una fuente específica"""
-    return SCRAPERS_DISPONIBLES.get(fuente)
+    """Obtener scraper para una fuente específica (se importa solo esa fuente)"""
+    if fuente not in SCRAPERS_POR_FUENTE:
+        return None
+    return _importar_clase(*SCRAPERS_POR_FUENTE[fuente])
 
 def get_scrapers_activos():
     """Obtener diccionario de scrapers activos"""
@@ -117,6 +99,7 @@ __all__ = [
     'get_fuente_palabras_clave',
     'get_fuente_exclusiones',
     'SCRAPERS_DISPONIBLES',
+    'SCRAPERS_POR_FUENTE',
     'get_scraper',
     'get_scrapers_activos',
     'listar_fuentes_disponibles',
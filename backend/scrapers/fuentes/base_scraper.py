@@ -6,11 +6,9 @@ Proporciona funcionalidades comunes para todos los scrapers
 
 import os
 import sys
-import requests
-import time
 import re
 from datetime import datetime, timezone
-from typing import List, Dict, Optional
+from typing import Dict, Iterator, List, Optional
 from bs4 import BeautifulSoup
 from urllib.parse import urljoin, urlparse
 from abc import ABC, abstractmethod
@@ -18,23 +16,27 @@ from abc import ABC, abstractmethod
 # Agregar el directorio padre al path
 sys.path.append(os.path.dirname(os.path.dirname(os.path.dirname(os.path.dirname(__file__)))))
 
-from backend.processors.content_processor import ContentProcessor
 from .data_schema import (
     NoticiaEstandarizada, 
     DataNormalizer, 
     crear_noticia_estandarizada,
     validar_noticia_estandarizada
 )
+from .limitador_peticiones import iterar_en_paralelo, obtener_en_paralelo
+from .contexto_ejecucion import ContextoEjecucion, contexto_por_defecto
+from .parseo import parsear, parsear_listado
 
 class BaseScraper(ABC):
     """Clase base para todos los scrapers de noticias jurídicas"""
     
-    def __init__(self, openai_api_key: str = None):
-        self.content_processor = ContentProcessor(openai_api_key or "")
+    def __init__(self, openai_api_key: str = None, contexto: ContextoEjecucion = None):
+        # Procesador, cachés y conexiones compartidos con el resto de los scrapers;
+        # la clave de OpenAI la define el contexto
+        self.contexto = contexto or contexto_por_defecto()
+        self.content_processor = self.contexto.content_processor
         
-        # Configurar sesión base
-        self.session = requests.Session()
-        self.session.headers.update({
+        # Configurar sesión base (espaciado de peticiones controlado por host)
+        self.session = self.contexto.nueva_sesion({
             'User-Agent': 'Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36',
             'Accept': 'text/html,application/xhtml+xml,application/xml;q=0.9,image/avif,image/webp,image/apng,*/*;q=0.8',
             'Accept-Language': 'es-ES,es;q=0.9,en;q=0.8',
@@ -58,10 +60,26 @@ class BaseScraper(ABC):
         pass
     
     @abstractmethod
-    def scrape_noticias_recientes(self, max_noticias: int = 10) -> List[NoticiaEstandarizada]:
-        """Scrapear noticias recientes completas - debe ser implementado por cada scraper"""
+    def iter_noticias(self, max_noticias: int = 10) -> Iterator[NoticiaEstandarizada]:
+        """Entregar noticias recientes completas a medida que se descargan - debe ser implementado por cada scraper
+        
+        Los detalles se descargan en paralelo, pero solo unas pocas noticias por
+        delante de quien consume el generador (ver _iterar_detalles).
+        """
         pass
     
+    def scrape_noticias_recientes(self, max_noticias: int = 10) -> List[NoticiaEstandarizada]:
+        """Scrapear noticias recientes completas, todas en una lista"""
+        return list(self.iter_noticias(max_noticias))
+    
+    def _parsear(self, contenido) -> BeautifulSoup:
+        """Parsear una página completa - método común"""
+        return parsear(contenido)
+    
+    def _parsear_listado(self, contenido) -> BeautifulSoup:
+        """Parsear el listado de noticias con las etiquetas que eligió la fuente (ver parseo.py)"""
+        return parsear_listado(contenido, self.base_url)
+    
     def _limpiar_contenido(self, elemento) -> str:
         """Limpiar contenido HTML - método común"""
         if not elemento:
@@ -97,12 +115,9 @@ class BaseScraper(ABC):
             fecha_elem = soup.select_one(selector)
             if fecha_elem:
                 # Intentar obtener fecha del atributo datetime
-                datetime_attr = fecha_elem.get('datetime')
-                if datetime_attr:
-                    try:
-                        return datetime.fromisoformat(datetime_attr.replace('Z', '+00:00'))
-                    except:
-                        pass
+                fecha = self.contexto.parsear_fecha(fecha_elem.get('datetime'))
+                if fecha:
+                    return fecha
                 
                 # Intentar parsear texto
                 fecha_texto = fecha_elem.get_text(strip=True)
@@ -115,77 +130,15 @@ class BaseScraper(ABC):
     
     def _parse_fecha_generica(self, fecha_texto: str) -> Optional[datetime]:
         """Parsear fecha genérica - método común"""
-        if not fecha_texto:
-            return None
-        
-        # Patrones genéricos de fecha
-        patrones = [
-            r'(\d{1,2})/(\d{1,2})/(\d{4})',  # DD/MM/YYYY
-            r'(\d{1,2})-(\d{1,2})-(\d{4})',  # DD-MM-YYYY
-            r'(\d{4})-(\d{1,2})-(\d{1,2})',  # YYYY-MM-DD
-            r'(\d{1,2})\s+de\s+(\w+)\s+de\s+(\d{4})',  # DD de MES de YYYY
-            r'(\d{1,2})\s+(\w+)\s+(\d{4})',  # DD MES YYYY
-        ]
-        
-        for patron in patrones:
-            match = re.search(patron, fecha_texto, re.IGNORECASE)
-            if match:
-                try:
-                    if 'de' in patron or len(match.groups()) == 3:
-                        if 'de' in patron:
-                            # Formato "DD de MES de YYYY"
-                            dia, mes_nombre, año = match.groups()
-                            meses = {
-                                'enero': 1, 'febrero': 2, 'marzo': 3, 'abril': 4,
-                                'mayo': 5, 'junio': 6, 'julio': 7, 'agosto': 8,
-                                'septiembre': 9, 'octubre': 10, 'noviembre': 11, 'diciembre': 12
-                            }
-                            mes = meses.get(mes_nombre.lower(), 1)
-                        else:
-                            # Formato numérico
-                            if len(match.group(1)) == 4:  # YYYY-MM-DD
-                                año, mes, dia = match.groups()
-                            else:  # DD/MM/YYYY o DD-MM-YYYY
-                                dia, mes, año = match.groups()
-                    
-                    return datetime(int(año), int(mes), int(dia), tzinfo=timezone.utc)
-                except (ValueError, TypeError):
-                    continue
-        
-        return None
+        return self.contexto.parsear_fecha(fecha_texto)
     
     def _extract_contenido_generico(self, soup: BeautifulSoup) -> str:
-        """Extraer contenido genérico - método común"""
-        # Buscar contenedor de contenido genérico
-        contenido_selectors = [
-            '.contenido',
-            '.noticia-contenido',
-            '.noticia-texto',
-            '.noticia-cuerpo',
-            'article',
-            '.entry-content',
-            '.post-content',
-            '.main-content',
-            '.content-area',
-            '.article-content',
-            '.story-content'
-        ]
-        
-        for selector in contenido_selectors:
-            contenido_elem = soup.select_one(selector)
-            if contenido_elem:
-                return self._limpiar_contenido(contenido_elem)
+        """Extraer el contenido principal - método común
         
-        # Si no se encuentra selector específico, buscar en el body
-        body = soup.find('body')
-        if body:
-            # Remover elementos no deseados
-            for elem in body.find_all(['nav', 'header', 'footer', 'aside', 'script', 'style']):
-                elem.decompose()
-            
-            return self._limpiar_contenido(body)
-        
-        return ""
+        El bloque se elige por densidad de texto y de enlaces en una sola pasada
+        por el DOM (ver extractor_contenido), sin depender de selectores del sitio.
+        """
+        return self.contexto.extractor_contenido.extraer(soup)
     
     def _extract_imagen_generica(self, soup: BeautifulSoup, base_url: str) -> Optional[str]:
         """Extraer imagen genérica - método común"""
@@ -237,9 +190,39 @@ class BaseScraper(ABC):
         
         return autor_info
     
-    def _pausa_entre_requests(self, segundos: int = 1):
-        """Pausa entre requests para no sobrecargar servidores"""
-        time.sleep(segundos)
+    def _obtener_detalles(self, items: List, funcion) -> List:
+        """Aplicar `funcion` a cada item en paralelo, dentro del presupuesto del host"""
+        return obtener_en_paralelo(items, funcion, getattr(self, 'base_url', ''), sesion=getattr(self, 'session', None))
+    
+    def _iterar_detalles(self, items: List, funcion) -> Iterator:
+        """Como _obtener_detalles, pero entregando cada resultado apenas está listo"""
+        return iterar_en_paralelo(items, funcion, getattr(self, 'base_url', ''), sesion=getattr(self, 'session', None))
+    
+    @property
+    def marca_agua(self) -> Optional[Dict]:
+        """Noticia más reciente ya ingerida de esta fuente ({'url', 'fecha', 'actualizada'})"""
+        return self.contexto.marcas_agua.get(getattr(self, 'base_url', ''))
+    
+    def _sin_cambios(self, response) -> bool:
+        """Indicar si un listado pedido con get_condicional no cambió (304)"""
+        if response.status_code != 304:
+            return False
+        self._log_info("Listado sin cambios desde la última ejecución (304)")
+        return True
+    
+    def _descartar_conocidas(self, links: List[Dict]) -> List[Dict]:
+        """Cortar el listado en la marca de agua y quitar las URLs ya almacenadas
+        
+        `links` debe venir ordenado del más reciente al más antiguo.
+        """
+        recientes = self.contexto.marcas_agua.recortar(getattr(self, 'base_url', ''), links)
+        if len(recientes) < len(links):
+            self._log_info(f"Listado cortado en la marca de agua: {len(links) - len(recientes)} noticias ya ingeridas")
+        
+        nuevas = self.contexto.indice_urls.filtrar_nuevas(recientes)
+        if len(nuevas) < len(recientes):
+            self._log_info(f"{len(recientes) - len(nuevas)} noticias ya almacenadas, se omite su descarga")
+        return nuevas
     
     def _log_error(self, mensaje: str, error: Exception = None):
         """Log de errores común"""
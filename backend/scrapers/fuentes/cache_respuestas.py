@@ -0,0 +1,192 @@
+#!/usr/bin/env python3
+"""
+Caché de respuestas HTTP en disco para los scrapers
+Los cuerpos se guardan comprimidos y direccionados por contenido (sha256), de
+modo que páginas idénticas ocupan un solo archivo. Cada petición apunta a su
+cuerpo mediante una entrada pequeña con estado, cabeceras y fecha de grabación.
+
+Modos:
+    ''        desactivada
+    'grabar'  sirve respuestas vigentes según el TTL de la fuente y graba el resto
+    'replay'  sirve solo desde la caché y falla ante cualquier petición no grabada
+"""
+
+import gzip
+import hashlib
+import json
+import os
+import threading
+import time
+from typing import Dict, Optional
+
+import requests
+from requests.structures import CaseInsensitiveDict
+from requests.utils import get_encoding_from_headers
+
+from .config import FUENTES_CONFIG, SCRAPING_CONFIG
+
+MODOS = ('', 'grabar', 'replay')
+
+# Cabeceras que se conservan junto al cuerpo
+CABECERAS_GRABADAS = ('Content-Type', 'ETag', 'Last-Modified')
+
+class RespuestaNoGrabada(requests.RequestException):
+    """Petición sin respuesta en caché durante el modo replay"""
+
+class CacheRespuestas:
+    """Caché de respuestas GET direccionada por contenido, con TTL por fuente"""
+
+    def __init__(self, directorio: str = None, modo: str = None):
+        self.directorio = directorio or os.path.join(SCRAPING_CONFIG['directorio_estado'], 'respuestas')
+        self.modo = ''
+        try:
+            self.configurar(SCRAPING_CONFIG['cache_http'] if modo is None else modo)
+        except ValueError as e:
+            print(f"⚠️  {e}; caché HTTP desactivada")
+        self._lock = threading.Lock()
+        self.estadisticas = {'aciertos': 0, 'fallos': 0, 'grabadas': 0}
+        self._ttl_por_host = None
+
+    def configurar(self, modo: str):
+        """Cambiar el modo de la caché ('', 'grabar' o 'replay')"""
+        if modo not in MODOS:
+            raise ValueError(f"Modo de caché desconocido: {modo!r} (opciones: grabar, replay)")
+        self.modo = modo
+
+    @property
+    def activa(self) -> bool:
+        return bool(self.modo)
+
+    def ttl(self, url: str) -> int:
+        """TTL en segundos para el host de una URL"""
+        # Importado aquí para no crear un ciclo con limitador_peticiones
+        from .limitador_peticiones import normalizar_host
+
+        if self._ttl_por_host is None:
+            self._ttl_por_host = {
+                normalizar_host(config['url_base']): config['ttl_cache']
+                for config in FUENTES_CONFIG.values() if 'ttl_cache' in config
+            }
+        return self._ttl_por_host.get(normalizar_host(url), SCRAPING_CONFIG['ttl_cache'])
+
+    # ========================================
+    # LECTURA
+    # ========================================
+
+    def obtener(self, metodo: str, url: str, params: Dict = None) -> Optional[requests.Response]:
+        """Respuesta grabada para la petición, o None si hay que ir a la red
+
+        En modo replay una petición no grabada lanza RespuestaNoGrabada.
+        """
+        if not self.activa or metodo.upper() != 'GET':
+            return None
+
+        url_completa = self._url_completa(url, params)
+        entrada = self._leer_entrada(url_completa)
+
+        vigente = entrada is not None and (
+            self.modo == 'replay' or time.time() - entrada['grabada'] < self.ttl(url_completa)
+        )
+        if vigente:
+            contenido = self._leer_objeto(entrada['contenido'])
+            vigente = contenido is not None
+
+        with self._lock:
+            self.estadisticas['aciertos' if vigente else 'fallos'] += 1
+
+        if not vigente:
+            if self.modo == 'replay':
+                raise RespuestaNoGrabada(f"Sin respuesta grabada para {url_completa}")
+            return None
+
+        return self._construir_respuesta(entrada, contenido)
+
+    def _leer_entrada(self, url_completa: str) -> Optional[Dict]:
+        try:
+            with open(self._ruta_entrada(url_completa), encoding='utf-8') as archivo:
+                return json.load(archivo)
+        except (OSError, ValueError):
+            return None
+
+    def _leer_objeto(self, huella: str) -> Optional[bytes]:
+        try:
+            with gzip.open(self._ruta_objeto(huella), 'rb') as archivo:
+                return archivo.read()
+        except (OSError, EOFError):
+            return None
+
+    @staticmethod
+    def _construir_respuesta(entrada: Dict, contenido: bytes) -> requests.Response:
+        """Reconstruir un requests.Response desde la caché"""
+        response = requests.Response()
+        response.status_code = entrada['estado']
+        response.headers = CaseInsensitiveDict(entrada['cabeceras'])
+        response.url = entrada['url']
+        response.encoding = get_encoding_from_headers(response.headers)
+        response.reason = 'OK (caché)'
+        response._content = contenido
+        return response
+
+    # ========================================
+    # ESCRITURA
+    # ========================================
+
+    def guardar(self, metodo: str, url: str, params: Dict, response: requests.Response):
+        """Grabar una respuesta 200 a un GET"""
+        if self.modo != 'grabar' or metodo.upper() != 'GET' or response.status_code != 200:
+            return
+
+        contenido = response.content
+        huella = hashlib.sha256(contenido).hexdigest()
+        url_completa = self._url_completa(url, params)
+        entrada = {
+            'url': response.url or url_completa,
+            'estado': response.status_code,
+            'cabeceras': {
+                cabecera: response.headers[cabecera]
+                for cabecera in CABECERAS_GRABADAS if cabecera in response.headers
+            },
+            'contenido': huella,
+            'grabada': time.time()
+        }
+
+        try:
+            ruta_objeto = self._ruta_objeto(huella)
+            if not os.path.exists(ruta_objeto):
+                self._escribir(ruta_objeto, gzip.compress(contenido))
+            self._escribir(self._ruta_entrada(url_completa), json.dumps(entrada).encode('utf-8'))
+        except OSError as e:
+            print(f"⚠️  No se pudo grabar la respuesta de {url_completa}: {e}")
+            return
+
+        with self._lock:
+            self.estadisticas['grabadas'] += 1
+
+    @staticmethod
+    def _escribir(ruta: str, datos: bytes):
+        """Escritura atómica (seguro con varios hilos grabando a la vez)"""
+        os.makedirs(os.path.dirname(ruta), exist_ok=True)
+        temporal = f"{ruta}.{threading.get_ident()}.tmp"
+        with open(temporal, 'wb') as archivo:
+            archivo.write(datos)
+        os.replace(temporal, ruta)
+
+    # ========================================
+    # RUTAS
+    # ========================================
+
+    @staticmethod
+    def _url_completa(url: str, params: Dict = None) -> str:
+        if not params:
+            return url
+        return requests.Request('GET', url, params=params).prepare().url
+
+    def _ruta_entrada(self, url_completa: str) -> str:
+        clave = hashlib.sha256(f"GET {url_completa}".encode('utf-8')).hexdigest()
+        return os.path.join(self.directorio, 'peticiones', clave[:2], f"{clave}.json")
+
+    def _ruta_objeto(self, huella: str) -> str:
+        return os.path.join(self.directorio, 'objetos', huella[:2], f"{huella}.gz")
+
+# Instancia global
+cache_respuestas = CacheRespuestas()
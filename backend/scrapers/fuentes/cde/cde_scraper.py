@@ -5,7 +5,7 @@ Scraper para la Comisión de Defensa de la Libre Competencia de Chile
 
 import sys
 import os
-from typing import List, Dict, Optional
+from typing import Dict, Iterator, List, Optional
 from datetime import datetime, timezone
 from bs4 import BeautifulSoup
 import re
@@ -15,6 +15,7 @@ import xml.etree.ElementTree as ET
 sys.path.append(os.path.dirname(os.path.dirname(os.path.dirname(os.path.dirname(__file__)))))
 
 from backend.scrapers.fuentes.base_scraper import BaseScraper
+from backend.scrapers.fuentes.contexto_ejecucion import ContextoEjecucion
 from backend.scrapers.fuentes.data_schema import (
     NoticiaEstandarizada, 
     MetadataNoticia,
@@ -27,8 +28,8 @@ from backend.scrapers.fuentes.data_schema import (
 class CDEScraper(BaseScraper):
     """Scraper para la Comisión de Defensa de la Libre Competencia de Chile"""
     
-    def __init__(self, openai_api_key: str = None):
-        super().__init__(openai_api_key)
+    def __init__(self, openai_api_key: str = None, contexto: ContextoEjecucion = None):
+        super().__init__(openai_api_key, contexto)
         self.base_url = "https://www.cde.cl"
         self.noticias_url = "https://www.cde.cl/post-sitemap1.xml"
         self.version_scraper = "1.0"
@@ -85,10 +86,12 @@ class CDEScraper(BaseScraper):
             # Intentar con la página principal de noticias
             noticias_page_url = "https://www.cde.cl/noticias/"
             
-            response = self.session.get(noticias_page_url, timeout=30)
+            response = self.session.get_condicional(noticias_page_url, timeout=30)
+            if self._sin_cambios(response):
+                return []
             response.raise_for_status()
             
-            soup = BeautifulSoup(response.content, 'html.parser')
+            soup = self._parsear_listado(response.content)
             
             noticias_links = []
             
@@ -151,7 +154,7 @@ class CDEScraper(BaseScraper):
             response = self.session.get(url, timeout=30)
             response.raise_for_status()
             
-            soup = BeautifulSoup(response.content, 'html.parser')
+            soup = self._parsear(response.content)
             
             # Extraer título
             if not titulo:
@@ -264,29 +267,10 @@ class CDEScraper(BaseScraper):
             for selector in fecha_selectors:
                 fecha_elem = soup.select_one(selector)
                 if fecha_elem:
-                    # Intentar extraer fecha del atributo datetime
-                    datetime_attr = fecha_elem.get('datetime')
-                    if datetime_attr:
-                        return datetime.fromisoformat(datetime_attr.replace('Z', '+00:00'))
-                    
-                    # Intentar extraer fecha del texto
-                    fecha_texto = fecha_elem.get_text(strip=True)
-                    if fecha_texto:
-                        # Patrones de fecha comunes
-                        patterns = [
-                            r'(\d{1,2})/(\d{1,2})/(\d{4})',
-                            r'(\d{1,2})-(\d{1,2})-(\d{4})',
-                            r'(\d{4})-(\d{1,2})-(\d{1,2})'
-                        ]
-                        
-                        for pattern in patterns:
-                            match = re.search(pattern, fecha_texto)
-                            if match:
-                                if len(match.groups()) == 3:
-                                    if len(match.group(1)) == 4:  # YYYY-MM-DD
-                                        return datetime(int(match.group(1)), int(match.group(2)), int(match.group(3)), tzinfo=timezone.utc)
-                                    else:  # DD/MM/YYYY o DD-MM-YYYY
-                                        return datetime(int(match.group(3)), int(match.group(2)), int(match.group(1)), tzinfo=timezone.utc)
+                    # Intentar extraer fecha del atributo datetime y, si no, del texto
+                    fecha = self.contexto.parsear_fecha(fecha_elem.get('datetime')) or self.contexto.parsear_fecha(fecha_elem.get_text(strip=True))
+                    if fecha:
+                        return fecha
             
             return None
             
@@ -325,35 +309,25 @@ class CDEScraper(BaseScraper):
         
         return info
     
-    def scrape_noticias_recientes(self, max_noticias: int = 10) -> List[NoticiaEstandarizada]:
-        """Scrapear noticias recientes completas del CDE"""
+    def iter_noticias(self, max_noticias: int = 10) -> Iterator[NoticiaEstandarizada]:
+        """Entregar noticias recientes completas del CDE a medida que se descargan"""
         self._log_info("Iniciando scraping de la Comisión de Defensa de la Libre Competencia...")
         
-        # Obtener enlaces de noticias
-        noticias_links = self.get_noticias_recientes(max_noticias)
+        # Obtener enlaces de noticias (sin las ya almacenadas)
+        noticias_links = self._descartar_conocidas(self.get_noticias_recientes(max_noticias))
         
         if not noticias_links:
             self._log_warning("No se encontraron enlaces de noticias del CDE")
-            return []
+            return
         
-        # Extraer noticias completas
-        noticias_completas = []
+        # Extraer noticias completas (en paralelo, según el límite del host)
+        def obtener(link):
+            self._log_info(f"Procesando noticia: {link['titulo'][:50]}...")
+            return self.get_noticia_completa(link['url'], link['titulo'])
         
-        for i, link in enumerate(noticias_links):
-            try:
-                self._log_info(f"Procesando noticia {i+1}/{len(noticias_links)}: {link['titulo'][:50]}...")
-                
-                noticia = self.get_noticia_completa(link['url'], link['titulo'])
-                
-                if noticia:
-                    noticias_completas.append(noticia)
-                
-                # Pausa entre requests
-                self._pausa_entre_requests(1)
-                
-            except Exception as e:
-                self._log_error(f"Error procesando noticia {link['url']}", e)
-                continue
+        extraidas = 0
+        for noticia in self._iterar_detalles(noticias_links, obtener):
+            extraidas += 1
+            yield noticia
         
-        self._log_success(f"Scraping del CDE completado: {len(noticias_completas)} noticias extraídas")
-        return noticias_completas 
\ No newline at end of file
+        self._log_success(f"Scraping del CDE completado: {extraidas} noticias extraídas") 
\ No newline at end of file
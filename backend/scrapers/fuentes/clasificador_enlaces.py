@@ -0,0 +1,123 @@
+#!/usr/bin/env python3
+"""
+Clasificador de enlaces de los listados de noticias
+Compila una sola vez por fuente, desde FUENTES_CONFIG, las palabras clave y
+exclusiones en una alternancia de expresiones regulares, de modo que cada
+enlace se evalúa con una sola búsqueda por lista en lugar de un `in` por
+palabra. Normaliza y deduplica las URLs del listado y devuelve los
+candidatos ordenados por puntaje.
+"""
+
+import re
+import threading
+from typing import Dict, Iterable, List, Optional, Pattern, Sequence
+from urllib.parse import urljoin, urlsplit, urlunsplit
+
+from .config import FUENTES_CONFIG
+from .limitador_peticiones import normalizar_host
+
+# Enlaces que nunca son noticias
+ESQUEMAS_IGNORADOS = ('#', 'javascript:', 'mailto:', 'tel:')
+
+def normalizar_url(href: str, url_base: str) -> Optional[str]:
+    """URL absoluta sin fragmento y con esquema y host en minúsculas
+
+    La ruta y la consulta no se tocan: son parte de url_origen, la clave con
+    la que se guardan las noticias.
+    """
+    href = (href or '').strip()
+    if not href or href.lower().startswith(ESQUEMAS_IGNORADOS):
+        return None
+    partes = urlsplit(urljoin(url_base, href))
+    if partes.scheme not in ('http', 'https'):
+        return None
+    return urlunsplit((partes.scheme.lower(), partes.netloc.lower(), partes.path, partes.query, ''))
+
+def compilar_palabras(palabras: Sequence[str]) -> Optional[Pattern]:
+    """Alternancia de las palabras (en minúsculas), las más largas primero"""
+    palabras = sorted({palabra.lower() for palabra in palabras if palabra}, key=len, reverse=True)
+    if not palabras:
+        return None
+    return re.compile('|'.join(re.escape(palabra) for palabra in palabras))
+
+class ClasificadorEnlaces:
+    """Filtro y ranking de enlaces de un listado según las listas de una fuente"""
+
+    def __init__(self, url_base: str, palabras_clave: Sequence[str] = (), exclusiones: Sequence[str] = (),
+                 urls_noticia: Sequence[str] = (), urls_excluidas: Sequence[str] = (),
+                 solo_internos: bool = False, min_largo_titulo: int = 20):
+        self.url_base = url_base
+        self.host = normalizar_host(url_base)
+        self.min_largo_titulo = min_largo_titulo
+        self.solo_internos = solo_internos
+        self._claves = compilar_palabras(palabras_clave)
+        self._exclusiones = compilar_palabras(exclusiones)
+        self._urls_noticia = compilar_palabras(urls_noticia)
+        self._urls_excluidas = compilar_palabras(urls_excluidas)
+
+    def puntaje(self, titulo: str, url: str) -> int:
+        """Palabras clave distintas en el título (+1 si la URL es de noticia); -1 si se descarta"""
+        if not titulo or len(titulo) < self.min_largo_titulo:
+            return -1
+
+        minusculas = titulo.lower()
+        if self._exclusiones and self._exclusiones.search(minusculas):
+            return -1
+
+        url_minusculas = url.lower()
+        if self._urls_excluidas and self._urls_excluidas.search(url_minusculas):
+            return -1
+        if self.solo_internos and normalizar_host(url) != self.host:
+            return -1
+
+        puntaje = len(set(self._claves.findall(minusculas))) if self._claves else 0
+        if self._urls_noticia and self._urls_noticia.search(url_minusculas):
+            puntaje += 1
+        # Con palabras clave o patrones de URL configurados, algo tiene que coincidir
+        if puntaje == 0 and (self._claves or self._urls_noticia):
+            return -1
+        return puntaje
+
+    def clasificar(self, enlaces: Iterable, url_pagina: str = None) -> List[Dict]:
+        """Candidatos de un listado, sin URLs repetidas, de mayor a menor puntaje
+
+        `enlaces` son elementos <a>; a igual puntaje se mantiene el orden de la página.
+        Los href relativos se resuelven contra `url_pagina` (por defecto la url_base).
+        Cada candidato incluye el elemento para buscar fechas u otros datos cercanos.
+        """
+        url_pagina = url_pagina or self.url_base
+        candidatos = []
+        vistas = set()
+        for enlace in enlaces:
+            url = normalizar_url(enlace.get('href'), url_pagina)
+            if not url or url in vistas:
+                continue
+            titulo = enlace.get_text(strip=True)
+            puntaje = self.puntaje(titulo, url)
+            if puntaje < 0:
+                continue
+            vistas.add(url)
+            candidatos.append({'titulo': titulo, 'url': url, 'puntaje': puntaje, 'elemento': enlace})
+
+        candidatos.sort(key=lambda candidato: candidato['puntaje'], reverse=True)
+        return candidatos
+
+_clasificadores = {}
+_lock = threading.Lock()
+
+def clasificador_para(codigo: str) -> ClasificadorEnlaces:
+    """Clasificador compilado (una vez) con la configuración de una fuente"""
+    with _lock:
+        clasificador = _clasificadores.get(codigo)
+        if clasificador is None:
+            config = FUENTES_CONFIG[codigo]
+            clasificador = _clasificadores[codigo] = ClasificadorEnlaces(
+                config['url_base'],
+                palabras_clave=config.get('palabras_clave', ()),
+                exclusiones=config.get('exclusiones', ()),
+                urls_noticia=config.get('urls_noticia', ()),
+                urls_excluidas=config.get('urls_excluidas', ()),
+                solo_internos=config.get('solo_enlaces_internos', False),
+                min_largo_titulo=config.get('min_largo_titulo', 20)
+            )
+        return clasificador
@@ -3,6 +3,8 @@
 Configuración centralizada para todos los scrapers de noticias jurídicas
 """
 
+import os
+
 # ========================================
 # CONFIGURACIÓN GENERAL
 # ========================================
@@ -11,6 +13,72 @@ SCRAPING_CONFIG = {
     'max_retries': 3,
     'pause_between_requests': 1,
     'max_noticias_por_fuente': 20,
+    # Límite por defecto para hosts sin configuración propia
+    # (por_segundo: tasa sostenida, rafaga: tokens acumulables, max_concurrentes: peticiones simultáneas)
+    'limite_peticiones': {'por_segundo': 1.0, 'rafaga': 1, 'max_concurrentes': 1},
+    # Estado local persistente entre ejecuciones (índices y cachés)
+    'directorio_estado': os.getenv(
+        'NOTICIAS_DIRECTORIO_ESTADO',
+        os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..', '..', '.estado_scraping'))
+    ),
+    # Caché de respuestas HTTP (desactivada salvo --cache/--replay o NOTICIAS_CACHE_HTTP)
+    # ttl_cache: segundos que una respuesta se considera vigente; cada fuente puede ajustarlo
+    'cache_http': os.getenv('NOTICIAS_CACHE_HTTP', ''),
+    'ttl_cache': 3600,
+    # Modelo de boilerplate: una frase se elimina de los cuerpos de una fuente si aparece
+    # en al menos min_documentos documentos y en al menos esa proporción del total
+    'boilerplate': {'min_documentos': 5, 'proporcion_minima': 0.3, 'max_frases': 20000},
+    # Noticias descargadas que pueden esperar a ser guardadas antes de pausar las descargas
+    # (por worker del host), y tamaño de los lotes que el orquestador escribe en la base
+    'noticias_en_espera': 2,
+    'tamano_lote': 5,
+    # Planificación por fuente (segundos): cada fuente se visita cuando se espera que haya
+    # publicado `nuevas_por_visita` noticias según su ritmo en los últimos `ventana_dias`,
+    # dentro de [intervalo_minimo, intervalo_maximo] y con ±jitter. `holgura` adelanta las
+    # visitas que vencen poco después de una ejecución (cron). Cada fuente puede ajustar
+    # estos valores con su propia clave 'planificacion'.
+    'planificacion': {
+        'intervalo_minimo': 900,
+        'intervalo_maximo': 21600,
+        'intervalo_sin_historial': 3600,
+        'nuevas_por_visita': 0.15,
+        'jitter': 0.1,
+        'ventana_dias': 60,
+        'dias_minimos': 7,
+        'holgura': 300
+    },
+    # Plazo de ejecución (--deadline): las fuentes se recorren por prioridad y costo esperado
+    # (duración de sus visitas anteriores, o duracion_sin_historial) y cada una recibe una
+    # franja proporcional a su costo, y al menos `margen_costo` veces su costo aunque no alcance
+    # para las siguientes. `reserva` queda para guardar lo descargado y cerrar la ejecución;
+    # una fuente no empieza si quedan menos de `franja_minima` segundos.
+    'plazo': {
+        'reserva': 60,
+        'franja_minima': 20,
+        'margen_costo': 2,
+        'duracion_sin_historial': 120
+    },
+    # Salud por fuente (ver salud_fuentes.py). Una visita falla si termina con errores o si no
+    # entrega noticias y sus peticiones fallaron. Tras `umbral_fallos` visitas fallidas seguidas
+    # el circuito se abre: la fuente se omite durante `enfriamiento` segundos, que se duplican
+    # con cada reapertura hasta `enfriamiento_maximo`. Al vencer, una visita de prueba con
+    # `noticias_sonda` noticias decide si se cierra. Las tasas se calculan sobre las últimas
+    # `ventana_visitas` visitas; --working-only deja fuera las fuentes con una tasa de error
+    # mayor a `tasa_error_maxima` en al menos `visitas_minimas` visitas, --test-mode recorre las `fuentes_prueba` más sanas y rápidas,
+    # y --quick omite además las de latencia mediana mayor a `latencia_maxima_rapida`. Dentro de
+    # una visita, `fallos_seguidos_visita` peticiones fallidas seguidas dan el sitio por caído.
+    'salud': {
+        'umbral_fallos': 3,
+        'enfriamiento': 3600,
+        'enfriamiento_maximo': 21600,
+        'noticias_sonda': 1,
+        'ventana_visitas': 20,
+        'tasa_error_maxima': 0.5,
+        'visitas_minimas': 5,
+        'fuentes_prueba': 3,
+        'latencia_maxima_rapida': 3.0,
+        'fallos_seguidos_visita': 5
+    },
     'user_agent': 'Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36'
 }
 
@@ -30,12 +98,19 @@ PODER_JUDICIAL_CONFIG = {
         'fiscal', 'corte', 'juzgado', 'tribunal', 'sentencia', 'fallo', 
         'condena', 'prisión', 'acusado', 'imputado', 'sumario', 'querella',
         'liquidación', 'robo', 'abuso', 'violación', 'homicidio', 'alcalde',
-        'ejército', 'garantía', 'apelaciones', 'suprema', 'oral', 'penal'
+        'ejército', 'garantía', 'apelaciones', 'suprema', 'oral', 'penal',
+        'civil', 'familia', 'laboral', 'cobranza', 'administrativo'
     ],
     'exclusiones': [
         'anterior', 'siguiente', 'última', 'página', 'filtrar', 'inicio',
         'menu', 'portal', 'sistema', 'traducción', 'licitaciones'
-    ]
+    ],
+    # Enlaces del listado que son noticias aunque el título no tenga palabras clave
+    'urls_noticia': ['/noticias-del-poder-judicial/'],
+    'limite_peticiones': {'por_segundo': 2.0, 'rafaga': 3, 'max_concurrentes': 3},
+    'ttl_cache': 900,
+    # El listado solo usa los enlaces: se parsean únicamente las etiquetas <a>
+    'parseo_listado': ('a',)
 }
 
 # Ministerio de Justicia
@@ -46,15 +121,35 @@ MINISTERIO_JUSTICIA_CONFIG = {
     'url_noticias': 'https://www.minjusticia.gob.cl/category/noticias/',
     'activo': True,
     'prioridad': 1,
+    # El sitio publica los títulos sin tildes
     'palabras_clave': [
-        'ley', 'proyecto', 'reforma', 'código', 'servicio', 'nacional',
-        'defensoría', 'víctimas', 'derechos', 'humanos', 'justicia',
-        'penal', 'civil', 'familia', 'adopciones', 'delitos'
+        'cuenta publica', 'inaugura', 'nombro', 'presentamos', 'mesa',
+        'ley', 'estudio', 'dialogo', 'lanzamiento', 'nuevo', 'proyecto',
+        'reforma', 'adopciones', 'delitos', 'intervencion', 'poblacion',
+        'penal', 'interculturales', 'religiosos', 'normativa', 'penitenciaria',
+        'genero', 'equidad', 'reinsercion', 'social', 'juvenil', 'abogado',
+        'ninez', 'adolescencia', 'videograbadas', 'coordinacion', 'sistema',
+        'justicia', 'investigaciones', 'informes', 'estudios', 'anteproyecto',
+        'codigo', 'servicio', 'nacional', 'acceso', 'victimas',
+        'aranceles', 'receptores', 'judiciales', 'comision', 'asesora',
+        'fortalecimiento', 'indh', 'auditoria', 'revision', 'especial',
+        'efectuada', 'unidad', 'derechos', 'humanos', 'desnotarizacion'
     ],
     'exclusiones': [
-        'regiones', 'seminarios', 'subsecretario', 'defensoria', 'caj',
-        'mediacion', 'transparencia', 'trabaja', 'indicadores', 'lobby'
-    ]
+        'inicio', 'ministerio', 'ministro', 'subsecretaria', 'servicios',
+        'mision', 'organigrama', 'participacion', 'comunicaciones',
+        'siguiente', 'anterior', 'menu', 'facebook', 'twitter', 'youtube',
+        'flickr', 'outlook', 'gendarmeria', 'sml', 'sename', 'registro civil',
+        'defensoria', 'caj', 'mediacion', 'transparencia', 'trabaja',
+        'indicadores', 'lobby', 'solicitud', 'politicas', 'sitio historico',
+        'protocolo', 'informacion', 'seguridad', 'consulta ciudadana',
+        'dialogos participativos'
+    ],
+    'urls_excluidas': ['/page/', '/category/', '/tag/', '/author/'],
+    'solo_enlaces_internos': True,
+    'limite_peticiones': {'por_segundo': 1.0, 'rafaga': 2, 'max_concurrentes': 2},
+    'ttl_cache': 3600,
+    'parseo_listado': ('a',)
 }
 
 # Defensoría Penal Pública
@@ -71,7 +166,9 @@ DPP_CONFIG = {
     ],
     'exclusiones': [
         'inicio', 'menu', 'departamentos', 'unidades', 'regiones'
-    ]
+    ],
+    'limite_peticiones': {'por_segundo': 1.0, 'rafaga': 2, 'max_concurrentes': 2},
+    'ttl_cache': 3600
 }
 
 # Contraloría General de la República
@@ -88,7 +185,9 @@ CONTRALORIA_CONFIG = {
     ],
     'exclusiones': [
         'inicio', 'menu', 'contacto', 'transparencia'
-    ]
+    ],
+    'limite_peticiones': {'por_segundo': 1.0, 'rafaga': 2, 'max_concurrentes': 2},
+    'ttl_cache': 3600
 }
 
 # Tribunal de Propiedad Industrial
@@ -105,7 +204,9 @@ TDPI_CONFIG = {
     ],
     'exclusiones': [
         'inicio', 'menu', 'contacto', 'transparencia'
-    ]
+    ],
+    'limite_peticiones': {'por_segundo': 1.0, 'rafaga': 2, 'max_concurrentes': 2},
+    'ttl_cache': 3600
 }
 
 # CDE (Comisión de Defensa de la Libre Competencia)
@@ -122,7 +223,9 @@ CDE_CONFIG = {
     ],
     'exclusiones': [
         'inicio', 'menu', 'contacto', 'transparencia'
-    ]
+    ],
+    'limite_peticiones': {'por_segundo': 1.0, 'rafaga': 2, 'max_concurrentes': 2},
+    'ttl_cache': 3600
 }
 
 # Nuevas fuentes de tribunales ambientales y TDLC
@@ -138,7 +241,9 @@ TDLC_CONFIG = {
         'fiscalía nacional económica', 'fne', 'decreto ley 211'
     ],
     'categoria': 'TRIBUNAL',
-    'jurisdiccion': 'NACIONAL'
+    'jurisdiccion': 'NACIONAL',
+    'limite_peticiones': {'por_segundo': 0.5, 'rafaga': 1, 'max_concurrentes': 1},
+    'ttl_cache': 21600
 }
 
 TRIBUNAL_AMBIENTAL_1TA_CONFIG = {
@@ -154,7 +259,9 @@ TRIBUNAL_AMBIENTAL_1TA_CONFIG = {
     ],
     'categoria': 'TRIBUNAL',
     'jurisdiccion': 'NACIONAL',
-    'prefijo': '(1º)'
+    'prefijo': '(1º)',
+    'limite_peticiones': {'por_segundo': 0.5, 'rafaga': 1, 'max_concurrentes': 1},
+    'ttl_cache': 21600
 }
 
 TRIBUNAL_AMBIENTAL_3TA_CONFIG = {
@@ -170,7 +277,9 @@ TRIBUNAL_AMBIENTAL_3TA_CONFIG = {
     ],
     'categoria': 'TRIBUNAL',
     'jurisdiccion': 'NACIONAL',
-    'prefijo': '(3º)'
+    'prefijo': '(3º)',
+    'limite_peticiones': {'por_segundo': 0.5, 'rafaga': 1, 'max_concurrentes': 1},
+    'ttl_cache': 21600
 }
 
 TRIBUNAL_AMBIENTAL_GENERAL_CONFIG = {
@@ -186,7 +295,9 @@ TRIBUNAL_AMBIENTAL_GENERAL_CONFIG = {
     ],
     'categoria': 'TRIBUNAL',
     'jurisdiccion': 'NACIONAL',
-    'prefijo': '(2º)'
+    'prefijo': '(2º)',
+    'limite_peticiones': {'por_segundo': 0.5, 'rafaga': 1, 'max_concurrentes': 1},
+    'ttl_cache': 21600
 }
 
 # Servicio de Impuestos Internos
@@ -206,7 +317,9 @@ SII_CONFIG = {
         'menú', 'inicio', 'buscar', 'rss', 'formularios', 'trámites'
     ],
     'categoria': 'NORMATIVA',
-    'jurisdiccion': 'NACIONAL'
+    'jurisdiccion': 'NACIONAL',
+    'limite_peticiones': {'por_segundo': 2.0, 'rafaga': 3, 'max_concurrentes': 3},
+    'ttl_cache': 900
 }
 
 # Tribunales Tributarios y Aduaneros
@@ -225,7 +338,9 @@ TTA_CONFIG = {
         'menú', 'inicio', 'buscar', 'rss', 'formularios'
     ],
     'categoria': 'TRIBUNAL',
-    'jurisdiccion': 'NACIONAL'
+    'jurisdiccion': 'NACIONAL',
+    'limite_peticiones': {'por_segundo': 1.0, 'rafaga': 2, 'max_concurrentes': 2},
+    'ttl_cache': 3600
 }
 
 # Instituto Nacional de Propiedad Industrial
@@ -244,7 +359,10 @@ INAPI_CONFIG = {
         'menú', 'inicio', 'buscar', 'rss', 'formularios', 'trámites'
     ],
     'categoria': 'NORMATIVA',
-    'jurisdiccion': 'NACIONAL'
+    'jurisdiccion': 'NACIONAL',
+    'limite_peticiones': {'por_segundo': 1.0, 'rafaga': 2, 'max_concurrentes': 2},
+    'ttl_cache': 3600,
+    'parseo_listado': ('a',)
 }
 
 # Dirección del Trabajo
@@ -263,7 +381,9 @@ DT_CONFIG = {
         'menú', 'inicio', 'buscar', 'rss', 'formularios', 'trámites'
     ],
     'categoria': 'NORMATIVA',
-    'jurisdiccion': 'NACIONAL'
+    'jurisdiccion': 'NACIONAL',
+    'limite_peticiones': {'por_segundo': 1.0, 'rafaga': 2, 'max_concurrentes': 2},
+    'ttl_cache': 3600
 }
 
 # ========================================
@@ -0,0 +1,189 @@
+#!/usr/bin/env python3
+"""
+Contexto de ejecución compartido por todos los scrapers
+Reúne lo que antes cada scraper construía por su cuenta: un solo
+ContentProcessor (y su caché de resúmenes), las reglas de limpieza ya
+compiladas, el parser de fechas, las cachés de la ejecución y un pool de
+conexiones HTTP por host, dimensionado con el máximo de peticiones simultáneas
+que el limitador permite a ese host. Las estadísticas de cachés y conexiones
+de toda la ejecución se consultan en un solo lugar.
+
+Los scrapers leen estos componentes de su contexto (self.contexto), nunca de
+las instancias globales de cada módulo: el contexto que se les inyecta
+controla la ejecución completa.
+"""
+
+import threading
+from typing import Dict
+
+from requests.adapters import HTTPAdapter
+
+from backend.processors.content_processor import (
+    ContentProcessor,
+    estadisticas_limpieza,
+    motor_contenido_para,
+    reset_estadisticas_limpieza
+)
+from backend.processors.modelo_boilerplate import modelo_boilerplate
+from .limitador_peticiones import RegistroLimitadores, SesionLimitada, limitador_peticiones, normalizar_host
+from .validadores_http import CacheValidadores, validadores_http
+from .cache_respuestas import CacheRespuestas, cache_respuestas
+from .indice_urls import indice_urls
+from .marcas_agua import marcas_agua
+from .extractor_contenido import extractor_contenido
+from .date_extractor import date_extractor
+from . import fechas
+
+class PoolConexiones:
+    """Adaptadores HTTP compartidos, uno por host
+
+    Cada adaptador guarda tantas conexiones abiertas como peticiones
+    simultáneas admite el limitador del host: más no se usarían y menos
+    obligarían a abrir y cerrar conexiones en cada ráfaga.
+    """
+
+    def __init__(self, registro: RegistroLimitadores = None):
+        self.registro = registro or limitador_peticiones
+        self._adaptadores: Dict[str, HTTPAdapter] = {}
+        self._tamanos: Dict[str, int] = {}
+        self._base: Dict[str, Dict[str, int]] = {}
+        self._lock = threading.Lock()
+
+    def para_url(self, url: str) -> HTTPAdapter:
+        """Obtener (o crear) el adaptador del host de una URL"""
+        host = normalizar_host(url)
+
+        with self._lock:
+            adaptador = self._adaptadores.get(host)
+            if adaptador is None:
+                tamano = self.registro.para_url(url).max_concurrentes
+                # Un pool por esquema (http/https) del host
+                adaptador = HTTPAdapter(pool_connections=2, pool_maxsize=tamano)
+                self._adaptadores[host] = adaptador
+                self._tamanos[host] = tamano
+            return adaptador
+
+    @staticmethod
+    def _contadores(adaptador: HTTPAdapter) -> Dict[str, int]:
+        pools = adaptador.poolmanager.pools
+        conexiones = peticiones = 0
+        for clave in pools.keys():
+            pool = pools.get(clave)
+            if pool is not None:
+                conexiones += pool.num_connections
+                peticiones += pool.num_requests
+        return {'conexiones': conexiones, 'peticiones': peticiones}
+
+    def get_estadisticas(self) -> Dict[str, Dict]:
+        """Conexiones abiertas y peticiones servidas por host desde el último reset"""
+        with self._lock:
+            adaptadores = dict(self._adaptadores)
+            tamanos = dict(self._tamanos)
+            base = dict(self._base)
+
+        estadisticas = {}
+        for host, adaptador in adaptadores.items():
+            contadores = self._contadores(adaptador)
+            previos = base.get(host, {})
+            estadisticas[host] = {
+                'tamano_pool': tamanos[host],
+                'conexiones': contadores['conexiones'] - previos.get('conexiones', 0),
+                'peticiones': contadores['peticiones'] - previos.get('peticiones', 0)
+            }
+        return estadisticas
+
+    def reset_estadisticas(self):
+        # Los contadores de urllib3 no se reinician: se guarda el punto de partida
+        with self._lock:
+            self._base = {host: self._contadores(adaptador) for host, adaptador in self._adaptadores.items()}
+
+    def cerrar(self):
+        """Cerrar las conexiones abiertas de todos los hosts"""
+        with self._lock:
+            for adaptador in self._adaptadores.values():
+                adaptador.close()
+            self._adaptadores = {}
+            self._tamanos = {}
+            self._base = {}
+
+class ContextoEjecucion:
+    """Estado compartido por los scrapers de una ejecución"""
+
+    def __init__(self, openai_api_key: str = None, registro: RegistroLimitadores = None,
+                 validadores: CacheValidadores = None, cache: CacheRespuestas = None, **componentes):
+        """
+        Args:
+            componentes: reemplazos de indice_urls, marcas_agua, extractor_contenido,
+                date_extractor o modelo_boilerplate (por defecto, las instancias globales)
+        """
+        self.registro = registro or limitador_peticiones
+        self.validadores = validadores or validadores_http
+        self.cache = cache or cache_respuestas
+        self.conexiones = PoolConexiones(self.registro)
+        self.content_processor = ContentProcessor(openai_api_key or "")
+
+        # Componentes con estado (índice, marcas de agua, contadores y cachés de extracción)
+        self.indice_urls = componentes.pop('indice_urls', indice_urls)
+        self.marcas_agua = componentes.pop('marcas_agua', marcas_agua)
+        self.extractor_contenido = componentes.pop('extractor_contenido', extractor_contenido)
+        self.date_extractor = componentes.pop('date_extractor', date_extractor)
+        self.modelo_boilerplate = componentes.pop('modelo_boilerplate', modelo_boilerplate)
+        if componentes:
+            raise TypeError(f"Componentes desconocidos: {', '.join(componentes)}")
+
+        # Funciones puras, con su memo compartido por todo el proceso
+        self.parsear_fecha = fechas.parsear_fecha
+        self.normalizar_fecha = fechas.normalizar_fecha
+        self.motor_limpieza = motor_contenido_para
+
+    def nueva_sesion(self, cabeceras: Dict[str, str] = None) -> SesionLimitada:
+        """Sesión para un scraper: cabeceras y cookies propias, conexiones compartidas por host"""
+        sesion = SesionLimitada(self.registro, self.validadores, self.cache, self.conexiones)
+        if cabeceras:
+            sesion.headers.update(cabeceras)
+        return sesion
+
+    def get_estadisticas(self) -> Dict[str, Dict]:
+        """Estadísticas de cachés y conexiones de la ejecución"""
+        return {
+            'conexiones': self.conexiones.get_estadisticas(),
+            'limitadores': self.registro.get_estadisticas(),
+            'cache_http': dict(self.cache.estadisticas),
+            'validadores_http': dict(self.validadores.estadisticas),
+            'indice_urls': dict(self.indice_urls.estadisticas),
+            'marcas_agua': dict(self.marcas_agua.estadisticas),
+            'fechas': fechas.get_estadisticas(),
+            'fechas_pagina': self.date_extractor.get_estadisticas(),
+            'contenido': self.extractor_contenido.get_estadisticas(),
+            'limpieza': estadisticas_limpieza(),
+            'resumenes': self.content_processor.get_estadisticas(),
+            'boilerplate': self.modelo_boilerplate.get_estadisticas()
+        }
+
+    def reset_estadisticas(self):
+        """Poner a cero los contadores al comenzar una ejecución"""
+        self.conexiones.reset_estadisticas()
+        self.cache.estadisticas.update(aciertos=0, fallos=0, grabadas=0)
+        self.validadores.estadisticas.update(sin_cambios=0, con_cambios=0)
+        self.indice_urls.estadisticas.update(consultas=0, omitidas=0)
+        self.marcas_agua.estadisticas.update(recortadas=0)
+        self.date_extractor.reset_estadisticas()
+        self.extractor_contenido.reset_estadisticas()
+        reset_estadisticas_limpieza()
+        self.content_processor.reset_estadisticas()
+        self.modelo_boilerplate.reset_estadisticas()
+
+_contexto_por_defecto = None
+_lock_contexto = threading.Lock()
+
+def contexto_por_defecto() -> ContextoEjecucion:
+    """Contexto para scrapers construidos fuera del sistema (pruebas, scripts)
+
+    Se crea al primer uso: importar este módulo no construye un ContentProcessor,
+    y una ejecución del sistema solo construye el suyo.
+    """
+    global _contexto_por_defecto
+    with _lock_contexto:
+        if _contexto_por_defecto is None:
+            _contexto_por_defecto = ContextoEjecucion()
+        return _contexto_por_defecto
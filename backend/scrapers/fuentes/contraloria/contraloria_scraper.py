@@ -6,7 +6,7 @@ Scraper para la Contraloría General de la República de Chile
 import sys
 import os
 import requests
-from typing import List, Dict, Optional
+from typing import Dict, Iterator, List, Optional
 from datetime import datetime, timezone
 from bs4 import BeautifulSoup
 import re
@@ -15,6 +15,7 @@ import re
 sys.path.append(os.path.dirname(os.path.dirname(os.path.dirname(os.path.dirname(__file__)))))
 
 from backend.scrapers.fuentes.base_scraper import BaseScraper
+from backend.scrapers.fuentes.contexto_ejecucion import ContextoEjecucion
 from backend.scrapers.fuentes.data_schema import (
     NoticiaEstandarizada, 
     MetadataNoticia,
@@ -27,8 +28,8 @@ from backend.scrapers.fuentes.data_schema import (
 class ContraloriaScraper(BaseScraper):
     """Scraper para la Contraloría General de la República de Chile"""
     
-    def __init__(self, openai_api_key: str = None):
-        super().__init__(openai_api_key)
+    def __init__(self, openai_api_key: str = None, contexto: ContextoEjecucion = None):
+        super().__init__(openai_api_key, contexto)
         self.base_url = "https://www.contraloria.cl"
         self.noticias_url = "https://www.contraloria.cl/portalweb/web/cgr/noticias"
         self.version_scraper = "1.0"
@@ -61,10 +62,12 @@ class ContraloriaScraper(BaseScraper):
         try:
             self._log_info("Obteniendo noticias de la Contraloría General de la República...")
             
-            response = self.session.get(self.noticias_url, timeout=30)
+            response = self.session.get_condicional(self.noticias_url, timeout=30)
+            if self._sin_cambios(response):
+                return []
             response.raise_for_status()
             
-            soup = BeautifulSoup(response.content, 'html.parser')
+            soup = self._parsear_listado(response.content)
             
             # Extraer noticias con fechas de la página principal
             noticias = self._extract_noticias_con_fechas(soup, max_noticias)
@@ -214,7 +217,7 @@ class ContraloriaScraper(BaseScraper):
             response = self.session.get(url, timeout=30)
             response.raise_for_status()
             
-            soup = BeautifulSoup(response.content, 'html.parser')
+            soup = self._parsear(response.content)
             
             # Extraer título
             if not titulo:
@@ -256,7 +259,7 @@ class ContraloriaScraper(BaseScraper):
             if fecha_str:
                 fecha = self._parse_fecha_contraloria(fecha_str)
             else:
-                fecha = self._extract_fecha_universalcontraloria(soup)
+                fecha = self._extract_fecha_contraloria(soup)
             
             if not fecha:
                 fecha = datetime.now(timezone.utc)
@@ -330,29 +333,10 @@ class ContraloriaScraper(BaseScraper):
             for selector in fecha_selectors:
                 fecha_elem = soup.select_one(selector)
                 if fecha_elem:
-                    # Intentar extraer fecha del atributo datetime
-                    datetime_attr = fecha_elem.get('datetime')
-                    if datetime_attr:
-                        return datetime.fromisoformat(datetime_attr.replace('Z', '+00:00'))
-                    
-                    # Intentar extraer fecha del texto
-                    fecha_texto = fecha_elem.get_text(strip=True)
-                    if fecha_texto:
-                        # Patrones de fecha comunes
-                        patterns = [
-                            r'(\d{1,2})/(\d{1,2})/(\d{4})',
-                            r'(\d{1,2})-(\d{1,2})-(\d{4})',
-                            r'(\d{4})-(\d{1,2})-(\d{1,2})'
-                        ]
-                        
-                        for pattern in patterns:
-                            match = re.search(pattern, fecha_texto)
-                            if match:
-                                if len(match.groups()) == 3:
-                                    if len(match.group(1)) == 4:  # YYYY-MM-DD
-                                        return datetime(int(match.group(1)), int(match.group(2)), int(match.group(3)), tzinfo=timezone.utc)
-                                    else:  # DD/MM/YYYY o DD-MM-YYYY
-                                        return datetime(int(match.group(3)), int(match.group(2)), int(match.group(1)), tzinfo=timezone.utc)
+                    # Intentar extraer fecha del atributo datetime y, si no, del texto
+                    fecha = self.contexto.parsear_fecha(fecha_elem.get('datetime')) or self.contexto.parsear_fecha(fecha_elem.get_text(strip=True))
+                    if fecha:
+                        return fecha
             
             return None
             
@@ -361,28 +345,8 @@ class ContraloriaScraper(BaseScraper):
             return None
     
     def _parse_fecha_contraloria(self, fecha_str: str) -> Optional[datetime]:
-        """Parsear fecha de la Contraloría desde string"""
-        try:
-            if not fecha_str:
-                return None
-            
-            # Formato DD/MM/YYYY (como 25/07/2025)
-            if re.match(r'\d{1,2}/\d{1,2}/\d{4}', fecha_str):
-                return datetime.strptime(fecha_str, '%d/%m/%Y').replace(tzinfo=timezone.utc)
-            
-            # Formato DD-MM-YYYY
-            if re.match(r'\d{1,2}-\d{1,2}-\d{4}', fecha_str):
-                return datetime.strptime(fecha_str, '%d-%m-%Y').replace(tzinfo=timezone.utc)
-            
-            # Formato YYYY-MM-DD
-            if re.match(r'\d{4}-\d{1,2}-\d{1,2}', fecha_str):
-                return datetime.strptime(fecha_str, '%Y-%m-%d').replace(tzinfo=timezone.utc)
-            
-            return None
-            
-        except Exception as e:
-            self._log_warning(f"Error parseando fecha '{fecha_str}': {e}")
-            return None
+        """Parsear fecha de la Contraloría desde string (como 25/07/2025)"""
+        return self.contexto.parsear_fecha(fecha_str)
     
     def _extract_info_legal_contraloria(self, soup: BeautifulSoup, contenido: str) -> Dict:
         """Extraer información legal específica de Contraloría"""
@@ -557,37 +521,26 @@ class ContraloriaScraper(BaseScraper):
         contenido_para_hash = f"{titulo}|{contenido[:200]}|{url}"
         return hashlib.md5(contenido_para_hash.encode('utf-8')).hexdigest()
 
-    def scrape_noticias_recientes(self, max_noticias: int = 10) -> List[NoticiaEstandarizada]:
-        """Scrapear noticias recientes completas de la Contraloría"""
+    def iter_noticias(self, max_noticias: int = 10) -> Iterator[NoticiaEstandarizada]:
+        """Entregar noticias recientes completas de la Contraloría a medida que se descargan"""
         self._log_info("Iniciando scraping de la Contraloría General de la República...")
         
-        # Obtener enlaces de noticias
-        noticias_links = self.get_noticias_recientes(max_noticias)
+        # Obtener enlaces de noticias (sin las ya almacenadas)
+        noticias_links = self._descartar_conocidas(self.get_noticias_recientes(max_noticias))
         
         if not noticias_links:
             self._log_warning("No se encontraron enlaces de noticias de la Contraloría")
-            return []
+            return
         
-        # Extraer noticias completas
-        noticias_completas = []
+        # Extraer noticias completas (en paralelo, según el límite del host)
+        def obtener(link):
+            self._log_info(f"Procesando noticia: {link['titulo'][:50]}...")
+            # Pasar la fecha si está disponible
+            return self.get_noticia_completa(link['url'], link['titulo'], link.get('fecha'))
         
-        for i, link in enumerate(noticias_links):
-            try:
-                self._log_info(f"Procesando noticia {i+1}/{len(noticias_links)}: {link['titulo'][:50]}...")
-                
-                # Pasar la fecha si está disponible
-                fecha_str = link.get('fecha')
-                noticia = self.get_noticia_completa(link['url'], link['titulo'], fecha_str)
-                
-                if noticia:
-                    noticias_completas.append(noticia)
-                
-                # Pausa entre requests
-                self._pausa_entre_requests(1)
-                
-            except Exception as e:
-                self._log_error(f"Error procesando noticia {link['url']}", e)
-                continue
+        extraidas = 0
+        for noticia in self._iterar_detalles(noticias_links, obtener):
+            extraidas += 1
+            yield noticia
         
-        self._log_success(f"Scraping de la Contraloría completado: {len(noticias_completas)} noticias extraídas")
-        return noticias_completas 
\ No newline at end of file
+        self._log_success(f"Scraping de la Contraloría completado: {extraidas} noticias extraídas") 
\ No newline at end of file
@@ -10,6 +10,8 @@ from typing import List, Dict, Optional, Any
 from dataclasses import dataclass, field
 from enum import Enum
 
+from .fechas import normalizar_fecha, parsear_fecha
+
 class Categoria(Enum):
     """Categorías de noticias jurídicas"""
     TRIBUNAL = "tribunal"
@@ -213,32 +215,8 @@ class NoticiaEstandarizada:
             self.etiquetas = []
     
     def _parse_fecha(self, fecha_str: str) -> datetime:
-        """Parsear fecha en múltiples formatos"""
-        if not fecha_str:
-            return datetime.now(timezone.utc)
-        
-        # Formato: DD/MM/YYYY HH:MM:SS
-        if re.match(r'\d{2}/\d{2}/\d{4} \d{2}:\d{2}:\d{2}', fecha_str):
-            return datetime.strptime(fecha_str, '%d/%m/%Y %H:%M:%S').replace(tzinfo=timezone.utc)
-        
-        # Formato: DD/MM/YYYY HH:MM
-        if re.match(r'\d{2}/\d{2}/\d{4} \d{2}:\d{2}', fecha_str):
-            return datetime.strptime(fecha_str, '%d/%m/%Y %H:%M').replace(tzinfo=timezone.utc)
-        
-        # Formato: DD/MM/YYYY
-        if re.match(r'\d{2}/\d{2}/\d{4}', fecha_str):
-            return datetime.strptime(fecha_str, '%d/%m/%Y').replace(tzinfo=timezone.utc)
-        
-        # Formato: YYYY-MM-DD HH:MM:SS
-        if re.match(r'\d{4}-\d{2}-\d{2} \d{2}:\d{2}:\d{2}', fecha_str):
-            return datetime.strptime(fecha_str, '%Y-%m-%d %H:%M:%S').replace(tzinfo=timezone.utc)
-        
-        # Formato: YYYY-MM-DD
-        if re.match(r'\d{4}-\d{2}-\d{2}', fecha_str):
-            return datetime.strptime(fecha_str, '%Y-%m-%d').replace(tzinfo=timezone.utc)
-        
-        # Si no se puede parsear, usar fecha actual
-        return datetime.now(timezone.utc)
+        """Parsear fecha en múltiples formatos (fecha actual si no se reconoce)"""
+        return normalizar_fecha(fecha_str)
     
     def _generar_hash(self) -> str:
         """Generar hash único del contenido"""
@@ -287,32 +265,8 @@ class DataNormalizer:
     
     @staticmethod
     def normalizar_fecha(fecha_str: str) -> datetime:
-        """Normalizar fecha en múltiples formatos"""
-        if not fecha_str:
-            return datetime.now(timezone.utc)
-        
-        # Formato: DD/MM/YYYY HH:MM:SS
-        if re.match(r'\d{2}/\d{2}/\d{4} \d{2}:\d{2}:\d{2}', fecha_str):
-            return datetime.strptime(fecha_str, '%d/%m/%Y %H:%M:%S').replace(tzinfo=timezone.utc)
-        
-        # Formato: DD/MM/YYYY HH:MM
-        if re.match(r'\d{2}/\d{2}/\d{4} \d{2}:\d{2}', fecha_str):
-            return datetime.strptime(fecha_str, '%d/%m/%Y %H:%M').replace(tzinfo=timezone.utc)
-        
-        # Formato: DD/MM/YYYY
-        if re.match(r'\d{2}/\d{2}/\d{4}', fecha_str):
-            return datetime.strptime(fecha_str, '%d/%m/%Y').replace(tzinfo=timezone.utc)
-        
-        # Formato: YYYY-MM-DD HH:MM:SS
-        if re.match(r'\d{4}-\d{2}-\d{2} \d{2}:\d{2}:\d{2}', fecha_str):
-            return datetime.strptime(fecha_str, '%Y-%m-%d %H:%M:%S').replace(tzinfo=timezone.utc)
-        
-        # Formato: YYYY-MM-DD
-        if re.match(r'\d{4}-\d{2}-\d{2}', fecha_str):
-            return datetime.strptime(fecha_str, '%Y-%m-%d').replace(tzinfo=timezone.utc)
-        
-        # Si no se puede parsear, usar fecha actual
-        return datetime.now(timezone.utc)
+        """Normalizar fecha en múltiples formatos (fecha actual si no se reconoce)"""
+        return normalizar_fecha(fecha_str)
     
     @staticmethod
     def extraer_metadata_avanzada(texto: str, url: str = None) -> MetadataNoticia:
@@ -364,24 +318,7 @@ class DataNormalizer:
         metadata.idioma = 'es'  # Por defecto español
         
         # Extraer fechas de eventos
-        patrones_fecha = [
-            r'(\d{2}/\d{2}/\d{4})\s+(?:a las\s+)?(\d{2}:\d{2})',
-            r'(\d{2}/\d{2}/\d{4})',
-            r'(\d{4}-\d{2}-\d{2})'
-        ]
-        
-        for patron in patrones_fecha:
-            match = re.search(patron, texto)
-            if match:
-                try:
-                    if len(match.groups()) == 2:
-                        fecha_str = f"{match.group(1)} {match.group(2)}"
-                        metadata.fecha_evento = DataNormalizer.normalizar_fecha(fecha_str)
-                    else:
-                        metadata.fecha_evento = DataNormalizer.normalizar_fecha(match.group(1))
-                    break
-                except:
-                    continue
+        metadata.fecha_evento = parsear_fecha(texto)
         
         return metadata
     
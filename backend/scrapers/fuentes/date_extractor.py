@@ -1,266 +1,177 @@
 #!/usr/bin/env python3
 """
 Extractor universal de fechas para todas las fuentes
-Maneja múltiples formatos de fecha encontrados en noticias jurídicas
+Prueba las estrategias de la más barata y confiable a la más cara: atributos
+(meta tags y time[datetime]), JSON-LD, URL, bloque de contenido principal y,
+solo si nada de lo anterior funciona, el texto de la página completa. El texto
+del contenido principal es el mismo que memoriza extractor_contenido para el
+cuerpo de la noticia, así que la mayoría de las páginas nunca se convierten
+completas a texto.
 """
 
-import re
-from datetime import datetime, timezone
-from typing import Optional, List
+import json
+import threading
+from datetime import datetime
+from typing import Optional, Tuple
 from bs4 import BeautifulSoup
 
+from .extractor_contenido import extractor_contenido
+from .fechas import fecha_en_url, parsear_fecha
+
+# Orden en que se prueban las estrategias
+ESTRATEGIAS = ('atributos', 'json_ld', 'url', 'contenido', 'pagina')
+
+# Meta tags de fecha de publicación, de mayor a menor preferencia
+META_FECHA = (
+    'article:published_time', 'datepublished', 'publish_date', 'pubdate',
+    'date', 'dc.date', 'dc.date.issued', 'article:modified_time', 'og:updated_time'
+)
+PRIORIDAD_META = {nombre: posicion for posicion, nombre in enumerate(META_FECHA)}
+
+# Claves de JSON-LD, de mayor a menor preferencia
+CLAVES_JSON_LD = ('datePublished', 'dateCreated', 'uploadDate', 'dateModified')
+
+# Elementos que suelen mostrar la fecha de la noticia (un solo select)
+ELEMENTOS_FECHA = ', '.join((
+    '.fecha', '.date', '.fecha-publicacion', '.fecha-noticia', '.meta-fecha', '.entry-date',
+    '.post-date', '.noticia-fecha', '.publicacion-fecha', '.fecha-articulo', '.fecha-creacion'
+))
+
+def _fecha_json_ld(datos) -> Optional[datetime]:
+    """Primera fecha de publicación en un objeto JSON-LD (con @graph o listas anidadas)"""
+    pendientes = [datos]
+    while pendientes:
+        nodo = pendientes.pop(0)
+        if isinstance(nodo, list):
+            pendientes.extend(nodo)
+        elif isinstance(nodo, dict):
+            for clave in CLAVES_JSON_LD:
+                valor = nodo.get(clave)
+                if isinstance(valor, str):
+                    fecha = parsear_fecha(valor)
+                    if fecha:
+                        return fecha
+            pendientes.extend(valor for valor in nodo.values() if isinstance(valor, (list, dict)))
+    return None
+
 class UniversalDateExtractor:
     """Extractor universal de fechas para noticias jurídicas"""
-    
+
     def __init__(self):
-        self.meses = {
-            'enero': 1, 'febrero': 2, 'marzo': 3, 'abril': 4,
-            'mayo': 5, 'junio': 6, 'julio': 7, 'agosto': 8,
-            'septiembre': 9, 'octubre': 10, 'noviembre': 11, 'diciembre': 12,
-            'jan': 1, 'feb': 2, 'mar': 3, 'apr': 4,
-            'may': 5, 'jun': 6, 'jul': 7, 'aug': 8,
-            'sep': 9, 'oct': 10, 'nov': 11, 'dec': 12
-        }
-        
-        # Patrones de fecha universales
-        self.patrones = [
-            # Formato DD/MM/YYYY o DD-MM-YYYY o DD.MM.YYYY
-            r'(\d{1,2})[/\-\.](\d{1,2})[/\-\.](\d{4})',
-            
-            # Formato YYYY-MM-DD
-            r'(\d{4})-(\d{1,2})-(\d{1,2})',
-            
-            # Formato DD de Mes de YYYY (español)
-            r'(\d{1,2})\s+de\s+(\w+)\s+de\s+(\d{4})',
-            r'(\d{1,2})\s+de\s+(\w+)\s+del\s+(\d{4})',
-            
-            # Formato Mes DD, YYYY (inglés)
-            r'(\w+)\s+(\d{1,2}),?\s+(\d{4})',
-            
-            # Formato DD Mes YYYY
-            r'(\d{1,2})\s+(\w+)\s+(\d{4})',
-            
-            # Formato con día de la semana
-            r'(\w+),\s+(\d{1,2})\s+(\w+)\s+(\d{4})',
-            
-            # Formato ISO
-            r'(\d{4})-(\d{2})-(\d{2})T(\d{2}):(\d{2}):(\d{2})',
-            
-            # Formato DD/MM/YY (año corto)
-            r'(\d{1,2})[/\-\.](\d{1,2})[/\-\.](\d{2})',
-        ]
-    
-    def extract_date_from_html(self, soup: BeautifulSoup, url: str = None) -> Optional[datetime]:
+        self._lock = threading.Lock()
+        self.estadisticas = {estrategia: 0 for estrategia in ESTRATEGIAS + ('sin_fecha',)}
+
+    def extract_date_from_html(self, soup: BeautifulSoup, url: str = None, texto: str = None) -> Optional[datetime]:
         """
         Extraer fecha de una página HTML usando múltiples estrategias
         """
-        # Estrategia 1: Buscar en elementos específicos de fecha
-        fecha = self._extract_from_date_elements(soup)
-        if fecha:
-            return fecha
-        
-        # Estrategia 2: Buscar en el contenido completo
-        fecha = self._extract_from_content(soup.get_text())
-        if fecha:
-            return fecha
-        
-        # Estrategia 3: Buscar en la URL (si contiene fecha)
-        if url:
-            fecha = self._extract_from_url(url)
+        return self.extraer(soup, url, texto)[0]
+
+    def extraer(self, soup: BeautifulSoup, url: str = None,
+                texto: str = None) -> Tuple[Optional[datetime], Optional[str]]:
+        """
+        Fecha de la página y estrategia que la encontró (None, None si ninguna)
+
+        texto es el contenido principal ya extraído; si no se entrega se toma
+        de extractor_contenido, que lo memoriza para el resto del scraper.
+        """
+        for estrategia in ESTRATEGIAS:
+            try:
+                if estrategia == 'atributos':
+                    fecha = self._extract_from_meta_tags(soup) or self._extract_from_time(soup)
+                elif estrategia == 'json_ld':
+                    fecha = self._extract_from_json_ld(soup)
+                elif estrategia == 'url':
+                    fecha = self._extract_from_url(url)
+                elif estrategia == 'contenido':
+                    fecha = self._extract_from_main_content(soup, texto)
+                else:
+                    fecha = self._extract_from_page(soup)
+            except Exception as e:
+                print(f"⚠️  Error extrayendo fecha ({estrategia}): {e}")
+                fecha = None
+
+            if fecha:
+                self._contar(estrategia)
+                return fecha, estrategia
+
+        self._contar('sin_fecha')
+        return None, None
+
+    def _extract_from_meta_tags(self, soup: BeautifulSoup) -> Optional[datetime]:
+        """Extraer fecha de meta tags (la de mayor preferencia entre las presentes)"""
+        candidatos = []
+        for meta in (soup.head or soup).find_all('meta'):
+            nombre = (meta.get('property') or meta.get('name') or meta.get('itemprop') or '').lower()
+            if nombre in PRIORIDAD_META and meta.get('content'):
+                candidatos.append((PRIORIDAD_META[nombre], meta['content']))
+
+        for _, content in sorted(candidatos):
+            fecha = parsear_fecha(content)
             if fecha:
                 return fecha
-        
-        # Estrategia 4: Buscar en meta tags
-        fecha = self._extract_from_meta_tags(soup)
-        if fecha:
-            return fecha
-        
         return None
-    
-    def _extract_from_date_elements(self, soup: BeautifulSoup) -> Optional[datetime]:
-        """Extraer fecha de elementos específicos de fecha"""
-        selectors = [
-            '.fecha', '.date', '.fecha-publicacion', '.fecha-noticia',
-            'time', '[datetime]', '.meta .fecha', '.entry-date', '.post-date',
-            '.noticia-fecha', '.publicacion-fecha', '.fecha-articulo',
-            '.fecha-creacion', '.fecha-modificacion', '.fecha-actualizacion'
-        ]
-        
-        for selector in selectors:
-            elementos = soup.select(selector)
-            for elemento in elementos:
-                # Buscar en atributo datetime
-                datetime_attr = elemento.get('datetime')
-                if datetime_attr:
-                    fecha = self._parse_datetime_string(datetime_attr)
-                    if fecha:
-                        return fecha
-                
-                # Buscar en el texto del elemento
-                texto = elemento.get_text(strip=True)
-                fecha = self._parse_date_string(texto)
-                if fecha:
-                    return fecha
-        
+
+    def _extract_from_time(self, soup: BeautifulSoup) -> Optional[datetime]:
+        """Extraer fecha del atributo datetime de <time> (o de cualquier elemento que lo tenga)"""
+        for elemento in soup.find_all(attrs={'datetime': True}):
+            fecha = parsear_fecha(elemento['datetime'])
+            if fecha:
+                return fecha
         return None
-    
-    def _extract_from_content(self, texto: str) -> Optional[datetime]:
-        """Extraer fecha del contenido de texto"""
-        # Buscar todos los patrones de fecha en el texto
-        for patron in self.patrones:
-            matches = re.finditer(patron, texto, re.IGNORECASE)
-            for match in matches:
-                fecha = self._parse_match(match)
-                if fecha:
-                    return fecha
-        
+
+    def _extract_from_json_ld(self, soup: BeautifulSoup) -> Optional[datetime]:
+        """Extraer datePublished de los bloques JSON-LD"""
+        for script in soup.find_all('script', type='application/ld+json'):
+            try:
+                datos = json.loads(script.string or '')
+            except ValueError:
+                continue
+            fecha = _fecha_json_ld(datos)
+            if fecha:
+                return fecha
         return None
-    
+
     def _extract_from_url(self, url: str) -> Optional[datetime]:
         """Extraer fecha de la URL"""
-        # Buscar patrones de fecha en la URL
-        url_patrones = [
-            r'/(\d{4})/(\d{1,2})/(\d{1,2})/',  # /2025/08/01/
-            r'(\d{4})-(\d{1,2})-(\d{1,2})',    # 2025-08-01
-            r'(\d{1,2})-(\d{1,2})-(\d{4})',    # 01-08-2025
-        ]
-        
-        for patron in url_patrones:
-            match = re.search(patron, url)
-            if match:
-                fecha = self._parse_match(match)
-                if fecha:
-                    return fecha
-        
-        return None
-    
-    def _extract_from_meta_tags(self, soup: BeautifulSoup) -> Optional[datetime]:
-        """Extraer fecha de meta tags"""
-        meta_selectors = [
-            'meta[property="article:published_time"]',
-            'meta[name="publish_date"]',
-            'meta[name="date"]',
-            'meta[name="pubdate"]',
-            'meta[property="og:updated_time"]'
-        ]
-        
-        for selector in meta_selectors:
-            meta = soup.select_one(selector)
-            if meta:
-                content = meta.get('content')
-                if content:
-                    fecha = self._parse_datetime_string(content)
-                    if fecha:
-                        return fecha
-        
-        return None
-    
-    def _parse_match(self, match) -> Optional[datetime]:
-        """Parsear un match de regex a datetime"""
-        try:
-            grupos = match.groups()
-            
-            if len(grupos) == 3:
-                # Formato DD/MM/YYYY o DD-MM-YYYY
-                if match.re.pattern == r'(\d{1,2})[/\-\.](\d{1,2})[/\-\.](\d{4})':
-                    dia, mes, año = int(grupos[0]), int(grupos[1]), int(grupos[2])
-                    return datetime(año, mes, dia, tzinfo=timezone.utc)
-                
-                # Formato YYYY-MM-DD
-                elif match.re.pattern == r'(\d{4})-(\d{1,2})-(\d{1,2})':
-                    año, mes, dia = int(grupos[0]), int(grupos[1]), int(grupos[2])
-                    return datetime(año, mes, dia, tzinfo=timezone.utc)
-                
-                # Formato DD de Mes de YYYY
-                elif 'de' in match.re.pattern:
-                    dia = int(grupos[0])
-                    mes_texto = grupos[1].lower()
-                    año = int(grupos[2])
-                    
-                    if mes_texto in self.meses:
-                        return datetime(año, self.meses[mes_texto], dia, tzinfo=timezone.utc)
-                
-                # Formato Mes DD, YYYY
-                elif match.re.pattern == r'(\w+)\s+(\d{1,2}),?\s+(\d{4})':
-                    mes_texto = grupos[0].lower()
-                    dia = int(grupos[1])
-                    año = int(grupos[2])
-                    
-                    if mes_texto in self.meses:
-                        return datetime(año, self.meses[mes_texto], dia, tzinfo=timezone.utc)
-                
-                # Formato DD Mes YYYY
-                elif match.re.pattern == r'(\d{1,2})\s+(\w+)\s+(\d{4})':
-                    dia = int(grupos[0])
-                    mes_texto = grupos[1].lower()
-                    año = int(grupos[2])
-                    
-                    if mes_texto in self.meses:
-                        return datetime(año, self.meses[mes_texto], dia, tzinfo=timezone.utc)
-                
-                # Formato DD/MM/YY (año corto)
-                elif match.re.pattern == r'(\d{1,2})[/\-\.](\d{1,2})[/\-\.](\d{2})':
-                    dia, mes, año_corto = int(grupos[0]), int(grupos[1]), int(grupos[2])
-                    año = 2000 + año_corto if año_corto < 50 else 1900 + año_corto
-                    return datetime(año, mes, dia, tzinfo=timezone.utc)
-            
-            elif len(grupos) == 4:
-                # Formato con día de la semana
-                if match.re.pattern == r'(\w+),\s+(\d{1,2})\s+(\w+)\s+(\d{4})':
-                    dia = int(grupos[1])
-                    mes_texto = grupos[2].lower()
-                    año = int(grupos[3])
-                    
-                    if mes_texto in self.meses:
-                        return datetime(año, self.meses[mes_texto], dia, tzinfo=timezone.utc)
-            
-            elif len(grupos) == 6:
-                # Formato ISO completo
-                if match.re.pattern == r'(\d{4})-(\d{2})-(\d{2})T(\d{2}):(\d{2}):(\d{2})':
-                    año, mes, dia = int(grupos[0]), int(grupos[1]), int(grupos[2])
-                    hora, minuto, segundo = int(grupos[3]), int(grupos[4]), int(grupos[5])
-                    return datetime(año, mes, dia, hora, minuto, segundo, tzinfo=timezone.utc)
-        
-        except (ValueError, IndexError) as e:
-            print(f"⚠️ Error parseando fecha: {e}")
-            return None
-        
-        return None
-    
-    def _parse_datetime_string(self, datetime_str: str) -> Optional[datetime]:
-        """Parsear string de datetime ISO"""
-        try:
-            # Intentar parsear como ISO
-            return datetime.fromisoformat(datetime_str.replace('Z', '+00:00'))
-        except ValueError:
-            try:
-                # Intentar otros formatos comunes
-                for formato in [
-                    '%Y-%m-%d %H:%M:%S',
-                    '%Y-%m-%d %H:%M:%S%z',
-                    '%Y-%m-%dT%H:%M:%S',
-                    '%Y-%m-%dT%H:%M:%SZ',
-                    '%d/%m/%Y %H:%M:%S',
-                    '%d-%m-%Y %H:%M:%S'
-                ]:
-                    try:
-                        return datetime.strptime(datetime_str, formato)
-                    except ValueError:
-                        continue
-            except Exception:
-                pass
-        
-        return None
-    
-    def _parse_date_string(self, date_str: str) -> Optional[datetime]:
-        """Parsear string de fecha usando patrones"""
-        for patron in self.patrones:
-            match = re.search(patron, date_str, re.IGNORECASE)
-            if match:
-                fecha = self._parse_match(match)
-                if fecha:
-                    return fecha
+        return fecha_en_url(url)
+
+    def _extract_from_main_content(self, soup: BeautifulSoup, texto: str = None) -> Optional[datetime]:
+        """Extraer fecha del bloque principal: primero sus elementos de fecha, luego su texto"""
+        bloque = extractor_contenido.elemento(soup)
+        if bloque is not None:
+            fecha = self._extract_from_date_elements(bloque)
+            if fecha:
+                return fecha
+        if texto is None:
+            texto = extractor_contenido.extraer(soup)
+        return parsear_fecha(texto)
+
+    def _extract_from_page(self, soup: BeautifulSoup) -> Optional[datetime]:
+        """Último recurso: elementos de fecha y texto de la página completa (barras laterales incluidas)"""
+        return self._extract_from_date_elements(soup) or parsear_fecha(soup.get_text(' '))
+
+    def _extract_from_date_elements(self, elemento) -> Optional[datetime]:
+        """Extraer fecha de elementos específicos de fecha, en orden de documento"""
+        for fecha_elem in elemento.select(ELEMENTOS_FECHA):
+            fecha = parsear_fecha(fecha_elem.get_text(' ', strip=True))
+            if fecha:
+                return fecha
         return None
 
+    def _contar(self, estrategia: str):
+        with self._lock:
+            self.estadisticas[estrategia] += 1
+
+    def get_estadisticas(self) -> dict:
+        """Páginas resueltas por cada estrategia"""
+        with self._lock:
+            return dict(self.estadisticas)
+
+    def reset_estadisticas(self):
+        with self._lock:
+            for estrategia in self.estadisticas:
+                self.estadisticas[estrategia] = 0
+
 # Instancia global del extractor
-date_extractor = UniversalDateExtractor() 
\ No newline at end of file
+date_extractor = UniversalDateExtractor()
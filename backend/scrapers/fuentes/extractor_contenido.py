@@ -0,0 +1,215 @@
+#!/usr/bin/env python3
+"""
+Extractor del contenido principal de una página (al estilo Readability)
+En lugar de probar una cascada de selectores CSS, recorre el DOM una sola vez
+acumulando por elemento la cantidad de texto, de texto en enlaces y de comas.
+Los bloques con texto propio (párrafos, o divs con texto directo) puntúan a sus
+ancestros, cada vez menos a medida que se alejan; gana el contenedor con mayor
+puntaje corregido por densidad de enlaces, junto con los hermanos que también
+puntúan alto. El resultado se memoriza por documento.
+"""
+
+import re
+import threading
+from collections import OrderedDict
+from typing import Dict, Optional
+
+from bs4 import BeautifulSoup, NavigableString, Tag
+
+# Elementos que nunca forman parte del contenido
+EXCLUIDAS = frozenset({
+    'script', 'style', 'noscript', 'template', 'iframe', 'svg', 'button', 'select',
+    'nav', 'header', 'footer', 'aside', 'form', 'menu'
+})
+
+# Elementos de bloque: el texto directo de los demás (span, strong, a...) se suma a su bloque
+BLOQUES = frozenset({
+    'address', 'article', 'blockquote', 'body', 'center', 'dd', 'div', 'dl', 'dt', 'fieldset',
+    'figure', 'h1', 'h2', 'h3', 'h4', 'h5', 'h6', 'html', 'li', 'main', 'ol', 'p', 'pre',
+    'section', 'table', 'tbody', 'td', 'th', 'tr', 'ul'
+})
+
+PESO_ETIQUETA = {
+    'article': 10, 'main': 5, 'div': 5, 'section': 3, 'pre': 3, 'td': 3, 'blockquote': 3,
+    'address': -3, 'ol': -3, 'ul': -3, 'dl': -3, 'dd': -3, 'dt': -3, 'li': -3,
+    'h1': -5, 'h2': -5, 'h3': -5, 'h4': -5, 'h5': -5, 'h6': -5, 'th': -5
+}
+
+CLASE_POSITIVA = re.compile(
+    r'article|body|content|entry|main|noticia|post|text|cuerpo|story|detalle', re.IGNORECASE
+)
+CLASE_NEGATIVA = re.compile(
+    r'comment|contact|foot|menu|masthead|meta|nav|related|relacionad|share|compartir|social|redes|'
+    r'sidebar|sponsor|widget|banner|breadcrumb|paginacion|pagination', re.IGNORECASE
+)
+
+# Texto directo mínimo para que un bloque cuente como párrafo
+MINIMO_PARRAFO = 25
+
+# Ancestros de cada párrafo que reciben parte de su puntaje
+NIVELES_ANCESTROS = 5
+
+def recorrer(elemento):
+    """Nodos del elemento en orden de documento, sin entrar en los subárboles excluidos"""
+    pendientes = [elemento]
+    while pendientes:
+        nodo = pendientes.pop()
+        if isinstance(nodo, Tag):
+            if nodo.name in EXCLUIDAS:
+                continue
+            pendientes.extend(reversed(nodo.contents))
+        yield nodo
+
+def texto_visible(elemento) -> str:
+    """Texto del elemento sin los subárboles excluidos, con espacios normalizados"""
+    if elemento is None:
+        return ""
+    partes = [
+        nodo.strip() for nodo in recorrer(elemento)
+        if type(nodo) is NavigableString and not nodo.isspace()
+    ]
+    return re.sub(r'\s+', ' ', ' '.join(partes)).strip()
+
+def peso_inicial(elemento: Tag) -> float:
+    """Puntaje de partida de un candidato según su etiqueta, clase e id"""
+    peso = PESO_ETIQUETA.get(elemento.name, 0)
+    for valor in (' '.join(elemento.get('class') or ()), elemento.get('id') or ''):
+        if valor:
+            if CLASE_POSITIVA.search(valor):
+                peso += 25
+            if CLASE_NEGATIVA.search(valor):
+                peso -= 25
+    return peso
+
+class ExtractorContenido:
+    """Elige el bloque principal de un documento y memoriza el resultado por documento"""
+
+    def __init__(self, tamano_cache: int = 16):
+        self.tamano_cache = tamano_cache
+        # id(soup) -> (soup, elemento, texto); se guarda el soup para que el id no se reutilice
+        self._cache = OrderedDict()
+        self._lock = threading.Lock()
+        self.estadisticas = {'documentos': 0, 'cache': 0}
+
+    def _puntuar(self, soup):
+        """Recorrer el DOM una vez; devuelve el mejor candidato y los bloques que forman el contenido"""
+        # [texto, texto en enlaces, texto directo, comas] por elemento
+        medidas: Dict[int, list] = {}
+        parrafos = []
+
+        # En orden inverso al documento cada hijo se procesa antes que su padre
+        nodos = list(recorrer(soup))
+        for nodo in reversed(nodos[1:]):
+            if isinstance(nodo, Tag):
+                medida = medidas.get(id(nodo))
+                if medida is None:
+                    continue
+                if nodo.name == 'a':
+                    medida[1] = medida[0]
+                if nodo.name in BLOQUES and medida[2] >= MINIMO_PARRAFO:
+                    parrafos.append((nodo, medida))
+
+                padre = medidas.setdefault(id(nodo.parent), [0, 0, 0, 0])
+                padre[0] += medida[0]
+                padre[1] += medida[1]
+                # El texto de los enlaces no cuenta como texto propio del bloque
+                if nodo.name not in BLOQUES and nodo.name != 'a':
+                    padre[2] += medida[2]
+                    padre[3] += medida[3]
+            elif type(nodo) is NavigableString:
+                largo = len(nodo.strip())
+                if largo:
+                    padre = medidas.setdefault(id(nodo.parent), [0, 0, 0, 0])
+                    padre[0] += largo
+                    padre[2] += largo
+                    padre[3] += nodo.count(',')
+
+        candidatos = {}
+        for parrafo, medida in parrafos:
+            puntaje = 1 + medida[3] + min(medida[2] // 100, 3)
+            ancestro = parrafo.parent
+            for nivel in range(NIVELES_ANCESTROS):
+                if not isinstance(ancestro, Tag) or isinstance(ancestro, BeautifulSoup):
+                    break
+                candidato = candidatos.get(id(ancestro))
+                if candidato is None:
+                    candidato = candidatos[id(ancestro)] = [ancestro, peso_inicial(ancestro)]
+                # Padre completo, abuelo la mitad y desde ahí un tercio por nivel
+                candidato[1] += puntaje / (1 if nivel == 0 else 2 if nivel == 1 else nivel * 3)
+                ancestro = ancestro.parent
+
+        puntajes = {}
+        for clave, (elemento, puntaje) in candidatos.items():
+            texto, enlaces = medidas.get(clave, (0, 0))[:2]
+            puntajes[clave] = puntaje * (1 - (enlaces / texto if texto else 0))
+        if not puntajes:
+            return None, []
+
+        mejor = candidatos[max(puntajes, key=puntajes.get)][0]
+        return mejor, self._hermanos(mejor, puntajes, medidas)
+
+    @staticmethod
+    def _hermanos(mejor: Tag, puntajes: Dict[int, float], medidas: Dict[int, list]) -> list:
+        """El mejor candidato y sus hermanos con puntaje suficiente (cuerpos repartidos en varios bloques)"""
+        padre = mejor.parent
+        if not isinstance(padre, Tag) or isinstance(padre, BeautifulSoup):
+            return [mejor]
+
+        umbral = max(10, puntajes[id(mejor)] * 0.2)
+        incluidos = []
+        for hermano in padre.children:
+            if not isinstance(hermano, Tag) or hermano.name in EXCLUIDAS:
+                continue
+            if hermano is mejor or puntajes.get(id(hermano), float('-inf')) >= umbral:
+                incluidos.append(hermano)
+            elif hermano.name == 'p':
+                texto, enlaces = medidas.get(id(hermano), (0, 0))[:2]
+                if texto > 80 and enlaces < 0.25 * texto:
+                    incluidos.append(hermano)
+        return incluidos
+
+    def elemento(self, soup) -> Optional[Tag]:
+        """Bloque principal del documento (su padre si el contenido abarca varios hermanos, o el body si no hay párrafos)"""
+        return self._extraer(soup)[0]
+
+    def extraer(self, soup) -> str:
+        """Texto del bloque principal del documento"""
+        return self._extraer(soup)[1]
+
+    def _extraer(self, soup):
+        if soup is None:
+            return None, ""
+
+        with self._lock:
+            memorizado = self._cache.get(id(soup))
+            if memorizado is not None and memorizado[0] is soup:
+                self._cache.move_to_end(id(soup))
+                self.estadisticas['cache'] += 1
+                return memorizado[1:]
+
+        elemento, bloques = self._puntuar(soup)
+        if elemento is None:
+            elemento = soup.find('body') or soup
+            bloques = [elemento]
+        elif len(bloques) > 1:
+            elemento = elemento.parent
+        texto = ' '.join(filter(None, (texto_visible(bloque) for bloque in bloques)))
+
+        with self._lock:
+            self.estadisticas['documentos'] += 1
+            self._cache[id(soup)] = (soup, elemento, texto)
+            while len(self._cache) > self.tamano_cache:
+                self._cache.popitem(last=False)
+        return elemento, texto
+
+    def get_estadisticas(self) -> Dict[str, int]:
+        with self._lock:
+            return dict(self.estadisticas)
+
+    def reset_estadisticas(self):
+        with self._lock:
+            for clave in self.estadisticas:
+                self.estadisticas[clave] = 0
+
+# Instancia global para usar en scrapers
+extractor_contenido = ExtractorContenido()
@@ -0,0 +1,135 @@
+#!/usr/bin/env python3
+"""
+Parseo de fechas común a todos los scrapers
+Una sola expresión regular precompilada reconoce los formatos que publican
+las fuentes (ISO 8601, YYYY/MM/DD, DD/MM/YYYY con hora opcional, "DD de mes de YYYY",
+"mes DD, YYYY") y devuelve la primera fecha válida del texto en una sola
+pasada. Los textos cortos (atributos datetime, elementos .fecha, títulos de
+listados) se repiten mucho entre páginas y ejecuciones, así que el resultado
+se memoriza con un LRU. Las fechas sin zona horaria se devuelven en UTC.
+"""
+
+import re
+from datetime import datetime, timedelta, timezone
+from functools import lru_cache
+from typing import Optional
+
+MESES = {
+    'enero': 1, 'febrero': 2, 'marzo': 3, 'abril': 4, 'mayo': 5, 'junio': 6, 'julio': 7,
+    'agosto': 8, 'septiembre': 9, 'setiembre': 9, 'octubre': 10, 'noviembre': 11, 'diciembre': 12,
+    'ene': 1, 'feb': 2, 'mar': 3, 'abr': 4, 'may': 5, 'jun': 6, 'jul': 7, 'ago': 8,
+    'sep': 9, 'sept': 9, 'oct': 10, 'nov': 11, 'dic': 12,
+    'january': 1, 'february': 2, 'march': 3, 'april': 4, 'june': 6, 'july': 7, 'august': 8,
+    'september': 9, 'october': 10, 'november': 11, 'december': 12,
+    'jan': 1, 'apr': 4, 'aug': 8, 'dec': 12
+}
+
+_MES = '|'.join(sorted(MESES, key=len, reverse=True))
+
+# Un grupo con nombre por formato; en cada posición se prueban en este orden
+FECHA = re.compile(
+    # 2025-05-12, 2025-05-12T10:30:00-04:00, 2025-05-12 10:30, 2025/05/12
+    r'(?<!\d)(?P<iso_a>\d{4})(?P<iso_sep>[-/])(?P<iso_m>\d{1,2})(?P=iso_sep)(?P<iso_d>\d{1,2})(?!\d)'
+    r'(?:[T ](?P<iso_h>\d{1,2}):(?P<iso_mi>\d{2})(?::(?P<iso_s>\d{2})(?:\.\d+)?)?'
+    r'\s*(?P<iso_z>Z|[+-]\d{2}:?\d{2})?)?'
+    # 12/05/2025, 12-05-2025, 12.05.25, 12/05/2025 10:30
+    r'|(?<!\d)(?P<num_d>\d{1,2})(?P<sep>[/.\-])(?P<num_m>\d{1,2})(?P=sep)(?P<num_a>\d{4}|\d{2})(?!\d)'
+    r'(?:,?\s+(?:a\s+las\s+)?(?P<num_h>\d{1,2}):(?P<num_mi>\d{2})(?::(?P<num_s>\d{2}))?)?'
+    # 12 de mayo de 2025, 24 de noviembre del 2023, 12 mayo, 2025, 12-may-2025
+    rf'|(?<!\d)(?P<es_d>\d{{1,2}})(?:\s+de\s+|\s+|-)(?P<es_m>{_MES})\b\.?(?:,?\s+del?\s+|,?\s+|-)(?P<es_a>\d{{4}})(?!\d)'
+    # May 12, 2025, Aug. 1 2025
+    rf'|\b(?P<en_m>{_MES})\b\.?\s+(?P<en_d>\d{{1,2}}),?\s+(?P<en_a>\d{{4}})(?!\d)',
+    re.IGNORECASE
+)
+
+# Fecha en la ruta de una URL (/2025/08/01/)
+FECHA_URL = re.compile(r'/(\d{4})/(\d{1,2})/(\d{1,2})(?:/|$)')
+
+# Textos más largos no se memorizan: son páginas completas, que no se repiten
+LARGO_MEMO = 200
+
+def _zona(texto: Optional[str]):
+    """Zona horaria de un sufijo ISO (Z, +00:00, -0400)"""
+    if not texto or texto.upper() == 'Z':
+        return timezone.utc
+    signo = -1 if texto[0] == '-' else 1
+    digitos = texto[1:].replace(':', '')
+    return timezone(signo * timedelta(hours=int(digitos[:2]), minutes=int(digitos[2:])))
+
+def _desde_match(match) -> Optional[datetime]:
+    """datetime de un match de FECHA, o None si la fecha no existe (31/02)"""
+    try:
+        año, mes, dia = match.group('iso_a', 'iso_m', 'iso_d')
+        if año:
+            hora, minuto, segundo, zona = match.group('iso_h', 'iso_mi', 'iso_s', 'iso_z')
+            return datetime(int(año), int(mes), int(dia), int(hora or 0), int(minuto or 0), int(segundo or 0),
+                            tzinfo=_zona(zona))
+
+        dia, mes, año = match.group('num_d', 'num_m', 'num_a')
+        if año:
+            hora, minuto, segundo = match.group('num_h', 'num_mi', 'num_s')
+            año_numero = int(año)
+            if len(año) == 2:
+                año_numero += 2000 if año_numero < 50 else 1900
+            return datetime(año_numero, int(mes), int(dia), int(hora or 0), int(minuto or 0), int(segundo or 0),
+                            tzinfo=timezone.utc)
+
+        dia, mes, año = match.group('es_d', 'es_m', 'es_a')
+        if not año:
+            mes, dia, año = match.group('en_m', 'en_d', 'en_a')
+        return datetime(int(año), MESES[mes.lower()], int(dia), tzinfo=timezone.utc)
+    except ValueError:
+        return None
+
+def _parsear(texto: str) -> Optional[datetime]:
+    # Camino rápido: DD/MM/YYYY exacto, la forma más común en las fuentes
+    if len(texto) == 10 and texto[2] == '/' and texto[5] == '/':
+        try:
+            return datetime(int(texto[6:]), int(texto[3:5]), int(texto[:2]), tzinfo=timezone.utc)
+        except ValueError:
+            pass
+
+    # Camino rápido: atributos datetime y meta tags en ISO 8601
+    if len(texto) >= 10 and texto[4] == '-' and texto[:4].isdigit():
+        try:
+            fecha = datetime.fromisoformat(texto.strip().replace('Z', '+00:00'))
+            return fecha if fecha.tzinfo else fecha.replace(tzinfo=timezone.utc)
+        except ValueError:
+            pass
+
+    for match in FECHA.finditer(texto):
+        fecha = _desde_match(match)
+        if fecha:
+            return fecha
+    return None
+
+_parsear_memo = lru_cache(maxsize=4096)(_parsear)
+
+def parsear_fecha(texto: Optional[str]) -> Optional[datetime]:
+    """Primera fecha válida de un texto (None si no hay)"""
+    if not texto:
+        return None
+    if len(texto) > LARGO_MEMO:
+        return _parsear(texto)
+    return _parsear_memo(texto)
+
+def fecha_en_url(url: Optional[str]) -> Optional[datetime]:
+    """Fecha de la ruta (/2025/08/01/) o, si no hay, de cualquier formato en la URL"""
+    if not url:
+        return None
+    match = FECHA_URL.search(url)
+    if match:
+        try:
+            return datetime(int(match.group(1)), int(match.group(2)), int(match.group(3)), tzinfo=timezone.utc)
+        except ValueError:
+            pass
+    return parsear_fecha(url)
+
+def normalizar_fecha(texto: Optional[str]) -> datetime:
+    """Fecha de un texto o, si no se reconoce, la fecha actual"""
+    return parsear_fecha(texto) or datetime.now(timezone.utc)
+
+def get_estadisticas() -> dict:
+    """Aciertos y tamaño del memo de fechas"""
+    info = _parsear_memo.cache_info()
+    return {'aciertos': info.hits, 'fallos': info.misses, 'memo': info.currsize}
@@ -3,21 +3,21 @@
 Scraper corregido para INAPI basado en la estructura real
 """
 
-import requests
-from bs4 import BeautifulSoup
-import re
 from datetime import datetime
 import hashlib
-from typing import List, Optional
+from typing import Iterator, List, Optional
 from ..data_schema import NoticiaEstandarizada, Categoria, Jurisdiccion, TipoDocumento
+from ..limitador_peticiones import iterar_en_paralelo
+from ..contexto_ejecucion import ContextoEjecucion, contexto_por_defecto
+from ..parseo import parsear, parsear_listado
 import hashlib
 
 class INAPIScraper:
-    def __init__(self, openai_api_key: str = None):
+    def __init__(self, openai_api_key: str = None, contexto: ContextoEjecucion = None):
         self.base_url = "https://www.inapi.cl"
         self.noticias_url = "https://www.inapi.cl/sala-de-prensa/noticias"
-        self.session = requests.Session()
-        self.session.headers.update({
+        self.contexto = contexto or contexto_por_defecto()
+        self.session = self.contexto.nueva_sesion({
             'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36'
         })
         self.openai_api_key = openai_api_key
@@ -25,13 +25,16 @@ class INAPIScraper:
     def extraer_noticias_lista(self):
         """Extraer lista de noticias de la página principal"""
         try:
-            response = self.session.get(self.noticias_url, timeout=10)
+            response = self.session.get_condicional(self.noticias_url, timeout=10)
+            if response.status_code == 304:
+                print(f"ℹ️ Listado sin cambios desde la última ejecución (304)")
+                return []
             if response.status_code != 200:
                 print(f"❌ Error accediendo a {self.noticias_url}: {response.status_code}")
                 return []
             
-            soup = BeautifulSoup(response.text, 'html.parser')
-            noticias = []
+            soup = parsear_listado(response.text, self.base_url)
+            enlaces_noticias = []
             
             # Buscar enlaces que contengan 'detalle-noticia'
             enlaces = soup.find_all('a', href=True)
@@ -50,28 +53,35 @@ class INAPIScraper:
                     else:
                         url_completa = f"{self.base_url}/{href}"
                     
-                    # Extraer información básica
-                    noticia = NoticiaEstandarizada(
-                        titulo=texto,
-                        cuerpo_completo=texto,  # Por ahora usamos el título como contenido
-                        fecha_publicacion=datetime.now().replace(tzinfo=None),
-                        fuente='inapi',
-                        url_origen=url_completa,
-                        categoria=Categoria.ORGANISMO,
-                        jurisdiccion=Jurisdiccion.NACIONAL,
-                        tipo_documento=TipoDocumento.NOTICIA
-                    )
-                    
-                    # Extraer contenido completo
-                    contenido_completo = self.extraer_contenido_noticia(url_completa)
-                    if contenido_completo:
-                        # Usar el contenido completo en lugar del básico
-                        noticias.append(contenido_completo)
-                    else:
-                        # Si no se puede extraer contenido completo, usar el básico
-                        noticias.append(noticia)
+                    enlaces_noticias.append((texto, url_completa))
             
-            return noticias
+            def obtener(enlace_noticia):
+                texto, url_completa = enlace_noticia
+                
+                # Extraer contenido completo
+                contenido_completo = self.extraer_contenido_noticia(url_completa)
+                if contenido_completo:
+                    # Usar el contenido completo en lugar del básico
+                    return contenido_completo
+                
+                # Si no se puede extraer contenido completo, usar el básico
+                return NoticiaEstandarizada(
+                    titulo=texto,
+                    cuerpo_completo=texto,  # Por ahora usamos el título como contenido
+                    fecha_publicacion=datetime.now().replace(tzinfo=None),
+                    fuente='inapi',
+                    url_origen=url_completa,
+                    categoria=Categoria.ORGANISMO,
+                    jurisdiccion=Jurisdiccion.NACIONAL,
+                    tipo_documento=TipoDocumento.NOTICIA
+                )
+            
+            # Cortar en la marca de agua, omitir las ya almacenadas y obtener detalles
+            # en paralelo, según el límite del host
+            urls = self.contexto.marcas_agua.recortar(self.base_url, [url for _, url in enlaces_noticias])
+            urls_nuevas = set(self.contexto.indice_urls.filtrar_nuevas(urls))
+            enlaces_noticias = [enlace for enlace in enlaces_noticias if enlace[1] in urls_nuevas]
+            return iterar_en_paralelo(enlaces_noticias, obtener, self.base_url, sesion=self.session)
             
         except Exception as e:
             print(f"❌ Error extrayendo lista de noticias: {e}")
@@ -84,7 +94,7 @@ class INAPIScraper:
             if response.status_code != 200:
                 return None
             
-            soup = BeautifulSoup(response.text, 'html.parser')
+            soup = parsear(response.text)
             
             # Extraer título
             titulo = soup.find('h1') or soup.find('title')
@@ -145,53 +155,11 @@ class INAPIScraper:
             return None
     
     def extraer_fecha(self, soup):
-        """Extraer fecha de la noticia"""
+        """Extraer fecha de la noticia ("31 de julio de 2025", "31/07/2025", "Jul. 31, 2025"...)"""
         try:
-            # Buscar fecha en diferentes formatos
-            fecha_patterns = [
-                r'(\w+\s+\d{1,2}\s+\w+\s+de\s+2025)',
-                r'(\d{1,2}/\d{1,2}/2025)',
-                r'(\d{4}-\d{2}-\d{2})',
-                r'(\w+\.\s+\d{1,2},\s+2025)'
-            ]
-            
-            texto_completo = soup.get_text()
-            
-            for pattern in fecha_patterns:
-                match = re.search(pattern, texto_completo)
-                if match:
-                    fecha_str = match.group(1)
-                    
-                    # Intentar parsear diferentes formatos
-                    try:
-                        # Formato: "31 de julio de 2025"
-                        if ' de ' in fecha_str:
-                            meses = {
-                                'enero': 1, 'febrero': 2, 'marzo': 3, 'abril': 4,
-                                'mayo': 5, 'junio': 6, 'julio': 7, 'agosto': 8,
-                                'septiembre': 9, 'octubre': 10, 'noviembre': 11, 'diciembre': 12
-                            }
-                            partes = fecha_str.split(' de ')
-                            if len(partes) == 3:
-                                dia = int(partes[0])
-                                mes = meses.get(partes[1].lower(), 1)
-                                año = int(partes[2])
-                                return datetime(año, mes, dia).replace(tzinfo=None)
-                        
-                        # Formato: "31/07/2025"
-                        elif '/' in fecha_str:
-                            return datetime.strptime(fecha_str, '%d/%m/%Y').replace(tzinfo=None)
-                        
-                        # Formato: "2025-07-31"
-                        elif '-' in fecha_str:
-                            return datetime.strptime(fecha_str, '%Y-%m-%d').replace(tzinfo=None)
-                        
-                        # Formato: "Jul. 31, 2025"
-                        elif ',' in fecha_str:
-                            return datetime.strptime(fecha_str, '%b. %d, %Y').replace(tzinfo=None)
-                            
-                    except ValueError:
-                        pass
+            fecha = self.contexto.date_extractor.extract_date_from_html(soup)
+            if fecha:
+                return fecha.replace(tzinfo=None)
             
             # Si no se encuentra, usar fecha actual
             return datetime.now().replace(tzinfo=None)
@@ -202,14 +170,18 @@ class INAPIScraper:
     
     def scrape(self):
         """Método principal de scraping"""
-        print("🔍 Iniciando scraping del INAPI (versión corregida)...")
-        noticias = self.extraer_noticias_lista()
+        noticias = list(self.iter_noticias())
         print(f"✅ Se extrajeron {len(noticias)} noticias del INAPI")
         return noticias
     
     def scrape_noticias_recientes(self, max_noticias: int = 10) -> List[NoticiaEstandarizada]:
         """Método compatible con el sistema principal"""
         return self.scrape()
+    
+    def iter_noticias(self, max_noticias: int = 10) -> Iterator[NoticiaEstandarizada]:
+        """Entregar las noticias a medida que se descargan (el listado se lee completo antes)"""
+        print("🔍 Iniciando scraping del INAPI (versión corregida)...")
+        return iter(self.extraer_noticias_lista())
 
 # Uso del scraper
 if __name__ == "__main__":
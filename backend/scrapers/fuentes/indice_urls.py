@@ -0,0 +1,188 @@
+#!/usr/bin/env python3
+"""
+Índice local de URLs ya almacenadas
+Permite a los scrapers saltarse la descarga de detalles que ya están en Supabase
+"""
+
+import os
+import sqlite3
+import threading
+import time
+from typing import Dict, Iterable, List, Optional
+
+from .config import SCRAPING_CONFIG
+
+class IndiceURLs:
+    """Índice SQLite de url_origen y huellas de contenido conocidas"""
+
+    def __init__(self, ruta: str = None):
+        self.ruta = ruta or os.path.join(SCRAPING_CONFIG['directorio_estado'], 'indice_urls.sqlite3')
+        # Con NOTICIAS_REFRESCAR=1 se vuelven a descargar también las URLs conocidas
+        self.omitir_conocidas = os.getenv('NOTICIAS_REFRESCAR', '0') != '1'
+        self._conexion = None
+        self._lock = threading.Lock()
+        self.estadisticas = {'consultas': 0, 'omitidas': 0}
+
+    def _conectar(self) -> sqlite3.Connection:
+        """Abrir la base local la primera vez que se usa"""
+        if self._conexion is None:
+            os.makedirs(os.path.dirname(self.ruta), exist_ok=True)
+            conexion = sqlite3.connect(self.ruta, check_same_thread=False)
+            conexion.execute("""
+                CREATE TABLE IF NOT EXISTS urls (
+                    url TEXT PRIMARY KEY,
+                    fuente TEXT,
+                    hash_contenido TEXT,
+                    fecha_publicacion TEXT,
+                    registrado REAL
+                )
+            """)
+            conexion.execute("CREATE TABLE IF NOT EXISTS meta (clave TEXT PRIMARY KEY, valor TEXT)")
+            conexion.commit()
+            self._conexion = conexion
+        return self._conexion
+
+    # ========================================
+    # CONSULTAS
+    # ========================================
+
+    def contiene(self, url: str) -> bool:
+        """Verificar si una URL ya está almacenada"""
+        with self._lock:
+            fila = self._conectar().execute("SELECT 1 FROM urls WHERE url = ?", (url,)).fetchone()
+        return fila is not None
+
+    def get_hash(self, url: str) -> Optional[str]:
+        """Obtener la huella de contenido registrada para una URL"""
+        with self._lock:
+            fila = self._conectar().execute("SELECT hash_contenido FROM urls WHERE url = ?", (url,)).fetchone()
+        return fila[0] if fila else None
+
+    def filtrar_nuevas(self, items: List, clave: str = 'url') -> List:
+        """Descartar los items cuya URL ya está almacenada
+
+        Los items pueden ser diccionarios (se usa `clave`) o URLs directamente.
+        """
+        if not items or not self.omitir_conocidas:
+            return items
+
+        urls = [item.get(clave) if isinstance(item, dict) else item for item in items]
+        conocidas = self.conocidas(urls)
+
+        nuevas = [item for item, url in zip(items, urls) if url not in conocidas]
+        self.estadisticas['consultas'] += len(items)
+        self.estadisticas['omitidas'] += len(items) - len(nuevas)
+        return nuevas
+
+    def conocidas(self, urls: List[str]) -> set:
+        """URLs de la lista presentes en el índice"""
+        conocidas = set()
+        urls = [url for url in urls if url]
+        with self._lock:
+            conexion = self._conectar()
+            for i in range(0, len(urls), 500):
+                lote = urls[i:i + 500]
+                marcadores = ','.join('?' * len(lote))
+                conocidas.update(
+                    fila[0] for fila in conexion.execute(f"SELECT url FROM urls WHERE url IN ({marcadores})", lote)
+                )
+        return conocidas
+
+    def publicaciones_por_fuente(self, desde: str, hasta: str) -> Dict[str, Dict]:
+        """Noticias publicadas entre dos fechas (YYYY-MM-DD) y primera fecha registrada, por fuente
+
+        Solo se consideran las filas cuya fecha_publicacion empieza con una fecha ISO.
+        """
+        with self._lock:
+            filas = self._conectar().execute("""
+                SELECT LOWER(fuente), SUM(substr(fecha_publicacion, 1, 10) BETWEEN ? AND ?),
+                       MIN(substr(fecha_publicacion, 1, 10))
+                FROM urls
+                WHERE fuente IS NOT NULL
+                  AND fecha_publicacion GLOB '[12][0-9][0-9][0-9]-[01][0-9]-[0-3][0-9]*'
+                GROUP BY LOWER(fuente)
+            """, (desde, hasta)).fetchall()
+        return {fuente: {'publicadas': publicadas, 'primera': primera} for fuente, publicadas, primera in filas}
+
+    def total(self) -> int:
+        """Cantidad de URLs registradas"""
+        with self._lock:
+            return self._conectar().execute("SELECT COUNT(*) FROM urls").fetchone()[0]
+
+    # ========================================
+    # ACTUALIZACIÓN
+    # ========================================
+
+    def registrar(self, url: str, fuente: str = None, hash_contenido: str = None, fecha_publicacion: str = None):
+        """Registrar una URL almacenada"""
+        self.registrar_lote([{
+            'url_origen': url,
+            'fuente': fuente,
+            'hash_contenido': hash_contenido,
+            'fecha_publicacion': fecha_publicacion
+        }])
+
+    def registrar_lote(self, filas: Iterable[Dict]):
+        """Registrar varias filas con url_origen, fuente, hash_contenido y fecha_publicacion"""
+        ahora = time.time()
+        valores = [
+            (
+                fila['url_origen'],
+                fila.get('fuente'),
+                fila.get('hash_contenido'),
+                str(fila['fecha_publicacion']) if fila.get('fecha_publicacion') else None,
+                ahora
+            )
+            for fila in filas if fila.get('url_origen')
+        ]
+        if not valores:
+            return
+
+        with self._lock:
+            conexion = self._conectar()
+            conexion.executemany("""
+                INSERT INTO urls (url, fuente, hash_contenido, fecha_publicacion, registrado)
+                VALUES (?, ?, ?, ?, ?)
+                ON CONFLICT(url) DO UPDATE SET
+                    fuente = COALESCE(excluded.fuente, urls.fuente),
+                    hash_contenido = COALESCE(excluded.hash_contenido, urls.hash_contenido),
+                    fecha_publicacion = COALESCE(excluded.fecha_publicacion, urls.fecha_publicacion),
+                    registrado = excluded.registrado
+            """, valores)
+            conexion.commit()
+
+    def calentar(self, supabase) -> int:
+        """Sincronizar con Supabase las URLs creadas desde la última sincronización"""
+        with self._lock:
+            fila = self._conectar().execute("SELECT valor FROM meta WHERE clave = 'sincronizado_hasta'").fetchone()
+        desde = fila[0] if fila else None
+
+        filas = supabase.get_urls_conocidas(desde=desde)
+        if filas is None:
+            print("⚠️  No se pudo sincronizar el índice local de URLs")
+            return 0
+
+        self.registrar_lote(filas)
+
+        # Sin created_at en ninguna fila, la marca de sincronización queda donde estaba
+        hasta = max((fila['created_at'] for fila in filas if fila.get('created_at')), default=None)
+        if hasta is not None:
+            with self._lock:
+                conexion = self._conectar()
+                conexion.execute(
+                    "INSERT OR REPLACE INTO meta (clave, valor) VALUES ('sincronizado_hasta', ?)", (hasta,)
+                )
+                conexion.commit()
+
+        print(f"🗂️  Índice local de URLs: {len(filas)} nuevas desde Supabase, {self.total()} en total")
+        return len(filas)
+
+    def cerrar(self):
+        """Cerrar la conexión local"""
+        with self._lock:
+            if self._conexion is not None:
+                self._conexion.close()
+                self._conexion = None
+
+# Instancia global
+indice_urls = IndiceURLs()
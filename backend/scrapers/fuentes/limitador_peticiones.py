@@ -0,0 +1,444 @@
+#!/usr/bin/env python3
+"""
+Limitador de peticiones por host para los scrapers de noticias jurídicas
+Combina un token bucket con un máximo de peticiones simultáneas y retrocede
+automáticamente ante 429/503, cabeceras Retry-After y latencias crecientes
+"""
+
+import statistics
+import time
+import threading
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from email.utils import parsedate_to_datetime
+from datetime import datetime, timezone
+from typing import Callable, Dict, Iterator, List, Optional
+from urllib.parse import urlparse
+
+import requests
+from urllib3.exceptions import NewConnectionError
+
+from .config import FUENTES_CONFIG, SCRAPING_CONFIG
+from .validadores_http import CacheValidadores, validadores_http
+from .cache_respuestas import CacheRespuestas, cache_respuestas
+
+# Estados HTTP que indican que el servidor pide bajar el ritmo
+ESTADOS_SOBRECARGA = (429, 503)
+
+# Métodos que la sesión reintenta ante errores de conexión y respuestas 5xx
+METODOS_REINTENTABLES = ('GET', 'HEAD')
+
+class PlazoAgotado(requests.exceptions.Timeout):
+    """Petición posterior al vencimiento de la franja de tiempo de la fuente"""
+
+class FuenteCaida(requests.RequestException):
+    """Petición omitida porque el sitio acumula demasiados fallos seguidos en la visita"""
+
+def normalizar_host(url: str) -> str:
+    """Obtener host en minúsculas, sin puerto ni prefijo www."""
+    host = (urlparse(url).hostname or '').lower()
+    return host[4:] if host.startswith('www.') else host
+
+class LimitadorHost:
+    """Token bucket con límite de concurrencia y retroceso adaptativo para un host"""
+
+    def __init__(self, host: str, por_segundo: float = 1.0, rafaga: int = 1,
+                 max_concurrentes: int = 1, por_segundo_minimo: float = 0.05):
+        self.host = host
+        self.tasa_objetivo = float(por_segundo)
+        self.tasa = float(por_segundo)
+        self.tasa_minima = min(float(por_segundo_minimo), self.tasa_objetivo)
+        self.capacidad = max(1, int(rafaga))
+        self.max_concurrentes = max(1, int(max_concurrentes))
+
+        self._tokens = float(self.capacidad)
+        self._ultima_recarga = time.monotonic()
+        self._bloqueado_hasta = 0.0
+        self._lock = threading.Lock()
+        self._semaforo = threading.BoundedSemaphore(self.max_concurrentes)
+
+        # Latencia: media lenta (referencia) y rápida (tendencia reciente)
+        self._latencia_base = None
+        self._latencia_reciente = None
+
+        self.estadisticas = {
+            'peticiones': 0,
+            'espera_total': 0.0,
+            'retrocesos': 0,
+            'errores': 0
+        }
+
+    def adquirir(self):
+        """Esperar turno: un hueco de concurrencia y un token disponible"""
+        inicio = time.monotonic()
+        self._semaforo.acquire()
+
+        while True:
+            with self._lock:
+                ahora = time.monotonic()
+                espera = self._bloqueado_hasta - ahora
+
+                if espera <= 0:
+                    self._recargar(ahora)
+                    if self._tokens >= 1:
+                        self._tokens -= 1
+                        self.estadisticas['peticiones'] += 1
+                        self.estadisticas['espera_total'] += ahora - inicio
+                        return
+                    espera = (1 - self._tokens) / self.tasa
+
+            time.sleep(espera)
+
+    def liberar(self, estado: Optional[int] = None, latencia: Optional[float] = None,
+                retry_after: Optional[str] = None, error: bool = False):
+        """Liberar el hueco de concurrencia y ajustar la tasa según la respuesta"""
+        try:
+            with self._lock:
+                ahora = time.monotonic()
+
+                if error or estado in ESTADOS_SOBRECARGA:
+                    self._retroceder(ahora, 0.5)
+                    self.estadisticas['errores'] += 1
+
+                    segundos = self._parse_retry_after(retry_after)
+                    pausa = segundos if segundos is not None else 1.0 / self.tasa
+                    self._bloqueado_hasta = max(self._bloqueado_hasta, ahora + pausa)
+
+                elif latencia is not None:
+                    self._registrar_latencia(latencia)
+
+                    if self._latencia_creciente():
+                        self._retroceder(ahora, 0.8)
+                    else:
+                        # Recuperación aditiva hacia la tasa configurada
+                        self._recargar(ahora)
+                        self.tasa = min(self.tasa_objetivo, self.tasa + self.tasa_objetivo * 0.1)
+        finally:
+            self._semaforo.release()
+
+    def _recargar(self, ahora: float):
+        """Agregar tokens según el tiempo transcurrido"""
+        transcurrido = ahora - self._ultima_recarga
+        self._ultima_recarga = ahora
+        self._tokens = min(self.capacidad, self._tokens + transcurrido * self.tasa)
+
+    def _retroceder(self, ahora: float, factor: float):
+        """Reducir la tasa de forma multiplicativa"""
+        self._recargar(ahora)
+        self.tasa = max(self.tasa_minima, self.tasa * factor)
+        self.estadisticas['retrocesos'] += 1
+
+    def _registrar_latencia(self, latencia: float):
+        """Actualizar medias móviles de latencia"""
+        if self._latencia_base is None:
+            self._latencia_base = latencia
+            self._latencia_reciente = latencia
+            return
+
+        self._latencia_base += 0.05 * (latencia - self._latencia_base)
+        self._latencia_reciente += 0.3 * (latencia - self._latencia_reciente)
+
+    def _latencia_creciente(self) -> bool:
+        """Detectar si la latencia reciente duplica la habitual"""
+        if self._latencia_base is None:
+            return False
+        return self._latencia_reciente > max(2 * self._latencia_base, 0.5)
+
+    @staticmethod
+    def _parse_retry_after(valor: Optional[str]) -> Optional[float]:
+        """Interpretar Retry-After en segundos o como fecha HTTP (máximo 5 minutos)"""
+        if not valor:
+            return None
+        try:
+            segundos = float(valor)
+        except ValueError:
+            try:
+                fecha = parsedate_to_datetime(valor)
+                segundos = (fecha - datetime.now(timezone.utc)).total_seconds()
+            except (TypeError, ValueError):
+                return None
+        return min(max(segundos, 0.0), 300.0)
+
+class RegistroLimitadores:
+    """Limitadores compartidos por host, configurados desde FUENTES_CONFIG"""
+
+    def __init__(self):
+        self._limitadores = {}
+        self._lock = threading.Lock()
+        self._config_por_host = {
+            normalizar_host(config['url_base']): config.get('limite_peticiones', {})
+            for config in FUENTES_CONFIG.values()
+        }
+
+    def para_url(self, url: str) -> LimitadorHost:
+        """Obtener (o crear) el limitador del host de una URL"""
+        host = normalizar_host(url)
+
+        with self._lock:
+            limitador = self._limitadores.get(host)
+            if limitador is None:
+                config = dict(SCRAPING_CONFIG['limite_peticiones'])
+                config.update(self._config_por_host.get(host, {}))
+                limitador = LimitadorHost(host, **config)
+                self._limitadores[host] = limitador
+            return limitador
+
+    def get_estadisticas(self) -> Dict[str, Dict]:
+        """Estadísticas por host"""
+        with self._lock:
+            return {
+                host: dict(limitador.estadisticas, tasa_actual=round(limitador.tasa, 3))
+                for host, limitador in self._limitadores.items()
+            }
+
+def conexion_interrumpida(error: requests.RequestException) -> bool:
+    """Error de conexión que vale la pena reintentar: la conexión se cortó (p. ej. un
+    keep-alive cerrado por el servidor). Un timeout ya consumió su espera completa, y un
+    host que no resuelve o rechaza la conexión no se recupera en segundos."""
+    if not isinstance(error, requests.ConnectionError) or isinstance(error, requests.Timeout):
+        return False
+    razon = error.args[0] if error.args else None
+    return not isinstance(getattr(razon, 'reason', razon), NewConnectionError)
+
+def acotar_timeout(timeout, restante: float):
+    """Timeout de requests (número o tupla conexión/lectura) que no exceda `restante` segundos"""
+    if isinstance(timeout, tuple):
+        return tuple(restante if valor is None else min(valor, restante) for valor in timeout)
+    return restante if timeout is None else min(timeout, restante)
+
+class SesionLimitada(requests.Session):
+    """Sesión de requests que respeta el limitador del host de destino
+
+    Las peticiones GET/HEAD se reintentan hasta `max_reintentos` veces ante conexiones
+    interrumpidas y respuestas 5xx; el limitador del host espacia los reintentos. Tras
+    `max_fallos_seguidos` peticiones fallidas seguidas el sitio se da por caído y
+    las demás peticiones de la sesión fallan de inmediato con FuenteCaida.
+    """
+
+    def __init__(self, registro: RegistroLimitadores = None, validadores: CacheValidadores = None,
+                 cache: CacheRespuestas = None, conexiones=None, max_reintentos: int = None,
+                 max_fallos_seguidos: int = None):
+        super().__init__()
+        self.registro = registro or limitador_peticiones
+        self.validadores = validadores or validadores_http
+        self.cache = cache or cache_respuestas
+        # Pool de conexiones por host compartido entre sesiones (ver contexto_ejecucion.py);
+        # sin él, cada sesión abre sus propias conexiones
+        self.conexiones = conexiones
+        # Validadores recibidos en esta ejecución, pendientes de confirmar
+        self.validadores_pendientes = {}
+        # Hora (epoch) en que vence la franja de la fuente: el timeout de cada petición se
+        # acota al tiempo restante y, una vez vencida, las peticiones fallan con PlazoAgotado
+        self.plazo = None
+        self.max_reintentos = SCRAPING_CONFIG['max_retries'] if max_reintentos is None else max_reintentos
+        self.max_fallos_seguidos = (SCRAPING_CONFIG['salud']['fallos_seguidos_visita']
+                                    if max_fallos_seguidos is None else max_fallos_seguidos)
+        self.fallos_seguidos = 0
+        self.estadisticas = {'peticiones': 0, 'errores': 0, 'reintentos': 0}
+        self._latencias = []
+        self._lock_estadisticas = threading.Lock()
+
+    def request(self, method, url, *args, **kwargs):
+        # Las respuestas en caché no consumen turno del limitador
+        grabada = self.cache.obtener(method, url, kwargs.get('params'))
+        if grabada is not None:
+            return grabada
+
+        self.verificar_disponible(url)
+
+        reintentos = self.max_reintentos if method.upper() in METODOS_REINTENTABLES else 0
+        for intento in range(reintentos + 1):
+            try:
+                response = self._enviar(method, url, *args, **kwargs)
+            except PlazoAgotado:
+                raise
+            except requests.RequestException as e:
+                self._contar_fallo(intento > 0)
+                if intento == reintentos or self.caida() or not conexion_interrumpida(e):
+                    raise
+                continue
+
+            if response.status_code >= 500:
+                self._contar_fallo(intento > 0)
+                if intento < reintentos and not self.caida():
+                    continue
+            else:
+                with self._lock_estadisticas:
+                    self.fallos_seguidos = 0
+                    self.estadisticas['reintentos'] += int(intento > 0)
+            self.cache.guardar(method, url, kwargs.get('params'), response)
+            return response
+
+    def _enviar(self, method, url, *args, **kwargs) -> requests.Response:
+        """Una petición con turno del limitador, acotada por el plazo de la fuente"""
+        limitador = self.registro.para_url(url)
+        limitador.adquirir()
+        inicio = time.monotonic()
+        with self._lock_estadisticas:
+            self.estadisticas['peticiones'] += 1
+
+        if self.plazo is not None:
+            restante = self.plazo - time.time()
+            if restante <= 0:
+                limitador.liberar()
+                raise PlazoAgotado(f"Plazo agotado antes de pedir {url}")
+            kwargs['timeout'] = acotar_timeout(kwargs.get('timeout'), restante)
+
+        try:
+            response = super().request(method, url, *args, **kwargs)
+        except Exception as e:
+            if self.plazo is not None and time.time() >= self.plazo:
+                # El corte es nuestro: no es motivo para que el host retroceda
+                limitador.liberar()
+                raise PlazoAgotado(f"Plazo agotado esperando {url}") from e
+            limitador.liberar(error=True)
+            raise
+
+        latencia = time.monotonic() - inicio
+        with self._lock_estadisticas:
+            self._latencias.append(latencia)
+        limitador.liberar(
+            estado=response.status_code,
+            latencia=latencia,
+            retry_after=response.headers.get('Retry-After')
+        )
+        return response
+
+    def verificar_disponible(self, url: str = ''):
+        """Fallar de inmediato (PlazoAgotado o FuenteCaida) si la franja de la fuente venció
+        o el sitio ya se dio por caído, sin consumir turno del limitador"""
+        if self.plazo is not None and time.time() >= self.plazo:
+            raise PlazoAgotado(f"Plazo agotado antes de pedir {url}".rstrip())
+        if self.caida():
+            raise FuenteCaida(f"{self.fallos_seguidos} peticiones fallidas seguidas, se omite {url}".rstrip())
+
+    def caida(self) -> bool:
+        """Si el sitio acumula `max_fallos_seguidos` peticiones fallidas seguidas en la visita"""
+        return bool(self.max_fallos_seguidos) and self.fallos_seguidos >= self.max_fallos_seguidos
+
+    def _contar_fallo(self, reintento: bool):
+        with self._lock_estadisticas:
+            self.fallos_seguidos += 1
+            self.estadisticas['errores'] += 1
+            self.estadisticas['reintentos'] += int(reintento)
+
+    def get_estadisticas(self) -> Dict:
+        """Peticiones, errores, reintentos y latencia mediana (segundos) de la sesión"""
+        with self._lock_estadisticas:
+            return dict(
+                self.estadisticas,
+                latencia_mediana=statistics.median(self._latencias) if self._latencias else None
+            )
+
+    def reset_estadisticas(self):
+        """Empezar una visita nueva: contadores en cero y el sitio vuelve a considerarse disponible"""
+        with self._lock_estadisticas:
+            self.estadisticas = {'peticiones': 0, 'errores': 0, 'reintentos': 0}
+            self._latencias = []
+            self.fallos_seguidos = 0
+
+    def get_adapter(self, url):
+        if self.conexiones is not None and url.lower().startswith(('http://', 'https://')):
+            return self.conexiones.para_url(url)
+        return super().get_adapter(url)
+
+    def get_condicional(self, url: str, **kwargs) -> requests.Response:
+        """GET con If-None-Match / If-Modified-Since; un 304 indica que no hubo cambios"""
+        condicionales = self.validadores.cabeceras(url)
+        kwargs['headers'] = dict(kwargs.get('headers') or {}, **condicionales)
+
+        response = self.get(url, **kwargs)
+        if condicionales:
+            self.validadores.contar(response.status_code == 304)
+
+        if response.status_code == 200:
+            validador = {
+                'etag': response.headers.get('ETag'),
+                'last_modified': response.headers.get('Last-Modified')
+            }
+            if validador['etag'] or validador['last_modified']:
+                self.validadores_pendientes[url] = validador
+        return response
+
+    def confirmar_validadores(self):
+        """Persistir los validadores recibidos, una vez guardada la fuente"""
+        self.validadores.guardar(self.validadores_pendientes)
+        self.validadores_pendientes = {}
+
+    def descartar_validadores(self):
+        """Olvidar los validadores recibidos; la próxima ejecución descarga todo"""
+        self.validadores_pendientes = {}
+
+def iterar_en_paralelo(items: List, funcion: Callable, url_referencia: str,
+                       registro: RegistroLimitadores = None, en_espera: int = None,
+                       sesion: SesionLimitada = None) -> Iterator:
+    """Aplicar una función a cada item usando tantos hilos como permita el host, entregando
+    cada resultado apenas está listo
+
+    Conserva el orden original y descarta los resultados vacíos o con error. A lo
+    más `en_espera` items por worker quedan descargados o en curso sin que quien
+    consume los haya pedido: si el consumidor se atrasa, las descargas se pausan.
+    Cerrar el generador cancela los items que aún no empezaron.
+
+    PlazoAgotado y FuenteCaida no son errores de un item sino de la fuente: se
+    propagan y cancelan los items pendientes. Con `sesion`, además, ningún item
+    empieza una vez vencida su franja o dado por caído el sitio, aunque `funcion`
+    capture sus propios errores. Sin `registro`, los workers se cuentan con el
+    registro de la sesión, el mismo que limita sus peticiones.
+    """
+    if not items:
+        return
+
+    limitador = (registro or getattr(sesion, 'registro', None) or limitador_peticiones).para_url(url_referencia)
+
+    def ejecutar(item):
+        if hasattr(sesion, 'verificar_disponible'):
+            sesion.verificar_disponible()
+        try:
+            return funcion(item)
+        except (PlazoAgotado, FuenteCaida):
+            raise
+        except Exception as e:
+            print(f"❌ Error procesando {item.get('url', item) if isinstance(item, dict) else item}: {e}")
+            return None
+
+    if limitador.max_concurrentes == 1 or len(items) == 1:
+        for item in items:
+            resultado = ejecutar(item)
+            if resultado:
+                yield resultado
+        return
+
+    workers = min(limitador.max_concurrentes, len(items))
+    ventana = workers * max(1, en_espera or SCRAPING_CONFIG.get('noticias_en_espera', 2))
+    pendientes = iter(items)
+    futuros = deque()
+    executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix=limitador.host)
+    try:
+        for item in pendientes:
+            futuros.append(executor.submit(ejecutar, item))
+            if len(futuros) >= ventana:
+                break
+        while futuros:
+            resultado = futuros.popleft().result()
+            siguiente = next(pendientes, None)
+            if siguiente is not None:
+                futuros.append(executor.submit(ejecutar, siguiente))
+            if resultado:
+                yield resultado
+    finally:
+        # Ante un corte de la fuente (o el cierre del generador) los pendientes no empiezan
+        for futuro in futuros:
+            futuro.cancel()
+        executor.shutdown(wait=True, cancel_futures=True)
+
+def obtener_en_paralelo(items: List, funcion: Callable, url_referencia: str,
+                        registro: RegistroLimitadores = None, sesion: SesionLimitada = None) -> List:
+    """Aplicar una función a cada item usando tantos hilos como permita el host
+
+    Conserva el orden original y descarta los resultados vacíos o con error.
+    """
+    return list(iterar_en_paralelo(items, funcion, url_referencia, registro, sesion=sesion))
+
+# Instancia global
+limitador_peticiones = RegistroLimitadores()
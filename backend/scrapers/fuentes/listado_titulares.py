@@ -0,0 +1,44 @@
+#!/usr/bin/env python3
+"""
+Emparejamiento titular → enlace para listados sin contenedor por noticia
+Algunos sitios publican cada noticia como un titular (<h3>) seguido, más
+abajo, de su enlace ("Seguir leyendo", URL con fecha). En lugar de buscar
+hacia adelante desde cada titular, se indexan titulares y enlaces en orden
+de documento con una sola búsqueda y se emparejan en una pasada lineal.
+"""
+
+from typing import Callable, List, Optional, Sequence, Tuple
+
+from bs4 import BeautifulSoup, Tag
+
+TITULARES = ('h1', 'h2', 'h3', 'h4', 'h5', 'h6')
+
+def emparejar_titulares(soup: BeautifulSoup, es_enlace: Callable[[Tag], bool],
+                        titulares: Sequence[str] = ('h3',),
+                        consumir: bool = True) -> List[Tuple[Optional[Tag], Tag]]:
+    """Pares (titular, enlace) en orden de documento
+
+    Cada enlace que cumple `es_enlace` se asocia al titular más cercano
+    que lo precede (también si está dentro del titular). Con `consumir`, cada
+    titular se usa una sola vez y los enlaces sin titular pendiente se
+    ignoran; sin él, todos los enlaces válidos se devuelven con el último
+    titular visto (o None si aún no aparece ninguno).
+    """
+    buscados = set(titulares)
+    titular = None
+    pares = []
+    # find_all devuelve titulares y enlaces en orden de documento: es el índice por posición
+    for elemento in soup.find_all(list(buscados) + ['a']):
+        if elemento.name in buscados:
+            titular = elemento
+            continue
+        if not elemento.get('href') or not es_enlace(elemento):
+            continue
+        if consumir:
+            if titular is None:
+                continue
+            pares.append((titular, elemento))
+            titular = None
+        else:
+            pares.append((titular, elemento))
+    return pares
@@ -0,0 +1,119 @@
+#!/usr/bin/env python3
+"""
+Marcas de agua por fuente para scraping incremental
+Guarda la noticia más reciente ya ingerida de cada fuente para cortar el
+recorrido del listado en cuanto se llega a lo ya procesado
+"""
+
+import json
+import os
+import threading
+from datetime import datetime, timezone
+from typing import Callable, Dict, List, Optional
+
+from .config import SCRAPING_CONFIG
+from .limitador_peticiones import normalizar_host
+
+class MarcasAgua:
+    """Marca de agua (URL y fecha más recientes) por host de fuente, persistida en JSON"""
+
+    def __init__(self, ruta: str = None):
+        self.ruta = ruta or os.path.join(SCRAPING_CONFIG['directorio_estado'], 'marcas_agua.json')
+        # Con NOTICIAS_REFRESCAR=1 se recorre el listado completo
+        self.activas = os.getenv('NOTICIAS_REFRESCAR', '0') != '1'
+        self._marcas = None
+        self._pendientes = {}
+        self._lock = threading.Lock()
+        self.estadisticas = {'recortadas': 0}
+
+    def _cargar(self) -> Dict[str, Dict]:
+        """Leer el archivo la primera vez que se usa"""
+        if self._marcas is None:
+            try:
+                with open(self.ruta, encoding='utf-8') as archivo:
+                    self._marcas = json.load(archivo)
+            except (OSError, ValueError):
+                self._marcas = {}
+        return self._marcas
+
+    def get(self, url_fuente: str) -> Optional[Dict]:
+        """Marca de agua confirmada de una fuente ({'url', 'fecha', 'actualizada'})"""
+        with self._lock:
+            return self._cargar().get(normalizar_host(url_fuente))
+
+    def recortar(self, url_fuente: str, items: List, clave: str = 'url') -> List:
+        """Devolver los items del listado anteriores a la marca de agua
+
+        Los items (diccionarios con `clave` o URLs) deben venir del más reciente
+        al más antiguo. Las URLs devueltas quedan pendientes hasta `confirmar`.
+        """
+        if not items:
+            return items
+
+        urls = [item.get(clave) if isinstance(item, dict) else item for item in items]
+        fuente = normalizar_host(url_fuente)
+
+        with self._lock:
+            marca = self._cargar().get(fuente)
+
+        corte = len(items)
+        if self.activas and marca and marca.get('url') in urls:
+            corte = urls.index(marca['url'])
+
+        with self._lock:
+            self._pendientes[fuente] = [url for url in urls[:corte] if url]
+            self.estadisticas['recortadas'] += len(items) - corte
+        return items[:corte]
+
+    def confirmar(self, url_fuente: str, conocidas: Callable[[List[str]], set],
+                  fecha: Optional[datetime] = None) -> bool:
+        """Avanzar la marca de agua tras guardar la fuente
+
+        `conocidas` devuelve cuáles de las URLs ya están almacenadas. La nueva
+        marca es la URL más reciente a partir de la cual todo el listado
+        pendiente quedó almacenado, de modo que lo que falló se reintenta.
+        Devuelve True si todo el listado pendiente quedó almacenado.
+        """
+        fuente = normalizar_host(url_fuente)
+
+        with self._lock:
+            pendientes = self._pendientes.pop(fuente, None)
+        if not pendientes:
+            return True
+
+        almacenadas = conocidas(pendientes)
+        url = None
+        for pendiente in reversed(pendientes):
+            if pendiente not in almacenadas:
+                break
+            url = pendiente
+        if not url:
+            return False
+
+        with self._lock:
+            marcas = self._cargar()
+            anterior = marcas.get(fuente, {})
+            if isinstance(fecha, datetime) and fecha.tzinfo:
+                fecha = fecha.astimezone(timezone.utc)
+            fecha_texto = fecha.isoformat() if isinstance(fecha, datetime) else None
+            marcas[fuente] = {
+                'url': url,
+                'fecha': max(filter(None, [fecha_texto, anterior.get('fecha')]), default=None),
+                'actualizada': datetime.now().isoformat()
+            }
+            self._guardar(marcas)
+        return url == pendientes[0]
+
+    def _guardar(self, marcas: Dict):
+        """Escribir el archivo de forma atómica"""
+        try:
+            os.makedirs(os.path.dirname(self.ruta), exist_ok=True)
+            temporal = f"{self.ruta}.tmp"
+            with open(temporal, 'w', encoding='utf-8') as archivo:
+                json.dump(marcas, archivo, ensure_ascii=False, indent=2)
+            os.replace(temporal, self.ruta)
+        except OSError as e:
+            print(f"⚠️  No se pudieron guardar las marcas de agua: {e}")
+
+# Instancia global
+marcas_agua = MarcasAgua()
@@ -5,32 +5,31 @@ Scraper específico para el Ministerio de Justicia de Chile
 
 import os
 import sys
-import requests
-import time
 from datetime import datetime, timezone
-from typing import List, Dict, Optional
+from typing import Dict, Iterator, List, Optional
 from bs4 import BeautifulSoup
-import re
-from urllib.parse import urljoin, urlparse
 
 # Agregar el directorio padre al path
 sys.path.append(os.path.dirname(os.path.dirname(os.path.dirname(__file__))))
 
-from backend.processors.content_processor import ContentProcessor, NoticiaCompleta
+from backend.processors.content_processor import NoticiaCompleta
 from ..data_schema import NoticiaEstandarizada, Categoria, Jurisdiccion, TipoDocumento
-from ..date_extractor import date_extractor
+from ..limitador_peticiones import iterar_en_paralelo
+from ..contexto_ejecucion import ContextoEjecucion, contexto_por_defecto
+from ..parseo import parsear, parsear_listado
+from ..clasificador_enlaces import clasificador_para
 
 class MinisterioJusticiaScraper:
     """Scraper específico para el Ministerio de Justicia"""
     
-    def __init__(self, openai_api_key: str = None):
+    def __init__(self, openai_api_key: str = None, contexto: ContextoEjecucion = None):
         self.base_url = "https://www.minjusticia.gob.cl"
         self.noticias_url = "https://www.minjusticia.gob.cl/category/noticias/"
-        self.content_processor = ContentProcessor(openai_api_key or "")
+        self.contexto = contexto or contexto_por_defecto()
+        self.content_processor = self.contexto.content_processor
         
-        # Configurar sesión
-        self.session = requests.Session()
-        self.session.headers.update({
+        # Configurar sesión (con límite de peticiones por host)
+        self.session = self.contexto.nueva_sesion({
             'User-Agent': 'Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36',
             'Accept': 'text/html,application/xhtml+xml,application/xml;q=0.9,image/webp,*/*;q=0.8',
             'Accept-Language': 'es-ES,es;q=0.8,en-US;q=0.5,en;q=0.3',
@@ -44,33 +43,29 @@ class MinisterioJusticiaScraper:
         try:
             print(f"🔍 Obteniendo noticias del Ministerio de Justicia...")
             
-            response = self.session.get(self.noticias_url, timeout=30)
+            response = self.session.get_condicional(self.noticias_url, timeout=30)
+            if response.status_code == 304:
+                print(f"ℹ️ Listado sin cambios desde la última ejecución (304)")
+                return []
             response.raise_for_status()
             
             # Configurar encoding para evitar problemas de codificación
             response.encoding = 'utf-8'
             
-            soup = BeautifulSoup(response.text, 'html.parser')  # Usar response.text en lugar de response.content
-            
-            # Buscar enlaces de noticias específicamente
-            noticias_links = []
+            soup = parsear_listado(response.text, self.base_url)  # Usar response.text en lugar de response.content
             
-            # Buscar enlaces que parezcan noticias (títulos largos, sin palabras de navegación)
-            for link in soup.find_all('a', href=True):
-                href = link.get('href')
-                titulo = link.get_text(strip=True)
-                
-                # Filtrar enlaces que parezcan noticias
-                if self._es_noticia_valida(href, titulo):
-                    full_url = urljoin(self.base_url, href)
-                    noticias_links.append({
-                        'titulo': titulo,
-                        'url': full_url,
-                        'fecha': self._extract_fecha_link(link)
-                    })
+            # Candidatos del listado ya filtrados, sin URLs repetidas y ordenados por puntaje
+            noticias_links = [
+                {
+                    'titulo': candidato['titulo'],
+                    'url': candidato['url'],
+                    'fecha': self._extract_fecha_link(candidato['elemento'])
+                }
+                for candidato in clasificador_para('ministerio_justicia').clasificar(soup.find_all('a', href=True))
+            ]
             
             # Ordenar por fecha y limitar
-            noticias_links = sorted(noticias_links, key=lambda x: x['fecha'] or datetime.now(), reverse=True)
+            noticias_links = sorted(noticias_links, key=lambda x: x['fecha'] or datetime.now(timezone.utc), reverse=True)
             noticias_links = noticias_links[:max_noticias]
             
             print(f"✅ Encontradas {len(noticias_links)} noticias")
@@ -80,65 +75,6 @@ class MinisterioJusticiaScraper:
             print(f"❌ Error obteniendo noticias: {e}")
             return []
     
-    def _es_noticia_valida(self, href: str, titulo: str) -> bool:
-        """Verificar si un enlace es una noticia válida"""
-        try:
-            # Excluir enlaces de navegación
-            exclusiones = [
-                'inicio', 'ministerio', 'ministro', 'subsecretaria', 'servicios',
-                'mision', 'organigrama', 'participacion', 'comunicaciones',
-                'siguiente', 'anterior', 'menu', 'facebook', 'twitter', 'youtube',
-                'flickr', 'outlook', 'gendarmeria', 'sml', 'sename', 'registro civil',
-                'defensoria', 'caj', 'mediacion', 'transparencia', 'trabaja',
-                'indicadores', 'lobby', 'solicitud', 'politicas', 'sitio historico',
-                'protocolo', 'informacion', 'seguridad', 'consulta ciudadana',
-                'dialogos participativos', 'participacion ciudadana'
-            ]
-            
-            # Verificar exclusiones en el título
-            titulo_lower = titulo.lower()
-            for exclusion in exclusiones:
-                if exclusion in titulo_lower:
-                    return False
-            
-            # Verificar que el título sea suficientemente largo
-            if len(titulo) < 20:
-                return False
-            
-            # Verificar que la URL sea del mismo dominio
-            if not href.startswith('/') and not href.startswith(self.base_url):
-                return False
-            
-            # Verificar que no sea una página de categoría o navegación
-            if any(pattern in href.lower() for pattern in ['/page/', '/category/', '/tag/', '/author/']):
-                return False
-            
-            # Verificar que sea una noticia real (contenga palabras clave de noticias)
-            palabras_clave_noticias = [
-                'cuenta publica', 'inaugura', 'nombro', 'presentamos', 'mesa',
-                'ley', 'estudio', 'dialogo', 'lanzamiento', 'nuevo', 'proyecto',
-                'reforma', 'adopciones', 'delitos', 'intervencion', 'poblacion',
-                'penal', 'interculturales', 'religiosos', 'normativa', 'penitenciaria',
-                'genero', 'equidad', 'reinsercion', 'social', 'juvenil', 'abogado',
-                'ninez', 'adolescencia', 'videograbadas', 'coordinacion', 'sistema',
-                'justicia', 'investigaciones', 'informes', 'estudios', 'anteproyecto',
-                'codigo', 'servicio', 'nacional', 'acceso', 'defensoria', 'victimas',
-                'aranceles', 'receptores', 'judiciales', 'comision', 'asesora',
-                'fortalecimiento', 'indh', 'auditoria', 'revision', 'especial',
-                'efectuada', 'unidad', 'derechos', 'humanos', 'desnotarizacion'
-            ]
-            
-            # Verificar que contenga al menos una palabra clave de noticias
-            titulo_lower = titulo.lower()
-            for palabra in palabras_clave_noticias:
-                if palabra in titulo_lower:
-                    return True
-            
-            return False
-            
-        except Exception:
-            return False
-    
     def get_noticia_completa(self, url: str, titulo: str = None) -> Optional[NoticiaCompleta]:
         """Obtener noticia completa desde una URL"""
         try:
@@ -150,7 +86,7 @@ class MinisterioJusticiaScraper:
             # Configurar encoding para evitar problemas de codificación
             response.encoding = 'utf-8'
             
-            soup = BeautifulSoup(response.text, 'html.parser')  # Usar response.text en lugar de response.content
+            soup = parsear(response.text)  # Usar response.text en lugar de response.content
             
             # Extraer información específica del Ministerio de Justicia
             noticia = self._extract_noticia_ministerio(soup, url, titulo)
@@ -204,7 +140,7 @@ class MinisterioJusticiaScraper:
         """Extraer fecha de noticia del Ministerio de Justicia usando extractor universal"""
         try:
             # Usar el extractor universal de fechas
-            fecha = date_extractor.extract_date_from_html(soup, url)
+            fecha = self.contexto.date_extractor.extract_date_from_html(soup, url)
             if fecha:
                 return fecha
             
@@ -216,101 +152,18 @@ class MinisterioJusticiaScraper:
             return datetime.now(timezone.utc)
     
     def _parse_fecha_ministerio(self, fecha_texto: str) -> Optional[datetime]:
-        """Parsear fecha del Ministerio de Justicia"""
-        try:
-            # Patrones de fecha comunes en el Ministerio de Justicia
-            patrones = [
-                r'(\d{1,2})/(\d{1,2})/(\d{4})',
-                r'(\d{1,2})-(\d{1,2})-(\d{4})',
-                r'(\d{4})-(\d{1,2})-(\d{1,2})',
-                r'(\d{1,2})\s+de\s+(\w+)\s+de\s+(\d{4})',
-                r'(\d{1,2})\s+de\s+(\w+)\s+del\s+(\d{4})'  # Nuevo patrón para "del 2023"
-            ]
-            
-            for patron in patrones:
-                match = re.search(patron, fecha_texto)
-                if match:
-                    if len(match.groups()) == 3:
-                        if 'de' in patron:
-                            # Formato: "15 de julio de 2024" o "24 de noviembre del 2023"
-                            dia = int(match.group(1))
-                            mes_texto = match.group(2).lower()
-                            año = int(match.group(3))
-                            
-                            meses = {
-                                'enero': 1, 'febrero': 2, 'marzo': 3, 'abril': 4,
-                                'mayo': 5, 'junio': 6, 'julio': 7, 'agosto': 8,
-                                'septiembre': 9, 'octubre': 10, 'noviembre': 11, 'diciembre': 12
-                            }
-                            
-                            if mes_texto in meses:
-                                return datetime(año, meses[mes_texto], dia, tzinfo=timezone.utc)
-                        else:
-                            # Formato numérico
-                            if patron == r'(\d{4})-(\d{1,2})-(\d{1,2})':
-                                año, mes, dia = match.groups()
-                            else:
-                                dia, mes, año = match.groups()
-                            
-                            return datetime(int(año), int(mes), int(dia), tzinfo=timezone.utc)
-            
-            return None
-            
-        except Exception as e:
-            print(f"⚠️  Error parseando fecha: {e}")
-            return None
+        """Parsear fecha del Ministerio de Justicia ("15 de julio de 2024", "24 de noviembre del 2023"...)"""
+        return self.contexto.parsear_fecha(fecha_texto)
     
     def _extract_contenido_ministerio(self, soup: BeautifulSoup) -> str:
         """Extraer contenido de noticia del Ministerio de Justicia"""
         try:
-            # Buscar contenido en diferentes selectors
-            contenido_selectors = [
-                '.contenido', '.content', '.noticia-contenido',
-                '.post-content', '.entry-content', 'article',
-                '.noticia-texto', '.texto-noticia',
-                '.entry', '.post'
-            ]
-            
-            for selector in contenido_selectors:
-                contenido_elem = soup.select_one(selector)
-                if contenido_elem:
-                    return self._limpiar_contenido(contenido_elem)
-            
-            # Si no se encuentra, buscar en el body
-            body = soup.find('body')
-            if body:
-                # Remover elementos no deseados
-                for elem in body.find_all(['script', 'style', 'nav', 'header', 'footer', 'aside']):
-                    elem.decompose()
-                
-                return self._limpiar_contenido(body)
-            
-            return ""
+            return self.contexto.extractor_contenido.extraer(soup)
             
         except Exception as e:
             print(f"❌ Error extrayendo contenido: {e}")
             return ""
     
-    def _limpiar_contenido(self, elemento) -> str:
-        """Limpiar contenido HTML"""
-        try:
-            # Remover scripts y estilos
-            for script in elemento(["script", "style"]):
-                script.decompose()
-            
-            # Obtener texto
-            texto = elemento.get_text(separator=' ', strip=True)
-            
-            # Limpiar espacios extra
-            texto = re.sub(r'\s+', ' ', texto)
-            texto = texto.strip()
-            
-            return texto
-            
-        except Exception as e:
-            print(f"⚠️  Error limpiando contenido: {e}")
-            return ""
-    
     def _extract_fecha_link(self, link_elem) -> Optional[datetime]:
         """Extraer fecha de un enlace"""
         try:
@@ -321,40 +174,37 @@ class MinisterioJusticiaScraper:
             return None
     
     def scrape_noticias_recientes(self, max_noticias: int = 10) -> List[NoticiaCompleta]:
-        """Scraper completo de noticias recientes"""
+        """Scraper completo de noticias recientes, todas en una lista"""
+        return list(self.iter_noticias(max_noticias))
+    
+    def iter_noticias(self, max_noticias: int = 10) -> Iterator[NoticiaCompleta]:
+        """Entregar noticias recientes completas a medida que se descargan"""
         try:
             print(f"🚀 Iniciando scraping del Ministerio de Justicia...")
             
-            # Obtener lista de noticias
-            noticias_links = self.get_noticias_recientes(max_noticias)
+            # Obtener lista de noticias (sin las ya almacenadas)
+            noticias_links = self.contexto.indice_urls.filtrar_nuevas(
+                self.contexto.marcas_agua.recortar(self.base_url, self.get_noticias_recientes(max_noticias))
+            )
             
             if not noticias_links:
                 print("❌ No se encontraron noticias")
-                return []
+                return
             
-            # Extraer noticias completas
-            noticias_completas = []
+            # Extraer noticias completas (en paralelo, según el límite del host)
+            def obtener(noticia_link):
+                print(f"📄 Procesando noticia: {noticia_link['titulo'][:50]}...")
+                return self.get_noticia_completa(noticia_link['url'], noticia_link['titulo'])
             
-            for i, noticia_link in enumerate(noticias_links, 1):
-                print(f"📄 Procesando noticia {i}/{len(noticias_links)}: {noticia_link['titulo'][:50]}...")
-                
-                noticia_completa = self.get_noticia_completa(
-                    noticia_link['url'],
-                    noticia_link['titulo']
-                )
-                
-                if noticia_completa:
-                    noticias_completas.append(noticia_completa)
-                
-                # Pausa entre requests
-                time.sleep(1)
+            extraidas = 0
+            for noticia in iterar_en_paralelo(noticias_links, obtener, self.base_url, sesion=self.session):
+                extraidas += 1
+                yield noticia
             
-            print(f"✅ Scraping completado: {len(noticias_completas)} noticias extraídas")
-            return noticias_completas
+            print(f"✅ Scraping completado: {extraidas} noticias extraídas")
             
         except Exception as e:
             print(f"❌ Error en scraping: {e}")
-            return []
 
 def test_scraper():
     """Función de prueba"""
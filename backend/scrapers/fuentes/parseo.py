@@ -0,0 +1,69 @@
+#!/usr/bin/env python3
+"""
+Capa de parseo HTML para los scrapers
+Usa lxml cuando está instalado (más rápido que html.parser) y ofrece un modo
+"listado" que construye el árbol de BeautifulSoup solo con las etiquetas que
+la fuente necesita para encontrar sus noticias. Con lxml la página se parsea
+en C y solo esos elementos pasan a BeautifulSoup; sin lxml se usa SoupStrainer.
+Cada fuente elige sus etiquetas de listado en FUENTES_CONFIG ('parseo_listado');
+sin esa clave el listado se parsea completo.
+"""
+
+from typing import Optional, Sequence, Tuple
+
+from bs4 import BeautifulSoup, SoupStrainer, UnicodeDammit
+
+from .config import FUENTES_CONFIG
+from .limitador_peticiones import normalizar_host
+
+try:
+    import lxml.html
+    from lxml.etree import ParserError
+    PARSER_HTML = 'lxml'
+    _parser_utf8 = lxml.html.HTMLParser(encoding='utf-8')
+except ImportError:
+    PARSER_HTML = 'html.parser'
+
+_etiquetas_por_host = None
+
+def parsear(contenido, etiquetas: Sequence[str] = None) -> BeautifulSoup:
+    """Parsear una página completa o, con `etiquetas`, solo esos elementos y su contenido"""
+    if not etiquetas:
+        return BeautifulSoup(contenido, PARSER_HTML)
+    if PARSER_HTML != 'lxml':
+        return BeautifulSoup(contenido, PARSER_HTML, parse_only=SoupStrainer(list(etiquetas)))
+    return BeautifulSoup(_fragmento(contenido, etiquetas), PARSER_HTML)
+
+def _fragmento(contenido, etiquetas: Sequence[str]) -> str:
+    """HTML con solo los elementos de `etiquetas` (los más externos), como haría SoupStrainer"""
+    if isinstance(contenido, bytes):
+        try:
+            contenido = contenido.decode('utf-8')
+        except UnicodeDecodeError:
+            contenido = UnicodeDammit(contenido, is_html=True).unicode_markup or ''
+    try:
+        arbol = lxml.html.fromstring(contenido.encode('utf-8'), parser=_parser_utf8)
+    except (ParserError, ValueError):
+        return ''
+
+    buscadas = set(etiquetas)
+    partes = []
+    for elemento in arbol.iter(*buscadas):
+        if any(ancestro.tag in buscadas for ancestro in elemento.iterancestors()):
+            continue
+        partes.append(lxml.html.tostring(elemento, encoding='unicode', with_tail=False))
+    return ''.join(partes)
+
+def etiquetas_listado(url: str) -> Optional[Tuple[str, ...]]:
+    """Etiquetas del modo listado para el host de una URL (None: árbol completo)"""
+    global _etiquetas_por_host
+    if _etiquetas_por_host is None:
+        _etiquetas_por_host = {
+            normalizar_host(config['url_base']): tuple(config['parseo_listado'])
+            for config in FUENTES_CONFIG.values() if config.get('parseo_listado')
+        }
+    return _etiquetas_por_host.get(normalizar_host(url))
+
+def parsear_listado(contenido, url: str) -> BeautifulSoup:
+    """Parsear un listado de noticias según el modo que eligió su fuente"""
+    return parsear(contenido, etiquetas_listado(url))
@@ -0,0 +1,249 @@
+#!/usr/bin/env python3
+"""
+Planificador de visitas por fuente
+Aprende el ritmo de publicación de cada fuente (noticias por día) a partir de
+las fechas de publicación del índice local de URLs, que replica
+noticias_juridicas, o de los logs de scraping cuando una fuente aún no tiene
+noticias registradas. Cada fuente se vuelve a visitar cuando se espera que
+haya publicado algo nuevo: las que publican varias veces al día se visitan a
+menudo y las que publican pocas veces a la semana, rara vez. También recuerda
+cuánto tarda cada visita, que es el costo esperado de la fuente al repartir el
+plazo de una ejecución (ver plazo_ejecucion.py).
+"""
+
+import json
+import os
+import random
+import statistics
+import threading
+import time
+from datetime import datetime, timedelta, timezone
+from typing import Dict, Iterable, List, Optional
+
+from .config import FUENTES_CONFIG, SCRAPING_CONFIG
+from .fechas import parsear_fecha
+
+SEGUNDOS_DIA = 86400
+
+# Peso de la última visita en la duración esperada de una fuente (media móvil)
+PESO_DURACION = 0.3
+
+class PlanificadorFuentes:
+    """Próxima visita de cada fuente según su ritmo de publicación, persistida en JSON"""
+
+    def __init__(self, ruta: str = None, aleatorio: random.Random = None, **config):
+        """
+        Args:
+            ruta: archivo JSON de estado (por defecto en el directorio de estado)
+            aleatorio: generador para el jitter (permite reproducir simulaciones)
+            config: valores que reemplazan a SCRAPING_CONFIG['planificacion']
+        """
+        self.ruta = ruta or os.path.join(SCRAPING_CONFIG['directorio_estado'], 'planificacion.json')
+        self.config = dict(SCRAPING_CONFIG['planificacion'], **config)
+        self.aleatorio = aleatorio or random.Random()
+        # fuente -> noticias por día (None: sin historial)
+        self.por_dia: Dict[str, Optional[float]] = {}
+        # fuente -> duración mediana de sus visitas según los logs (si no hay estado propio)
+        self.duraciones: Dict[str, float] = {}
+        self._estado = None
+        self._lock = threading.Lock()
+
+    def _cargar(self) -> Dict[str, Dict]:
+        """Leer el archivo la primera vez que se usa"""
+        if self._estado is None:
+            try:
+                with open(self.ruta, encoding='utf-8') as archivo:
+                    self._estado = json.load(archivo)
+            except (OSError, ValueError):
+                self._estado = {}
+        return self._estado
+
+    def _config(self, fuente: str) -> Dict:
+        """Configuración general más la de la fuente"""
+        propia = FUENTES_CONFIG.get(fuente, {}).get('planificacion')
+        return dict(self.config, **propia) if propia else self.config
+
+    # ========================================
+    # APRENDIZAJE
+    # ========================================
+
+    def aprender(self, publicaciones: Dict[str, Dict], ahora: float = None):
+        """Estimar noticias por día desde {fuente: {'publicadas', 'primera'}}
+
+        `publicadas` cuenta las noticias de los últimos `ventana_dias` y `primera`
+        es la fecha (YYYY-MM-DD) más antigua registrada: si el historial es más
+        corto que la ventana, el ritmo se calcula sobre el historial disponible.
+        """
+        hoy = datetime.fromtimestamp(ahora if ahora is not None else time.time(), timezone.utc)
+        for fuente, datos in publicaciones.items():
+            config = self._config(fuente)
+            primera = parsear_fecha(datos.get('primera'))
+            dias = config['ventana_dias']
+            if primera:
+                dias = min(dias, max(config['dias_minimos'], (hoy - primera).total_seconds() / SEGUNDOS_DIA))
+            self.por_dia[fuente] = (datos.get('publicadas') or 0) / dias
+
+    def aprender_desde(self, indice, supabase=None, fuentes: Iterable[str] = (), ahora: float = None):
+        """Aprender del índice local; las fuentes sin noticias registradas, de los logs de scraping"""
+        ahora = ahora if ahora is not None else time.time()
+        hoy = datetime.fromtimestamp(ahora, timezone.utc)
+        desde = hoy - timedelta(days=self.config['ventana_dias'])
+
+        try:
+            publicaciones = indice.publicaciones_por_fuente(desde.date().isoformat(), hoy.date().isoformat())
+        except Exception as e:
+            print(f"⚠️  No se pudo leer el historial de publicaciones: {e}")
+            publicaciones = {}
+
+        sin_historial = [fuente for fuente in fuentes if fuente not in publicaciones]
+        if sin_historial and supabase is not None:
+            publicaciones.update(self._publicaciones_desde_logs(self._leer_logs(supabase), sin_historial, desde))
+        self.aprender(publicaciones, ahora)
+
+    def aprender_duraciones(self, supabase, fuentes: Iterable[str]):
+        """Duración de las fuentes nunca visitadas desde este estado, según los logs de scraping"""
+        sin_duracion = [fuente for fuente in fuentes if self.duracion_esperada(fuente) is None]
+        if not sin_duracion or supabase is None:
+            return
+
+        duraciones = {}
+        for log in self._leer_logs(supabase):
+            fuente = str(log.get('fuente_nombre') or '').lower()
+            if fuente in sin_duracion and log.get('duracion_segundos') is not None:
+                duraciones.setdefault(fuente, []).append(log['duracion_segundos'])
+        self.duraciones.update({fuente: statistics.median(valores) for fuente, valores in duraciones.items()})
+
+    @staticmethod
+    def _leer_logs(supabase) -> List[Dict]:
+        """Logs recientes de noticias_logs_scraping"""
+        try:
+            return supabase.get_logs_recientes(limit=1000) or []
+        except Exception as e:
+            print(f"⚠️  No se pudieron leer los logs de scraping: {e}")
+            return []
+
+    @staticmethod
+    def _publicaciones_desde_logs(logs: List[Dict], fuentes: List[str], desde: datetime) -> Dict[str, Dict]:
+        """Noticias nuevas por fuente según noticias_logs_scraping"""
+        publicaciones = {}
+        for log in logs:
+            fuente = str(log.get('fuente_nombre') or '').lower()
+            creado = parsear_fecha(log.get('created_at'))
+            if fuente not in fuentes or not creado or creado < desde:
+                continue
+            datos = publicaciones.setdefault(fuente, {'publicadas': 0, 'primera': None})
+            datos['publicadas'] += log.get('noticias_nuevas') or 0
+            fecha = creado.date().isoformat()
+            datos['primera'] = min(filter(None, [datos['primera'], fecha]))
+        return publicaciones
+
+    # ========================================
+    # PLANIFICACIÓN
+    # ========================================
+
+    def intervalo(self, fuente: str) -> float:
+        """Segundos entre visitas de una fuente, sin jitter"""
+        config = self._config(fuente)
+        por_dia = self.por_dia.get(fuente)
+        if por_dia is None:
+            intervalo = config['intervalo_sin_historial']
+        elif por_dia <= 0:
+            intervalo = config['intervalo_maximo']
+        else:
+            intervalo = config['nuevas_por_visita'] * SEGUNDOS_DIA / por_dia
+        return min(config['intervalo_maximo'], max(config['intervalo_minimo'], intervalo))
+
+    def registrar_visita(self, fuente: str, nuevas: int = 0, exito: bool = True, ahora: float = None) -> float:
+        """Agendar la próxima visita de una fuente recién recorrida; devuelve su fecha (epoch)
+
+        Si la visita falló, la fuente se reintenta tras el intervalo mínimo.
+        """
+        return self.registrar_visitas([{'fuente': fuente, 'nuevas': nuevas, 'exito': exito}], ahora)[fuente]
+
+    def registrar_visitas(self, resultados: Iterable[Dict], ahora: float = None) -> Dict[str, float]:
+        """Agendar las fuentes de una ejecución a partir de sus resultados
+        ({'fuente', 'nuevas', 'errores', 'duracion', 'truncada'})
+
+        Una visita truncada por el plazo de la ejecución cuenta como fallida: lo que
+        quedó sin recorrer se retoma tras el intervalo mínimo.
+        """
+        ahora = ahora if ahora is not None else time.time()
+        proximas = {}
+
+        with self._lock:
+            estado = self._cargar()
+            for resultado in resultados:
+                fuente = resultado['fuente']
+                config = self._config(fuente)
+                truncada = bool(resultado.get('truncada'))
+                if resultado.get('exito', not resultado.get('errores') and not truncada):
+                    jitter = config['jitter']
+                    espera = self.intervalo(fuente) * self.aleatorio.uniform(1 - jitter, 1 + jitter)
+                else:
+                    espera = config['intervalo_minimo']
+
+                duracion = estado.get(fuente, {}).get('duracion')
+                if resultado.get('duracion') is not None:
+                    if duracion is None:
+                        duracion = resultado['duracion']
+                    elif truncada:
+                        # La visita cortada solo dice que la fuente tarda al menos eso
+                        duracion = max(duracion, resultado['duracion'])
+                    else:
+                        duracion += PESO_DURACION * (resultado['duracion'] - duracion)
+
+                proximas[fuente] = ahora + espera
+                estado[fuente] = {
+                    'ultima_visita': ahora,
+                    'proxima': proximas[fuente],
+                    'nuevas': resultado.get('nuevas', 0),
+                    'por_dia': self.por_dia.get(fuente),
+                    'duracion': duracion,
+                    'truncada': truncada
+                }
+            if proximas:
+                self._guardar(estado)
+        return proximas
+
+    def posponer(self, proximas: Dict[str, float]):
+        """Mover la próxima visita de fuentes que no se recorrieron ({fuente: epoch})"""
+        if not proximas:
+            return
+        with self._lock:
+            estado = self._cargar()
+            for fuente, proxima in proximas.items():
+                estado.setdefault(fuente, {})['proxima'] = proxima
+            self._guardar(estado)
+
+    def proxima(self, fuente: str) -> float:
+        """Fecha (epoch) de la próxima visita; 0 si nunca se visitó"""
+        with self._lock:
+            return self._cargar().get(fuente, {}).get('proxima', 0.0)
+
+    def duracion_esperada(self, fuente: str) -> Optional[float]:
+        """Segundos que suele tardar una visita a la fuente; None si no hay historial"""
+        with self._lock:
+            duracion = self._cargar().get(fuente, {}).get('duracion')
+        return duracion if duracion is not None else self.duraciones.get(fuente)
+
+    def vencidas(self, fuentes: Iterable[str], ahora: float = None, holgura: float = None) -> List[str]:
+        """Fuentes cuya próxima visita ya llegó (o llega dentro de la holgura), en su orden"""
+        ahora = ahora if ahora is not None else time.time()
+        holgura = self.config['holgura'] if holgura is None else holgura
+        return [fuente for fuente in fuentes if self.proxima(fuente) <= ahora + holgura]
+
+    def segundos_hasta_proxima(self, fuentes: Iterable[str], ahora: float = None) -> float:
+        """Segundos hasta la próxima visita de cualquiera de las fuentes"""
+        ahora = ahora if ahora is not None else time.time()
+        return max(0.0, min((self.proxima(fuente) for fuente in fuentes), default=ahora) - ahora)
+
+    def _guardar(self, estado: Dict):
+        """Escribir el archivo de forma atómica"""
+        try:
+            os.makedirs(os.path.dirname(self.ruta), exist_ok=True)
+            temporal = f"{self.ruta}.tmp"
+            with open(temporal, 'w', encoding='utf-8') as archivo:
+                json.dump(estado, archivo, ensure_ascii=False, indent=2)
+            os.replace(temporal, self.ruta)
+        except OSError as e:
+            print(f"⚠️  No se pudo guardar la planificación: {e}")
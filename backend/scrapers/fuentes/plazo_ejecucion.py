@@ -0,0 +1,67 @@
+#!/usr/bin/env python3
+"""
+Plazo de una ejecución de scraping
+Ordena las fuentes por prioridad (config.py) y costo esperado, y reparte el
+tiempo que queda entre las que aún no empiezan en proporción a su costo. Cada
+fuente recibe una franja al empezar; si otra terminó antes de lo previsto, lo
+que sobró se reparte entre las siguientes. Si el tiempo no alcanza para todas,
+cada fuente puede igual tardar `margen_costo` veces su costo: terminan las de
+mayor prioridad y las últimas quedan sin recorrer, vencidas para la próxima
+ejecución. Una fuente lenta o colgada se corta al vencer su franja.
+"""
+
+import math
+import threading
+import time
+from typing import Dict, Iterable, List, Optional
+
+from .config import SCRAPING_CONFIG, get_fuentes_por_prioridad
+
+def ordenar_fuentes(fuentes: Iterable[str], costos: Dict[str, float]) -> List[str]:
+    """Fuentes por prioridad y, a igual prioridad, las más baratas primero
+
+    Las fuentes inactivas o sin configuración quedan al final.
+    """
+    prioridades = {codigo: config['prioridad'] for codigo, config in get_fuentes_por_prioridad()}
+    return sorted(fuentes, key=lambda fuente: (prioridades.get(fuente, math.inf), costos.get(fuente, 0)))
+
+class PlazoEjecucion:
+    """Franjas de tiempo de las fuentes de una ejecución que debe terminar en `limite`"""
+
+    def __init__(self, limite: float, costos: Dict[str, float], workers: int = 1, **config):
+        """
+        Args:
+            limite: hora (epoch) en que debe terminar la ejecución
+            costos: segundos esperados por fuente, de las fuentes a recorrer
+            workers: fuentes que se recorren en paralelo
+            config: valores que reemplazan a SCRAPING_CONFIG['plazo']
+        """
+        self.config = dict(SCRAPING_CONFIG['plazo'], **config)
+        self.limite = limite
+        self.workers = max(1, workers)
+        # Costo esperado de las fuentes que aún no empiezan
+        self.pendientes = dict(costos)
+        # fuente -> segundos asignados; fuentes que ya no alcanzaron a empezar
+        self.franjas: Dict[str, float] = {}
+        self.sin_tiempo: List[str] = []
+        self._lock = threading.Lock()
+
+    def asignar(self, fuente: str, ahora: float = None) -> Optional[float]:
+        """Franja de una fuente que empieza: hora (epoch) en que debe cortarse, o None si no hay tiempo
+
+        Con varios workers la capacidad es aproximada: se supone que todos quedan
+        disponibles para las fuentes pendientes.
+        """
+        ahora = ahora if ahora is not None else time.time()
+        with self._lock:
+            costo = self.pendientes.pop(fuente, self.config['duracion_sin_historial'])
+            restante = self.limite - self.config['reserva'] - ahora
+            if restante < self.config['franja_minima']:
+                self.sin_tiempo.append(fuente)
+                return None
+
+            total = costo + sum(self.pendientes.values())
+            franja = restante * self.workers * costo / total if total > 0 else restante
+            franja = min(restante, max(self.config['franja_minima'], self.config['margen_costo'] * costo, franja))
+            self.franjas[fuente] = franja
+            return ahora + franja
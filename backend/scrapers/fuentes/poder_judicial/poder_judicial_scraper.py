@@ -6,10 +6,8 @@ Extrae noticias completas de https://www.pjud.cl
 
 import os
 import sys
-import requests
-import time
 from datetime import datetime, timezone
-from typing import List, Dict, Optional
+from typing import Dict, Iterator, List, Optional
 from bs4 import BeautifulSoup
 import re
 from urllib.parse import urljoin, urlparse
@@ -17,19 +15,23 @@ from urllib.parse import urljoin, urlparse
 # Agregar el directorio padre al path
 sys.path.append(os.path.dirname(os.path.dirname(os.path.dirname(__file__))))
 
-from backend.processors.content_processor import ContentProcessor, NoticiaCompleta
+from backend.processors.content_processor import NoticiaCompleta
+from ..limitador_peticiones import iterar_en_paralelo
+from ..contexto_ejecucion import ContextoEjecucion, contexto_por_defecto
+from ..parseo import parsear, parsear_listado
+from ..clasificador_enlaces import clasificador_para
 
 class PoderJudicialScraper:
     """Scraper para el Poder Judicial de Chile"""
     
-    def __init__(self, openai_api_key: str = None):
+    def __init__(self, openai_api_key: str = None, contexto: ContextoEjecucion = None):
         self.base_url = "https://www.pjud.cl"
         self.noticias_url = "https://www.pjud.cl/prensa-y-comunicaciones/noticias-del-poder-judicial"
-        self.content_processor = ContentProcessor(openai_api_key or "")
+        self.contexto = contexto or contexto_por_defecto()
+        self.content_processor = self.contexto.content_processor
         
-        # Configurar sesión
-        self.session = requests.Session()
-        self.session.headers.update({
+        # Configurar sesión (con límite de peticiones por host)
+        self.session = self.contexto.nueva_sesion({
             'User-Agent': 'Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36',
             'Accept': 'text/html,application/xhtml+xml,application/xml;q=0.9,image/webp,*/*;q=0.8',
             'Accept-Language': 'es-ES,es;q=0.8,en-US;q=0.5,en;q=0.3',
@@ -43,46 +45,24 @@ class PoderJudicialScraper:
         try:
             print(f"🔍 Obteniendo noticias del Poder Judicial...")
             
-            response = self.session.get(self.noticias_url, timeout=30)
+            response = self.session.get_condicional(self.noticias_url, timeout=30)
+            if response.status_code == 304:
+                print(f"ℹ️ Listado sin cambios desde la última ejecución (304)")
+                return []
             response.raise_for_status()
             
-            soup = BeautifulSoup(response.content, 'html.parser')
+            soup = parsear_listado(response.content, self.base_url)
             
-            # Buscar noticias en la estructura específica del Poder Judicial
-            noticias_links = []
-            
-            # Buscar enlaces que contengan noticias específicas
-            # Basado en la estructura real de la página
-            for link in soup.find_all('a', href=True):
-                href = link.get('href')
-                titulo = link.get_text(strip=True)
-                
-                # Filtrar noticias específicas del Poder Judicial
-                if (titulo and len(titulo) > 20 and 
-                    any(keyword in titulo.lower() for keyword in [
-                        'fiscal', 'corte', 'juzgado', 'tribunal', 'sentencia', 
-                        'fallo', 'condena', 'prisión', 'acusado', 'imputado',
-                        'sumario', 'querella', 'liquidación', 'robo', 'abuso',
-                        'violación', 'homicidio', 'alcalde', 'ejército'
-                    ]) and
-                    not any(exclusion in titulo.lower() for exclusion in [
-                        'anterior', 'siguiente', 'última', 'página', 'filtrar'
-                    ])):
-                    
-                    # Construir URL completa
-                    if href.startswith('http'):
-                        url_completa = href
-                    else:
-                        url_completa = urljoin(self.base_url, href)
-                    
-                    # Extraer fecha del texto del enlace o elementos cercanos
-                    fecha = self._extract_fecha_from_text(titulo)
-                    
-                    noticias_links.append({
-                        'titulo': titulo,
-                        'url': url_completa,
-                        'fecha': fecha
-                    })
+            # Candidatos del listado ya filtrados, sin URLs repetidas y ordenados por puntaje
+            noticias_links = [
+                {
+                    'titulo': candidato['titulo'],
+                    'url': candidato['url'],
+                    # Extraer fecha del texto del enlace
+                    'fecha': self._extract_fecha_from_text(candidato['titulo'])
+                }
+                for candidato in clasificador_para('poder_judicial').clasificar(soup.find_all('a', href=True))
+            ]
             
             # Ordenar por fecha y limitar
             noticias_links = sorted(noticias_links, key=lambda x: x['fecha'] or datetime.now(timezone.utc), reverse=True)
@@ -103,7 +83,7 @@ class PoderJudicialScraper:
             response = self.session.get(url, timeout=30)
             response.raise_for_status()
             
-            soup = BeautifulSoup(response.content, 'html.parser')
+            soup = parsear(response.content)
             
             # Extraer información específica del Poder Judicial
             noticia = self._extract_noticia_poder_judicial(soup, url, titulo)
@@ -180,12 +160,9 @@ class PoderJudicialScraper:
             fecha_elem = soup.select_one(selector)
             if fecha_elem:
                 # Intentar obtener fecha del atributo datetime
-                datetime_attr = fecha_elem.get('datetime')
-                if datetime_attr:
-                    try:
-                        return datetime.fromisoformat(datetime_attr.replace('Z', '+00:00'))
-                    except:
-                        pass
+                fecha = self.contexto.parsear_fecha(fecha_elem.get('datetime'))
+                if fecha:
+                    return fecha
                 
                 # Intentar parsear texto
                 fecha_texto = fecha_elem.get_text(strip=True)
@@ -193,105 +170,21 @@ class PoderJudicialScraper:
                 if fecha_parseada:
                     return fecha_parseada
         
-        # Buscar fecha en el texto de la página
-        texto_completo = soup.get_text()
-        fecha_match = re.search(r'(\d{1,2})/(\d{1,2})/(\d{4})', texto_completo)
-        if fecha_match:
-            dia, mes, año = fecha_match.groups()
-            try:
-                return datetime(int(año), int(mes), int(dia), tzinfo=timezone.utc)
-            except:
-                pass
+        # Meta tags, JSON-LD, bloque principal y, en último caso, la página completa
+        fecha = self.contexto.date_extractor.extract_date_from_html(soup)
+        if fecha:
+            return fecha
         
         # Si no se encuentra, usar fecha actual
         return datetime.now(timezone.utc)
     
     def _parse_fecha_poder_judicial(self, fecha_texto: str) -> Optional[datetime]:
         """Parsear fecha específica del formato del Poder Judicial"""
-        if not fecha_texto:
-            return None
-        
-        # Patrones específicos del Poder Judicial
-        patrones = [
-            r'(\d{1,2})/(\d{1,2})/(\d{4})',  # DD/MM/YYYY
-            r'(\d{1,2})-(\d{1,2})-(\d{4})',  # DD-MM-YYYY
-            r'(\d{4})-(\d{1,2})-(\d{1,2})',  # YYYY-MM-DD
-            r'(\d{1,2})\s+de\s+(\w+)\s+de\s+(\d{4})',  # DD de MES de YYYY
-            r'(\d{1,2})\s+(\w+)\s+(\d{4})',  # DD MES YYYY
-        ]
-        
-        for patron in patrones:
-            match = re.search(patron, fecha_texto, re.IGNORECASE)
-            if match:
-                try:
-                    if 'de' in patron or len(match.groups()) == 3:
-                        if 'de' in patron:
-                            # Formato "DD de MES de YYYY"
-                            dia, mes_nombre, año = match.groups()
-                            meses = {
-                                'enero': 1, 'febrero': 2, 'marzo': 3, 'abril': 4,
-                                'mayo': 5, 'junio': 6, 'julio': 7, 'agosto': 8,
-                                'septiembre': 9, 'octubre': 10, 'noviembre': 11, 'diciembre': 12
-                            }
-                            mes = meses.get(mes_nombre.lower(), 1)
-                        else:
-                            # Formato numérico
-                            if len(match.group(1)) == 4:  # YYYY-MM-DD
-                                año, mes, dia = match.groups()
-                            else:  # DD/MM/YYYY o DD-MM-YYYY
-                                dia, mes, año = match.groups()
-                    
-                    return datetime(int(año), int(mes), int(dia), tzinfo=timezone.utc)
-                except (ValueError, TypeError):
-                    continue
-        
-        return None
+        return self.contexto.parsear_fecha(fecha_texto)
     
     def _extract_contenido_poder_judicial(self, soup: BeautifulSoup) -> str:
         """Extraer contenido específico del Poder Judicial"""
-        # Buscar contenedor de contenido
-        contenido_selectors = [
-            '.contenido',
-            '.noticia-contenido',
-            '.noticia-texto',
-            '.noticia-cuerpo',
-            'article',
-            '.entry-content',
-            '.post-content'
-        ]
-        
-        for selector in contenido_selectors:
-            contenido_elem = soup.select_one(selector)
-            if contenido_elem:
-                return self._limpiar_contenido(contenido_elem)
-        
-        # Si no se encuentra selector específico, buscar en el body
-        body = soup.find('body')
-        if body:
-            # Remover elementos no deseados
-            for elem in body.find_all(['nav', 'header', 'footer', 'aside', 'script', 'style']):
-                elem.decompose()
-            
-            return self._limpiar_contenido(body)
-        
-        return ""
-    
-    def _limpiar_contenido(self, elemento) -> str:
-        """Limpiar contenido HTML"""
-        if not elemento:
-            return ""
-        
-        # Remover elementos no deseados
-        for elem in elemento.find_all(['script', 'style', 'nav', 'header', 'footer', 'aside', 'form']):
-            elem.decompose()
-        
-        # Obtener texto
-        texto = elemento.get_text(separator=' ', strip=True)
-        
-        # Limpiar espacios múltiples
-        texto = re.sub(r'\s+', ' ', texto)
-        
-        return texto.strip()
+        return self.contexto.extractor_contenido.extraer(soup)
     
     def _extract_info_legal_poder_judicial(self, soup: BeautifulSoup, contenido: str) -> Dict:
         """Extraer información legal específica del Poder Judicial"""
@@ -417,28 +310,8 @@ class PoderJudicialScraper:
         return any(re.search(pattern, href, re.IGNORECASE) for pattern in noticia_patterns)
     
     def _extract_fecha_from_text(self, texto: str) -> Optional[datetime]:
-        """Extraer fecha del texto de la noticia"""
-        # Patrones de fecha específicos del Poder Judicial
-        patrones = [
-            r'(\d{1,2})-(\d{1,2})-(\d{4})\s+(\d{1,2}):(\d{1,2})',  # DD-MM-YYYY HH:MM
-            r'(\d{1,2})-(\d{1,2})-(\d{4})',  # DD-MM-YYYY
-            r'(\d{1,2})/(\d{1,2})/(\d{4})',  # DD/MM/YYYY
-        ]
-        
-        for patron in patrones:
-            match = re.search(patron, texto)
-            if match:
-                try:
-                    if len(match.groups()) == 5:  # Con hora
-                        dia, mes, año, hora, minuto = match.groups()
-                        return datetime(int(año), int(mes), int(dia), int(hora), int(minuto), tzinfo=timezone.utc)
-                    else:  # Solo fecha
-                        dia, mes, año = match.groups()
-                        return datetime(int(año), int(mes), int(dia), tzinfo=timezone.utc)
-                except (ValueError, TypeError):
-                    continue
-        
-        return None
+        """Extraer fecha del texto de la noticia (DD-MM-YYYY HH:MM, DD/MM/YYYY...)"""
+        return self.contexto.parsear_fecha(texto)
     
     def _extract_fecha_link(self, link_elem) -> Optional[datetime]:
         """Extraer fecha de un enlace de noticia"""
@@ -454,35 +327,33 @@ class PoderJudicialScraper:
         return None
     
     def scrape_noticias_recientes(self, max_noticias: int = 10) -> List[NoticiaCompleta]:
-        """Scrapear noticias recientes completas"""
+        """Scrapear noticias recientes completas, todas en una lista"""
+        return list(self.iter_noticias(max_noticias))
+    
+    def iter_noticias(self, max_noticias: int = 10) -> Iterator[NoticiaCompleta]:
+        """Entregar noticias recientes completas a medida que se descargan"""
         print(f"🚀 Iniciando scraping del Poder Judicial...")
         
-        # Obtener lista de noticias
-        noticias_links = self.get_noticias_recientes(max_noticias)
+        # Obtener lista de noticias (sin las ya almacenadas)
+        noticias_links = self.contexto.indice_urls.filtrar_nuevas(
+            self.contexto.marcas_agua.recortar(self.base_url, self.get_noticias_recientes(max_noticias))
+        )
         
         if not noticias_links:
             print("❌ No se encontraron noticias")
-            return []
+            return
         
-        # Extraer noticias completas
-        noticias_completas = []
+        # Extraer noticias completas (en paralelo, según el límite del host)
+        def obtener(noticia_link):
+            print(f"📄 Procesando noticia: {noticia_link['titulo'][:50]}...")
+            return self.get_noticia_completa(noticia_link['url'], noticia_link['titulo'])
         
-        for i, noticia_link in enumerate(noticias_links, 1):
-            print(f"📄 Procesando noticia {i}/{len(noticias_links)}: {noticia_link['titulo'][:50]}...")
-            
-            noticia_completa = self.get_noticia_completa(
-                noticia_link['url'], 
-                noticia_link['titulo']
-            )
-            
-            if noticia_completa:
-                noticias_completas.append(noticia_completa)
-            
-            # Pausa entre requests
-            time.sleep(1)
+        extraidas = 0
+        for noticia in iterar_en_paralelo(noticias_links, obtener, self.base_url, sesion=self.session):
+            extraidas += 1
+            yield noticia
         
-        print(f"✅ Scraping completado: {len(noticias_completas)} noticias extraídas")
-        return noticias_completas
+        print(f"✅ Scraping completado: {extraidas} noticias extraídas")
 
 # Función de prueba
 def test_scraper():
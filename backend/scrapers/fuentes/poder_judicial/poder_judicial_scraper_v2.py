@@ -10,7 +10,7 @@ import requests
 import time
 import re
 from datetime import datetime, timezone
-from typing import List, Dict, Optional
+from typing import Dict, Iterator, List, Optional
 from bs4 import BeautifulSoup
 from urllib.parse import urljoin, urlparse
 
@@ -19,6 +19,9 @@ sys.path.append(os.path.dirname(os.path.dirname(os.path.dirname(os.path.dirname(
 
 from backend.processors.content_processor import ContentProcessor
 from ..base_scraper import BaseScraper
+from ..contexto_ejecucion import ContextoEjecucion
+from ..clasificador_enlaces import clasificador_para
+from ..fechas import fecha_en_url
 from ..data_schema import (
     NoticiaEstandarizada, 
     DataNormalizer,
@@ -31,8 +34,8 @@ from ..data_schema import (
 class PoderJudicialScraperV2(BaseScraper):
     """Scraper optimizado para el Poder Judicial de Chile"""
     
-    def __init__(self, openai_api_key: str = None):
-        super().__init__(openai_api_key)
+    def __init__(self, openai_api_key: str = None, contexto: ContextoEjecucion = None):
+        super().__init__(openai_api_key, contexto)
         self.base_url = "https://www.pjud.cl"
         self.noticias_url = "https://www.pjud.cl/prensa-y-comunicaciones/noticias-del-poder-judicial"
         self.version_scraper = "2.0"
@@ -59,32 +62,18 @@ class PoderJudicialScraperV2(BaseScraper):
             response = self.session.get(self.noticias_url, timeout=30)
             response.raise_for_status()
             
-            soup = BeautifulSoup(response.content, 'html.parser')
+            soup = self._parsear_listado(response.content)
             
-            # Buscar noticias específicas del Poder Judicial
-            noticias_links = []
-            
-            # Buscar enlaces que contengan noticias específicas
-            for link in soup.find_all('a', href=True):
-                href = link.get('href')
-                titulo = link.get_text(strip=True)
-                
-                # Filtrar noticias específicas del Poder Judicial
-                if self._es_noticia_poder_judicial(titulo, href):
-                    # Construir URL completa
-                    if href.startswith('http'):
-                        url_completa = href
-                    else:
-                        url_completa = urljoin(self.base_url, href)
-                    
+            # Candidatos del listado ya filtrados, sin URLs repetidas y ordenados por puntaje
+            noticias_links = [
+                {
+                    'titulo': candidato['titulo'],
+                    'url': candidato['url'],
                     # Extraer fecha del texto del enlace
-                    fecha = self._extract_fecha_from_text(titulo)
-                    
-                    noticias_links.append({
-                        'titulo': titulo,
-                        'url': url_completa,
-                        'fecha': fecha
-                    })
+                    'fecha': self._extract_fecha_from_text(candidato['titulo'])
+                }
+                for candidato in clasificador_para('poder_judicial').clasificar(soup.find_all('a', href=True))
+            ]
             
             # Ordenar por fecha y limitar
             noticias_links = sorted(noticias_links, key=lambda x: x['fecha'] or datetime.now(timezone.utc), reverse=True)
@@ -97,63 +86,9 @@ class PoderJudicialScraperV2(BaseScraper):
             self._log_error("Error obteniendo noticias del Poder Judicial", e)
             return []
     
-    def _es_noticia_poder_judicial(self, titulo: str, href: str) -> bool:
-        """Verificar si es una noticia específica del Poder Judicial"""
-        if not titulo or len(titulo) < 20:
-            return False
-        
-        # Palabras clave específicas del Poder Judicial
-        palabras_clave = [
-            'fiscal', 'corte', 'juzgado', 'tribunal', 'sentencia', 'fallo', 
-            'condena', 'prisión', 'acusado', 'imputado', 'sumario', 'querella',
-            'liquidación', 'robo', 'abuso', 'violación', 'homicidio', 'alcalde',
-            'ejército', 'garantía', 'apelaciones', 'suprema', 'oral', 'penal',
-            'civil', 'familia', 'laboral', 'cobranza', 'administrativo'
-        ]
-        
-        # Exclusiones
-        exclusiones = [
-            'anterior', 'siguiente', 'última', 'página', 'filtrar', 'inicio',
-            'menu', 'portal', 'sistema', 'traducción', 'licitaciones'
-        ]
-        
-        # Verificar exclusiones
-        if any(exclusion in titulo.lower() for exclusion in exclusiones):
-            return False
-        
-        # Verificar palabras clave
-        if any(keyword in titulo.lower() for keyword in palabras_clave):
-            return True
-        
-        # Verificar si la URL contiene patrones de noticias
-        if '/noticias-del-poder-judicial/' in href:
-            return True
-        
-        return False
-    
     def _extract_fecha_from_text(self, texto: str) -> Optional[datetime]:
-        """Extraer fecha del texto de la noticia del Poder Judicial"""
-        # Patrones de fecha específicos del Poder Judicial
-        patrones = [
-            r'(\d{1,2})-(\d{1,2})-(\d{4})\s+(\d{1,2}):(\d{1,2})',  # DD-MM-YYYY HH:MM
-            r'(\d{1,2})-(\d{1,2})-(\d{4})',  # DD-MM-YYYY
-            r'(\d{1,2})/(\d{1,2})/(\d{4})',  # DD/MM/YYYY
-        ]
-        
-        for patron in patrones:
-            match = re.search(patron, texto)
-            if match:
-                try:
-                    if len(match.groups()) == 5:  # Con hora
-                        dia, mes, año, hora, minuto = match.groups()
-                        return datetime(int(año), int(mes), int(dia), int(hora), int(minuto), tzinfo=timezone.utc)
-                    else:  # Solo fecha
-                        dia, mes, año = match.groups()
-                        return datetime(int(año), int(mes), int(dia), tzinfo=timezone.utc)
-                except (ValueError, TypeError):
-                    continue
-        
-        return None
+        """Extraer fecha del texto de la noticia (DD-MM-YYYY HH:MM, DD/MM/YYYY...)"""
+        return self.contexto.parsear_fecha(texto)
     
     def get_noticia_completa(self, url: str, titulo: str = None) -> Optional[NoticiaEstandarizada]:
         """Obtener noticia completa desde una URL del Poder Judicial"""
@@ -163,7 +98,7 @@ class PoderJudicialScraperV2(BaseScraper):
             response = self.session.get(url, timeout=30)
             response.raise_for_status()
             
-            soup = BeautifulSoup(response.content, 'html.parser')
+            soup = self._parsear(response.content)
             
             # Extraer información específica del Poder Judicial
             noticia = self._extract_noticia_poder_judicial(soup, url, titulo)
@@ -195,7 +130,7 @@ class PoderJudicialScraperV2(BaseScraper):
             fecha = self._extract_fecha_poder_judicial(soup, titulo, url)
             
             # Buscar contenido
-            contenido = self._extract_contenido_poder_judicial(soup)
+            contenido = self._extract_contenido_generico(soup)
             
             # Extraer información legal específica del Poder Judicial
             info_legal = self._extract_info_legal_poder_judicial(soup, contenido)
@@ -256,12 +191,9 @@ class PoderJudicialScraperV2(BaseScraper):
             fecha_elem = soup.select_one(selector)
             if fecha_elem:
                 # Intentar obtener fecha del atributo datetime
-                datetime_attr = fecha_elem.get('datetime')
-                if datetime_attr:
-                    try:
-                        return datetime.fromisoformat(datetime_attr.replace('Z', '+00:00'))
-                    except:
-                        pass
+                fecha = self.contexto.parsear_fecha(fecha_elem.get('datetime'))
+                if fecha:
+                    return fecha
                 
                 # Intentar parsear texto
                 fecha_texto = fecha_elem.get_text(strip=True)
@@ -277,7 +209,7 @@ class PoderJudicialScraperV2(BaseScraper):
         
         # Buscar fecha en la URL
         if url and 'noticias-del-poder-judicial' in url:
-            fecha_url = self._extract_fecha_from_url(url)
+            fecha_url = fecha_en_url(url)
             if fecha_url:
                 return fecha_url
         
@@ -286,74 +218,7 @@ class PoderJudicialScraperV2(BaseScraper):
     
     def _parse_fecha_poder_judicial(self, fecha_texto: str) -> Optional[datetime]:
         """Parsear fecha específica del formato del Poder Judicial"""
-        if not fecha_texto:
-            return None
-        
-        # Patrones específicos del Poder Judicial
-        patrones = [
-            r'(\d{1,2})/(\d{1,2})/(\d{4})',  # DD/MM/YYYY
-            r'(\d{1,2})-(\d{1,2})-(\d{4})',  # DD-MM-YYYY
-            r'(\d{4})-(\d{1,2})-(\d{1,2})',  # YYYY-MM-DD
-            r'(\d{1,2})\s+de\s+(\w+)\s+de\s+(\d{4})',  # DD de MES de YYYY
-            r'(\d{1,2})\s+(\w+)\s+(\d{4})',  # DD MES YYYY
-        ]
-        
-        for patron in patrones:
-            match = re.search(patron, fecha_texto, re.IGNORECASE)
-            if match:
-                try:
-                    if 'de' in patron:
-                        # Formato "DD de MES de YYYY"
-                        dia, mes_nombre, año = match.groups()
-                        meses = {
-                            'enero': 1, 'febrero': 2, 'marzo': 3, 'abril': 4,
-                            'mayo': 5, 'junio': 6, 'julio': 7, 'agosto': 8,
-                            'septiembre': 9, 'octubre': 10, 'noviembre': 11, 'diciembre': 12
-                        }
-                        mes = meses.get(mes_nombre.lower(), 1)
-                    else:
-                        # Formato numérico
-                        if len(match.group(1)) == 4:  # YYYY-MM-DD
-                            año, mes, dia = match.groups()
-                        else:  # DD/MM/YYYY o DD-MM-YYYY
-                            dia, mes, año = match.groups()
-                    
-                    return datetime(int(año), int(mes), int(dia), tzinfo=timezone.utc)
-                except (ValueError, TypeError):
-                    continue
-        
-        return None
-    
-    def _extract_contenido_poder_judicial(self, soup: BeautifulSoup) -> str:
-        """Extraer contenido específico del Poder Judicial"""
-        # Buscar contenedor de contenido específico del Poder Judicial
-        contenido_selectors = [
-            '.contenido',
-            '.noticia-contenido',
-            '.noticia-texto',
-            '.noticia-cuerpo',
-            'article',
-            '.entry-content',
-            '.post-content',
-            '.main-content',
-            '.content-area'
-        ]
-        
-        for selector in contenido_selectors:
-            contenido_elem = soup.select_one(selector)
-            if contenido_elem:
-                return self._limpiar_contenido(contenido_elem)
-        
-        # Si no se encuentra selector específico, buscar en el body
-        body = soup.find('body')
-        if body:
-            # Remover elementos no deseados
-            for elem in body.find_all(['nav', 'header', 'footer', 'aside', 'script', 'style']):
-                elem.decompose()
-            
-            return self._limpiar_contenido(body)
-        
-        return ""
+        return self.contexto.parsear_fecha(fecha_texto)
     
     def _extract_info_legal_poder_judicial(self, soup: BeautifulSoup, contenido: str) -> Dict:
         """Extraer información legal específica del Poder Judicial"""
@@ -476,8 +341,8 @@ class PoderJudicialScraperV2(BaseScraper):
         
         return autor_info
     
-    def scrape_noticias_recientes(self, max_noticias: int = 10) -> List[NoticiaEstandarizada]:
-        """Scrapear noticias recientes completas del Poder Judicial"""
+    def iter_noticias(self, max_noticias: int = 10) -> Iterator[NoticiaEstandarizada]:
+        """Entregar noticias recientes completas del Poder Judicial a medida que se descargan"""
         self._log_info("Iniciando scraping del Poder Judicial...")
         
         # Obtener lista de noticias
@@ -485,10 +350,10 @@ class PoderJudicialScraperV2(BaseScraper):
         
         if not noticias_links:
             self._log_warning("No se encontraron noticias del Poder Judicial")
-            return []
+            return
         
         # Extraer noticias completas
-        noticias_completas = []
+        extraidas = 0
         
         for i, noticia_link in enumerate(noticias_links, 1):
             self._log_info(f"Procesando noticia {i}/{len(noticias_links)}: {noticia_link['titulo'][:50]}...")
@@ -499,13 +364,10 @@ class PoderJudicialScraperV2(BaseScraper):
             )
             
             if noticia_completa:
-                noticias_completas.append(noticia_completa)
-            
-            # Pausa entre requests para no sobrecargar el servidor
-            self._pausa_entre_requests(1)
+                extraidas += 1
+                yield noticia_completa
         
-        self._log_success(f"Scraping del Poder Judicial completado: {len(noticias_completas)} noticias extraídas")
-        return noticias_completas
+        self._log_success(f"Scraping del Poder Judicial completado: {extraidas} noticias extraídas")
 
 # Función de prueba específica para el Poder Judicial
 def test_poder_judicial_scraper():
@@ -1,66 +1,109 @@
 #!/usr/bin/env python3
 """
 Módulo de prevención de texto problemático para scrapers
+Usa las reglas de los tribunales ambientales de backend/processors/reglas_limpieza.py,
+las mismas que aplica ContentProcessor a esas fuentes.
 """
 
 import re
-from typing import Dict
+from typing import Dict, List
+
+from backend.processors.motor_limpieza import MotorLimpieza
+from backend.processors.reglas_limpieza import FLAGS_CONTENIDO, TRIBUNALES_AMBIENTALES, crear_grupos_fuente
 
 class PrevencionTextoProblematico:
     """Clase para prevenir texto problemático en noticias"""
-    
+
     def __init__(self):
-        # Patrones de texto problemático a detectar y eliminar
-        self.patrones_problematicos = [
-            # Patrones específicos del Tribunal Ambiental
-            r'Acceder al expediente de la causa[A-Z0-9\-]+.*?contacto@tribunalambiental\.cl\.',
-            r'Acceder al expediente[A-Z0-9\-]+.*?contacto@tribunalambiental\.cl\.',
-            r'Morandé 360, Piso 8, Santiago.*?contacto@tribunalambiental\.cl\.',
-            r'Piso 8, Santiago\([0-9\s\+]+\)contacto@tribunalambiental\.cl\.',
-            r'\([0-9\s\+]+\)contacto@tribunalambiental\.cl\.',
-            r'contacto@tribunalambiental\.cl\.',
-            r'R-[0-9\-]+ Morandé 360, Piso 8, Santiago',
-            r'Piso 8, Santiago\([0-9\s\+]+\)\, Piso 8, Santiago',
-        ]
-        
         # Texto de reemplazo para información de contacto
         self.texto_reemplazo = "Para más información, consulte la página oficial del tribunal."
-    
+
+        self.motor_contenido = MotorLimpieza(
+            crear_grupos_fuente(TRIBUNALES_AMBIENTALES), reemplazo=self.texto_reemplazo
+        )
+        self.motor_titulo = MotorLimpieza(crear_grupos_fuente(TRIBUNALES_AMBIENTALES, re.IGNORECASE))
+
+        # Patrones de texto problemático a detectar y eliminar
+        self.patrones_problematicos = [patron for patron, _ in self.motor_contenido.patrones]
+
+    @staticmethod
+    def aplica_a(fuente: str = None) -> bool:
+        """Las reglas aplican a los tribunales ambientales"""
+        if not fuente:
+            return False
+        fuente = fuente.lower()
+        return fuente in TRIBUNALES_AMBIENTALES or 'ambiental' in fuente
+
     def limpiar_contenido(self, contenido: str, fuente: str = None) -> str:
         """Limpiar contenido de texto problemático"""
         if not contenido:
             return contenido
-        
+
         contenido_limpio = contenido
-        
+
         # Aplicar patrones específicos para tribunales ambientales
-        if fuente and 'ambiental' in fuente.lower():
-            for patron in self.patrones_problematicos:
-                contenido_limpio = re.sub(patron, self.texto_reemplazo, contenido_limpio, flags=re.IGNORECASE | re.DOTALL)
-        
+        if self.aplica_a(fuente):
+            contenido_limpio = self.motor_contenido.aplicar(contenido_limpio)
+
         # Limpiar espacios múltiples
         contenido_limpio = re.sub(r'\s+', ' ', contenido_limpio)
         contenido_limpio = contenido_limpio.strip()
-        
+
         return contenido_limpio
-    
+
     def limpiar_titulo(self, titulo: str, fuente: str = None) -> str:
         """Limpiar título de texto problemático"""
         if not titulo:
             return titulo
-        
+
         titulo_limpio = titulo
-        
+
         # Aplicar patrones específicos para tribunales ambientales
-        if fuente and 'ambiental' in fuente.lower():
-            for patron in self.patrones_problematicos:
-                titulo_limpio = re.sub(patron, '', titulo_limpio, flags=re.IGNORECASE)
-        
+        if self.aplica_a(fuente):
+            titulo_limpio = self.motor_titulo.aplicar(titulo_limpio)
+
         # Limpiar espacios múltiples
         titulo_limpio = re.sub(r'\s+', ' ', titulo_limpio)
         titulo_limpio = titulo_limpio.strip()
-        
+
         return titulo_limpio
 
+    def detectar_texto_problematico(self, texto: str) -> List[str]:
+        """Detectar si hay texto problemático en el contenido"""
+        problemas_encontrados = []
+
+        for patron in self.patrones_problematicos:
+            matches = re.findall(patron, texto, FLAGS_CONTENIDO)
+            if matches:
+                problemas_encontrados.append(f"Patrón: {patron}, Coincidencias: {len(matches)}")
+
+        return problemas_encontrados
+
+    def procesar_noticia(self, noticia: Dict) -> Dict:
+        """Procesar una noticia completa para eliminar texto problemático"""
+        fuente = noticia.get('fuente', '')
+
+        # Limpiar título
+        if 'titulo' in noticia:
+            noticia['titulo'] = self.limpiar_titulo(noticia['titulo'], fuente)
+
+        # Limpiar contenido
+        if 'cuerpo_completo' in noticia:
+            noticia['cuerpo_completo'] = self.limpiar_contenido(noticia['cuerpo_completo'], fuente)
+
+        if 'contenido' in noticia:
+            noticia['contenido'] = self.limpiar_contenido(noticia['contenido'], fuente)
+
+        # Detectar problemas
+        texto_completo = f"{noticia.get('titulo', '')} {noticia.get('cuerpo_completo', '')} {noticia.get('contenido', '')}"
+        problemas = self.detectar_texto_problematico(texto_completo)
+
+        if problemas:
+            print(f"⚠️  Texto problemático detectado en noticia de {fuente}:")
+            for problema in problemas:
+                print(f"   - {problema}")
+
+        return noticia
+
 # Instancia global para usar en scrapers
 prevencion_texto = PrevencionTextoProblematico()
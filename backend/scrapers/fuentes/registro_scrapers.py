@@ -0,0 +1,81 @@
+#!/usr/bin/env python3
+"""
+Registro diferido de scrapers por código de fuente
+Se comporta como el diccionario fuente -> scraper que usaba el sistema, pero
+cada scraper se importa y se construye la primera vez que se pide. Un proceso
+que solo muestra estadísticas o recorre una fuente no paga el arranque del
+resto.
+"""
+
+import threading
+from collections.abc import Mapping
+from typing import Dict, Iterable, List, Optional
+
+class RegistroScrapers(Mapping):
+    """Scrapers construidos a pedido, en el orden de `codigos`"""
+
+    def __init__(self, codigos: Iterable[str], fabrica=None, **argumentos):
+        """
+        Args:
+            codigos: Códigos de fuente, en el orden en que se recorren
+            fabrica: función código -> clase (por defecto get_scraper)
+            argumentos: argumentos con que se construye cada scraper
+        """
+        self.codigos: List[str] = list(dict.fromkeys(codigos))
+        self.fabrica = fabrica
+        self.argumentos = argumentos
+        self._instancias: Dict[str, object] = {}
+        self._lock = threading.Lock()
+
+    def __getitem__(self, codigo: str):
+        if codigo not in self.codigos:
+            raise KeyError(codigo)
+
+        instancia = self._instancias.get(codigo)
+        if instancia is not None:
+            return instancia
+
+        with self._lock:
+            instancia = self._instancias.get(codigo)
+            if instancia is None:
+                clase = self._clase(codigo)
+                if clase is None:
+                    raise KeyError(f"{codigo}: el scraper no se pudo importar")
+                instancia = self._instancias[codigo] = clase(**self.argumentos)
+        return instancia
+
+    def __iter__(self):
+        return iter(self.codigos)
+
+    def __len__(self) -> int:
+        return len(self.codigos)
+
+    def __contains__(self, codigo) -> bool:
+        return codigo in self.codigos
+
+    def _clase(self, codigo: str):
+        if self.fabrica is not None:
+            return self.fabrica(codigo)
+        from . import get_scraper
+        return get_scraper(codigo)
+
+    def seleccionar(self, codigos: Iterable[str]) -> 'RegistroScrapers':
+        """Registro con solo esas fuentes (en ese orden), conservando los scrapers ya construidos"""
+        desconocidos = [codigo for codigo in codigos if codigo not in self.codigos]
+        if desconocidos:
+            raise KeyError(f"Fuentes desconocidas: {', '.join(desconocidos)}")
+
+        seleccion = RegistroScrapers(codigos, self.fabrica, **self.argumentos)
+        with self._lock:
+            seleccion._instancias = {
+                codigo: instancia for codigo, instancia in self._instancias.items() if codigo in seleccion.codigos
+            }
+        return seleccion
+
+    def construido(self, codigo: str) -> Optional[object]:
+        """Scraper de la fuente si ya se construyó (sin construirlo)"""
+        return self._instancias.get(codigo)
+
+    def construidos(self) -> List[str]:
+        """Fuentes cuyo scraper ya se construyó"""
+        return [codigo for codigo in self.codigos if codigo in self._instancias]
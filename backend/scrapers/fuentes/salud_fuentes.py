@@ -0,0 +1,200 @@
+#!/usr/bin/env python3
+"""
+Salud de las fuentes y cortacircuitos
+Registra por fuente las visitas fallidas seguidas, la tasa de error y la
+latencia mediana de las últimas visitas, persistidas entre ejecuciones. Una
+fuente que falla varias visitas seguidas abre su circuito y se omite durante
+un enfriamiento creciente; al vencer, una visita de prueba corta decide si
+vuelve a recorrerse con normalidad. Así un sitio caído no consume minutos de
+timeouts en cada ejecución.
+"""
+
+import json
+import os
+import statistics
+import threading
+import time
+from typing import Dict, Iterable, List
+
+from .config import SCRAPING_CONFIG
+
+# Modos de selección: 'completo' omite los circuitos abiertos, 'funcionando' también las
+# fuentes con muchos errores, 'rapido' además las lentas y las visitas de prueba, 'prueba'
+# recorre solo las más sanas y 'todas' no filtra
+MODOS = ('completo', 'funcionando', 'rapido', 'prueba', 'todas')
+
+CERRADO, ABIERTO, PRUEBA = 'cerrado', 'abierto', 'prueba'
+
+def visita_fallida(resultado: Dict) -> bool:
+    """Una visita falla si terminó con errores, o si no entregó noticias y sus peticiones
+    fallaron o se quedó sin tiempo esperando al sitio"""
+    if resultado.get('errores'):
+        return True
+    if resultado.get('encontradas'):
+        return False
+    peticiones = resultado.get('peticiones') or {}
+    return bool(peticiones.get('errores')) or bool(resultado.get('truncada'))
+
+class SaludFuentes:
+    """Historial de visitas y estado del circuito de cada fuente, persistidos en JSON"""
+
+    def __init__(self, ruta: str = None, **config):
+        """
+        Args:
+            ruta: archivo JSON de estado (por defecto en el directorio de estado)
+            config: valores que reemplazan a SCRAPING_CONFIG['salud']
+        """
+        self.ruta = ruta or os.path.join(SCRAPING_CONFIG['directorio_estado'], 'salud_fuentes.json')
+        self.config = dict(SCRAPING_CONFIG['salud'], **config)
+        self._estado = None
+        self._lock = threading.Lock()
+
+    def _cargar(self) -> Dict[str, Dict]:
+        """Leer el archivo la primera vez que se usa"""
+        if self._estado is None:
+            try:
+                with open(self.ruta, encoding='utf-8') as archivo:
+                    self._estado = json.load(archivo)
+            except (OSError, ValueError):
+                self._estado = {}
+        return self._estado
+
+    def _fuente(self, fuente: str) -> Dict:
+        """Registro de una fuente (vacío si nunca se visitó)"""
+        return self._cargar().get(fuente, {})
+
+    # ========================================
+    # CONSULTAS
+    # ========================================
+
+    def estado(self, fuente: str, ahora: float = None) -> str:
+        """'cerrado' (se recorre), 'abierto' (se omite) o 'prueba' (enfriamiento vencido)"""
+        ahora = ahora if ahora is not None else time.time()
+        with self._lock:
+            registro = self._fuente(fuente)
+        if registro.get('circuito') != ABIERTO:
+            return CERRADO
+        return PRUEBA if registro.get('abierto_hasta', 0) <= ahora else ABIERTO
+
+    def resumen(self, fuente: str, ahora: float = None) -> Dict:
+        """Estado del circuito, fallos seguidos, tasa de error y latencia mediana de una fuente"""
+        with self._lock:
+            registro = self._fuente(fuente)
+            visitas = list(registro.get('visitas', []))
+        latencias = [visita['latencia'] for visita in visitas if visita.get('latencia') is not None]
+        return {
+            'circuito': self.estado(fuente, ahora),
+            'abierto_hasta': registro.get('abierto_hasta'),
+            'fallos_consecutivos': registro.get('fallos_consecutivos', 0),
+            'visitas': len(visitas),
+            'tasa_error': sum(not visita['ok'] for visita in visitas) / len(visitas) if visitas else None,
+            'latencia_mediana': statistics.median(latencias) if latencias else None
+        }
+
+    def seleccionar(self, fuentes: Iterable[str], modo: str = 'completo', ahora: float = None) -> List[str]:
+        """Fuentes a recorrer según su salud (ver MODOS); las fuentes sin historial cuentan como sanas"""
+        if modo not in MODOS:
+            raise ValueError(f"Modo de selección desconocido: {modo}")
+        fuentes = list(fuentes)
+        if modo == 'todas':
+            return fuentes
+
+        resumenes = {fuente: self.resumen(fuente, ahora) for fuente in fuentes}
+        seleccion = []
+        for fuente in fuentes:
+            resumen = resumenes[fuente]
+            if resumen['circuito'] == ABIERTO:
+                continue
+            if modo == 'completo':
+                seleccion.append(fuente)
+                continue
+            if resumen['circuito'] == PRUEBA:
+                if modo == 'funcionando':
+                    seleccion.append(fuente)
+                continue
+            if (resumen['visitas'] >= self.config['visitas_minimas']
+                    and resumen['tasa_error'] > self.config['tasa_error_maxima']):
+                continue
+            if modo == 'rapido' and (resumen['latencia_mediana'] or 0) > self.config['latencia_maxima_rapida']:
+                continue
+            if modo == 'prueba' and resumen['fallos_consecutivos']:
+                continue
+            seleccion.append(fuente)
+
+        if modo == 'prueba':
+            # Las de menos errores y más rápidas primero; sin historial, después de las conocidas
+            seleccion = sorted(seleccion, key=lambda fuente: (
+                resumenes[fuente]['tasa_error'] if resumenes[fuente]['visitas'] else 1,
+                resumenes[fuente]['latencia_mediana'] if resumenes[fuente]['latencia_mediana'] is not None else float('inf')
+            ))[:self.config['fuentes_prueba']]
+        return seleccion
+
+    def get_estadisticas(self, fuentes: Iterable[str] = None, ahora: float = None) -> Dict[str, Dict]:
+        """Resumen de cada fuente (por defecto, de todas las registradas)"""
+        if fuentes is None:
+            with self._lock:
+                fuentes = list(self._cargar())
+        return {fuente: self.resumen(fuente, ahora) for fuente in fuentes}
+
+    # ========================================
+    # ACTUALIZACIÓN
+    # ========================================
+
+    def registrar_visitas(self, resultados: Iterable[Dict], ahora: float = None) -> Dict[str, str]:
+        """Actualizar historial y circuitos con los resultados de una ejecución
+        ({'fuente', 'encontradas', 'errores', 'truncada', 'duracion', 'peticiones'})
+
+        Devuelve el estado del circuito de las fuentes cuyo circuito cambió.
+        """
+        ahora = ahora if ahora is not None else time.time()
+        cambios = {}
+        visitadas = 0
+
+        with self._lock:
+            estado = self._cargar()
+            for resultado in resultados:
+                visitadas += 1
+                fuente = resultado['fuente']
+                registro = estado.setdefault(fuente, {})
+                fallida = visita_fallida(resultado)
+
+                visitas = registro.setdefault('visitas', [])
+                visitas.append({
+                    'fecha': ahora,
+                    'ok': not fallida,
+                    'latencia': (resultado.get('peticiones') or {}).get('latencia_mediana'),
+                    'duracion': resultado.get('duracion')
+                })
+                del visitas[:-self.config['ventana_visitas']]
+
+                abierto = registro.get('circuito') == ABIERTO
+                if not fallida:
+                    registro['fallos_consecutivos'] = 0
+                    if abierto:
+                        registro.update(circuito=CERRADO, aperturas=0, abierto_hasta=None)
+                        cambios[fuente] = CERRADO
+                    continue
+
+                registro['fallos_consecutivos'] = registro.get('fallos_consecutivos', 0) + 1
+                if abierto or registro['fallos_consecutivos'] >= self.config['umbral_fallos']:
+                    # Una visita de prueba fallida duplica el enfriamiento
+                    aperturas = registro.get('aperturas', 0) + 1
+                    enfriamiento = min(self.config['enfriamiento_maximo'],
+                                       self.config['enfriamiento'] * 2 ** (aperturas - 1))
+                    registro.update(circuito=ABIERTO, aperturas=aperturas, abierto_hasta=ahora + enfriamiento)
+                    cambios[fuente] = ABIERTO
+
+            if visitadas:
+                self._guardar(estado)
+        return cambios
+
+    def _guardar(self, estado: Dict):
+        """Escribir el archivo de forma atómica"""
+        try:
+            os.makedirs(os.path.dirname(self.ruta), exist_ok=True)
+            temporal = f"{self.ruta}.tmp"
+            with open(temporal, 'w', encoding='utf-8') as archivo:
+                json.dump(estado, archivo, ensure_ascii=False, indent=2)
+            os.replace(temporal, self.ruta)
+        except OSError as e:
+            print(f"⚠️  No se pudo guardar la salud de las fuentes: {e}")
@@ -3,21 +3,22 @@
 Scraper final para SII basado en análisis manual
 """
 
-import requests
 from bs4 import BeautifulSoup
 import re
 from datetime import datetime, timezone
 import hashlib
-from typing import List, Optional
+from typing import Iterator, List, Optional
 from ..data_schema import NoticiaEstandarizada, Categoria, Jurisdiccion, TipoDocumento
-from ..date_extractor import date_extractor
+from ..limitador_peticiones import iterar_en_paralelo
+from ..contexto_ejecucion import ContextoEjecucion, contexto_por_defecto
+from ..parseo import parsear
 
 class SIIScraper:
-    def __init__(self, openai_api_key: str = None):
+    def __init__(self, openai_api_key: str = None, contexto: ContextoEjecucion = None):
         self.base_url = "https://www.sii.cl"
         self.noticias_url = "https://www.sii.cl/noticias/2025/index.html"
-        self.session = requests.Session()
-        self.session.headers.update({
+        self.contexto = contexto or contexto_por_defecto()
+        self.session = self.contexto.nueva_sesion({
             'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36'
         })
         self.openai_api_key = openai_api_key
@@ -25,7 +26,10 @@ class SIIScraper:
     def extraer_codigos_noticias(self):
         """Extraer códigos de noticias de la página principal"""
         try:
-            response = self.session.get(self.noticias_url, timeout=10)
+            response = self.session.get_condicional(self.noticias_url, timeout=10)
+            if response.status_code == 304:
+                print(f"ℹ️ Listado sin cambios desde la última ejecución (304)")
+                return []
             if response.status_code != 200:
                 print(f"❌ Error accediendo a {self.noticias_url}: {response.status_code}")
                 return []
@@ -39,14 +43,18 @@ class SIIScraper:
             
             print(f"🔍 Encontrados {len(codigos)} códigos de noticias")
             
-            noticias = []
-            for codigo in codigos[:10]:  # Limitar a 10 noticias
-                url_noticia = f"https://www.sii.cl/noticias/2025/{codigo}.htm"
-                noticia = self.extraer_noticia_por_codigo(url_noticia, codigo)
-                if noticia:
-                    noticias.append(noticia)
+            # Limitar a 10 noticias, cortar en la marca de agua y omitir las ya almacenadas
+            urls = self.contexto.indice_urls.filtrar_nuevas(self.contexto.marcas_agua.recortar(self.base_url, [
+                f"https://www.sii.cl/noticias/2025/{codigo}.htm" for codigo in dict.fromkeys(codigos[:10])
+            ]))
             
-            return noticias
+            # Detalles en paralelo según el límite del host
+            return iterar_en_paralelo(
+                urls,
+                lambda url: self.extraer_noticia_por_codigo(url, url.rsplit('/', 1)[-1][:-len('.htm')]),
+                self.base_url,
+                sesion=self.session
+            )
             
         except Exception as e:
             print(f"❌ Error extrayendo códigos: {e}")
@@ -59,7 +67,7 @@ class SIIScraper:
             if response.status_code != 200:
                 return None
             
-            soup = BeautifulSoup(response.text, 'html.parser')
+            soup = parsear(response.text)
             
             # Extraer título
             titulo = soup.find('title')
@@ -100,7 +108,7 @@ class SIIScraper:
     def _extract_fecha_universal(self, soup: BeautifulSoup, url: str = None) -> datetime:
         """Extraer fecha usando extractor universal"""
         try:
-            fecha = date_extractor.extract_date_from_html(soup, url)
+            fecha = self.contexto.date_extractor.extract_date_from_html(soup, url)
             if fecha:
                 return fecha
             return datetime.now(timezone.utc)
@@ -110,14 +118,18 @@ class SIIScraper:
     
     def scrape(self):
         """Método principal de scraping"""
-        print("🔍 Iniciando scraping del SII (versión final)...")
-        noticias = self.extraer_codigos_noticias()
+        noticias = list(self.iter_noticias())
         print(f"✅ Se extrajeron {len(noticias)} noticias del SII")
         return noticias
     
     def scrape_noticias_recientes(self, max_noticias: int = 10) -> List[NoticiaEstandarizada]:
         """Método compatible con el sistema principal"""
         return self.scrape()
+    
+    def iter_noticias(self, max_noticias: int = 10) -> Iterator[NoticiaEstandarizada]:
+        """Entregar las noticias a medida que se descargan (el listado se lee completo antes)"""
+        print("🔍 Iniciando scraping del SII (versión final)...")
+        return iter(self.extraer_codigos_noticias())
 
 # Uso del scraper
 if __name__ == "__main__":
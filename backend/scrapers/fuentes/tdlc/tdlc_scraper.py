@@ -4,12 +4,12 @@ Scraper para el Tribunal de Defensa de la Libre Competencia de Chile
 """
 import sys
 import os
-from typing import List, Dict, Optional
+from typing import Dict, Iterator, List, Optional
 from datetime import datetime, timezone
-from bs4 import BeautifulSoup
 import re
 sys.path.append(os.path.dirname(os.path.dirname(os.path.dirname(os.path.dirname(__file__)))))
 from backend.scrapers.fuentes.base_scraper import BaseScraper
+from backend.scrapers.fuentes.contexto_ejecucion import ContextoEjecucion
 from backend.scrapers.fuentes.data_schema import (
     NoticiaEstandarizada,
     DataNormalizer,
@@ -21,8 +21,8 @@ from backend.scrapers.fuentes.data_schema import (
 class TDLScraper(BaseScraper):
     """Scraper para el Tribunal de Defensa de la Libre Competencia de Chile"""
     
-    def __init__(self, openai_api_key: str = None):
-        super().__init__(openai_api_key)
+    def __init__(self, openai_api_key: str = None, contexto: ContextoEjecucion = None):
+        super().__init__(openai_api_key, contexto)
         self.base_url = "https://www.tdlc.cl"
         self.noticias_url = "https://www.tdlc.cl/noticias/"
         self.version_scraper = "1.0"
@@ -39,13 +39,15 @@ class TDLScraper(BaseScraper):
         """Extrae las noticias más recientes del TDLC"""
         try:
             print(f"🔍 Extrayendo noticias de TDLC...")
-            response = self.session.get(self.noticias_url, timeout=30)
+            response = self.session.get_condicional(self.noticias_url, timeout=30)
+            if self._sin_cambios(response):
+                return []
             response.raise_for_status()
             
             # Configurar encoding para evitar problemas de codificación
             response.encoding = 'utf-8'
             
-            soup = BeautifulSoup(response.text, 'html.parser')  # Usar response.text en lugar de response.content
+            soup = self._parsear_listado(response.text)  # Usar response.text en lugar de response.content
             noticias = []
             
             # Buscar noticias en la página principal
@@ -117,7 +119,7 @@ class TDLScraper(BaseScraper):
             # Configurar encoding para evitar problemas de codificación
             response.encoding = 'utf-8'
             
-            soup = BeautifulSoup(response.text, 'html.parser')  # Usar response.text en lugar de response.content
+            soup = self._parsear(response.text)  # Usar response.text en lugar de response.content
             
             # Buscar contenido principal
             contenido_selectors = [
@@ -187,32 +189,8 @@ class TDLScraper(BaseScraper):
             return None
 
     def normalizar_fecha(self, fecha_str: str) -> datetime:
-        """Normaliza diferentes formatos de fecha del TDLC"""
-        try:
-            # Formato: DD/MM/YYYY
-            if re.match(r'\d{2}/\d{2}/\d{4}', fecha_str):
-                return datetime.strptime(fecha_str, '%d/%m/%Y').replace(tzinfo=timezone.utc)
-            
-            # Otros formatos comunes
-            formatos = [
-                '%Y-%m-%d',
-                '%d-%m-%Y',
-                '%Y/%m/%d',
-                '%d/%m/%Y %H:%M',
-                '%Y-%m-%d %H:%M:%S'
-            ]
-            
-            for formato in formatos:
-                try:
-                    return datetime.strptime(fecha_str, formato).replace(tzinfo=timezone.utc)
-                except:
-                    continue
-            
-            # Si no se puede parsear, usar fecha actual
-            return datetime.now(timezone.utc)
-            
-        except Exception:
-            return datetime.now(timezone.utc)
+        """Normaliza diferentes formatos de fecha del TDLC (fecha actual si no se reconoce)"""
+        return self.contexto.normalizar_fecha(fecha_str)
 
     def extraer_palabras_clave(self, texto: str) -> List[str]:
         """Extrae palabras clave relevantes del texto"""
@@ -255,18 +233,13 @@ class TDLScraper(BaseScraper):
             print(f"❌ Error obteniendo noticia completa TDLC: {str(e)}")
             return None
 
-    def scrape_noticias_recientes(self, max_noticias: int = 10) -> List[NoticiaEstandarizada]:
-        """Scrapear noticias recientes completas"""
+    def iter_noticias(self, max_noticias: int = 10) -> Iterator[NoticiaEstandarizada]:
+        """Entregar noticias recientes completas a medida que se descargan"""
         try:
-            noticias_raw = self.get_noticias_recientes(max_noticias)
-            noticias_procesadas = []
-            
-            for noticia_raw in noticias_raw:
-                noticia_procesada = self.procesar_noticia(noticia_raw)
-                if noticia_procesada:
-                    noticias_procesadas.append(noticia_procesada)
+            # Obtener lista de noticias (sin las ya almacenadas)
+            noticias_raw = self._descartar_conocidas(self.get_noticias_recientes(max_noticias))
             
-            return noticias_procesadas
+            # Detalles en paralelo, según el límite del host
+            yield from self._iterar_detalles(noticias_raw, self.procesar_noticia)
         except Exception as e:
             print(f"❌ Error scrapeando noticias TDLC: {str(e)}")
-            return [] 
\ No newline at end of file
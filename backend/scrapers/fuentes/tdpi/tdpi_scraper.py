@@ -5,7 +5,7 @@ Scraper para el Tribunal de Propiedad Industrial de Chile
 
 import sys
 import os
-from typing import List, Dict, Optional
+from typing import Dict, Iterator, List, Optional
 from datetime import datetime, timezone
 from bs4 import BeautifulSoup
 import re
@@ -14,6 +14,7 @@ import re
 sys.path.append(os.path.dirname(os.path.dirname(os.path.dirname(os.path.dirname(__file__)))))
 
 from backend.scrapers.fuentes.base_scraper import BaseScraper
+from backend.scrapers.fuentes.contexto_ejecucion import ContextoEjecucion
 from backend.scrapers.fuentes.data_schema import (
     NoticiaEstandarizada, 
     DataNormalizer,
@@ -21,13 +22,22 @@ from backend.scrapers.fuentes.data_schema import (
     Jurisdiccion,
     TipoDocumento
 )
-from backend.scrapers.fuentes.date_extractor import date_extractor
+from backend.scrapers.fuentes.clasificador_enlaces import normalizar_url
+from backend.scrapers.fuentes.listado_titulares import TITULARES, emparejar_titulares
+
+# Enlaces de WordPress con la fecha en la ruta (/2025/05/12/)
+ENLACE_CON_FECHA = re.compile(r'/\d{4}/\d{2}/\d{2}/')
+
+def es_enlace_noticia(link) -> bool:
+    """Enlace "Seguir leyendo", con fecha en la URL o del propio sitio"""
+    href = link['href']
+    return 'seguir' in link.get_text().lower() or bool(ENLACE_CON_FECHA.search(href)) or 'tdpi.cl' in href
 
 class TDPScraper(BaseScraper):
     """Scraper para el Tribunal de Propiedad Industrial de Chile"""
     
-    def __init__(self, openai_api_key: str = None):
-        super().__init__(openai_api_key)
+    def __init__(self, openai_api_key: str = None, contexto: ContextoEjecucion = None):
+        super().__init__(openai_api_key, contexto)
         self.base_url = "https://www.tdpi.cl"
         self.noticias_url = "https://www.tdpi.cl/category/noticias/"
         self.version_scraper = "1.0"
@@ -47,116 +57,58 @@ class TDPScraper(BaseScraper):
         try:
             self._log_info("Obteniendo noticias del Tribunal de Propiedad Industrial...")
             
-            response = self.session.get(self.noticias_url, timeout=30)
+            response = self.session.get_condicional(self.noticias_url, timeout=30)
+            if self._sin_cambios(response):
+                return []
             response.raise_for_status()
             
             # Configurar encoding para evitar problemas de codificación
             response.encoding = 'utf-8'
             
-            soup = BeautifulSoup(response.text, 'html.parser')  # Usar response.text en lugar de response.content
+            soup = self._parsear_listado(response.text)  # Usar response.text en lugar de response.content
             
             # Buscar enlaces de noticias
             noticias_links = []
+            vistas = set()
             
-            # Método 1: Buscar títulos con enlaces "Seguir leyendo"
-            # Las noticias tienen estructura: <h3>título</h3> ... <a>Seguir leyendo</a>
-            h3_titles = soup.find_all('h3')
+            def agregar(titulo: str, href: str):
+                url = normalizar_url(href, self.base_url)
+                if url and url not in vistas:
+                    vistas.add(url)
+                    noticias_links.append({
+                        'url': url,
+                        'titulo': titulo
+                    })
             
-            for h3 in h3_titles:
+            # Método 1: Las noticias tienen estructura: <h3>título</h3> ... <a>Seguir leyendo</a>
+            # Cada título se empareja con el primer enlace de noticia que lo sigue
+            for h3, enlace in emparejar_titulares(soup, es_enlace_noticia):
                 titulo = h3.get_text(strip=True)
-                
                 if titulo and len(titulo) > 10:
-                    # Buscar el enlace "Seguir leyendo" en el siguiente contenido
-                    next_sibling = h3.find_next_sibling()
-                    url = None
-                    
-                    # Buscar en los siguientes 5 elementos hermanos
-                    current = h3
-                    for _ in range(5):
-                        current = current.find_next()
-                        if current and current.name == 'a':
-                            href = current.get('href', '')
-                            if href and ('seguir' in current.get_text().lower() or 
-                                       '2025' in href or 'tdpi.cl' in href):
-                                url = href
-                                break
-                        elif current and current.find('a'):
-                            link = current.find('a')
-                            href = link.get('href', '')
-                            if href and ('seguir' in link.get_text().lower() or 
-                                       '2025' in href or 'tdpi.cl' in href):
-                                url = href
-                                break
-                    
-                    # Si no se encuentra el enlace, buscar en toda la página enlaces que contengan el título
-                    if not url:
-                        all_links = soup.find_all('a', href=True)
-                        for link in all_links:
-                            href = link.get('href', '')
-                            if href and ('2025' in href or 'tdpi.cl' in href):
-                                # Verificar si el enlace está cerca del título
-                                url = href
-                                break
-                    
-                    if url:
-                        # Construir URL completa
-                        if url.startswith('/'):
-                            url = self.base_url + url
-                        elif not url.startswith('http'):
-                            url = self.base_url + '/' + url
-                        
-                        noticias_links.append({
-                            'url': url,
-                            'titulo': titulo
-                        })
-                        
-                        if len(noticias_links) >= max_noticias:
-                            break
+                    agregar(titulo, enlace['href'])
+                    if len(noticias_links) >= max_noticias:
+                        break
             
-            # Método 2: Si no hay suficientes noticias, buscar enlaces que contengan fechas
+            # Método 2: Si no hay suficientes noticias, buscar enlaces que contengan fechas (formato YYYY/MM/DD)
             if len(noticias_links) < 3:
-                # Buscar enlaces que contengan fechas (formato YYYY/MM/DD)
-                date_links = soup.find_all('a', href=re.compile(r'/\d{4}/\d{2}/\d{2}/'))
-                
-                for link in date_links:
-                    href = link.get('href', '')
-                    
-                    # Buscar el título en el contexto cercano
-                    titulo = ""
+                enlaces_fecha = emparejar_titulares(
+                    soup, lambda link: bool(ENLACE_CON_FECHA.search(link['href'])),
+                    titulares=TITULARES, consumir=False
+                )
+                for titular, link in enlaces_fecha:
+                    href = link['href']
                     
-                    # Buscar título en elementos hermanos anteriores
-                    prev_elem = link.find_previous(['h1', 'h2', 'h3', 'h4', 'h5', 'h6'])
-                    if prev_elem:
-                        titulo = prev_elem.get_text(strip=True)
-                    
-                    # Si no se encuentra, extraer de la URL
+                    # Título del encabezado anterior o, si no hay, de la URL
+                    titulo = titular.get_text(strip=True) if titular else ""
                     if not titulo:
-                        url_parts = href.split('/')
-                        if len(url_parts) > 3:
-                            last_part = url_parts[-1]
-                            if last_part:
-                                titulo = last_part.replace('-', ' ').replace('_', ' ').title()
+                        last_part = href.rstrip('/').split('/')[-1]
+                        titulo = last_part.replace('-', ' ').replace('_', ' ').title()
                     
-                    if (href and titulo and len(titulo) > 10 and
+                    if (titulo and len(titulo) > 10 and
                         not any(excl in titulo.lower() for excl in ['inicio', 'menu', 'contacto', 'transparencia'])):
-                        
-                        # Construir URL completa
-                        if href.startswith('/'):
-                            url = self.base_url + href
-                        elif href.startswith('http'):
-                            url = href
-                        else:
-                            url = self.base_url + '/' + href
-                        
-                        # Evitar duplicados
-                        if not any(n['url'] == url for n in noticias_links):
-                            noticias_links.append({
-                                'url': url,
-                                'titulo': titulo
-                            })
-                            
-                            if len(noticias_links) >= max_noticias:
-                                break
+                        agregar(titulo, href)
+                        if len(noticias_links) >= max_noticias:
+                            break
             
             self._log_success(f"Encontradas {len(noticias_links)} noticias del TDPI")
             return noticias_links[:max_noticias]
@@ -176,7 +128,7 @@ class TDPScraper(BaseScraper):
             # Configurar encoding para evitar problemas de codificación
             response.encoding = 'utf-8'
             
-            soup = BeautifulSoup(response.text, 'html.parser')  # Usar response.text en lugar de response.content
+            soup = self._parsear(response.text)  # Usar response.text en lugar de response.content
             
             # Extraer título
             if not titulo:
@@ -265,7 +217,7 @@ class TDPScraper(BaseScraper):
     def _extract_fecha_universal(self, soup: BeautifulSoup, url: str = None) -> datetime:
         """Extraer fecha usando extractor universal"""
         try:
-            fecha = date_extractor.extract_date_from_html(soup, url)
+            fecha = self.contexto.date_extractor.extract_date_from_html(soup, url)
             if fecha:
                 return fecha
             return datetime.now(timezone.utc)
@@ -291,29 +243,10 @@ class TDPScraper(BaseScraper):
             for selector in fecha_selectors:
                 fecha_elem = soup.select_one(selector)
                 if fecha_elem:
-                    # Intentar extraer fecha del atributo datetime
-                    datetime_attr = fecha_elem.get('datetime')
-                    if datetime_attr:
-                        return datetime.fromisoformat(datetime_attr.replace('Z', '+00:00'))
-                    
-                    # Intentar extraer fecha del texto
-                    fecha_texto = fecha_elem.get_text(strip=True)
-                    if fecha_texto:
-                        # Patrones de fecha comunes
-                        patterns = [
-                            r'(\d{1,2})/(\d{1,2})/(\d{4})',
-                            r'(\d{1,2})-(\d{1,2})-(\d{4})',
-                            r'(\d{4})-(\d{1,2})-(\d{1,2})'
-                        ]
-                        
-                        for pattern in patterns:
-                            match = re.search(pattern, fecha_texto)
-                            if match:
-                                if len(match.groups()) == 3:
-                                    if len(match.group(1)) == 4:  # YYYY-MM-DD
-                                        return datetime(int(match.group(1)), int(match.group(2)), int(match.group(3)), tzinfo=timezone.utc)
-                                    else:  # DD/MM/YYYY o DD-MM-YYYY
-                                        return datetime(int(match.group(3)), int(match.group(2)), int(match.group(1)), tzinfo=timezone.utc)
+                    # Intentar extraer fecha del atributo datetime y, si no, del texto
+                    fecha = self.contexto.parsear_fecha(fecha_elem.get('datetime')) or self.contexto.parsear_fecha(fecha_elem.get_text(strip=True))
+                    if fecha:
+                        return fecha
             
             return None
             
@@ -352,35 +285,25 @@ class TDPScraper(BaseScraper):
         
         return info
     
-    def scrape_noticias_recientes(self, max_noticias: int = 10) -> List[NoticiaEstandarizada]:
-        """Scrapear noticias recientes completas del TDPI"""
+    def iter_noticias(self, max_noticias: int = 10) -> Iterator[NoticiaEstandarizada]:
+        """Entregar noticias recientes completas del TDPI a medida que se descargan"""
         self._log_info("Iniciando scraping del Tribunal de Propiedad Industrial...")
         
-        # Obtener enlaces de noticias
-        noticias_links = self.get_noticias_recientes(max_noticias)
+        # Obtener enlaces de noticias (sin las ya almacenadas)
+        noticias_links = self._descartar_conocidas(self.get_noticias_recientes(max_noticias))
         
         if not noticias_links:
             self._log_warning("No se encontraron enlaces de noticias del TDPI")
-            return []
+            return
         
-        # Extraer noticias completas
-        noticias_completas = []
+        # Extraer noticias completas (en paralelo, según el límite del host)
+        def obtener(link):
+            self._log_info(f"Procesando noticia: {link['titulo'][:50]}...")
+            return self.get_noticia_completa(link['url'], link['titulo'])
         
-        for i, link in enumerate(noticias_links):
-            try:
-                self._log_info(f"Procesando noticia {i+1}/{len(noticias_links)}: {link['titulo'][:50]}...")
-                
-                noticia = self.get_noticia_completa(link['url'], link['titulo'])
-                
-                if noticia:
-                    noticias_completas.append(noticia)
-                
-                # Pausa entre requests
-                self._pausa_entre_requests(1)
-                
-            except Exception as e:
-                self._log_error(f"Error procesando noticia {link['url']}", e)
-                continue
+        extraidas = 0
+        for noticia in self._iterar_detalles(noticias_links, obtener):
+            extraidas += 1
+            yield noticia
         
-        self._log_success(f"Scraping del TDPI completado: {len(noticias_completas)} noticias extraídas")
-        return noticias_completas 
\ No newline at end of file
+        self._log_success(f"Scraping del TDPI completado: {extraidas} noticias extraídas") 
\ No newline at end of file
@@ -4,12 +4,12 @@ Scraper para el Tercer Tribunal Ambiental de Chile
 """
 import sys
 import os
-from typing import List, Dict, Optional
+from typing import Dict, Iterator, List, Optional
 from datetime import datetime, timezone
-from bs4 import BeautifulSoup
 import re
 sys.path.append(os.path.dirname(os.path.dirname(os.path.dirname(os.path.dirname(__file__)))))
 from backend.scrapers.fuentes.base_scraper import BaseScraper
+from backend.scrapers.fuentes.contexto_ejecucion import ContextoEjecucion
 from backend.scrapers.fuentes.data_schema import (
     NoticiaEstandarizada, 
     MetadataNoticia,
@@ -22,8 +22,8 @@ from backend.scrapers.fuentes.data_schema import (
 class TercerTribunalAmbientalScraper(BaseScraper):
     """Scraper para el Tercer Tribunal Ambiental de Chile"""
     
-    def __init__(self, openai_api_key: str = None):
-        super().__init__(openai_api_key)
+    def __init__(self, openai_api_key: str = None, contexto: ContextoEjecucion = None):
+        super().__init__(openai_api_key, contexto)
         self.base_url = "https://3ta.cl"
         self.noticias_url = "https://3ta.cl/category/noticias/"
         self.version_scraper = "1.0"
@@ -40,10 +40,12 @@ class TercerTribunalAmbientalScraper(BaseScraper):
         """Extrae las noticias más recientes del Tercer Tribunal Ambiental"""
         try:
             print(f"🔍 Extrayendo noticias de 3TA...")
-            response = self.session.get(self.noticias_url, timeout=30)
+            response = self.session.get_condicional(self.noticias_url, timeout=30)
+            if self._sin_cambios(response):
+                return []
             response.raise_for_status()
             
-            soup = BeautifulSoup(response.content, 'html.parser')
+            soup = self._parsear_listado(response.content)
             noticias = []
             
             # Buscar artículos de noticias
@@ -108,7 +110,7 @@ class TercerTribunalAmbientalScraper(BaseScraper):
             response = self.session.get(url, timeout=30)
             response.raise_for_status()
             
-            soup = BeautifulSoup(response.content, 'html.parser')
+            soup = self._parsear(response.content)
             
             # Extraer título
             titulo_elem = soup.find(['h1', 'h2', 'h3'], class_=re.compile(r'titulo|title|entry-title'))
@@ -147,37 +149,33 @@ class TercerTribunalAmbientalScraper(BaseScraper):
                 'contenido': ''
             }
 
-    def scrape_noticias_recientes(self, max_noticias: int = 20) -> List[NoticiaEstandarizada]:
-        """Scrapea las noticias más recientes y las convierte a formato estandarizado"""
+    def iter_noticias(self, max_noticias: int = 20) -> Iterator[NoticiaEstandarizada]:
+        """Entrega las noticias más recientes en formato estandarizado a medida que se descargan"""
         try:
             print(f"🔄 Scrapeando noticias recientes de 3TA...")
             
-            # Obtener lista de noticias
-            noticias_raw = self.get_noticias_recientes(max_noticias)
-            noticias_estandarizadas = []
+            # Obtener lista de noticias (sin las ya almacenadas)
+            noticias_raw = self._descartar_conocidas(self.get_noticias_recientes(max_noticias))
             
-            for noticia_raw in noticias_raw:
-                try:
-                    # Obtener contenido completo si no lo tiene
-                    if not noticia_raw.get('contenido'):
-                        noticia_completa = self.get_noticia_completa(noticia_raw['url'])
-                        noticia_raw.update(noticia_completa)
-                    
-                    # Procesar y estandarizar
-                    noticia_estandarizada = self.procesar_noticia(noticia_raw)
-                    if noticia_estandarizada:
-                        noticias_estandarizadas.append(noticia_estandarizada)
-                        
-                except Exception as e:
-                    print(f"⚠️ Error procesando noticia: {str(e)}")
-                    continue
+            def obtener(noticia_raw):
+                # Obtener contenido completo si no lo tiene
+                if not noticia_raw.get('contenido'):
+                    noticia_completa = self.get_noticia_completa(noticia_raw['url'])
+                    noticia_raw.update(noticia_completa)
+                
+                # Procesar y estandarizar
+                return self.procesar_noticia(noticia_raw)
+            
+            # Detalles en paralelo, según el límite del host
+            estandarizadas = 0
+            for noticia in self._iterar_detalles(noticias_raw, obtener):
+                estandarizadas += 1
+                yield noticia
             
-            print(f"✅ 3TA: {len(noticias_estandarizadas)} noticias estandarizadas")
-            return noticias_estandarizadas
+            print(f"✅ 3TA: {estandarizadas} noticias estandarizadas")
             
         except Exception as e:
             print(f"❌ Error en scraping de 3TA: {str(e)}")
-            return []
 
     def extraer_contenido_completo(self, url: str) -> str:
         """Extrae el contenido completo de una noticia específica"""
@@ -185,7 +183,7 @@ class TercerTribunalAmbientalScraper(BaseScraper):
             response = self.session.get(url, timeout=30)
             response.raise_for_status()
             
-            soup = BeautifulSoup(response.content, 'html.parser')
+            soup = self._parsear(response.content)
             
             # Buscar contenido principal
             contenido_selectors = [
@@ -263,35 +261,8 @@ class TercerTribunalAmbientalScraper(BaseScraper):
             return None
 
     def normalizar_fecha(self, fecha_str: str) -> datetime:
-        """Normaliza diferentes formatos de fecha del 3TA"""
-        try:
-            if not fecha_str:
-                return datetime.now(timezone.utc)
-            
-            # Formato: DD/MM/YYYY
-            if re.match(r'\d{2}/\d{2}/\d{4}', fecha_str):
-                return datetime.strptime(fecha_str, '%d/%m/%Y').replace(tzinfo=timezone.utc)
-            
-            # Otros formatos comunes
-            formatos = [
-                '%Y-%m-%d',
-                '%d-%m-%Y',
-                '%Y/%m/%d',
-                '%d/%m/%Y %H:%M',
-                '%Y-%m-%d %H:%M:%S'
-            ]
-            
-            for formato in formatos:
-                try:
-                    return datetime.strptime(fecha_str, formato).replace(tzinfo=timezone.utc)
-                except:
-                    continue
-            
-            # Si no se puede parsear, usar fecha actual
-            return datetime.now(timezone.utc)
-            
-        except Exception:
-            return datetime.now(timezone.utc)
+        """Normaliza diferentes formatos de fecha del 3TA (fecha actual si no se reconoce)"""
+        return self.contexto.normalizar_fecha(fecha_str)
 
     def extraer_palabras_clave(self, texto: str) -> List[str]:
         """Extrae palabras clave relevantes del texto"""
@@ -4,12 +4,14 @@ Scraper para el Tribunal Ambiental General de Chile
 """
 import sys
 import os
-from typing import List, Dict, Optional
+from typing import Dict, Iterator, List, Optional
 from datetime import datetime, timezone
 from bs4 import BeautifulSoup
 import re
 sys.path.append(os.path.dirname(os.path.dirname(os.path.dirname(os.path.dirname(__file__)))))
 from backend.scrapers.fuentes.base_scraper import BaseScraper
+from backend.scrapers.fuentes.contexto_ejecucion import ContextoEjecucion
+from backend.scrapers.fuentes.fechas import fecha_en_url
 from backend.scrapers.fuentes.data_schema import (
     NoticiaEstandarizada, 
     MetadataNoticia,
@@ -22,8 +24,8 @@ from backend.scrapers.fuentes.data_schema import (
 class TribunalAmbientalScraper(BaseScraper):
     """Scraper para el Tribunal Ambiental General de Chile"""
     
-    def __init__(self, openai_api_key: str = None):
-        super().__init__(openai_api_key)
+    def __init__(self, openai_api_key: str = None, contexto: ContextoEjecucion = None):
+        super().__init__(openai_api_key, contexto)
         self.base_url = "https://tribunalambiental.cl"
         self.noticias_url = "https://tribunalambiental.cl/category/noticias/"
         self.version_scraper = "1.0"
@@ -40,10 +42,12 @@ class TribunalAmbientalScraper(BaseScraper):
         """Extrae las noticias más recientes del Tribunal Ambiental General"""
         try:
             print(f"🔍 Extrayendo noticias de Tribunal Ambiental...")
-            response = self.session.get(self.noticias_url, timeout=30)
+            response = self.session.get_condicional(self.noticias_url, timeout=30)
+            if self._sin_cambios(response):
+                return []
             response.raise_for_status()
             
-            soup = BeautifulSoup(response.content, 'html.parser')
+            soup = self._parsear_listado(response.content)
             noticias = []
             
             # Buscar artículos de noticias
@@ -108,7 +112,7 @@ class TribunalAmbientalScraper(BaseScraper):
             response = self.session.get(url, timeout=30)
             response.raise_for_status()
             
-            soup = BeautifulSoup(response.content, 'html.parser')
+            soup = self._parsear(response.content)
             
             # Extraer título
             titulo_elem = soup.find(['h1', 'h2', 'h3'], class_=re.compile(r'titulo|title|entry-title'))
@@ -147,37 +151,33 @@ class TribunalAmbientalScraper(BaseScraper):
                 'contenido': ''
             }
 
-    def scrape_noticias_recientes(self, max_noticias: int = 20) -> List[NoticiaEstandarizada]:
-        """Scrapea las noticias más recientes y las convierte a formato estandarizado"""
+    def iter_noticias(self, max_noticias: int = 20) -> Iterator[NoticiaEstandarizada]:
+        """Entrega las noticias más recientes en formato estandarizado a medida que se descargan"""
         try:
             print(f"🔄 Scrapeando noticias recientes de Tribunal Ambiental...")
             
-            # Obtener lista de noticias
-            noticias_raw = self.get_noticias_recientes(max_noticias)
-            noticias_estandarizadas = []
+            # Obtener lista de noticias (sin las ya almacenadas)
+            noticias_raw = self._descartar_conocidas(self.get_noticias_recientes(max_noticias))
             
-            for noticia_raw in noticias_raw:
-                try:
-                    # Obtener contenido completo si no lo tiene
-                    if not noticia_raw.get('contenido'):
-                        noticia_completa = self.get_noticia_completa(noticia_raw['url'])
-                        noticia_raw.update(noticia_completa)
-                    
-                    # Procesar y estandarizar
-                    noticia_estandarizada = self.procesar_noticia(noticia_raw)
-                    if noticia_estandarizada:
-                        noticias_estandarizadas.append(noticia_estandarizada)
-                        
-                except Exception as e:
-                    print(f"⚠️ Error procesando noticia: {str(e)}")
-                    continue
-            
-            print(f"✅ Tribunal Ambiental: {len(noticias_estandarizadas)} noticias estandarizadas")
-            return noticias_estandarizadas
+            def obtener(noticia_raw):
+                # Obtener contenido completo si no lo tiene
+                if not noticia_raw.get('contenido'):
+                    noticia_completa = self.get_noticia_completa(noticia_raw['url'])
+                    noticia_raw.update(noticia_completa)
+                
+                # Procesar y estandarizar
+                return self.procesar_noticia(noticia_raw)
+            
+            # Detalles en paralelo, según el límite del host
+            estandarizadas = 0
+            for noticia in self._iterar_detalles(noticias_raw, obtener):
+                estandarizadas += 1
+                yield noticia
+            
+            print(f"✅ Tribunal Ambiental: {estandarizadas} noticias estandarizadas")
             
         except Exception as e:
             print(f"❌ Error en scraping de Tribunal Ambiental: {str(e)}")
-            return []
 
     def extraer_contenido_completo(self, url: str) -> str:
         """Extrae el contenido completo de una noticia específica"""
@@ -185,7 +185,7 @@ class TribunalAmbientalScraper(BaseScraper):
             response = self.session.get(url, timeout=30)
             response.raise_for_status()
             
-            soup = BeautifulSoup(response.content, 'html.parser')
+            soup = self._parsear(response.content)
             
             # Buscar contenido principal
             contenido_selectors = [
@@ -229,7 +229,7 @@ class TribunalAmbientalScraper(BaseScraper):
             try:
                 response = self.session.get(url, timeout=30)
                 response.raise_for_status()
-                soup = BeautifulSoup(response.content, 'html.parser')
+                soup = self._parsear(response.content)
                 fecha = self._extract_fecha_tribunal_ambiental(soup, url)
             except:
                 # Fallback a fecha actual si no se puede extraer
@@ -270,35 +270,8 @@ class TribunalAmbientalScraper(BaseScraper):
             return None
 
     def normalizar_fecha(self, fecha_str: str) -> datetime:
-        """Normaliza diferentes formatos de fecha del Tribunal Ambiental"""
-        try:
-            if not fecha_str:
-                return datetime.now(timezone.utc)
-            
-            # Formato: DD/MM/YYYY
-            if re.match(r'\d{2}/\d{2}/\d{4}', fecha_str):
-                return datetime.strptime(fecha_str, '%d/%m/%Y').replace(tzinfo=timezone.utc)
-            
-            # Otros formatos comunes
-            formatos = [
-                '%Y-%m-%d',
-                '%d-%m-%Y',
-                '%Y/%m/%d',
-                '%d/%m/%Y %H:%M',
-                '%Y-%m-%d %H:%M:%S'
-            ]
-            
-            for formato in formatos:
-                try:
-                    return datetime.strptime(fecha_str, formato).replace(tzinfo=timezone.utc)
-                except:
-                    continue
-            
-            # Si no se puede parsear, usar fecha actual
-            return datetime.now(timezone.utc)
-            
-        except Exception:
-            return datetime.now(timezone.utc)
+        """Normaliza diferentes formatos de fecha del Tribunal Ambiental (fecha actual si no se reconoce)"""
+        return self.contexto.normalizar_fecha(fecha_str)
 
     def extraer_palabras_clave(self, texto: str) -> List[str]:
         """Extrae palabras clave relevantes del texto"""
@@ -340,12 +313,9 @@ class TribunalAmbientalScraper(BaseScraper):
                 fecha_elem = soup.select_one(selector)
                 if fecha_elem:
                     # Intentar obtener fecha del atributo datetime
-                    datetime_attr = fecha_elem.get('datetime')
-                    if datetime_attr:
-                        try:
-                            return datetime.fromisoformat(datetime_attr.replace('Z', '+00:00'))
-                        except:
-                            pass
+                    fecha = self.contexto.parsear_fecha(fecha_elem.get('datetime'))
+                    if fecha:
+                        return fecha
                     
                     # Intentar parsear texto
                     fecha_texto = fecha_elem.get_text(strip=True)
@@ -360,9 +330,9 @@ class TribunalAmbientalScraper(BaseScraper):
                 return fecha_en_contenido
             
             # Buscar fecha en la URL
-            fecha_en_url = self._extract_fecha_from_url(url)
-            if fecha_en_url:
-                return fecha_en_url
+            fecha_url = self._extract_fecha_from_url(url)
+            if fecha_url:
+                return fecha_url
             
             # Si no se encuentra, usar fecha actual
             return datetime.now(timezone.utc)
@@ -373,78 +343,12 @@ class TribunalAmbientalScraper(BaseScraper):
     
     def _parse_fecha_texto(self, fecha_texto: str) -> Optional[datetime]:
         """Parsear fecha desde texto"""
-        if not fecha_texto:
-            return None
-        
-        # Patrones específicos del Tribunal Ambiental
-        patrones = [
-            r'(\d{1,2})/(\d{1,2})/(\d{4})',  # DD/MM/YYYY
-            r'(\d{1,2})-(\d{1,2})-(\d{4})',  # DD-MM-YYYY
-            r'(\d{4})-(\d{1,2})-(\d{1,2})',  # YYYY-MM-DD
-            r'(\d{1,2})\s+de\s+(\w+)\s+de\s+(\d{4})',  # DD de MES de YYYY
-        ]
-        
-        for patron in patrones:
-            match = re.search(patron, fecha_texto, re.IGNORECASE)
-            if match:
-                try:
-                    grupos = match.groups()
-                    if len(grupos) == 3:
-                        if len(grupos[0]) == 4:  # Año primero
-                            año, mes, dia = grupos
-                        else:  # Día primero
-                            dia, mes, año = grupos
-                        
-                        return datetime(int(año), int(mes), int(dia), tzinfo=timezone.utc)
-                except:
-                    continue
-        
-        return None
+        return self.contexto.parsear_fecha(fecha_texto)
     
     def _extract_fecha_from_content(self, contenido: str) -> Optional[datetime]:
         """Extraer fecha del contenido del artículo"""
-        # Buscar patrones de fecha en el contenido
-        patrones_fecha = [
-            r'(\d{1,2})/(\d{1,2})/(\d{4})',  # DD/MM/YYYY
-            r'(\d{1,2})-(\d{1,2})-(\d{4})',  # DD-MM-YYYY
-            r'publicado.*?(\d{1,2})/(\d{1,2})/(\d{4})',  # publicado DD/MM/YYYY
-        ]
-        
-        for patron in patrones_fecha:
-            match = re.search(patron, contenido, re.IGNORECASE)
-            if match:
-                try:
-                    grupos = match.groups()
-                    if len(grupos) >= 3:
-                        dia, mes, año = grupos[-3:]  # Tomar los últimos 3 grupos
-                        return datetime(int(año), int(mes), int(dia), tzinfo=timezone.utc)
-                except:
-                    continue
-        
-        return None
+        return self.contexto.parsear_fecha(contenido)
     
     def _extract_fecha_from_url(self, url: str) -> Optional[datetime]:
-        """Extraer fecha de la URL"""
-        try:
-            # Buscar patrones de fecha en la URL
-            patrones_url = [
-                r'/(\d{4})/(\d{1,2})/(\d{1,2})/',  # /2025/07/28/
-                r'(\d{4})-(\d{1,2})-(\d{1,2})',   # 2025-07-28
-                r'(\d{1,2})-(\d{1,2})-(\d{4})',   # 28-07-2025
-            ]
-            
-            for patron in patrones_url:
-                match = re.search(patron, url)
-                if match:
-                    grupos = match.groups()
-                    if len(grupos) == 3:
-                        if len(grupos[0]) == 4:  # Año primero
-                            año, mes, dia = grupos
-                        else:  # Día primero
-                            dia, mes, año = grupos
-                        
-                        return datetime(int(año), int(mes), int(dia), tzinfo=timezone.utc)
-            
-            return None
-        except:
-            return None 
\ No newline at end of file
+        """Extraer fecha de la URL (/2025/07/28/, 2025-07-28, 28-07-2025)"""
+        return fecha_en_url(url) 
\ No newline at end of file
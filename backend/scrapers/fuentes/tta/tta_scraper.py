@@ -5,16 +5,16 @@ Scraper para el Tribunal de Cuentas (TTA) de Chile
 
 import sys
 import os
-from typing import List, Dict, Optional
+from typing import Dict, Iterator, List, Optional
 from datetime import datetime, timezone
 from bs4 import BeautifulSoup
-import re
 from urllib.parse import urljoin
 
 # Agregar el directorio padre al path
 sys.path.append(os.path.dirname(os.path.dirname(os.path.dirname(os.path.dirname(__file__)))))
 
 from backend.scrapers.fuentes.base_scraper import BaseScraper
+from backend.scrapers.fuentes.contexto_ejecucion import ContextoEjecucion
 from backend.scrapers.fuentes.data_schema import (
     NoticiaEstandarizada, 
     MetadataNoticia,
@@ -27,8 +27,8 @@ from backend.scrapers.fuentes.data_schema import (
 class TTAScraper(BaseScraper):
     """Scraper para el Tribunal de Cuentas (TTA) de Chile"""
     
-    def __init__(self, openai_api_key: str = None):
-        super().__init__(openai_api_key)
+    def __init__(self, openai_api_key: str = None, contexto: ContextoEjecucion = None):
+        super().__init__(openai_api_key, contexto)
         self.base_url = "https://www.tta.cl"
         self.noticias_url = "https://www.tta.cl/noticias/"
         self.version_scraper = "1.0"
@@ -49,10 +49,12 @@ class TTAScraper(BaseScraper):
             print("ℹ️ Iniciando scraping del Tribunal de Cuentas...")
             print("ℹ️ Obteniendo noticias del TTA...")
             
-            response = self.session.get(self.noticias_url, timeout=30)
+            response = self.session.get_condicional(self.noticias_url, timeout=30)
+            if self._sin_cambios(response):
+                return []
             response.raise_for_status()
             
-            soup = BeautifulSoup(response.content, 'html.parser')
+            soup = self._parsear_listado(response.content)
             
             noticias = []
             
@@ -130,40 +132,8 @@ class TTAScraper(BaseScraper):
             return []
     
     def _extraer_fecha_texto(self, texto: str) -> Optional[datetime]:
-        """Extraer fecha de un texto"""
-        if not texto:
-            return None
-            
-        # Patrones de fecha comunes
-        patrones = [
-            r'(\d{1,2})[/-](\d{1,2})[/-](\d{4})',
-            r'(\d{4})[/-](\d{1,2})[/-](\d{1,2})',
-            r'(\d{1,2})\s+de\s+(\w+)\s+de\s+(\d{4})'
-        ]
-        
-        for patron in patrones:
-            match = re.search(patron, texto)
-            if match:
-                try:
-                    if 'de' in patron:  # Formato "dd de mes de yyyy"
-                        dia, mes_nombre, año = match.groups()
-                        meses = {
-                            'enero': 1, 'febrero': 2, 'marzo': 3, 'abril': 4,
-                            'mayo': 5, 'junio': 6, 'julio': 7, 'agosto': 8,
-                            'septiembre': 9, 'octubre': 10, 'noviembre': 11, 'diciembre': 12
-                        }
-                        mes = meses.get(mes_nombre.lower(), 1)
-                        return datetime(int(año), mes, int(dia), tzinfo=timezone.utc)
-                    else:
-                        grupos = match.groups()
-                        if len(grupos[0]) == 4:  # yyyy-mm-dd
-                            return datetime(int(grupos[0]), int(grupos[1]), int(grupos[2]), tzinfo=timezone.utc)
-                        else:  # dd-mm-yyyy
-                            return datetime(int(grupos[2]), int(grupos[1]), int(grupos[0]), tzinfo=timezone.utc)
-                except:
-                    continue
-        
-        return None
+        """Extraer fecha de un texto (incluye el formato DT "24-jul-2025")"""
+        return self.contexto.parsear_fecha(texto)
     
     def get_noticia_completa(self, url: str, titulo: str = None, fecha_str: str = None) -> Optional[NoticiaEstandarizada]:
         """Obtener noticia completa del TTA"""
@@ -173,7 +143,7 @@ class TTAScraper(BaseScraper):
             response = self.session.get(url, timeout=30)
             response.raise_for_status()
             
-            soup = BeautifulSoup(response.content, 'html.parser')
+            soup = self._parsear(response.content)
             
             # Extraer título si no se proporcionó
             if not titulo:
@@ -181,7 +151,7 @@ class TTAScraper(BaseScraper):
                 titulo = titulo_elem.get_text(strip=True) if titulo_elem else "Sin título"
             
             # Extraer contenido principal
-            contenido = self._extraer_contenido_principal(soup)
+            contenido = self._extract_contenido_generico(soup)
             
             if not contenido or len(contenido) < 50:
                 print("❌ Contenido insuficiente")
@@ -212,66 +182,25 @@ class TTAScraper(BaseScraper):
             print(f"❌ Error extrayendo noticia del TTA {url}: {str(e)}")
             return None
     
-    def _extraer_contenido_principal(self, soup: BeautifulSoup) -> str:
-        """Extraer el contenido principal de la página"""
-        # Buscar contenido en diferentes selectores comunes
-        selectores = [
-            'article',
-            '.content',
-            '.noticia',
-            '.news-content',
-            '#content',
-            'main',
-            '.main-content',
-            '.post-content',
-            '.entry-content'
-        ]
-        
-        for selector in selectores:
-            contenido_elem = soup.select_one(selector)
-            if contenido_elem:
-                contenido = self._limpiar_contenido(contenido_elem)
-                if len(contenido) > 100:
-                    return contenido
-        
-        # Fallback: buscar en el body excluyendo navegación
-        body = soup.find('body')
-        if body:
-            # Remover elementos de navegación
-            for elem in body.find_all(['nav', 'header', 'footer', 'aside', 'menu']):
-                elem.decompose()
-            
-            contenido = self._limpiar_contenido(body)
-            return contenido
-        
-        return ""
-    
     def _extraer_fecha(self, soup: BeautifulSoup, fecha_str: str = None) -> datetime:
         """Extraer fecha de publicación"""
-        if fecha_str:
-            try:
-                return datetime.strptime(fecha_str, '%d/%m/%Y').replace(tzinfo=timezone.utc)
-            except:
-                pass
+        fecha = self.contexto.parsear_fecha(fecha_str)
+        if fecha:
+            return fecha
         
         # Buscar fecha en meta tags
         fecha_meta = soup.find('meta', {'name': 'date'}) or soup.find('meta', {'property': 'article:published_time'})
         if fecha_meta:
-            try:
-                fecha_valor = fecha_meta.get('content')
-                return datetime.fromisoformat(fecha_valor.replace('Z', '+00:00'))
-            except:
-                pass
+            fecha = self.contexto.parsear_fecha(fecha_meta.get('content'))
+            if fecha:
+                return fecha
         
         # Buscar fecha en elementos time
         time_elem = soup.find('time')
         if time_elem:
-            datetime_attr = time_elem.get('datetime')
-            if datetime_attr:
-                try:
-                    return datetime.fromisoformat(datetime_attr.replace('Z', '+00:00'))
-                except:
-                    pass
+            fecha = self.contexto.parsear_fecha(time_elem.get('datetime'))
+            if fecha:
+                return fecha
         
         # Buscar fecha en el texto
         texto = soup.get_text()
@@ -282,39 +211,32 @@ class TTAScraper(BaseScraper):
         # Fecha por defecto
         return datetime.now(timezone.utc)
     
-    def scrape_noticias_recientes(self, max_noticias: int = 10) -> List[NoticiaEstandarizada]:
-        """Scraper principal que obtiene noticias completas del TTA"""
+    def iter_noticias(self, max_noticias: int = 10) -> Iterator[NoticiaEstandarizada]:
+        """Scraper principal: entrega noticias completas del TTA a medida que se descargan"""
         try:
             print("🔍 Extrayendo noticias del TTA...")
             
-            # Obtener lista de noticias
-            noticias_raw = self.get_noticias_recientes(max_noticias)
+            # Obtener lista de noticias (sin las ya almacenadas)
+            noticias_raw = self._descartar_conocidas(self.get_noticias_recientes(max_noticias))
             
             if not noticias_raw:
                 print("⚠️ No se encontraron noticias del TTA")
-                return []
-            
-            noticias_procesadas = []
-            
-            for noticia_raw in noticias_raw:
-                try:
-                    # Procesar cada noticia
-                    noticia_completa = self.get_noticia_completa(
-                        url=noticia_raw['url'],
-                        titulo=noticia_raw['titulo'],
-                        fecha_str=noticia_raw.get('fecha')
-                    )
-                    
-                    if noticia_completa:
-                        noticias_procesadas.append(noticia_completa)
-                        
-                except Exception as e:
-                    print(f"❌ Error procesando noticia del TTA: {str(e)}")
-                    continue
-            
-            print(f"✅ TTA: {len(noticias_procesadas)} noticias estandarizadas")
-            return noticias_procesadas
+                return
+            
+            # Procesar cada noticia (en paralelo, según el límite del host)
+            procesadas = 0
+            for noticia in self._iterar_detalles(
+                noticias_raw,
+                lambda noticia_raw: self.get_noticia_completa(
+                    url=noticia_raw['url'],
+                    titulo=noticia_raw['titulo'],
+                    fecha_str=noticia_raw.get('fecha')
+                )
+            ):
+                procesadas += 1
+                yield noticia
+            
+            print(f"✅ TTA: {procesadas} noticias estandarizadas")
             
         except Exception as e:
             print(f"❌ Error en scraping del TTA: {str(e)}")
-            return [] 
\ No newline at end of file
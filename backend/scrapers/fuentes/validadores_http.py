@@ -0,0 +1,74 @@
+#!/usr/bin/env python3
+"""
+Caché de validadores HTTP (ETag / Last-Modified) para peticiones condicionales
+Permite pedir los listados con If-None-Match / If-Modified-Since y saltarse
+el parseo cuando el servidor responde 304
+"""
+
+import json
+import os
+import threading
+from typing import Dict
+
+from .config import SCRAPING_CONFIG
+
+class CacheValidadores:
+    """Validadores por URL, persistidos en un único archivo JSON"""
+
+    def __init__(self, ruta: str = None):
+        self.ruta = ruta or os.path.join(SCRAPING_CONFIG['directorio_estado'], 'validadores_http.json')
+        # Con NOTICIAS_REFRESCAR=1 se descargan los listados completos
+        self.activos = os.getenv('NOTICIAS_REFRESCAR', '0') != '1'
+        self._validadores = None
+        self._lock = threading.Lock()
+        self.estadisticas = {'sin_cambios': 0, 'con_cambios': 0}
+
+    def _cargar(self) -> Dict[str, Dict]:
+        """Leer el archivo la primera vez que se usa"""
+        if self._validadores is None:
+            try:
+                with open(self.ruta, encoding='utf-8') as archivo:
+                    self._validadores = json.load(archivo)
+            except (OSError, ValueError):
+                self._validadores = {}
+        return self._validadores
+
+    def cabeceras(self, url: str) -> Dict[str, str]:
+        """Cabeceras condicionales para una URL (vacío si no hay validadores)"""
+        if not self.activos:
+            return {}
+
+        with self._lock:
+            validador = self._cargar().get(url, {})
+
+        cabeceras = {}
+        if validador.get('etag'):
+            cabeceras['If-None-Match'] = validador['etag']
+        if validador.get('last_modified'):
+            cabeceras['If-Modified-Since'] = validador['last_modified']
+        return cabeceras
+
+    def contar(self, sin_cambios: bool):
+        """Registrar el resultado de una petición condicional"""
+        with self._lock:
+            self.estadisticas['sin_cambios' if sin_cambios else 'con_cambios'] += 1
+
+    def guardar(self, validadores: Dict[str, Dict]):
+        """Incorporar validadores nuevos y escribir el archivo de forma atómica"""
+        if not validadores:
+            return
+
+        with self._lock:
+            datos = self._cargar()
+            datos.update(validadores)
+            try:
+                os.makedirs(os.path.dirname(self.ruta), exist_ok=True)
+                temporal = f"{self.ruta}.tmp"
+                with open(temporal, 'w', encoding='utf-8') as archivo:
+                    json.dump(datos, archivo, ensure_ascii=False, indent=2)
+                os.replace(temporal, self.ruta)
+            except OSError as e:
+                print(f"⚠️  No se pudieron guardar los validadores HTTP: {e}")
+
+# Instancia global
+validadores_http = CacheValidadores()
@@ -18,6 +18,7 @@ from urllib.parse import urljoin, urlparse
 sys.path.append(os.path.dirname(os.path.dirname(os.path.dirname(__file__))))
 
 from backend.processors.content_processor import ContentProcessor, NoticiaCompleta
+from backend.scrapers.fuentes.fechas import parsear_fecha
 
 class PoderJudicialScraper:
     """Scraper para el Poder Judicial de Chile"""
@@ -180,12 +181,9 @@ class PoderJudicialScraper:
             fecha_elem = soup.select_one(selector)
             if fecha_elem:
                 # Intentar obtener fecha del atributo datetime
-                datetime_attr = fecha_elem.get('datetime')
-                if datetime_attr:
-                    try:
-                        return datetime.fromisoformat(datetime_attr.replace('Z', '+00:00'))
-                    except:
-                        pass
+                fecha = parsear_fecha(fecha_elem.get('datetime'))
+                if fecha:
+                    return fecha
                 
                 # Intentar parsear texto
                 fecha_texto = fecha_elem.get_text(strip=True)
@@ -208,44 +206,7 @@ class PoderJudicialScraper:
     
     def _parse_fecha_poder_judicial(self, fecha_texto: str) -> Optional[datetime]:
         """Parsear fecha específica del formato del Poder Judicial"""
-        if not fecha_texto:
-            return None
-        
-        # Patrones específicos del Poder Judicial
-        patrones = [
-            r'(\d{1,2})/(\d{1,2})/(\d{4})',  # DD/MM/YYYY
-            r'(\d{1,2})-(\d{1,2})-(\d{4})',  # DD-MM-YYYY
-            r'(\d{4})-(\d{1,2})-(\d{1,2})',  # YYYY-MM-DD
-            r'(\d{1,2})\s+de\s+(\w+)\s+de\s+(\d{4})',  # DD de MES de YYYY
-            r'(\d{1,2})\s+(\w+)\s+(\d{4})',  # DD MES YYYY
-        ]
-        
-        for patron in patrones:
-            match = re.search(patron, fecha_texto, re.IGNORECASE)
-            if match:
-                try:
-                    if 'de' in patron or len(match.groups()) == 3:
-                        if 'de' in patron:
-                            # Formato "DD de MES de YYYY"
-                            dia, mes_nombre, año = match.groups()
-                            meses = {
-                                'enero': 1, 'febrero': 2, 'marzo': 3, 'abril': 4,
-                                'mayo': 5, 'junio': 6, 'julio': 7, 'agosto': 8,
-                                'septiembre': 9, 'octubre': 10, 'noviembre': 11, 'diciembre': 12
-                            }
-                            mes = meses.get(mes_nombre.lower(), 1)
-                        else:
-                            # Formato numérico
-                            if len(match.group(1)) == 4:  # YYYY-MM-DD
-                                año, mes, dia = match.groups()
-                            else:  # DD/MM/YYYY o DD-MM-YYYY
-                                dia, mes, año = match.groups()
-                    
-                    return datetime(int(año), int(mes), int(dia), tzinfo=timezone.utc)
-                except (ValueError, TypeError):
-                    continue
-        
-        return None
+        return parsear_fecha(fecha_texto)
     
     def _extract_contenido_poder_judicial(self, soup: BeautifulSoup) -> str:
         """Extraer contenido específico del Poder Judicial"""
@@ -418,27 +379,7 @@ class PoderJudicialScraper:
     
     def _extract_fecha_from_text(self, texto: str) -> Optional[datetime]:
         """Extraer fecha del texto de la noticia"""
-        # Patrones de fecha específicos del Poder Judicial
-        patrones = [
-            r'(\d{1,2})-(\d{1,2})-(\d{4})\s+(\d{1,2}):(\d{1,2})',  # DD-MM-YYYY HH:MM
-            r'(\d{1,2})-(\d{1,2})-(\d{4})',  # DD-MM-YYYY
-            r'(\d{1,2})/(\d{1,2})/(\d{4})',  # DD/MM/YYYY
-        ]
-        
-        for patron in patrones:
-            match = re.search(patron, texto)
-            if match:
-                try:
-                    if len(match.groups()) == 5:  # Con hora
-                        dia, mes, año, hora, minuto = match.groups()
-                        return datetime(int(año), int(mes), int(dia), int(hora), int(minuto), tzinfo=timezone.utc)
-                    else:  # Solo fecha
-                        dia, mes, año = match.groups()
-                        return datetime(int(año), int(mes), int(dia), tzinfo=timezone.utc)
-                except (ValueError, TypeError):
-                    continue
-        
-        return None
+        return parsear_fecha(texto)
     
     def _extract_fecha_link(self, link_elem) -> Optional[datetime]:
         """Extraer fecha de un enlace de noticia"""
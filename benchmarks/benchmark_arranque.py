@@ -0,0 +1,106 @@
+#!/usr/bin/env python3
+"""
+Benchmark del arranque en frío del sistema
+Mide, en un intérprete nuevo por repetición, cuánto tarda en quedar listo
+NoticiasJuridicasSystem para los casos que se ejecutan cada hora: solo
+estadísticas (--stats), una sola fuente y todas las fuentes. Informa el
+tiempo total del proceso, el tiempo de importación y construcción medido
+dentro del proceso, los módulos cargados y si se importó openai.
+
+Uso:
+    python benchmarks/benchmark_arranque.py
+    python benchmarks/benchmark_arranque.py --repeticiones 10 --fuente tdlc
+"""
+
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+
+DIRECTORIO = os.path.dirname(os.path.abspath(__file__))
+RAIZ = os.path.dirname(DIRECTORIO)
+sys.path.append(RAIZ)
+
+from benchmarks.medicion import guardar_resultados, metadatos_ejecucion
+
+# Código que corre en cada intérprete nuevo; imprime una línea JSON al final
+PROGRAMA = '''
+import contextlib, io, json, sys, time
+inicio = time.perf_counter()
+with contextlib.redirect_stdout(io.StringIO()):
+    from backend.main import NoticiasJuridicasSystem
+    from backend.database.memoria_client import AlmacenamientoMemoria
+    importado = time.perf_counter()
+    sistema = NoticiasJuridicasSystem(almacenamiento=AlmacenamientoMemoria())
+    caso = sys.argv[1]
+    if caso == 'stats':
+        sistema.get_estadisticas()
+    elif caso == 'una_fuente':
+        sistema.scrapers[sys.argv[2]]
+    else:
+        for codigo in sistema.scrapers:
+            sistema.scrapers[codigo]
+fin = time.perf_counter()
+print(json.dumps({
+    'importacion': importado - inicio,
+    'listo': fin - inicio,
+    'modulos': len(sys.modules),
+    'openai': 'openai' in sys.modules
+}))
+'''
+
+def medir_caso(caso: str, fuente: str, repeticiones: int, entorno: dict) -> dict:
+    """Mediana de varias ejecuciones en frío de un caso"""
+    totales, internas, importaciones = [], [], []
+    ultima = {}
+    for _ in range(repeticiones):
+        inicio = time.perf_counter()
+        proceso = subprocess.run(
+            [sys.executable, '-c', PROGRAMA, caso, fuente],
+            cwd=RAIZ, env=entorno, capture_output=True, text=True, timeout=120
+        )
+        totales.append(time.perf_counter() - inicio)
+        if proceso.returncode != 0:
+            raise RuntimeError(f"{caso}: {proceso.stderr.strip().splitlines()[-1:]}")
+        ultima = json.loads(proceso.stdout.strip().splitlines()[-1])
+        internas.append(ultima['listo'])
+        importaciones.append(ultima['importacion'])
+
+    return {
+        'proceso_s': round(statistics.median(totales), 4),
+        'listo_s': round(statistics.median(internas), 4),
+        'importacion_s': round(statistics.median(importaciones), 4),
+        'modulos': ultima['modulos'],
+        'openai_importado': ultima['openai']
+    }
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark del arranque en frío del sistema')
+    parser.add_argument('--repeticiones', type=int, default=5, help='Ejecuciones por caso (se toma la mediana)')
+    parser.add_argument('--fuente', default='tdlc', help='Fuente del caso de una sola fuente')
+    parser.add_argument('--salida', default=None, help='Archivo JSON de resultados')
+    args = parser.parse_args()
+
+    # Estado incremental aislado y sin credenciales reales
+    entorno = dict(os.environ, NOTICIAS_DIRECTORIO_ESTADO=tempfile.mkdtemp(prefix='benchmark_arranque_'))
+
+    resultados = dict(metadatos_ejecucion(), repeticiones=args.repeticiones, fuente=args.fuente, casos={})
+    print(f"⏱️  Arranque en frío ({args.repeticiones} repeticiones, mediana)")
+    for caso in ('stats', 'una_fuente', 'todas'):
+        medicion = medir_caso(caso, args.fuente, args.repeticiones, entorno)
+        resultados['casos'][caso] = medicion
+        print(f"   {caso:<11} proceso {medicion['proceso_s']:6.3f}s  listo {medicion['listo_s']:6.3f}s  "
+              f"(importación {medicion['importacion_s']:.3f}s, {medicion['modulos']} módulos, "
+              f"openai {'sí' if medicion['openai_importado'] else 'no'})")
+
+    salida = args.salida or os.path.join(
+        DIRECTORIO, 'resultados', f"arranque_{time.strftime('%Y%m%d_%H%M%S')}.json"
+    )
+    print(f"💾 Resultados: {guardar_resultados(resultados, salida)}")
+
+if __name__ == "__main__":
+    main()
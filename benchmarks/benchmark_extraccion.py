@@ -0,0 +1,129 @@
+#!/usr/bin/env python3
+"""
+Micro-benchmark de la extracción del contenido principal
+Compara la cascada de selectores CSS de BaseScraper (tal como era antes del
+extractor) con el extractor de una sola pasada, sobre páginas sintéticas con
+navegación, barra lateral de enlaces y pie de página. Cada medición usa un
+documento recién parseado: la cascada modifica el árbol y el extractor
+memoriza por documento.
+
+Uso:
+    python benchmarks/benchmark_extraccion.py
+    python benchmarks/benchmark_extraccion.py --tamanos 10,100,1000 --repeticiones 5
+"""
+
+import argparse
+import os
+import random
+import re
+import sys
+import time
+
+DIRECTORIO = os.path.dirname(os.path.abspath(__file__))
+sys.path.append(os.path.dirname(DIRECTORIO))
+
+from bs4 import BeautifulSoup
+
+from benchmarks.medicion import guardar_resultados, metadatos_ejecucion
+
+SELECTORES_CASCADA = [
+    '.contenido', '.noticia-contenido', '.noticia-texto', '.noticia-cuerpo', 'article', '.entry-content',
+    '.post-content', '.main-content', '.content-area', '.article-content', '.story-content'
+]
+
+PARRAFOS = (
+    "La Corte Suprema acogió el recurso de protección y ordenó a la institución adoptar las medidas necesarias.",
+    "El tribunal estimó que la resolución impugnada carecía de fundamentación suficiente, conforme a la ley.",
+    "Según el fallo, la autoridad administrativa deberá pronunciarse nuevamente dentro del plazo de treinta días.",
+)
+
+def generar_pagina(parrafos: int, semilla: int = 0) -> str:
+    """HTML de noticia con el cuerpo en un contenedor sin clases conocidas (sitio rediseñado)"""
+    azar = random.Random(semilla)
+    enlaces = ''.join(
+        f'<li><a href="/noticias/{i}">Otra noticia del tribunal número {i}</a></li>' for i in range(parrafos // 2 + 20)
+    )
+    cuerpo = ''.join(
+        f'<div class="fila"><div class="col"><p>{azar.choice(PARRAFOS)} <strong>Rol {i}-2025</strong>.</p></div></div>'
+        for i in range(parrafos)
+    )
+    return (
+        f'<html><head><title>Noticia</title><style>p{{margin:0}}</style></head><body>'
+        f'<header><nav><ul>{enlaces[:2000]}</ul></nav></header>'
+        f'<div id="pagina"><div class="lateral"><ul>{enlaces}</ul></div>'
+        f'<div class="bloque"><h1>Título de la noticia</h1>{cuerpo}</div></div>'
+        f'<footer>Morandé 360, Santiago</footer><script>var x = 1;</script></body></html>'
+    )
+
+def extraer_cascada(soup: BeautifulSoup) -> str:
+    """Extracción como la hacía BaseScraper._extract_contenido_generico antes del extractor"""
+    def limpiar(elemento):
+        for elem in elemento.find_all(['script', 'style', 'nav', 'header', 'footer', 'aside', 'form']):
+            elem.decompose()
+        return re.sub(r'\s+', ' ', elemento.get_text(separator=' ', strip=True)).strip()
+
+    for selector in SELECTORES_CASCADA:
+        contenido_elem = soup.select_one(selector)
+        if contenido_elem:
+            return limpiar(contenido_elem)
+
+    body = soup.find('body')
+    if body:
+        for elem in body.find_all(['nav', 'header', 'footer', 'aside', 'script', 'style']):
+            elem.decompose()
+        return limpiar(body)
+    return ""
+
+def medir(funcion, html: str, repeticiones: int) -> float:
+    """Mejor tiempo (segundos) de varias repeticiones, sin contar el parseo"""
+    mejor = float('inf')
+    for _ in range(repeticiones):
+        soup = BeautifulSoup(html, 'html.parser')
+        inicio = time.perf_counter()
+        funcion(soup)
+        mejor = min(mejor, time.perf_counter() - inicio)
+    return mejor
+
+def main():
+    parser = argparse.ArgumentParser(description='Micro-benchmark de la extracción del contenido principal')
+    parser.add_argument('--tamanos', type=lambda valor: [int(t) for t in valor.split(',')], default=[10, 100, 1000],
+                        help='Cantidad de párrafos por página, separados por coma')
+    parser.add_argument('--repeticiones', type=int, default=5, help='Repeticiones por medición (se toma la mejor)')
+    parser.add_argument('--salida', default=None, help='Archivo JSON de resultados')
+    args = parser.parse_args()
+
+    from backend.scrapers.fuentes.extractor_contenido import ExtractorContenido
+
+    resultados = dict(metadatos_ejecucion(), paginas={})
+
+    print("⏱️  Extracción de contenido: cascada de selectores vs extractor de una pasada")
+    for parrafos in args.tamanos:
+        html = generar_pagina(parrafos)
+
+        # Cada medición con un extractor nuevo para no medir el memo
+        extractor = medir(lambda soup: ExtractorContenido().extraer(soup), html, args.repeticiones)
+        cascada = medir(extraer_cascada, html, args.repeticiones)
+
+        soup = BeautifulSoup(html, 'html.parser')
+        texto_extractor = ExtractorContenido().extraer(soup)
+        texto_cascada = extraer_cascada(BeautifulSoup(html, 'html.parser'))
+
+        resultados['paginas'][f"{parrafos}p"] = {
+            'bytes': len(html.encode('utf-8')),
+            'cascada_s': round(cascada, 6),
+            'extractor_s': round(extractor, 6),
+            'aceleracion': round(cascada / extractor, 2) if extractor > 0 else None,
+            'caracteres_cascada': len(texto_cascada),
+            'caracteres_extractor': len(texto_extractor)
+        }
+        print(f"   {parrafos:>5} párrafos ({len(html) // 1024:>5} KB)  cascada {cascada * 1000:9.2f} ms  "
+              f"extractor {extractor * 1000:9.2f} ms  (x{cascada / extractor:4.1f})  "
+              f"texto {len(texto_cascada)} vs {len(texto_extractor)} caracteres")
+
+    salida = args.salida or os.path.join(
+        DIRECTORIO, 'resultados', f"extraccion_{time.strftime('%Y%m%d_%H%M%S')}.json"
+    )
+    print(f"💾 Resultados: {guardar_resultados(resultados, salida)}")
+
+if __name__ == "__main__":
+    main()
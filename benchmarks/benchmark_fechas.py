@@ -0,0 +1,128 @@
+#!/usr/bin/env python3
+"""
+Micro-benchmark y precisión del parseo de fechas
+Compara el parseo que repetían los scrapers (BaseScraper._parse_fecha_generica
+tal como era: patrones sin compilar probados uno a uno y diccionario de meses
+armado en cada llamada) con el módulo fechas, sin memo y con memo, sobre el
+corpus de benchmarks/corpus_fechas.json. Informa cadenas por segundo y
+aciertos sobre el corpus.
+
+Uso:
+    python benchmarks/benchmark_fechas.py
+    python benchmarks/benchmark_fechas.py --vueltas 2000 --repeticiones 5
+"""
+
+import argparse
+import json
+import os
+import re
+import sys
+import time
+from datetime import datetime, timezone
+
+DIRECTORIO = os.path.dirname(os.path.abspath(__file__))
+sys.path.append(os.path.dirname(DIRECTORIO))
+
+from benchmarks.medicion import guardar_resultados, metadatos_ejecucion
+
+CORPUS = os.path.join(DIRECTORIO, 'corpus_fechas.json')
+
+def parsear_anterior(fecha_texto: str):
+    """BaseScraper._parse_fecha_generica antes del módulo fechas"""
+    if not fecha_texto:
+        return None
+    patrones = [
+        r'(\d{1,2})/(\d{1,2})/(\d{4})',
+        r'(\d{1,2})-(\d{1,2})-(\d{4})',
+        r'(\d{4})-(\d{1,2})-(\d{1,2})',
+        r'(\d{1,2})\s+de\s+(\w+)\s+de\s+(\d{4})',
+        r'(\d{1,2})\s+(\w+)\s+(\d{4})',
+    ]
+    for patron in patrones:
+        match = re.search(patron, fecha_texto, re.IGNORECASE)
+        if match:
+            try:
+                if 'de' in patron:
+                    dia, mes_nombre, año = match.groups()
+                    meses = {
+                        'enero': 1, 'febrero': 2, 'marzo': 3, 'abril': 4,
+                        'mayo': 5, 'junio': 6, 'julio': 7, 'agosto': 8,
+                        'septiembre': 9, 'octubre': 10, 'noviembre': 11, 'diciembre': 12
+                    }
+                    mes = meses.get(mes_nombre.lower(), 1)
+                elif len(match.group(1)) == 4:
+                    año, mes, dia = match.groups()
+                else:
+                    dia, mes, año = match.groups()
+                return datetime(int(año), int(mes), int(dia), tzinfo=timezone.utc)
+            except (ValueError, TypeError):
+                continue
+    return None
+
+def cargar_corpus():
+    with open(CORPUS, 'r', encoding='utf-8') as archivo:
+        return json.load(archivo)['casos']
+
+def aciertos(funcion, casos) -> int:
+    """Casos del corpus en que la fecha (y hora, si la hay) coincide con la esperada"""
+    total = 0
+    for caso in casos:
+        fecha = funcion(caso['texto'])
+        if (fecha.isoformat() if fecha else None) == caso['esperado']:
+            total += 1
+    return total
+
+def medir(funcion, textos, repeticiones: int, antes=None) -> float:
+    """Mejor tiempo (segundos) de varias repeticiones sobre todos los textos"""
+    mejor = float('inf')
+    for _ in range(repeticiones):
+        if antes:
+            antes()
+        inicio = time.perf_counter()
+        for texto in textos:
+            funcion(texto)
+        mejor = min(mejor, time.perf_counter() - inicio)
+    return mejor
+
+def main():
+    parser = argparse.ArgumentParser(description='Micro-benchmark y precisión del parseo de fechas')
+    parser.add_argument('--vueltas', type=int, default=500, help='Veces que se recorre el corpus por medición')
+    parser.add_argument('--repeticiones', type=int, default=3, help='Repeticiones por medición (se toma la mejor)')
+    parser.add_argument('--salida', default=None, help='Archivo JSON de resultados')
+    args = parser.parse_args()
+
+    from backend.scrapers.fuentes import fechas
+
+    casos = cargar_corpus()
+    textos = [caso['texto'] for caso in casos] * args.vueltas
+
+    modos = {
+        'anterior': (parsear_anterior, None),
+        'sin_memo': (fechas._parsear, None),
+        # El memo se vacía antes de cada repetición: la primera vuelta paga el parseo
+        'con_memo': (fechas.parsear_fecha, fechas._parsear_memo.cache_clear),
+    }
+
+    resultados = dict(metadatos_ejecucion(), casos=len(casos), cadenas=len(textos), modos={})
+    base = None
+    print(f"⏱️  Parseo de fechas: {len(casos)} casos x {args.vueltas} vueltas")
+    for modo, (funcion, antes) in modos.items():
+        segundos = medir(lambda texto: funcion(texto) if texto else None, textos, args.repeticiones, antes)
+        base = base or segundos
+        correctos = aciertos(lambda texto: funcion(texto) if texto else None, casos)
+        resultados['modos'][modo] = {
+            'segundos': round(segundos, 6),
+            'cadenas_por_segundo': round(len(textos) / segundos),
+            'aceleracion': round(base / segundos, 2),
+            'aciertos': correctos
+        }
+        print(f"   {modo:<9} {len(textos) / segundos:>12,.0f} cadenas/s  (x{base / segundos:5.1f})  "
+              f"aciertos {correctos}/{len(casos)}")
+
+    salida = args.salida or os.path.join(
+        DIRECTORIO, 'resultados', f"fechas_{time.strftime('%Y%m%d_%H%M%S')}.json"
+    )
+    print(f"💾 Resultados: {guardar_resultados(resultados, salida)}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,159 @@
+#!/usr/bin/env python3
+"""
+Benchmark de la extracción de fecha de una página
+Compara el orden de estrategias anterior de UniversalDateExtractor (elementos
+de fecha con un select por selector, texto de la página completa, URL y meta
+tags) con el orden por costo y confiabilidad actual, sobre páginas sintéticas
+con la forma de las fuentes: fecha en meta tags, en JSON-LD, solo en la URL o
+solo en el cuerpo, con barras laterales y pies de página que también traen
+fechas. Cada página se procesa como en un scraper: fecha y contenido principal.
+Informa páginas por segundo, aciertos y la estrategia que resolvió cada página.
+
+Uso:
+    python benchmarks/benchmark_fechas_pagina.py
+    python benchmarks/benchmark_fechas_pagina.py --paginas 200 --repeticiones 5
+"""
+
+import argparse
+import os
+import sys
+import time
+from datetime import datetime, timezone
+
+DIRECTORIO = os.path.dirname(os.path.abspath(__file__))
+sys.path.append(os.path.dirname(DIRECTORIO))
+
+from bs4 import BeautifulSoup
+
+from benchmarks.medicion import guardar_resultados, metadatos_ejecucion
+
+PARRAFO = ("La Corte de Apelaciones acogió el recurso de protección interpuesto por la comunidad, "
+           "ordenando a la autoridad sanitaria adoptar las medidas necesarias, dentro de treinta días. ")
+
+SELECTORES_ANTERIORES = [
+    '.fecha', '.date', '.fecha-publicacion', '.fecha-noticia',
+    'time', '[datetime]', '.meta .fecha', '.entry-date', '.post-date',
+    '.noticia-fecha', '.publicacion-fecha', '.fecha-articulo',
+    '.fecha-creacion', '.fecha-modificacion', '.fecha-actualizacion'
+]
+
+META_ANTERIORES = [
+    'meta[property="article:published_time"]', 'meta[name="publish_date"]',
+    'meta[name="date"]', 'meta[name="pubdate"]', 'meta[property="og:updated_time"]'
+]
+
+def extraer_anterior(soup, url=None):
+    """UniversalDateExtractor.extract_date_from_html antes del orden por costo"""
+    from backend.scrapers.fuentes.fechas import fecha_en_url, parsear_fecha
+
+    for selector in SELECTORES_ANTERIORES:
+        for elemento in soup.select(selector):
+            fecha = parsear_fecha(elemento.get('datetime')) or parsear_fecha(elemento.get_text(strip=True))
+            if fecha:
+                return fecha
+    fecha = parsear_fecha(soup.get_text())
+    if fecha:
+        return fecha
+    if url:
+        fecha = fecha_en_url(url)
+        if fecha:
+            return fecha
+    for selector in META_ANTERIORES:
+        meta = soup.select_one(selector)
+        if meta and meta.get('content'):
+            fecha = parsear_fecha(meta['content'])
+            if fecha:
+                return fecha
+    return None
+
+def generar_pagina(i: int):
+    """HTML, URL y fecha esperada de una página; el tipo rota entre cuatro formas"""
+    dia = i % 28 + 1
+    esperada = datetime(2025, 7, dia, tzinfo=timezone.utc)
+    lateral = ''.join(
+        f'<li><a href="/noticias/{n}">Noticia anterior del tribunal número {n}</a> <span>{n % 28 + 1:02d}/06/2025</span></li>'
+        for n in range(25)
+    )
+    pie = '<footer>Actualizado el 01/01/2024 · Morandé 360, Santiago</footer>'
+    cabeza, url, cuerpo_fecha = '', f'https://www.fuente.cl/noticias/{i}', ''
+    tipo = i % 4
+    if tipo == 0:
+        cabeza = f'<meta property="article:published_time" content="2025-07-{dia:02d}T00:00:00+00:00">'
+    elif tipo == 1:
+        cabeza = ('<script type="application/ld+json">{"@context": "https://schema.org", "@graph": '
+                  f'[{{"@type": "WebPage"}}, {{"@type": "NewsArticle", "datePublished": "2025-07-{dia:02d}"}}]}}</script>')
+    elif tipo == 2:
+        url = f'https://www.fuente.cl/2025/07/{dia:02d}/noticia-{i}/'
+    else:
+        cuerpo_fecha = f'<p>Santiago, {dia} de julio de 2025.</p>'
+    html = (
+        f'<html><head><title>Noticia {i}</title>{cabeza}</head><body>'
+        f'<header><nav>Inicio Noticias Contacto</nav></header>'
+        f'<div class="contenedor"><div class="lateral"><h3>Más noticias</h3><ul>{lateral}</ul></div>'
+        f'<div class="cuerpo-noticia"><h1>Fallo número {i}</h1>{cuerpo_fecha}'
+        f'<p>{PARRAFO * 3}</p><p>{PARRAFO * 2}</p></div></div>{pie}</body></html>'
+    )
+    return html, url, esperada
+
+def procesar(soups, urls, extraer_fecha) -> list:
+    """Fecha y contenido principal de cada página, como en un scraper"""
+    from backend.scrapers.fuentes.extractor_contenido import extractor_contenido
+
+    fechas = []
+    for soup, url in zip(soups, urls):
+        fechas.append(extraer_fecha(soup, url))
+        extractor_contenido.extraer(soup)
+    return fechas
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark de la extracción de fecha de una página')
+    parser.add_argument('--paginas', type=int, default=100, help='Páginas sintéticas')
+    parser.add_argument('--repeticiones', type=int, default=3, help='Repeticiones por medición (se toma la mejor)')
+    parser.add_argument('--salida', default=None, help='Archivo JSON de resultados')
+    args = parser.parse_args()
+
+    from backend.scrapers.fuentes.date_extractor import date_extractor
+
+    paginas = [generar_pagina(i) for i in range(args.paginas)]
+    urls = [url for _, url, _ in paginas]
+    esperadas = [esperada for _, _, esperada in paginas]
+
+    modos = {
+        'anterior': extraer_anterior,
+        'por_costo': date_extractor.extract_date_from_html,
+    }
+
+    resultados = dict(metadatos_ejecucion(), paginas=args.paginas, modos={})
+    base = None
+    print(f"⏱️  Fecha de página: {args.paginas} páginas")
+    for modo, extraer_fecha in modos.items():
+        mejor = float('inf')
+        for _ in range(args.repeticiones):
+            # Documentos nuevos en cada repetición: nada memorizado entre vueltas
+            soups = [BeautifulSoup(html, 'lxml') for html, _, _ in paginas]
+            date_extractor.reset_estadisticas()
+            inicio = time.perf_counter()
+            fechas = procesar(soups, urls, extraer_fecha)
+            mejor = min(mejor, time.perf_counter() - inicio)
+
+        base = base or mejor
+        correctas = sum(1 for fecha, esperada in zip(fechas, esperadas) if fecha == esperada)
+        resultados['modos'][modo] = {
+            'segundos': round(mejor, 6),
+            'paginas_por_segundo': round(args.paginas / mejor, 1),
+            'aceleracion': round(base / mejor, 2),
+            'aciertos': correctas
+        }
+        print(f"   {modo:<10} {args.paginas / mejor:>8,.1f} páginas/s  (x{base / mejor:5.1f})  "
+              f"aciertos {correctas}/{args.paginas}")
+
+    resultados['estrategias'] = date_extractor.get_estadisticas()
+    print(f"   estrategias: {resultados['estrategias']}")
+
+    salida = args.salida or os.path.join(
+        DIRECTORIO, 'resultados', f"fechas_pagina_{time.strftime('%Y%m%d_%H%M%S')}.json"
+    )
+    print(f"💾 Resultados: {guardar_resultados(resultados, salida)}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,134 @@
+#!/usr/bin/env python3
+"""
+Micro-benchmark del motor de limpieza de ContentProcessor
+Compara la limpieza secuencial (un re.sub por regla, como antes del motor)
+con el motor precompilado, en frío y con el memo por documento, y el motor
+con todas las reglas frente a los conjuntos por fuente.
+
+Uso:
+    python benchmarks/benchmark_limpieza.py
+    python benchmarks/benchmark_limpieza.py --tamanos 20,200,1000 --repeticiones 5
+"""
+
+import argparse
+import os
+import random
+import re
+import sys
+import time
+
+DIRECTORIO = os.path.dirname(os.path.abspath(__file__))
+sys.path.append(os.path.dirname(DIRECTORIO))
+
+from benchmarks.medicion import guardar_resultados, metadatos_ejecucion
+
+PARRAFOS = (
+    "La Corte Suprema acogió el recurso de protección y ordenó a la institución adoptar las medidas necesarias. ",
+    "El tribunal estimó que la resolución impugnada carecía de fundamentación suficiente conforme a la ley. ",
+    "Según el fallo, la autoridad administrativa deberá pronunciarse nuevamente dentro del plazo de treinta días. ",
+    "La sentencia fue redactada por el ministro y acordada con el voto en contra de uno de los integrantes. ",
+)
+
+RESTOS_PAGINA = (
+    "Compartir ",
+    "Volver ",
+    "Los horarios de atención son de lunes a viernes de 8:00 a 14:00 horas. ",
+    "Atención por teléfonos 600 333 0000 ",
+    "https://www.pjud.cl/prensa-y-comunicaciones/noticias ",
+    "Morandé 360, Piso 8, Santiago(56 2) 2393 4100)contacto@tribunalambiental.cl. ",
+    "Please ensure Javascript is enabled for purposes of website accessibility ",
+    "Publicado el 12-05-2025 10:30 ",
+)
+
+def generar_pagina(kilobytes: int, semilla: int = 0) -> str:
+    """Texto de noticia con restos de navegación intercalados"""
+    azar = random.Random(semilla)
+    partes, largo = [], 0
+    while largo < kilobytes * 1024:
+        parte = azar.choice(RESTOS_PAGINA) if azar.random() < 0.15 else azar.choice(PARRAFOS)
+        partes.append(parte)
+        largo += len(parte)
+    return ''.join(partes)
+
+def limpiar_secuencial(texto: str, patrones) -> str:
+    """Limpieza como la hacía ContentProcessor antes del motor"""
+    for patron, flags in patrones:
+        texto = re.sub(patron, '', texto, flags=flags)
+    texto = re.sub(r'\s+', ' ', texto).strip()
+    if len(texto) > 3 and re.search(r'[a-zA-ZáéíóúñÁÉÍÓÚÑ]', texto):
+        return texto
+    return ""
+
+def medir(funcion, repeticiones: int) -> float:
+    """Mejor tiempo (segundos) de varias repeticiones"""
+    mejor = float('inf')
+    for _ in range(repeticiones):
+        inicio = time.perf_counter()
+        funcion()
+        mejor = min(mejor, time.perf_counter() - inicio)
+    return mejor
+
+def main():
+    parser = argparse.ArgumentParser(description='Micro-benchmark del motor de limpieza')
+    parser.add_argument('--tamanos', type=lambda valor: [int(t) for t in valor.split(',')], default=[5, 50, 500],
+                        help='Tamaños de página en KB, separados por coma')
+    parser.add_argument('--repeticiones', type=int, default=5, help='Repeticiones por medición (se toma la mejor)')
+    parser.add_argument('--fuentes', type=lambda valor: valor.split(','), default=['poder_judicial', '1ta', 'tdlc'],
+                        help='Fuentes cuyo conjunto de reglas se mide, separadas por coma')
+    parser.add_argument('--salida', default=None, help='Archivo JSON de resultados')
+    args = parser.parse_args()
+
+    from backend.processors.content_processor import ContentProcessor, motor_contenido, motor_contenido_para
+
+    procesador = ContentProcessor()
+    resultados = dict(metadatos_ejecucion(), paginas={})
+
+    print("⏱️  Limpieza de contenido: secuencial vs motor precompilado")
+    for kilobytes in args.tamanos:
+        pagina = generar_pagina(kilobytes)
+
+        esperado = limpiar_secuencial(pagina, motor_contenido.patrones)
+        motor_contenido.vaciar_memo()
+        assert procesador._limpiar_contenido(pagina) == esperado, "El motor no reproduce la limpieza secuencial"
+
+        secuencial = medir(lambda: limpiar_secuencial(pagina, motor_contenido.patrones), args.repeticiones)
+        motor = medir(lambda: motor_contenido.finalizar(motor_contenido.aplicar(pagina)), args.repeticiones)
+
+        # Reglas base más las de cada fuente, en lugar de todas
+        por_fuente = {
+            fuente: round(medir(
+                lambda: motor_contenido_para(fuente).finalizar(motor_contenido_para(fuente).aplicar(pagina)),
+                args.repeticiones
+            ), 6)
+            for fuente in args.fuentes
+        }
+
+        # Resumen ejecutivo completo: antes limpiaba el cuerpo dos veces
+        def resumen():
+            motor_contenido_para('poder_judicial').vaciar_memo()
+            procesador.resumen_cache.clear()
+            procesador.generar_resumen_ejecutivo("Título de prueba", pagina, 'poder_judicial')
+        resumen_motor = medir(resumen, args.repeticiones)
+        memo = medir(lambda: procesador._limpiar_contenido(pagina), args.repeticiones)
+
+        resultados['paginas'][f"{kilobytes}kb"] = {
+            'bytes': len(pagina.encode('utf-8')),
+            'secuencial_s': round(secuencial, 6),
+            'motor_s': round(motor, 6),
+            'aceleracion': round(secuencial / motor, 2) if motor > 0 else None,
+            'por_fuente_s': por_fuente,
+            'resumen_s': round(resumen_motor, 6),
+            'memo_s': round(memo, 6)
+        }
+        print(f"   {kilobytes:>5} KB  secuencial {secuencial * 1000:9.2f} ms  motor {motor * 1000:9.2f} ms  "
+              f"(x{secuencial / motor:5.1f})  resumen {resumen_motor * 1000:9.2f} ms  memo {memo * 1e6:7.1f} µs")
+        for fuente, segundos in por_fuente.items():
+            print(f"            {fuente:<22} {segundos * 1000:9.2f} ms  (x{motor / segundos:5.1f} vs todas las reglas)")
+
+    salida = args.salida or os.path.join(
+        DIRECTORIO, 'resultados', f"limpieza_{time.strftime('%Y%m%d_%H%M%S')}.json"
+    )
+    print(f"💾 Resultados: {guardar_resultados(resultados, salida)}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,127 @@
+#!/usr/bin/env python3
+"""
+Micro-benchmark del emparejamiento titular → enlace de los listados
+Compara la búsqueda que hacía TDPScraper (cinco elementos hacia adelante desde
+cada <h3> y, si no aparece el enlace, un recorrido de todos los enlaces de la
+página) con el emparejamiento de una sola pasada de listado_titulares, sobre
+listados sintéticos con el "Seguir leyendo" después del extracto. Además del
+tiempo informa cuántas URLs distintas encontró cada método.
+
+Uso:
+    python benchmarks/benchmark_listado_titulares.py
+    python benchmarks/benchmark_listado_titulares.py --tamanos 50,500 --repeticiones 5
+"""
+
+import argparse
+import os
+import sys
+import time
+
+DIRECTORIO = os.path.dirname(os.path.abspath(__file__))
+sys.path.append(os.path.dirname(DIRECTORIO))
+
+from bs4 import BeautifulSoup
+
+from benchmarks.medicion import guardar_resultados, metadatos_ejecucion
+
+def generar_listado(noticias: int) -> str:
+    """Listado estilo WordPress: menú, tarjetas con extracto y enlace al final, barra lateral"""
+    menu = ''.join(f'<li><a href="https://www.tdpi.cl/seccion-{i}/">Sección {i}</a></li>' for i in range(30))
+    tarjetas = ''.join(
+        f'<article><h3>Tribunal resuelve apelación de marca número {i}</h3>'
+        f'<div class="meta"><span class="fecha">12 mayo, 2025</span><span class="autor">TDPI</span></div>'
+        f'<div class="extracto"><p>El tribunal revisó la solicitud de registro.</p><p>Se confirmó la resolución.</p></div>'
+        f'<a href="https://www.tdpi.cl/2025/05/12/noticia-{i}/">Seguir leyendo</a></article>'
+        for i in range(noticias)
+    )
+    lateral = ''.join(f'<h3>Widget {i}</h3><ul><li>Sin enlaces</li></ul>' for i in range(5))
+    return (
+        f'<html><body><header><ul>{menu}</ul></header><main>{tarjetas}</main>'
+        f'<aside>{lateral}</aside></body></html>'
+    )
+
+def listado_anterior(soup: BeautifulSoup):
+    """Método 1 de TDPScraper.get_noticias_recientes tal como era antes del emparejamiento"""
+    urls = []
+    for h3 in soup.find_all('h3'):
+        titulo = h3.get_text(strip=True)
+        if not titulo or len(titulo) <= 10:
+            continue
+        url = None
+        current = h3
+        for _ in range(5):
+            current = current.find_next()
+            if current and current.name == 'a':
+                href = current.get('href', '')
+                if href and ('seguir' in current.get_text().lower() or '2025' in href or 'tdpi.cl' in href):
+                    url = href
+                    break
+            elif current and current.find('a'):
+                link = current.find('a')
+                href = link.get('href', '')
+                if href and ('seguir' in link.get_text().lower() or '2025' in href or 'tdpi.cl' in href):
+                    url = href
+                    break
+        if not url:
+            for link in soup.find_all('a', href=True):
+                href = link.get('href', '')
+                if href and ('2025' in href or 'tdpi.cl' in href):
+                    url = href
+                    break
+        if url:
+            urls.append(url)
+    return urls
+
+def medir(funcion, soup: BeautifulSoup, repeticiones: int) -> float:
+    """Mejor tiempo (segundos) de varias repeticiones, sin contar el parseo"""
+    mejor = float('inf')
+    for _ in range(repeticiones):
+        inicio = time.perf_counter()
+        funcion(soup)
+        mejor = min(mejor, time.perf_counter() - inicio)
+    return mejor
+
+def main():
+    parser = argparse.ArgumentParser(description='Micro-benchmark del emparejamiento titular → enlace')
+    parser.add_argument('--tamanos', type=lambda valor: [int(t) for t in valor.split(',')], default=[20, 200, 1000],
+                        help='Cantidad de noticias por listado, separadas por coma')
+    parser.add_argument('--repeticiones', type=int, default=3, help='Repeticiones por medición (se toma la mejor)')
+    parser.add_argument('--salida', default=None, help='Archivo JSON de resultados')
+    args = parser.parse_args()
+
+    from backend.scrapers.fuentes.listado_titulares import emparejar_titulares
+    from backend.scrapers.fuentes.tdpi.tdpi_scraper import es_enlace_noticia
+
+    def listado_nuevo(soup: BeautifulSoup):
+        return [enlace['href'] for h3, enlace in emparejar_titulares(soup, es_enlace_noticia)
+                if len(h3.get_text(strip=True)) > 10]
+
+    resultados = dict(metadatos_ejecucion(), listados={})
+
+    print("⏱️  Listados titular → enlace: búsqueda por titular vs emparejamiento de una pasada")
+    for noticias in args.tamanos:
+        soup = BeautifulSoup(generar_listado(noticias), 'html.parser')
+
+        anterior = medir(listado_anterior, soup, args.repeticiones)
+        nuevo = medir(listado_nuevo, soup, args.repeticiones)
+        distintas_anterior = len(set(listado_anterior(soup)))
+        distintas_nuevo = len(set(listado_nuevo(soup)))
+
+        resultados['listados'][f"{noticias}n"] = {
+            'anterior_s': round(anterior, 6),
+            'emparejamiento_s': round(nuevo, 6),
+            'aceleracion': round(anterior / nuevo, 2) if nuevo > 0 else None,
+            'urls_distintas_anterior': distintas_anterior,
+            'urls_distintas_emparejamiento': distintas_nuevo
+        }
+        print(f"   {noticias:>5} noticias  anterior {anterior * 1000:9.2f} ms  "
+              f"emparejamiento {nuevo * 1000:8.2f} ms  (x{anterior / nuevo:6.1f})  "
+              f"URLs distintas {distintas_anterior} vs {distintas_nuevo}")
+
+    salida = args.salida or os.path.join(
+        DIRECTORIO, 'resultados', f"listado_titulares_{time.strftime('%Y%m%d_%H%M%S')}.json"
+    )
+    print(f"💾 Resultados: {guardar_resultados(resultados, salida)}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,118 @@
+#!/usr/bin/env python3
+"""
+Micro-benchmark del parseo de listados
+Compara html.parser (como parseaban antes todos los scrapers), lxml con el
+árbol completo y lxml en modo listado (solo <a>) sobre un listado sintético
+con la forma de los portales grandes: menús, scripts, tarjetas de noticias y
+pie de página. Mide tiempo y memoria pico, y comprueba que los enlaces
+encontrados sean los mismos en los tres casos.
+
+Uso:
+    python benchmarks/benchmark_parseo.py
+    python benchmarks/benchmark_parseo.py --tamanos 100,1000 --repeticiones 5
+"""
+
+import argparse
+import os
+import sys
+import time
+import tracemalloc
+
+DIRECTORIO = os.path.dirname(os.path.abspath(__file__))
+sys.path.append(os.path.dirname(DIRECTORIO))
+
+from bs4 import BeautifulSoup
+
+from benchmarks.medicion import MedidorMemoria, guardar_resultados, metadatos_ejecucion
+
+def generar_listado(noticias: int) -> bytes:
+    """Listado con `noticias` tarjetas y el andamiaje típico de un portal"""
+    menu = ''.join(f'<li class="menu-item"><a href="/seccion/{i}">Sección {i}</a></li>' for i in range(80))
+    tarjetas = ''.join(
+        f'<div class="col-md-4"><div class="card noticia"><div class="card-img"><img src="/img/{i}.jpg" alt=""></div>'
+        f'<div class="card-body"><span class="fecha">0{i % 9 + 1}/05/2025</span>'
+        f'<h3 class="card-title"><a href="/noticias/{i}">Corte Suprema acoge recurso de protección número {i}</a></h3>'
+        f'<p class="card-text">La Corte Suprema acogió el recurso y ordenó adoptar las medidas necesarias.</p>'
+        f'</div></div></div>'
+        for i in range(noticias)
+    )
+    script = '<script>' + 'var configuracion = {"clave": "valor"};' * 200 + '</script>'
+    return (
+        f'<html><head><title>Noticias</title>{script}<style>.card{{margin:0}}</style></head><body>'
+        f'<header><nav><ul>{menu}</ul></nav></header><main><div class="row">{tarjetas}</div></main>'
+        f'<footer><ul>{menu}</ul></footer>{script}</body></html>'
+    ).encode('utf-8')
+
+def enlaces(soup: BeautifulSoup):
+    """Lo que usan los listados: href y texto de cada enlace"""
+    return [(link.get('href'), link.get_text(strip=True)) for link in soup.find_all('a', href=True)]
+
+def medir(funcion, repeticiones: int) -> float:
+    """Mejor tiempo (segundos) de varias repeticiones"""
+    mejor = float('inf')
+    for _ in range(repeticiones):
+        inicio = time.perf_counter()
+        funcion()
+        mejor = min(mejor, time.perf_counter() - inicio)
+    return mejor
+
+def medir_memoria(funcion) -> float:
+    """Memoria pico (MB) de una ejecución; se mide aparte porque tracemalloc frena los tiempos"""
+    with MedidorMemoria() as memoria:
+        resultado = funcion()
+    del resultado
+    tracemalloc.stop()
+    return memoria.pico_mb
+
+def main():
+    parser = argparse.ArgumentParser(description='Micro-benchmark del parseo de listados')
+    parser.add_argument('--tamanos', type=lambda valor: [int(t) for t in valor.split(',')], default=[100, 1000],
+                        help='Cantidad de noticias por listado, separadas por coma')
+    parser.add_argument('--repeticiones', type=int, default=3, help='Repeticiones por medición (se toma la mejor)')
+    parser.add_argument('--salida', default=None, help='Archivo JSON de resultados')
+    args = parser.parse_args()
+
+    from backend.scrapers.fuentes.parseo import PARSER_HTML, parsear
+
+    resultados = dict(metadatos_ejecucion(), parser=PARSER_HTML, listados={})
+
+    print(f"⏱️  Parseo de listados: html.parser vs {PARSER_HTML} completo vs {PARSER_HTML} modo listado")
+    for noticias in args.tamanos:
+        html = generar_listado(noticias)
+
+        esperado = enlaces(BeautifulSoup(html, 'html.parser'))
+        assert enlaces(parsear(html)) == esperado, "El árbol completo no encuentra los mismos enlaces"
+        assert enlaces(parsear(html, ('a',))) == esperado, "El modo listado no encuentra los mismos enlaces"
+
+        modos = {
+            'html_parser': lambda: BeautifulSoup(html, 'html.parser'),
+            'completo': lambda: parsear(html),
+            'listado': lambda: parsear(html, ('a',)),
+        }
+        tiempos = {modo: medir(funcion, args.repeticiones) for modo, funcion in modos.items()}
+        medidas = {modo: (tiempos[modo], medir_memoria(funcion)) for modo, funcion in modos.items()}
+        base_s, base_mb = medidas['html_parser']
+        resultados['listados'][f"{noticias}n"] = {
+            'bytes': len(html),
+            **{
+                modo: {
+                    'segundos': round(segundos, 6),
+                    'memoria_pico_mb': memoria_mb,
+                    'aceleracion': round(base_s / segundos, 2) if segundos > 0 else None,
+                    'reduccion_memoria': round(base_mb / memoria_mb, 2) if memoria_mb else None
+                }
+                for modo, (segundos, memoria_mb) in medidas.items()
+            }
+        }
+        print(f"   {noticias:>5} noticias ({len(html) // 1024:>5} KB)")
+        for modo, (segundos, memoria_mb) in medidas.items():
+            print(f"            {modo:<12} {segundos * 1000:9.2f} ms (x{base_s / segundos:4.1f})  "
+                  f"{memoria_mb:7.2f} MB (x{base_mb / memoria_mb:4.1f})")
+
+    salida = args.salida or os.path.join(
+        DIRECTORIO, 'resultados', f"parseo_{time.strftime('%Y%m%d_%H%M%S')}.json"
+    )
+    print(f"💾 Resultados: {guardar_resultados(resultados, salida)}")
+
+if __name__ == "__main__":
+    main()
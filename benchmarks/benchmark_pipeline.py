@@ -0,0 +1,258 @@
+#!/usr/bin/env python3
+"""
+Benchmark del pipeline de noticias jurídicas sobre respuestas HTTP grabadas
+Ejecuta cada scraper y luego el pipeline completo de NoticiasJuridicasSystem
+en modo replay (sin red), guardando en memoria en lugar de Supabase.
+Si faltan los fixtures o alguna petición no tiene respuesta grabada, termina con
+código 1 sin guardar ni comparar resultados.
+
+Uso:
+    python benchmarks/benchmark_pipeline.py --grabar       # grabar fixtures (requiere red)
+    python benchmarks/benchmark_pipeline.py                # medir sobre los fixtures
+    python benchmarks/benchmark_pipeline.py --comparar benchmarks/resultados/anterior.json
+"""
+
+import argparse
+import contextlib
+import io
+import json
+import os
+import sys
+import tempfile
+import time
+
+DIRECTORIO = os.path.dirname(os.path.abspath(__file__))
+sys.path.append(os.path.dirname(DIRECTORIO))
+
+from benchmarks.medicion import (
+    Cronometro,
+    MedidorMemoria,
+    comparar_resultados,
+    guardar_resultados,
+    metadatos_ejecucion
+)
+
+# Métodos que obtienen y parsean el listado de cada fuente
+METODOS_LISTADO = ('get_noticias_recientes', 'extraer_codigos_noticias', 'extraer_noticias_lista')
+
+def instrumentar_etapas(cronometro: Cronometro, scrapers: dict):
+    """Cronometrar las etapas del pipeline en las clases que las implementan"""
+    from backend.database.memoria_client import AlmacenamientoMemoria
+    from backend.main import NoticiasJuridicasSystem
+    from backend.processors.content_processor import ContentProcessor
+    from backend.scrapers.fuentes.base_scraper import BaseScraper
+    from backend.scrapers.fuentes.data_schema import DataNormalizer, NoticiaEstandarizada
+    from backend.scrapers.fuentes.date_extractor import UniversalDateExtractor
+
+    for clase in {type(scraper) for scraper in scrapers.values()}:
+        for metodo in METODOS_LISTADO:
+            if metodo in vars(clase):
+                cronometro.instrumentar(clase, metodo, 'listado')
+        cronometro.instrumentar(clase, 'scrape_noticias_recientes', 'scraping')
+
+    cronometro.instrumentar(ContentProcessor, '_limpiar_contenido', 'limpieza')
+    cronometro.instrumentar(ContentProcessor, '_limpiar_titulo', 'limpieza')
+
+    cronometro.instrumentar(UniversalDateExtractor, 'extract_date_from_html', 'fechas')
+    cronometro.instrumentar(DataNormalizer, 'normalizar_fecha', 'fechas')
+    cronometro.instrumentar(NoticiaEstandarizada, '_parse_fecha', 'fechas')
+    cronometro.instrumentar(BaseScraper, '_extract_fecha_generica', 'fechas')
+    cronometro.instrumentar(BaseScraper, '_parse_fecha_generica', 'fechas')
+
+    cronometro.instrumentar(ContentProcessor, 'generar_resumen_ejecutivo', 'resumen')
+
+    cronometro.instrumentar(NoticiaEstandarizada, 'to_dict', 'serializacion')
+    cronometro.instrumentar(AlmacenamientoMemoria, '_serializar', 'serializacion')
+
+    cronometro.instrumentar(NoticiasJuridicasSystem, '_guardar_noticias', 'guardado')
+
+def completar_medicion(etapas: dict, items: int, segundos: float, memoria_mb, sin_grabar: int) -> dict:
+    """Armar el resultado de una medición, separando detalle de listado"""
+    if 'scraping' in etapas:
+        detalle = etapas['scraping']['segundos'] - etapas.get('listado', {}).get('segundos', 0.0)
+        etapas['detalle'] = {'segundos': round(max(detalle, 0.0), 6), 'llamadas': etapas['scraping']['llamadas']}
+
+    return {
+        'items': items,
+        'segundos': round(segundos, 4),
+        'items_por_segundo': round(items / segundos, 2) if segundos > 0 else None,
+        'memoria_pico_mb': memoria_mb,
+        'peticiones_sin_grabar': sin_grabar,
+        'etapas': etapas
+    }
+
+@contextlib.contextmanager
+def silenciar(activo: bool):
+    """Descartar la salida de los scrapers para no medir la consola"""
+    if not activo:
+        yield
+        return
+    with contextlib.redirect_stdout(io.StringIO()):
+        yield
+
+def serializar(noticias: list) -> tuple:
+    """Convertir noticias a filas como _guardar_noticias, contando las que fallan"""
+    filas, errores = [], 0
+    for noticia in noticias:
+        try:
+            filas.append(noticia.to_dict() if hasattr(noticia, 'to_dict') else noticia)
+        except Exception:
+            errores += 1
+    return filas, errores
+
+def medir_fuentes(sistema, cronometro, cache, args) -> dict:
+    """Ejecutar cada scraper por separado"""
+    from backend.database.memoria_client import AlmacenamientoMemoria
+
+    resultados = {}
+    for nombre, scraper in sistema.scrapers.items():
+        cronometro.reiniciar()
+        fallos_previos = cache.estadisticas['fallos']
+
+        with MedidorMemoria(not args.sin_memoria) as memoria, silenciar(not args.verbose):
+            inicio = time.perf_counter()
+            try:
+                noticias = scraper.scrape_noticias_recientes(max_noticias=args.max_noticias) or []
+            except Exception as e:
+                print(f"❌ {nombre}: {e}", file=sys.stderr)
+                noticias = []
+            filas, errores = serializar(noticias)
+            AlmacenamientoMemoria._serializar(filas)
+            segundos = time.perf_counter() - inicio
+
+        resultados[nombre] = completar_medicion(
+            cronometro.resumen(), len(noticias), segundos, memoria.pico_mb,
+            cache.estadisticas['fallos'] - fallos_previos
+        )
+        resultados[nombre]['errores_serializacion'] = errores
+        if errores:
+            print(f"⚠️  {nombre}: {errores} noticias no se pudieron serializar", file=sys.stderr)
+        print(f"   {nombre:<22} {len(noticias):>3} items  {segundos:7.3f}s  "
+              f"{resultados[nombre]['items_por_segundo'] or 0:8.2f} items/s  "
+              f"{memoria.pico_mb or 0:6.1f} MB")
+    return resultados
+
+def medir_pipeline(cronometro, cache, args) -> dict:
+    """Ejecutar run_scraping_completo con almacenamiento en memoria"""
+    from backend.database.memoria_client import AlmacenamientoMemoria
+    from backend.main import NoticiasJuridicasSystem
+
+    almacenamiento = AlmacenamientoMemoria()
+    with silenciar(not args.verbose):
+        sistema = NoticiasJuridicasSystem(almacenamiento=almacenamiento)
+        sistema.config['max_noticias_por_fuente'] = args.max_noticias
+        if args.fuentes:
+            sistema.seleccionar_fuentes([nombre for nombre in sistema.scrapers if nombre in args.fuentes])
+
+    # Momento de la primera escritura: las fuentes guardan por lotes mientras descargan
+    primera_escritura = []
+    upsert_noticias = almacenamiento.upsert_noticias
+
+    def upsert_cronometrado(*args_upsert, **kwargs_upsert):
+        if not primera_escritura:
+            primera_escritura.append(time.perf_counter())
+        return upsert_noticias(*args_upsert, **kwargs_upsert)
+
+    almacenamiento.upsert_noticias = upsert_cronometrado
+
+    cronometro.reiniciar()
+    fallos_previos = cache.estadisticas['fallos']
+
+    with MedidorMemoria(not args.sin_memoria) as memoria, silenciar(not args.verbose):
+        inicio = time.perf_counter()
+        sistema.run_scraping_completo()
+        segundos = time.perf_counter() - inicio
+
+    resultado = completar_medicion(
+        cronometro.resumen(), len(almacenamiento.noticias), segundos, memoria.pico_mb,
+        cache.estadisticas['fallos'] - fallos_previos
+    )
+    resultado['workers'] = sistema.config.get('max_workers')
+    resultado['primera_escritura_s'] = round(primera_escritura[0] - inicio, 4) if primera_escritura else None
+    # Cachés y conexiones compartidas por los scrapers durante la ejecución
+    resultado['contexto'] = sistema.contexto.get_estadisticas()
+    return resultado
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark del pipeline sobre respuestas grabadas')
+    parser.add_argument('--fixtures', default=os.path.join(DIRECTORIO, 'fixtures'),
+                        help='Directorio de respuestas grabadas (caché HTTP)')
+    parser.add_argument('--grabar', action='store_true', help='Grabar fixtures desde los sitios reales')
+    parser.add_argument('--max-noticias', type=int, default=5, help='Máximo de noticias por fuente')
+    parser.add_argument('--fuentes', type=lambda valor: valor.split(','), default=None,
+                        help='Fuentes a medir, separadas por coma (por defecto todas)')
+    parser.add_argument('--salida', default=None, help='Archivo JSON de resultados')
+    parser.add_argument('--comparar', default=None, help='JSON de una ejecución anterior para detectar regresiones')
+    parser.add_argument('--tolerancia', type=float, default=0.2, help='Regresión tolerada (0.2 = 20%%)')
+    parser.add_argument('--sin-memoria', action='store_true', help='No medir memoria pico (tracemalloc)')
+    parser.add_argument('--verbose', action='store_true', help='Mostrar la salida de los scrapers')
+    args = parser.parse_args()
+
+    # Estado incremental aislado: el benchmark no toca .estado_scraping
+    os.environ['NOTICIAS_DIRECTORIO_ESTADO'] = tempfile.mkdtemp(prefix='benchmark_estado_')
+
+    from backend.main import NoticiasJuridicasSystem
+    from backend.database.memoria_client import AlmacenamientoMemoria
+    from backend.scrapers.fuentes.cache_respuestas import cache_respuestas
+
+    modo = 'grabar' if args.grabar else 'replay'
+    with silenciar(not args.verbose):
+        sistema = NoticiasJuridicasSystem(almacenamiento=AlmacenamientoMemoria())
+        sistema.configurar_cache_http(modo)
+        if args.fuentes:
+            sistema.seleccionar_fuentes([nombre for nombre in sistema.scrapers if nombre in args.fuentes])
+    cache_respuestas.directorio = args.fixtures
+
+    if modo == 'replay' and not os.path.isdir(args.fixtures):
+        print(f"❌ No hay fixtures en {args.fixtures}; grábelos con --grabar (requiere red)")
+        sys.exit(1)
+
+    cronometro = Cronometro()
+    instrumentar_etapas(cronometro, sistema.scrapers)
+
+    print(f"⏱️  Benchmark ({modo}) - fixtures: {args.fixtures}")
+    print("📰 Por fuente:")
+    try:
+        fuentes = medir_fuentes(sistema, cronometro, cache_respuestas, args)
+        pipeline = medir_pipeline(cronometro, cache_respuestas, args)
+    finally:
+        cronometro.restaurar()
+
+    print(f"🏭 Pipeline completo: {pipeline['items']} items en {pipeline['segundos']:.3f}s "
+          f"({pipeline['items_por_segundo'] or 0:.2f} items/s, {pipeline['memoria_pico_mb'] or 0:.1f} MB)")
+    if pipeline['primera_escritura_s'] is not None:
+        print(f"   primera escritura a los {pipeline['primera_escritura_s']:.3f}s")
+    for etapa, medicion in pipeline['etapas'].items():
+        print(f"   {etapa:<14} {medicion['segundos']:8.3f}s  ({medicion['llamadas']} llamadas)")
+
+    # Un replay con respuestas faltantes no mide el pipeline completo: no se guarda ni se compara
+    sin_grabar = sum(f['peticiones_sin_grabar'] for f in fuentes.values()) + pipeline['peticiones_sin_grabar']
+    if modo == 'replay' and sin_grabar:
+        print(f"❌ Replay incompleto: {sin_grabar} peticiones sin respuesta grabada")
+        sys.exit(1)
+
+    resultados = dict(
+        metadatos_ejecucion(),
+        modo=modo,
+        fixtures=args.fixtures,
+        max_noticias=args.max_noticias,
+        fuentes=fuentes,
+        pipeline=pipeline
+    )
+    salida = args.salida or os.path.join(
+        DIRECTORIO, 'resultados', f"benchmark_{time.strftime('%Y%m%d_%H%M%S')}.json"
+    )
+    print(f"💾 Resultados: {guardar_resultados(resultados, salida)}")
+
+    if args.comparar:
+        with open(args.comparar, encoding='utf-8') as archivo:
+            regresiones = comparar_resultados(resultados, json.load(archivo), args.tolerancia)
+        if regresiones:
+            print(f"❌ Regresiones respecto de {args.comparar}:")
+            for regresion in regresiones:
+                print(f"   - {regresion}")
+            sys.exit(1)
+        print(f"✅ Sin regresiones respecto de {args.comparar}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,145 @@
+#!/usr/bin/env python3
+"""
+Benchmark de la planificación de visitas por fuente
+Simula varias semanas de publicaciones (proceso de Poisson por fuente, con el
+ritmo típico de cada una) y compara el barrido completo de todas las fuentes
+en cada ejecución con PlanificadorFuentes, que visita solo las fuentes
+vencidas. Ambas políticas corren en los mismos instantes (por defecto cada
+hora, como el cron del workflow). El planificador aprende de un historial
+previo de 60 días y de lo que ingiere durante la simulación, igual que con el
+índice local de URLs. Informa visitas (peticiones al listado), retraso entre
+publicación e ingesta y la proporción de noticias ingeridas a tiempo.
+
+Uso:
+    python benchmarks/benchmark_planificacion.py
+    python benchmarks/benchmark_planificacion.py --dias 56 --tick 60 --semilla 7
+"""
+
+import argparse
+import os
+import random
+import statistics
+import sys
+import tempfile
+import time
+from bisect import bisect_right
+from datetime import datetime, timezone
+
+DIRECTORIO = os.path.dirname(os.path.abspath(__file__))
+sys.path.append(os.path.dirname(DIRECTORIO))
+
+from benchmarks.medicion import guardar_resultados, metadatos_ejecucion
+from backend.scrapers.fuentes.planificador_fuentes import PlanificadorFuentes, SEGUNDOS_DIA
+
+# Noticias por día supuestas para cada fuente (orden de magnitud observado en los sitios)
+RITMOS = {
+    'poder_judicial': 15, 'contraloria': 3, 'ministerio_justicia': 2, 'dt': 2, 'sii': 1.5,
+    'cde': 1, 'inapi': 1, 'tdpi': 0.5, 'tdlc': 0.4, 'tribunal_ambiental': 0.4,
+    '1ta': 0.3, '3ta': 0.3, 'tta': 0.2
+}
+
+HISTORIAL_DIAS = 60
+
+def publicaciones(aleatorio: random.Random, por_dia: float, desde: float, hasta: float) -> list:
+    """Instantes de publicación de un proceso de Poisson"""
+    instantes, t = [], desde
+    while True:
+        t += aleatorio.expovariate(por_dia / SEGUNDOS_DIA)
+        if t >= hasta:
+            return instantes
+        instantes.append(t)
+
+class IndiceSimulado:
+    """Fechas de publicación ingeridas, con la consulta que usa el planificador"""
+
+    def __init__(self):
+        self.fechas = {}
+
+    def registrar(self, fuente: str, instantes):
+        self.fechas.setdefault(fuente, []).extend(instantes)
+
+    def publicaciones_por_fuente(self, desde: str, hasta: str) -> dict:
+        resultado = {}
+        for fuente, instantes in self.fechas.items():
+            dias = [datetime.fromtimestamp(t, timezone.utc).date().isoformat() for t in instantes]
+            resultado[fuente] = {'publicadas': sum(desde <= dia <= hasta for dia in dias), 'primera': min(dias)}
+        return resultado
+
+def simular(politica: str, eventos: dict, inicio: float, fin: float, tick: float, semilla: int) -> dict:
+    """Recorrer la simulación con una política ('barrido' o 'planificada')"""
+    indice = IndiceSimulado()
+    for fuente, instantes in eventos.items():
+        indice.registrar(fuente, [t for t in instantes if t < inicio])
+
+    planificador = None
+    if politica == 'planificada':
+        ruta = os.path.join(tempfile.mkdtemp(prefix='benchmark_planificacion_'), 'planificacion.json')
+        planificador = PlanificadorFuentes(ruta, random.Random(semilla))
+
+    ingeridas = {fuente: bisect_right(instantes, inicio) for fuente, instantes in eventos.items()}
+    retrasos, visitas, utiles = [], 0, 0
+
+    ahora = inicio
+    while ahora < fin:
+        fuentes = list(eventos) if planificador is None else planificador.vencidas(eventos, ahora)
+        resultados = []
+        for fuente in fuentes:
+            instantes = eventos[fuente]
+            hasta = bisect_right(instantes, ahora)
+            nuevas = instantes[ingeridas[fuente]:hasta]
+            ingeridas[fuente] = hasta
+            retrasos.extend(ahora - t for t in nuevas)
+            indice.registrar(fuente, nuevas)
+            visitas += 1
+            utiles += bool(nuevas)
+            resultados.append({'fuente': fuente, 'nuevas': len(nuevas), 'errores': []})
+
+        if planificador is not None and resultados:
+            planificador.aprender_desde(indice, ahora=ahora)
+            planificador.registrar_visitas(resultados, ahora)
+        ahora += tick
+
+    retrasos.sort()
+    return {
+        'visitas': visitas,
+        'visitas_utiles': utiles,
+        'noticias': len(retrasos),
+        'retraso_medio_h': round(statistics.mean(retrasos) / 3600, 3) if retrasos else None,
+        'retraso_p95_h': round(retrasos[int(len(retrasos) * 0.95)] / 3600, 3) if retrasos else None,
+        'retraso_max_h': round(retrasos[-1] / 3600, 3) if retrasos else None,
+        'antes_de_2h': round(sum(r <= 7200 for r in retrasos) / len(retrasos), 4) if retrasos else None
+    }
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark de la planificación de visitas por fuente')
+    parser.add_argument('--dias', type=int, default=28, help='Días simulados')
+    parser.add_argument('--tick', type=float, default=3600, help='Segundos entre ejecuciones (cron)')
+    parser.add_argument('--semilla', type=int, default=1, help='Semilla de las publicaciones y del jitter')
+    parser.add_argument('--salida', default=None, help='Archivo JSON de resultados')
+    args = parser.parse_args()
+
+    aleatorio = random.Random(args.semilla)
+    inicio = HISTORIAL_DIAS * SEGUNDOS_DIA
+    fin = inicio + args.dias * SEGUNDOS_DIA
+    eventos = {fuente: publicaciones(aleatorio, por_dia, 0.0, fin) for fuente, por_dia in RITMOS.items()}
+
+    resultados = dict(metadatos_ejecucion(), dias=args.dias, tick=args.tick, semilla=args.semilla,
+                      ritmos=RITMOS, politicas={})
+    print(f"🗓️  Planificación de visitas ({args.dias} días, ejecución cada {args.tick / 60:.0f} min)")
+    for politica in ('barrido', 'planificada'):
+        medicion = simular(politica, eventos, inicio, fin, args.tick, args.semilla)
+        resultados['politicas'][politica] = medicion
+        print(f"   {politica:<12} {medicion['visitas']:6d} visitas ({medicion['visitas_utiles']} con novedades)  "
+              f"retraso medio {medicion['retraso_medio_h']:.2f}h  p95 {medicion['retraso_p95_h']:.2f}h  "
+              f"máx {medicion['retraso_max_h']:.2f}h  antes de 2h {medicion['antes_de_2h']:.0%}")
+
+    barrido, planificada = resultados['politicas']['barrido'], resultados['politicas']['planificada']
+    print(f"   📉 Visitas: -{1 - planificada['visitas'] / barrido['visitas']:.0%}")
+
+    salida = args.salida or os.path.join(
+        DIRECTORIO, 'resultados', f"planificacion_{time.strftime('%Y%m%d_%H%M%S')}.json"
+    )
+    print(f"💾 Resultados: {guardar_resultados(resultados, salida)}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,118 @@
+#!/usr/bin/env python3
+"""
+Benchmark del plazo de ejecución (--deadline)
+Simula muchas ejecuciones del workflow con duraciones por fuente variables
+(lognormal alrededor de su duración típica) y, en cada una, una fuente
+colgada elegida al azar. Compara recorrer las fuentes en el orden del sistema
+hasta que el job se corta por timeout-minutes con ordenarlas por prioridad y
+costo y darle a cada una su franja (PlazoEjecucion). Informa fuentes
+completas, cortadas y sin recorrer, fuentes de prioridad 1 completas y la
+proporción de ejecuciones que el job mata antes de terminar.
+
+Uso:
+    python benchmarks/benchmark_plazo.py
+    python benchmarks/benchmark_plazo.py --ejecuciones 500 --workers 1 --deadline 18
+"""
+
+import argparse
+import heapq
+import os
+import random
+import statistics
+import sys
+import time
+
+DIRECTORIO = os.path.dirname(os.path.abspath(__file__))
+sys.path.append(os.path.dirname(DIRECTORIO))
+
+from benchmarks.medicion import guardar_resultados, metadatos_ejecucion
+from backend.main import FUENTES_SISTEMA
+from backend.scrapers.fuentes.config import get_fuente_config
+from backend.scrapers.fuentes.plazo_ejecucion import PlazoEjecucion, ordenar_fuentes
+
+# Duración típica de una visita por fuente, en segundos (orden de magnitud con --max-noticias 10)
+DURACIONES = {
+    'poder_judicial': 240, 'contraloria': 150, 'cde': 90, 'tdlc': 120, '1ta': 100, '3ta': 100,
+    'tribunal_ambiental': 120, 'sii': 80, 'tta': 90, 'inapi': 150, 'dt': 110, 'tdpi': 90,
+    'ministerio_justicia': 180
+}
+
+# Minutos del job que no son scraping (checkout, instalación, diagnóstico)
+MINUTOS_FUERA_DEL_SCRAPING = 4
+
+def simular(fuentes, duraciones: dict, workers: int, corte_job: float, plazo: PlazoEjecucion = None) -> dict:
+    """Recorrer una ejecución con `workers` fuentes en paralelo; con `plazo`, cada una dentro de su franja"""
+    libres = [0.0] * workers
+    resultado = {'completas': [], 'cortadas': [], 'sin_recorrer': [], 'fin': 0.0}
+    for fuente in fuentes:
+        inicio = heapq.heappop(libres)
+        limite = plazo.asignar(fuente, inicio) if plazo is not None else None
+        if inicio >= corte_job or (plazo is not None and limite is None):
+            resultado['sin_recorrer'].append(fuente)
+            heapq.heappush(libres, inicio)
+            continue
+
+        fin = inicio + duraciones[fuente]
+        if limite is not None and fin > limite:
+            fin = limite
+            resultado['cortadas'].append(fuente)
+        elif fin > corte_job:
+            resultado['cortadas'].append(fuente)
+        else:
+            resultado['completas'].append(fuente)
+        resultado['fin'] = max(resultado['fin'], fin)
+        heapq.heappush(libres, fin)
+    return resultado
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark del plazo de ejecución')
+    parser.add_argument('--ejecuciones', type=int, default=300, help='Ejecuciones simuladas')
+    parser.add_argument('--workers', type=int, default=4, help='Fuentes en paralelo')
+    parser.add_argument('--deadline', type=float, default=18, help='Plazo del scraping (minutos)')
+    parser.add_argument('--timeout-job', type=float, default=25, help='timeout-minutes del workflow')
+    parser.add_argument('--semilla', type=int, default=1, help='Semilla de las duraciones')
+    parser.add_argument('--salida', default=None, help='Archivo JSON de resultados')
+    args = parser.parse_args()
+
+    aleatorio = random.Random(args.semilla)
+    corte_job = (args.timeout_job - MINUTOS_FUERA_DEL_SCRAPING) * 60
+    prioridad_1 = {fuente for fuente in FUENTES_SISTEMA if get_fuente_config(fuente).get('prioridad') == 1}
+
+    mediciones = {'sin_plazo': [], 'con_plazo': []}
+    for _ in range(args.ejecuciones):
+        duraciones = {fuente: media * aleatorio.lognormvariate(0, 0.5) for fuente, media in DURACIONES.items()}
+        # Una fuente colgada: sin plazo, solo la detiene el timeout del job
+        duraciones[aleatorio.choice(FUENTES_SISTEMA)] = 3600
+
+        mediciones['sin_plazo'].append(simular(FUENTES_SISTEMA, duraciones, args.workers, corte_job))
+        # El costo esperado es la duración típica, como la media que guarda el planificador
+        orden = ordenar_fuentes(FUENTES_SISTEMA, DURACIONES)
+        plazo = PlazoEjecucion(args.deadline * 60, {fuente: DURACIONES[fuente] for fuente in orden}, args.workers)
+        mediciones['con_plazo'].append(simular(orden, duraciones, args.workers, corte_job, plazo))
+
+    resultados = dict(metadatos_ejecucion(), ejecuciones=args.ejecuciones, workers=args.workers,
+                      deadline=args.deadline, timeout_job=args.timeout_job, semilla=args.semilla,
+                      duraciones=DURACIONES, politicas={})
+    print(f"⏳ Plazo de ejecución ({args.ejecuciones} ejecuciones, {args.workers} workers, "
+          f"una fuente colgada, job de {args.timeout_job:.0f} min)")
+    for politica, ejecuciones in mediciones.items():
+        medicion = {
+            'completas': round(statistics.mean(len(e['completas']) for e in ejecuciones), 2),
+            'cortadas': round(statistics.mean(len(e['cortadas']) for e in ejecuciones), 2),
+            'sin_recorrer': round(statistics.mean(len(e['sin_recorrer']) for e in ejecuciones), 2),
+            'prioridad_1_completas': round(statistics.mean(
+                len(prioridad_1.intersection(e['completas'])) for e in ejecuciones), 2),
+            'job_cortado': round(sum(e['fin'] > corte_job for e in ejecuciones) / len(ejecuciones), 4),
+            'fin_medio_min': round(statistics.mean(min(e['fin'], corte_job) for e in ejecuciones) / 60, 2)
+        }
+        resultados['politicas'][politica] = medicion
+        print(f"   {politica:<10} completas {medicion['completas']:5.2f}  cortadas {medicion['cortadas']:4.2f}  "
+              f"sin recorrer {medicion['sin_recorrer']:4.2f}  prioridad 1 completas "
+              f"{medicion['prioridad_1_completas']:.2f}/{len(prioridad_1)}  job cortado {medicion['job_cortado']:.0%}  "
+              f"fin {medicion['fin_medio_min']:.1f} min")
+
+    salida = args.salida or os.path.join(DIRECTORIO, 'resultados', f"plazo_{time.strftime('%Y%m%d_%H%M%S')}.json")
+    print(f"💾 Resultados: {guardar_resultados(resultados, salida)}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,110 @@
+#!/usr/bin/env python3
+"""
+Benchmark de la salud de las fuentes y sus cortacircuitos
+Simula una semana de ejecuciones horarias (el cron del workflow) con dos
+sitios caídos: uno que no responde (cada petición agota su timeout) y otro que
+responde 500. El sitio que no responde vuelve a funcionar a mitad de la
+semana. Compara el comportamiento anterior (todas las fuentes en cada
+ejecución, sin corte dentro de la visita) con SaludFuentes y el corte tras
+`fallos_seguidos_visita` peticiones fallidas. Informa los minutos gastados en
+sitios caídos y las horas hasta volver a recorrer el sitio recuperado.
+
+Uso:
+    python benchmarks/benchmark_salud.py
+    python benchmarks/benchmark_salud.py --dias 14 --timeout 30 --peticiones 12
+"""
+
+import argparse
+import os
+import sys
+import tempfile
+import time
+
+DIRECTORIO = os.path.dirname(os.path.abspath(__file__))
+sys.path.append(os.path.dirname(DIRECTORIO))
+
+from benchmarks.medicion import guardar_resultados, metadatos_ejecucion
+from backend.scrapers.fuentes.config import SCRAPING_CONFIG
+from backend.scrapers.fuentes.salud_fuentes import SaludFuentes
+
+# Sitio -> (comportamiento, segundos por petición fallida)
+#   'timeout': cada petición espera el timeout completo (no se reintenta)
+#   '500': responde rápido con error; cada petición se reintenta max_retries veces
+CAIDOS = {'sii': 'timeout', 'inapi': '500'}
+RECUPERADO = 'sii'
+
+def costo_visita(comportamiento: str, peticiones: int, timeout: float, cortar: bool) -> tuple:
+    """Segundos y peticiones de una visita a un sitio caído"""
+    intentos = 1 if comportamiento == 'timeout' else 1 + SCRAPING_CONFIG['max_retries']
+    por_intento = timeout if comportamiento == 'timeout' else 0.5
+    total = peticiones * intentos
+    if cortar:
+        total = min(total, SCRAPING_CONFIG['salud']['fallos_seguidos_visita'])
+    return total * por_intento, total
+
+def simular(con_salud: bool, dias: int, peticiones: int, timeout: float) -> dict:
+    """Recorrer `dias` de ejecuciones horarias"""
+    salud = SaludFuentes(os.path.join(tempfile.mkdtemp(prefix='benchmark_salud_'), 'salud.json'))
+    recuperacion = dias * 86400 / 2
+    segundos, visitas, omitidas, recuperado_en = 0.0, 0, 0, None
+
+    for hora in range(dias * 24):
+        ahora = hora * 3600.0
+        fuentes = list(CAIDOS)
+        if con_salud:
+            seleccion = salud.seleccionar(fuentes, 'funcionando', ahora)
+            omitidas += len(fuentes) - len(seleccion)
+            fuentes = seleccion
+
+        resultados = []
+        for fuente in fuentes:
+            visitas += 1
+            if fuente == RECUPERADO and ahora >= recuperacion:
+                if recuperado_en is None:
+                    recuperado_en = ahora - recuperacion
+                resultados.append({'fuente': fuente, 'encontradas': 3, 'errores': [],
+                                   'peticiones': {'errores': 0, 'latencia_mediana': 0.4}})
+                continue
+            costo, fallidas = costo_visita(CAIDOS[fuente], peticiones, timeout, con_salud)
+            segundos += costo
+            resultados.append({'fuente': fuente, 'encontradas': 0, 'errores': [],
+                               'peticiones': {'errores': fallidas, 'latencia_mediana': None}})
+        if con_salud:
+            salud.registrar_visitas(resultados, ahora)
+
+    return {
+        'minutos_en_caidos': round(segundos / 60, 1),
+        'minutos_por_ejecucion': round(segundos / 60 / (dias * 24), 2),
+        'visitas': visitas,
+        'omitidas': omitidas,
+        'horas_hasta_recorrer_recuperado': None if recuperado_en is None else round(recuperado_en / 3600, 1)
+    }
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark de la salud de las fuentes')
+    parser.add_argument('--dias', type=int, default=7, help='Días simulados')
+    parser.add_argument('--timeout', type=float, default=SCRAPING_CONFIG['timeout'], help='Timeout por petición (s)')
+    parser.add_argument('--peticiones', type=int, default=10, help='Peticiones por visita a un sitio caído')
+    parser.add_argument('--salida', default=None, help='Archivo JSON de resultados')
+    args = parser.parse_args()
+
+    resultados = dict(metadatos_ejecucion(), dias=args.dias, timeout=args.timeout, peticiones=args.peticiones,
+                      caidos=CAIDOS, salud=SCRAPING_CONFIG['salud'], politicas={})
+    print(f"🩺 Salud de las fuentes ({args.dias} días de ejecuciones horarias, caídos: "
+          f"{', '.join(f'{fuente} ({modo})' for fuente, modo in CAIDOS.items())}; {RECUPERADO} se recupera a mitad)")
+    for politica, con_salud in (('sin_salud', False), ('con_salud', True)):
+        medicion = simular(con_salud, args.dias, args.peticiones, args.timeout)
+        resultados['politicas'][politica] = medicion
+        print(f"   {politica:<10} {medicion['minutos_en_caidos']:7.1f} min en sitios caídos "
+              f"({medicion['minutos_por_ejecucion']:.2f} min por ejecución)  {medicion['visitas']} visitas, "
+              f"{medicion['omitidas']} omitidas  {RECUPERADO} recorrido "
+              f"{medicion['horas_hasta_recorrer_recuperado']}h después de recuperarse")
+
+    sin_salud, con_salud = resultados['politicas']['sin_salud'], resultados['politicas']['con_salud']
+    print(f"   📉 Minutos en sitios caídos: -{1 - con_salud['minutos_en_caidos'] / sin_salud['minutos_en_caidos']:.0%}")
+
+    salida = args.salida or os.path.join(DIRECTORIO, 'resultados', f"salud_{time.strftime('%Y%m%d_%H%M%S')}.json")
+    print(f"💾 Resultados: {guardar_resultados(resultados, salida)}")
+
+if __name__ == "__main__":
+    main()
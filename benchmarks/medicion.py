@@ -0,0 +1,144 @@
+#!/usr/bin/env python3
+"""
+Utilidades comunes de medición para los benchmarks
+Cronometra etapas instrumentando métodos existentes, mide memoria pico y
+guarda/compara resultados en JSON
+"""
+
+import functools
+import inspect
+import json
+import os
+import platform
+import threading
+import time
+import tracemalloc
+from collections import defaultdict
+from datetime import datetime
+from typing import Dict, List
+
+class Cronometro:
+    """Acumula el tiempo pasado en cada etapa del pipeline
+
+    Los tiempos son acumulados: si una etapa corre en varios hilos a la vez,
+    se suman los de todos. Las llamadas anidadas a una misma etapa cuentan
+    una sola vez.
+    """
+
+    def __init__(self):
+        self._tiempos = defaultdict(float)
+        self._llamadas = defaultdict(int)
+        self._lock = threading.Lock()
+        self._local = threading.local()
+        self._originales = []
+
+    def instrumentar(self, clase, nombre_metodo: str, etapa: str):
+        """Reemplazar `clase.nombre_metodo` por una versión cronometrada"""
+        original = inspect.getattr_static(clase, nombre_metodo, None)
+        if original is None:
+            return
+
+        envoltorio = (staticmethod, classmethod)
+        funcion = original.__func__ if isinstance(original, envoltorio) else original
+        cronometrada = self._cronometrar(funcion, etapa)
+        if isinstance(original, envoltorio):
+            cronometrada = type(original)(cronometrada)
+
+        setattr(clase, nombre_metodo, cronometrada)
+        self._originales.append((clase, nombre_metodo, original))
+
+    def _cronometrar(self, funcion, etapa: str):
+        @functools.wraps(funcion)
+        def cronometrada(*args, **kwargs):
+            activas = self._local.__dict__.setdefault('activas', set())
+            if etapa in activas:
+                return funcion(*args, **kwargs)
+
+            activas.add(etapa)
+            inicio = time.perf_counter()
+            try:
+                return funcion(*args, **kwargs)
+            finally:
+                transcurrido = time.perf_counter() - inicio
+                activas.discard(etapa)
+                with self._lock:
+                    self._tiempos[etapa] += transcurrido
+                    self._llamadas[etapa] += 1
+        return cronometrada
+
+    def restaurar(self):
+        """Deshacer la instrumentación"""
+        for clase, nombre_metodo, original in reversed(self._originales):
+            setattr(clase, nombre_metodo, original)
+        self._originales = []
+
+    def reiniciar(self):
+        with self._lock:
+            self._tiempos.clear()
+            self._llamadas.clear()
+
+    def resumen(self) -> Dict[str, Dict]:
+        """{etapa: {'segundos', 'llamadas'}}"""
+        with self._lock:
+            return {
+                etapa: {'segundos': round(self._tiempos[etapa], 6), 'llamadas': self._llamadas[etapa]}
+                for etapa in sorted(self._tiempos)
+            }
+
+class MedidorMemoria:
+    """Memoria pico (MB) asignada por Python mientras dura el bloque"""
+
+    def __init__(self, activo: bool = True):
+        self.activo = activo
+        self.pico_mb = None
+
+    def __enter__(self):
+        if self.activo:
+            if not tracemalloc.is_tracing():
+                tracemalloc.start()
+            tracemalloc.reset_peak()
+        return self
+
+    def __exit__(self, *args):
+        if self.activo:
+            _, pico = tracemalloc.get_traced_memory()
+            self.pico_mb = round(pico / (1024 * 1024), 2)
+
+def metadatos_ejecucion() -> Dict:
+    """Información del entorno para poder comparar ejecuciones"""
+    return {
+        'fecha': datetime.now().isoformat(),
+        'python': platform.python_version(),
+        'plataforma': platform.platform()
+    }
+
+def guardar_resultados(resultados: Dict, ruta: str) -> str:
+    """Escribir resultados en JSON, creando el directorio si hace falta"""
+    os.makedirs(os.path.dirname(os.path.abspath(ruta)), exist_ok=True)
+    with open(ruta, 'w', encoding='utf-8') as archivo:
+        json.dump(resultados, archivo, ensure_ascii=False, indent=2)
+    return ruta
+
+def comparar_resultados(actual: Dict, anterior: Dict, tolerancia: float = 0.2) -> List[str]:
+    """Listar regresiones de items/s o memoria pico mayores que `tolerancia`
+
+    Se comparan todas las entradas con la misma ruta de claves en ambos
+    resultados que tengan 'items_por_segundo' o 'memoria_pico_mb'.
+    """
+    regresiones = []
+
+    def recorrer(nuevo: Dict, viejo: Dict, ruta: str):
+        for clave, valor in nuevo.items():
+            if isinstance(valor, dict) and isinstance(viejo.get(clave), dict):
+                recorrer(valor, viejo[clave], f"{ruta}.{clave}" if ruta else clave)
+
+        velocidad, velocidad_anterior = nuevo.get('items_por_segundo'), viejo.get('items_por_segundo')
+        if velocidad is not None and velocidad_anterior and velocidad < velocidad_anterior * (1 - tolerancia):
+            regresiones.append(f"{ruta}: {velocidad_anterior:.2f} → {velocidad:.2f} items/s")
+
+        memoria, memoria_anterior = nuevo.get('memoria_pico_mb'), viejo.get('memoria_pico_mb')
+        if memoria is not None and memoria_anterior and memoria > memoria_anterior * (1 + tolerancia):
+            regresiones.append(f"{ruta}: {memoria_anterior:.1f} → {memoria:.1f} MB pico")
+
+    recorrer(actual, anterior, '')
+    return regresiones
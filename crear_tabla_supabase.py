@@ -50,7 +50,7 @@ def crear_tabla_supabase():
             fecha_scraping TIMESTAMP WITH TIME ZONE DEFAULT NOW(),
             fuente TEXT NOT NULL,
             fuente_nombre_completo TEXT,
-            url_origen TEXT NOT NULL,
+            url_origen TEXT NOT NULL UNIQUE, -- Requerido por el upsert on_conflict=url_origen
             url_imagen TEXT,
             categoria TEXT,
             subcategoria TEXT,
@@ -65,7 +65,7 @@ def crear_tabla_supabase():
             autor_cargo TEXT,
             ubicacion TEXT,
             region TEXT,
-            hash_contenido TEXT UNIQUE,
+            hash_contenido TEXT, -- Indexado; la unicidad la da url_origen
             version INTEGER DEFAULT 1,
             es_actualizacion BOOLEAN DEFAULT false,
             relevancia_juridica INTEGER DEFAULT 0,
@@ -215,7 +215,7 @@ def crear_tabla_supabase():
         ('Corte Suprema confirma sentencia en caso emblemático', 'La Corte Suprema confirmó la sentencia del tribunal de primera instancia en un caso que ha generado gran interés público.', NOW(), 'poder_judicial', 'fallos', 'https://www.pjud.cl/noticia-ejemplo', 'hash_test_1'),
         ('Ministerio de Justicia anuncia nueva política de transparencia', 'El Ministerio de Justicia presentó una nueva política de transparencia que mejorará el acceso a la información pública.', NOW() - INTERVAL '1 hour', 'minjusticia', 'institucional', 'https://www.minjusticia.gob.cl/noticia-ejemplo', 'hash_test_2'),
         ('Fiscalía Regional obtiene condena en caso de corrupción', 'La Fiscalía Regional de Santiago logró una importante condena en un caso de corrupción que involucraba a funcionarios públicos.', NOW() - INTERVAL '2 hours', 'fiscalia', 'penal', 'https://www.fiscaliadechile.cl/noticia-ejemplo', 'hash_test_3')
-        ON CONFLICT (hash_contenido) DO NOTHING;
+        ON CONFLICT (url_origen) DO NOTHING;
         """
     ]
     
@@ -568,9 +568,6 @@ class ContraloriaScraper(BaseScraper):
                 if noticia:
                     noticias_completas.append(noticia)
                 
-                # Pausa entre requests
-                self._pausa_entre_requests(1)
-                
             except Exception as e:
                 self._log_error(f"Error procesando noticia {link['url']}", e)
                 continue
@@ -0,0 +1,96 @@
+#!/usr/bin/env python3
+"""
+Script para probar el benchmark del pipeline con un fixture sintético (sin acceso a red)
+"""
+
+import sys
+import os
+import json
+import subprocess
+import tempfile
+
+import requests
+
+# Agregar el directorio del proyecto al path
+sys.path.append(os.path.dirname(__file__))
+
+from backend.scrapers.fuentes.cache_respuestas import CacheRespuestas
+
+LISTADO_3TA = """
+<html><body>
+  <article class="post">
+    <h2>Tribunal ambiental acoge reclamación contra resolución de calificación</h2>
+    <span class="fecha">15/03/2025</span>
+    <a href="https://3ta.cl/noticias/reclamacion-resolucion/">Leer más</a>
+    <p class="excerpt">El Tercer Tribunal Ambiental acogió la reclamación presentada en contra de la
+    resolución que calificó favorablemente el proyecto, ordenando retrotraer el procedimiento de
+    evaluación ambiental a la etapa de participación ciudadana.</p>
+  </article>
+</body></html>
+"""
+
+def grabar(cache: CacheRespuestas, url: str, html: str):
+    response = requests.Response()
+    response.status_code = 200
+    response.url = url
+    response.headers['Content-Type'] = 'text/html; charset=utf-8'
+    response._content = html.encode('utf-8')
+    cache.guardar('GET', url, None, response)
+
+BENCHMARK = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'benchmarks', 'benchmark_pipeline.py')
+
+def ejecutar_benchmark(*argumentos) -> subprocess.CompletedProcess:
+    return subprocess.run([sys.executable, BENCHMARK, *argumentos], capture_output=True, text=True, timeout=120)
+
+def test_benchmark_con_fixture():
+    """Probar que el benchmark mide una fuente y el pipeline sobre fixtures grabados"""
+    print("🧪 PROBANDO BENCHMARK SOBRE FIXTURES")
+    with tempfile.TemporaryDirectory() as directorio:
+        fixtures = os.path.join(directorio, 'fixtures')
+        salida = os.path.join(directorio, 'resultado.json')
+        grabar(CacheRespuestas(fixtures, modo='grabar'), "https://3ta.cl/category/noticias/", LISTADO_3TA)
+
+        proceso = ejecutar_benchmark('--fixtures', fixtures, '--fuentes', '3ta', '--salida', salida)
+        print(proceso.stdout)
+        assert proceso.returncode == 0, proceso.stderr
+
+        with open(salida, encoding='utf-8') as archivo:
+            resultado = json.load(archivo)
+
+        fuente = resultado['fuentes']['3ta']
+        assert fuente['items'] == 1
+        assert fuente['peticiones_sin_grabar'] == 0
+        assert fuente['errores_serializacion'] == 0
+        assert 'listado' in fuente['etapas'] and 'detalle' in fuente['etapas']
+
+        pipeline = resultado['pipeline']
+        assert pipeline['items'] == 1, "La noticia debe quedar en el almacenamiento en memoria"
+        for etapa in ('listado', 'resumen', 'serializacion', 'guardado'):
+            assert etapa in pipeline['etapas'], f"Falta la etapa {etapa}"
+        assert pipeline['memoria_pico_mb'] is not None
+        assert 0 <= pipeline['primera_escritura_s'] <= pipeline['segundos']
+    print("✅ Benchmark generado correctamente")
+
+def test_benchmark_sin_fixtures():
+    """Sin fixtures, o con peticiones sin grabar, el benchmark falla sin guardar resultados"""
+    print("🧪 PROBANDO BENCHMARK INCOMPLETO")
+    with tempfile.TemporaryDirectory() as directorio:
+        fixtures = os.path.join(directorio, 'fixtures')
+        salida = os.path.join(directorio, 'resultado.json')
+
+        proceso = ejecutar_benchmark('--fixtures', fixtures, '--fuentes', '3ta', '--salida', salida)
+        assert proceso.returncode == 1 and 'No hay fixtures' in proceso.stdout, proceso.stdout
+        assert not os.path.exists(salida)
+
+        # El listado grabado es de otra fuente: el replay de 3ta queda sin respuestas
+        grabar(CacheRespuestas(fixtures, modo='grabar'), "https://ejemplo.cl/noticias/", LISTADO_3TA)
+        proceso = ejecutar_benchmark('--fixtures', fixtures, '--fuentes', '3ta', '--salida', salida)
+        assert proceso.returncode == 1 and 'Replay incompleto' in proceso.stdout, proceso.stdout
+        assert not os.path.exists(salida)
+    print("✅ Mediciones incompletas rechazadas")
+
+if __name__ == "__main__":
+    test_benchmark_con_fixture()
+    test_benchmark_sin_fixtures()
+
+    print(f"\n🎉 PRUEBA COMPLETADA")
@@ -0,0 +1,155 @@
+#!/usr/bin/env python3
+"""
+Script para probar la caché de respuestas HTTP y el modo replay contra un servidor local
+"""
+
+import sys
+import os
+import tempfile
+import threading
+import time
+from datetime import datetime, timezone
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+# Agregar el directorio del proyecto al path
+sys.path.append(os.path.dirname(__file__))
+
+# Estado incremental aislado: la prueba no toca .estado_scraping
+os.environ['NOTICIAS_DIRECTORIO_ESTADO'] = tempfile.mkdtemp(prefix='test_cache_respuestas_')
+
+from backend.database.memoria_client import AlmacenamientoMemoria
+from backend.database.supabase_client import SupabaseClient
+from backend.main import NoticiasJuridicasSystem
+from backend.scrapers.fuentes.limitador_peticiones import RegistroLimitadores, SesionLimitada
+from backend.scrapers.fuentes.cache_respuestas import CacheRespuestas, RespuestaNoGrabada
+from backend.scrapers.fuentes.contexto_ejecucion import ContextoEjecucion
+from backend.scrapers.fuentes.data_schema import crear_noticia_estandarizada
+from backend.scrapers.fuentes.planificador_fuentes import PlanificadorFuentes
+from backend.scrapers.fuentes.registro_scrapers import RegistroScrapers
+from backend.scrapers.fuentes.salud_fuentes import SaludFuentes
+
+class PaginaHandler(BaseHTTPRequestHandler):
+    """Devuelve la misma página para cualquier ruta y cuenta las peticiones"""
+    peticiones = 0
+
+    def do_GET(self):
+        PaginaHandler.peticiones += 1
+        cuerpo = "<html><body><h1>Noticia jurídica</h1></body></html>".encode('utf-8')
+        self.send_response(200)
+        self.send_header('Content-Type', 'text/html; charset=utf-8')
+        self.send_header('Content-Length', str(len(cuerpo)))
+        self.end_headers()
+        self.wfile.write(cuerpo)
+
+    def log_message(self, *args):
+        pass
+
+def contar_archivos(directorio):
+    return sum(len(archivos) for _, _, archivos in os.walk(directorio))
+
+def test_grabar_y_replay():
+    """Probar grabación, deduplicación por contenido, TTL y replay estricto"""
+    print("🧪 PROBANDO CACHÉ DE RESPUESTAS Y REPLAY")
+    servidor = ThreadingHTTPServer(('127.0.0.1', 0), PaginaHandler)
+    threading.Thread(target=servidor.serve_forever, daemon=True).start()
+    base = f"http://127.0.0.1:{servidor.server_address[1]}"
+
+    with tempfile.TemporaryDirectory() as directorio:
+        try:
+            cache = CacheRespuestas(directorio, modo='grabar')
+            sesion = SesionLimitada(RegistroLimitadores(), cache=cache)
+
+            for ruta in ('/a', '/b', '/a'):
+                response = sesion.get(base + ruta, timeout=5)
+                assert response.status_code == 200
+
+            # /a se sirvió desde la caché la segunda vez
+            assert PaginaHandler.peticiones == 2
+            assert cache.estadisticas == {'aciertos': 1, 'fallos': 2, 'grabadas': 2}
+
+            # Mismo contenido: un solo objeto comprimido para dos peticiones
+            assert contar_archivos(os.path.join(directorio, 'objetos')) == 1
+            assert contar_archivos(os.path.join(directorio, 'peticiones')) == 2
+
+            # TTL vencido: se vuelve a la red
+            cache.ttl = lambda url: 0
+            sesion.get(base + '/a', timeout=5)
+            assert PaginaHandler.peticiones == 3
+        finally:
+            servidor.shutdown()
+            servidor.server_close()
+
+        # Replay con el servidor apagado
+        cache = CacheRespuestas(directorio, modo='replay')
+        sesion = SesionLimitada(RegistroLimitadores(), cache=cache)
+
+        inicio = time.monotonic()
+        response = sesion.get(base + '/b', timeout=5)
+        assert "Noticia jurídica" in response.text
+        print(f"   Replay servido en {(time.monotonic() - inicio) * 1000:.1f}ms")
+
+        try:
+            sesion.get(base + '/no-grabada', timeout=5)
+            assert False, "El replay debe fallar ante peticiones no grabadas"
+        except RespuestaNoGrabada:
+            pass
+    print("✅ Caché y replay correctos")
+
+class ScraperGrabado:
+    """Entrega dos noticias, o falla como ante una petición que no está grabada"""
+
+    base_url = "https://www.tdlc.cl"
+
+    def __init__(self, codigo: str, **argumentos):
+        self.codigo = codigo
+
+    def iter_noticias(self, max_noticias: int = 10):
+        if self.codigo == 'cde':
+            raise RespuestaNoGrabada("GET https://www.cde.cl/ no está grabada")
+        for i in range(2):
+            yield crear_noticia_estandarizada(
+                titulo=f"Tribunal resuelve reclamación número {i}",
+                cuerpo_completo="El tribunal acogió la reclamación presentada en contra de la resolución. " * 4,
+                fecha_publicacion=datetime(2025, 7, i + 1, tzinfo=timezone.utc),
+                fuente=self.codigo,
+                url_origen=f"{self.base_url}/noticias/{i}"
+            )
+
+def test_replay_sin_estado_persistente():
+    """Un replay no escribe en Supabase ni toca la planificación, la salud o el índice local"""
+    print("🧪 PROBANDO REPLAY SIN ESTADO PERSISTENTE")
+    with tempfile.TemporaryDirectory() as directorio:
+        sistema = NoticiasJuridicasSystem()
+        assert isinstance(sistema.supabase, SupabaseClient)
+        contexto = ContextoEjecucion(cache=CacheRespuestas(directorio))
+        componentes = [(contexto.indice_urls, 'omitir_conocidas'), (contexto.marcas_agua, 'activas'),
+                       (contexto.validadores, 'activos'), (contexto.modelo_boilerplate, 'activo')]
+        originales = [getattr(componente, atributo) for componente, atributo in componentes]
+        try:
+            sistema.contexto = contexto
+            sistema.scrapers = RegistroScrapers(['tdlc', 'cde'], lambda codigo: lambda **argumentos: ScraperGrabado(codigo))
+            sistema.planificador = PlanificadorFuentes(os.path.join(directorio, 'planificacion.json'))
+            sistema.salud = SaludFuentes(os.path.join(directorio, 'salud.json'), umbral_fallos=1)
+            indexadas = contexto.indice_urls.total()
+
+            sistema.configurar_cache_http('replay')
+            assert isinstance(sistema.supabase, AlmacenamientoMemoria)
+            resultados = sistema.run_scraping_completo()
+
+            # Las noticias quedan solo en memoria, sin logs
+            assert {resultado['fuente']: resultado['nuevas'] for resultado in resultados} == {'tdlc': 2, 'cde': 0}
+            assert len(sistema.supabase.noticias) == 2 and sistema.supabase.logs == []
+            # El fallo del replay no abre el circuito ni se agenda nada
+            assert not os.path.exists(sistema.planificador.ruta) and not os.path.exists(sistema.salud.ruta)
+            assert sistema.salud.estado('cde') == 'cerrado' and sistema.planificador.proxima('tdlc') == 0
+            assert contexto.indice_urls.total() == indexadas
+        finally:
+            for (componente, atributo), valor in zip(componentes, originales):
+                setattr(componente, atributo, valor)
+    print("✅ Replay sin efectos persistentes")
+
+if __name__ == "__main__":
+    test_grabar_y_replay()
+    test_replay_sin_estado_persistente()
+
+    print(f"\n🎉 PRUEBA COMPLETADA")
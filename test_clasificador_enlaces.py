@@ -0,0 +1,80 @@
+#!/usr/bin/env python3
+"""
+Script para probar el clasificador de enlaces de los listados (sin acceso a red)
+"""
+
+import sys
+import os
+
+# Agregar el directorio del proyecto al path
+sys.path.append(os.path.dirname(__file__))
+
+from bs4 import BeautifulSoup
+
+from backend.scrapers.fuentes.clasificador_enlaces import ClasificadorEnlaces, clasificador_para, normalizar_url
+
+LISTADO = (
+    '<nav><a href="/">Inicio del portal del Poder Judicial</a>'
+    '<a href="?page=2">Página siguiente del listado de noticias</a></nav>'
+    '<a href="/noticias/1">Corte Suprema confirma fallo por homicidio</a>'
+    '<a href="/noticias/2#comentarios">Tribunal Oral dicta sentencia</a>'
+    '<a href="https://WWW.PJUD.CL/noticias/2">Tribunal Oral dicta sentencia (repetida)</a>'
+    '<a href="/noticias-del-poder-judicial/3">Ceremonia de bienvenida a nuevos funcionarios</a>'
+    '<a href="/otra/4">Ceremonia de bienvenida a nuevos funcionarios</a>'
+    '<a href="javascript:void(0)">Tribunal de Juicio Oral en lo Penal</a>'
+    '<a href="/n/5">Corte</a>'
+)
+
+def candidatos(clasificador, html=LISTADO, url_pagina=None):
+    soup = BeautifulSoup(html, 'html.parser')
+    return [(c['url'], c['puntaje']) for c in clasificador.clasificar(soup.find_all('a', href=True), url_pagina)]
+
+def test_normalizar_url():
+    """URLs absolutas, sin fragmento y con host en minúsculas"""
+    print("🧪 PROBANDO NORMALIZACIÓN DE URLS")
+    assert normalizar_url('/n/1#x', 'https://www.pjud.cl') == 'https://www.pjud.cl/n/1'
+    assert normalizar_url('HTTPS://WWW.PJUD.CL/N/1?a=1', 'https://www.pjud.cl') == 'https://www.pjud.cl/N/1?a=1'
+    assert normalizar_url('w3-article-1.html', 'https://www.dt.gob.cl/portal/1627/w3-x.html') == \
+        'https://www.dt.gob.cl/portal/1627/w3-article-1.html'
+    for href in ('#', 'javascript:void(0)', 'mailto:a@b.cl', 'tel:123', '', None, 'ftp://x/y'):
+        assert normalizar_url(href, 'https://www.pjud.cl') is None
+    print("✅ Normalización correcta")
+
+def test_clasificar_listado():
+    """Filtra, deduplica y ordena por puntaje manteniendo el orden de la página en los empates"""
+    print("🧪 PROBANDO CLASIFICACIÓN DE UN LISTADO")
+    clasificador = clasificador_para('poder_judicial')
+    assert clasificador is clasificador_para('poder_judicial'), "Se compila una vez por fuente"
+
+    assert candidatos(clasificador) == [
+        ('https://www.pjud.cl/noticias/1', 4),       # corte, suprema, fallo, homicidio
+        ('https://www.pjud.cl/noticias/2', 3),       # tribunal, oral, sentencia
+        ('https://www.pjud.cl/noticias-del-poder-judicial/3', 1),  # solo por la URL
+    ]
+    print("✅ Listado clasificado")
+
+def test_reglas_de_url():
+    """Exclusiones por URL y solo enlaces internos"""
+    print("🧪 PROBANDO REGLAS DE URL")
+    clasificador = ClasificadorEnlaces('https://www.minjusticia.gob.cl', palabras_clave=['ley'],
+                                       urls_excluidas=['/category/'], solo_internos=True)
+    html = (
+        '<a href="/2025/05/ley-1">Congreso despacha proyecto de ley de adopciones</a>'
+        '<a href="/category/ley">Noticias sobre la ley y reforma de adopciones</a>'
+        '<a href="https://www.gob.cl/ley">Gobierno publica ley de adopciones en el diario</a>'
+        '<a href="https://minjusticia.gob.cl/2025/05/ley-2">Promulgan ley de adopciones en ceremonia</a>'
+    )
+    assert [url for url, _ in candidatos(clasificador, html)] == [
+        'https://www.minjusticia.gob.cl/2025/05/ley-1', 'https://minjusticia.gob.cl/2025/05/ley-2'
+    ]
+
+    # Sin listas configuradas basta con el largo del título
+    assert len(candidatos(ClasificadorEnlaces('https://www.pjud.cl'))) == 6
+    print("✅ Reglas de URL correctas")
+
+if __name__ == "__main__":
+    test_normalizar_url()
+    test_clasificar_listado()
+    test_reglas_de_url()
+
+    print(f"\n🎉 TODAS LAS PRUEBAS COMPLETADAS")
@@ -0,0 +1,208 @@
+#!/usr/bin/env python3
+"""
+Script para probar el contexto de ejecución compartido por los scrapers contra un servidor local
+"""
+
+import sys
+import os
+import subprocess
+import tempfile
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+# Agregar el directorio del proyecto al path
+sys.path.append(os.path.dirname(__file__))
+
+# Estado incremental aislado: la prueba no toca .estado_scraping
+os.environ['NOTICIAS_DIRECTORIO_ESTADO'] = tempfile.mkdtemp(prefix='test_contexto_')
+
+from backend.scrapers.fuentes.contexto_ejecucion import ContextoEjecucion
+from backend.scrapers.fuentes.indice_urls import IndiceURLs, indice_urls
+from backend.scrapers.fuentes.limitador_peticiones import (
+    LimitadorHost, RegistroLimitadores, limitador_peticiones, normalizar_host
+)
+from backend.scrapers.fuentes.marcas_agua import MarcasAgua, marcas_agua
+from backend.scrapers.fuentes.poder_judicial.poder_judicial_scraper import PoderJudicialScraper
+from backend.scrapers.fuentes.tdlc.tdlc_scraper import TDLScraper
+from backend.scrapers.fuentes.sii.sii_scraper import SIIScraper
+
+RAIZ = os.path.dirname(os.path.abspath(__file__))
+
+class PaginaHandler(BaseHTTPRequestHandler):
+    """Responde siempre la misma página manteniendo la conexión abierta"""
+
+    protocol_version = 'HTTP/1.1'
+
+    def do_GET(self):
+        cuerpo = b"<html><body><p>Noticia</p></body></html>"
+        self.send_response(200)
+        self.send_header('Content-Length', str(len(cuerpo)))
+        self.end_headers()
+        self.wfile.write(cuerpo)
+
+    def log_message(self, *args):
+        pass
+
+class RegistroRapido(RegistroLimitadores):
+    """Limitadores sin espera, para no alargar la prueba"""
+
+    def para_url(self, url: str) -> LimitadorHost:
+        host = normalizar_host(url)
+        with self._lock:
+            return self._limitadores.setdefault(
+                host, LimitadorHost(host, por_segundo=1000, rafaga=10, max_concurrentes=3)
+            )
+
+def test_componentes_compartidos():
+    """Todos los scrapers de un contexto usan el mismo procesador y el mismo pool"""
+    print("🧪 PROBANDO COMPONENTES COMPARTIDOS")
+    contexto = ContextoEjecucion()
+    tdlc, sii = TDLScraper(contexto=contexto), SIIScraper(contexto=contexto)
+
+    assert tdlc.content_processor is contexto.content_processor
+    assert tdlc.contexto is sii.contexto is contexto
+    # Cabeceras y cookies propias por scraper, conexiones compartidas
+    assert tdlc.session is not sii.session
+    assert tdlc.session.headers['User-Agent'] != sii.session.headers['User-Agent']
+    assert tdlc.session.get_adapter('https://www.tdlc.cl/x') is sii.session.get_adapter('https://tdlc.cl/y')
+    assert TDLScraper().contexto is not contexto
+    print("✅ Procesador y pool compartidos")
+
+def test_conexiones_reutilizadas():
+    """Las peticiones de dos scrapers al mismo host reutilizan las conexiones del pool"""
+    print("🧪 PROBANDO CONEXIONES REUTILIZADAS")
+    servidor = ThreadingHTTPServer(('127.0.0.1', 0), PaginaHandler)
+    threading.Thread(target=servidor.serve_forever, daemon=True).start()
+    url = f"http://127.0.0.1:{servidor.server_address[1]}/noticias"
+
+    contexto = ContextoEjecucion(registro=RegistroRapido())
+    try:
+        sesiones = [contexto.nueva_sesion(), contexto.nueva_sesion()]
+        for _ in range(3):
+            for sesion in sesiones:
+                assert sesion.get(url, timeout=5).status_code == 200
+
+        conexiones = contexto.get_estadisticas()['conexiones']['127.0.0.1']
+        assert conexiones == {'tamano_pool': 3, 'conexiones': 1, 'peticiones': 6}, conexiones
+
+        contexto.reset_estadisticas()
+        sesiones[0].get(url, timeout=5)
+        assert contexto.get_estadisticas()['conexiones']['127.0.0.1']['peticiones'] == 1
+    finally:
+        contexto.conexiones.cerrar()
+        servidor.shutdown()
+    print("✅ Una conexión para seis peticiones")
+
+def test_workers_del_registro_inyectado():
+    """Los detalles se descargan con tantos workers como permita el registro del contexto"""
+    print("🧪 PROBANDO WORKERS DEL REGISTRO INYECTADO")
+    contexto = ContextoEjecucion(registro=RegistroRapido())
+    tdlc = TDLScraper(contexto=contexto)
+    assert limitador_peticiones.para_url(tdlc.base_url).max_concurrentes == 1
+
+    en_curso, maximo, lock = [0], [0], threading.Lock()
+    def descargar(item):
+        with lock:
+            en_curso[0] += 1
+            maximo[0] = max(maximo[0], en_curso[0])
+        time.sleep(0.05)
+        with lock:
+            en_curso[0] -= 1
+        return item
+
+    assert tdlc._obtener_detalles(list(range(1, 7)), descargar) == list(range(1, 7))
+    assert maximo[0] == 3, maximo[0]
+    print("✅ Tres workers, como indica el registro inyectado")
+
+def test_cache_de_resumenes_acotada():
+    """El procesador compartido no acumula resúmenes sin límite"""
+    print("🧪 PROBANDO CACHÉ DE RESÚMENES")
+    procesador = ContextoEjecucion().content_processor
+    procesador.tamano_cache = 2
+    cuerpo = "El tribunal acogió la reclamación presentada en contra de la resolución. " * 3
+    for i in range(4):
+        procesador.generar_resumen_ejecutivo(f"Tribunal resuelve causa {i}", cuerpo, 'tdlc')
+    procesador.generar_resumen_ejecutivo("Tribunal resuelve causa 3", cuerpo, 'tdlc')
+
+    assert procesador.get_estadisticas() == {'aciertos': 1, 'fallos': 4, 'en_cache': 2}
+    print("✅ Caché acotada")
+
+def test_componentes_inyectados():
+    """Los scrapers usan el índice y las marcas de agua de su contexto, no las instancias globales"""
+    print("🧪 PROBANDO COMPONENTES INYECTADOS")
+    with tempfile.TemporaryDirectory() as directorio:
+        indice = IndiceURLs(os.path.join(directorio, 'indice.sqlite3'))
+        marcas = MarcasAgua(os.path.join(directorio, 'marcas_agua.json'))
+        contexto = ContextoEjecucion(indice_urls=indice, marcas_agua=marcas)
+        consultas_globales = dict(indice_urls.estadisticas)
+
+        base = "https://www.tdlc.cl/noticias"
+        indice.registrar(f"{base}/2", fuente='tdlc')
+        marcas._cargar()['tdlc.cl'] = {'url': f"{base}/3", 'fecha': None}
+
+        tdlc = TDLScraper(contexto=contexto)
+        links = [{'url': f"{base}/{i}"} for i in range(1, 5)]
+        assert tdlc._descartar_conocidas(links) == [{'url': f"{base}/1"}]
+        assert tdlc.marca_agua['url'] == f"{base}/3"
+        assert marcas.estadisticas['recortadas'] == 2 and indice.estadisticas['omitidas'] == 1
+
+        # También los scrapers que no heredan de BaseScraper
+        pj = PoderJudicialScraper(contexto=contexto)
+        pj.get_noticias_recientes = lambda max_noticias: [
+            {'url': "https://www.pjud.cl/prensa/1", 'titulo': "Noticia 1"},
+            {'url': "https://www.pjud.cl/prensa/2", 'titulo': "Noticia 2"}
+        ]
+        pj.get_noticia_completa = lambda url, titulo: url
+        indice.registrar("https://www.pjud.cl/prensa/2", fuente='poder_judicial')
+        assert list(pj.iter_noticias(2)) == ["https://www.pjud.cl/prensa/1"]
+        assert indice.estadisticas['omitidas'] == 2
+
+        assert indice_urls.estadisticas == consultas_globales and 'tdlc.cl' not in marcas_agua._pendientes
+        indice.cerrar()
+
+    try:
+        ContextoEjecucion(indice=indice)
+        assert False, "un componente desconocido debe rechazarse"
+    except TypeError:
+        pass
+    print("✅ Componentes del contexto inyectado")
+
+def test_contexto_por_defecto_diferido():
+    """Importar los scrapers no construye un contexto; el sistema usa solo el suyo"""
+    print("🧪 PROBANDO CONTEXTO POR DEFECTO DIFERIDO")
+    programa = (
+        "import contextlib, io\n"
+        "with contextlib.redirect_stdout(io.StringIO()):\n"
+        "    from backend.processors import content_processor\n"
+        "    construidos = []\n"
+        "    original = content_processor.ContentProcessor.__init__\n"
+        "    def anotar(self, *args, **kwargs):\n"
+        "        construidos.append(self)\n"
+        "        original(self, *args, **kwargs)\n"
+        "    content_processor.ContentProcessor.__init__ = anotar\n"
+        "    from backend.scrapers.fuentes import contexto_ejecucion\n"
+        "    from backend.scrapers.fuentes.tdlc.tdlc_scraper import TDLScraper\n"
+        "    al_importar = len(construidos)\n"
+        "    from backend.main import NoticiasJuridicasSystem\n"
+        "    from backend.database.memoria_client import AlmacenamientoMemoria\n"
+        "    sistema = NoticiasJuridicasSystem(almacenamiento=AlmacenamientoMemoria())\n"
+        "    propio = sistema.scrapers['tdlc'].contexto is sistema.contexto\n"
+        "    en_sistema = len(construidos)\n"
+        "    suelto = TDLScraper()\n"
+        "print(al_importar, en_sistema, propio, contexto_ejecucion._contexto_por_defecto is suelto.contexto, len(construidos))\n"
+    )
+    proceso = subprocess.run([sys.executable, '-c', programa], cwd=RAIZ, capture_output=True, text=True, timeout=120)
+    assert proceso.returncode == 0, proceso.stderr
+    assert proceso.stdout.strip().splitlines()[-1] == "0 1 True True 2", proceso.stdout
+    print("✅ Un solo ContentProcessor por ejecución")
+
+if __name__ == "__main__":
+    test_componentes_compartidos()
+    test_conexiones_reutilizadas()
+    test_workers_del_registro_inyectado()
+    test_cache_de_resumenes_acotada()
+    test_componentes_inyectados()
+    test_contexto_por_defecto_diferido()
+
+    print(f"\n🎉 TODAS LAS PRUEBAS COMPLETADAS")
@@ -0,0 +1,84 @@
+#!/usr/bin/env python3
+"""
+Script para probar el orden de estrategias del extractor universal de fechas (sin acceso a red)
+"""
+
+import sys
+import os
+from datetime import datetime, timezone
+
+# Agregar el directorio del proyecto al path
+sys.path.append(os.path.dirname(__file__))
+
+from bs4 import BeautifulSoup
+
+from backend.scrapers.fuentes.date_extractor import UniversalDateExtractor
+
+PARRAFO = "La Corte Suprema acogió el recurso de protección, ordenando a la institución adoptar medidas. " * 3
+
+def pagina(cabeza: str = '', cuerpo: str = '') -> BeautifulSoup:
+    lateral = ''.join(f'<li><a href="/n{i}">Noticia anterior número {i}</a> {i + 1:02d}/06/2024</li>' for i in range(20))
+    html = (
+        f'<html><head><title>Noticia</title>{cabeza}</head><body>'
+        f'<div class="lateral"><ul>{lateral}</ul></div>'
+        f'<div class="bloque-x"><h1>Título</h1>{cuerpo}<p>{PARRAFO}</p><p>{PARRAFO}</p></div>'
+        f'<footer>Actualizado el 01/01/2024</footer></body></html>'
+    )
+    return BeautifulSoup(html, 'html.parser')
+
+def test_orden_de_estrategias():
+    """Gana la estrategia más barata disponible, no la primera fecha de la página"""
+    print("🧪 PROBANDO ORDEN DE ESTRATEGIAS")
+    extractor = UniversalDateExtractor()
+    esperada = datetime(2025, 7, 28, tzinfo=timezone.utc)
+
+    soup = pagina('<meta name="date" content="2025-07-01">'
+                  '<meta property="article:published_time" content="2025-07-28T00:00:00Z">')
+    assert extractor.extraer(soup, 'https://www.fuente.cl/2025/01/01/x/') == (esperada, 'atributos')
+
+    soup = pagina(cuerpo='<time datetime="2025-07-28">hace dos días</time>')
+    assert extractor.extraer(soup) == (esperada, 'atributos')
+
+    soup = pagina('<script type="application/ld+json">'
+                  '{"@graph": [{"@type": "WebPage"}, {"@type": "NewsArticle", "datePublished": "2025-07-28"}]}'
+                  '</script><script type="application/ld+json">{roto</script>')
+    assert extractor.extraer(soup) == (esperada, 'json_ld')
+
+    soup = pagina()
+    assert extractor.extraer(soup, 'https://www.1ta.cl/2025/07/28/audiencia/') == (esperada, 'url')
+
+    # La fecha del cuerpo gana a las de la barra lateral, que aparecen antes
+    soup = pagina(cuerpo='<p>Santiago, 28 de julio de 2025.</p>')
+    assert extractor.extraer(soup, 'https://www.fuente.cl/noticias/1') == (esperada, 'contenido')
+    soup = pagina(cuerpo='<span class="fecha">28/07/2025</span>')
+    assert extractor.extraer(soup) == (esperada, 'contenido')
+
+    # Sin fecha en el cuerpo, la página completa es el último recurso
+    soup = pagina()
+    assert extractor.extraer(soup) == (datetime(2024, 6, 1, tzinfo=timezone.utc), 'pagina')
+    assert extractor.extraer(BeautifulSoup('<p>Sin fecha</p>', 'html.parser')) == (None, None)
+    print("✅ Orden correcto")
+
+    print("🧪 PROBANDO ESTADÍSTICAS")
+    assert extractor.get_estadisticas() == {
+        'atributos': 2, 'json_ld': 1, 'url': 1, 'contenido': 2, 'pagina': 1, 'sin_fecha': 1
+    }
+    extractor.reset_estadisticas()
+    assert sum(extractor.get_estadisticas().values()) == 0
+    print("✅ Estadísticas correctas")
+
+def test_texto_compartido():
+    """El texto del contenido ya extraído se usa sin volver a recorrer el documento"""
+    print("🧪 PROBANDO TEXTO COMPARTIDO")
+    extractor = UniversalDateExtractor()
+    soup = pagina()
+    fecha, estrategia = extractor.extraer(soup, texto="Santiago, 3 de marzo de 2025. " + PARRAFO)
+    assert (fecha, estrategia) == (datetime(2025, 3, 3, tzinfo=timezone.utc), 'contenido')
+    assert extractor.extract_date_from_html(soup, texto="") == datetime(2024, 6, 1, tzinfo=timezone.utc)
+    print("✅ Texto compartido correcto")
+
+if __name__ == "__main__":
+    test_orden_de_estrategias()
+    test_texto_compartido()
+
+    print(f"\n🎉 TODAS LAS PRUEBAS COMPLETADAS")
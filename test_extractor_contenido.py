@@ -0,0 +1,73 @@
+#!/usr/bin/env python3
+"""
+Script para probar el extractor del contenido principal (sin acceso a red)
+"""
+
+import sys
+import os
+
+# Agregar el directorio del proyecto al path
+sys.path.append(os.path.dirname(__file__))
+
+from bs4 import BeautifulSoup
+
+from backend.scrapers.fuentes.extractor_contenido import ExtractorContenido, texto_visible
+
+PARRAFO = "La Corte Suprema acogió el recurso de protección, ordenando a la institución adoptar medidas."
+
+def pagina(cuerpo: str) -> BeautifulSoup:
+    enlaces = ''.join(f'<li><a href="/n{i}">Otra noticia relacionada número {i} del tribunal</a></li>' for i in range(30))
+    html = (
+        f'<html><body><header><nav>Inicio Noticias Contacto</nav></header>'
+        f'<div id="pagina"><div class="lateral"><ul>{enlaces}</ul></div>{cuerpo}</div>'
+        f'<footer>Morandé 360, Santiago</footer><script>var x = 1;</script></body></html>'
+    )
+    return BeautifulSoup(html, 'html.parser')
+
+def test_contenedor_sin_clases_conocidas():
+    """El cuerpo se encuentra aunque el sitio cambie sus clases"""
+    print("🧪 PROBANDO CONTENEDOR SIN CLASES CONOCIDAS")
+    extractor = ExtractorContenido()
+    soup = pagina(f'<div class="bloque-x"><h1>Título</h1><p>{PARRAFO}</p><p>{PARRAFO}</p>'
+                  f'<div>Según el fallo, la autoridad deberá pronunciarse, dentro de treinta días.</div>'
+                  f'<script>alert(1)</script></div>')
+
+    assert extractor.elemento(soup)['class'] == ['bloque-x']
+    texto = extractor.extraer(soup)
+    assert texto.startswith("Título La Corte Suprema")
+    assert texto.endswith("dentro de treinta días.")
+    assert "Otra noticia" not in texto and "Morandé" not in texto and "alert" not in texto
+    print("✅ Contenido principal extraído")
+
+def test_cuerpo_repartido_en_bloques():
+    """Los párrafos en bloques hermanos se juntan en un solo contenido"""
+    print("🧪 PROBANDO CUERPO REPARTIDO EN BLOQUES")
+    filas = ''.join(f'<div class="fila"><div class="col"><p>{PARRAFO} Rol {i}.</p></div></div>' for i in range(8))
+    soup = pagina(f'<div class="bloque">{filas}</div>')
+
+    texto = ExtractorContenido().extraer(soup)
+    for i in range(8):
+        assert f"Rol {i}." in texto
+    assert "Otra noticia" not in texto
+    print("✅ Bloques hermanos incluidos")
+
+def test_memo_y_respaldo():
+    """Cada documento se analiza una vez; sin párrafos se usa el body"""
+    print("🧪 PROBANDO MEMO Y RESPALDO")
+    extractor = ExtractorContenido()
+    soup = pagina(f'<div class="bloque"><p>{PARRAFO}</p></div>')
+    assert extractor.extraer(soup) == extractor.extraer(soup)
+    assert extractor.get_estadisticas() == {'documentos': 1, 'cache': 1}
+
+    corto = BeautifulSoup('<html><body><div>Resolución exenta</div><nav>Menú</nav></body></html>', 'html.parser')
+    assert extractor.extraer(corto) == "Resolución exenta"
+    assert extractor.elemento(corto).name == 'body'
+    assert texto_visible(None) == ""
+    print("✅ Memo y respaldo correctos")
+
+if __name__ == "__main__":
+    test_contenedor_sin_clases_conocidas()
+    test_cuerpo_repartido_en_bloques()
+    test_memo_y_respaldo()
+
+    print(f"\n🎉 TODAS LAS PRUEBAS COMPLETADAS")
@@ -0,0 +1,62 @@
+#!/usr/bin/env python3
+"""
+Script para probar el parseo de fechas común a los scrapers (sin acceso a red)
+"""
+
+import sys
+import os
+import json
+from datetime import datetime, timezone
+
+# Agregar el directorio del proyecto al path
+sys.path.append(os.path.dirname(__file__))
+
+from backend.scrapers.fuentes import fechas
+from backend.scrapers.fuentes.fechas import fecha_en_url, normalizar_fecha, parsear_fecha
+
+CORPUS = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'benchmarks', 'corpus_fechas.json')
+
+def test_corpus():
+    """Cada texto del corpus da la fecha esperada"""
+    print("🧪 PROBANDO CORPUS DE FECHAS")
+    with open(CORPUS, 'r', encoding='utf-8') as archivo:
+        casos = json.load(archivo)['casos']
+    for caso in casos:
+        fecha = parsear_fecha(caso['texto'])
+        obtenido = fecha.isoformat() if fecha else None
+        assert obtenido == caso['esperado'], f"{caso['fuente']}: {caso['texto']!r} → {obtenido}"
+    print(f"✅ {len(casos)} casos correctos")
+
+def test_memo_y_textos_largos():
+    """Los textos cortos se memorizan; las páginas completas no"""
+    print("🧪 PROBANDO MEMO")
+    fechas._parsear_memo.cache_clear()
+    parsear_fecha("12 de mayo de 2025")
+    parsear_fecha("12 de mayo de 2025")
+    estadisticas = fechas.get_estadisticas()
+    assert estadisticas == {'aciertos': 1, 'fallos': 1, 'memo': 1}
+
+    pagina = "Texto de la noticia. " * 20 + "Santiago, 3 de marzo de 2025"
+    assert parsear_fecha(pagina) == datetime(2025, 3, 3, tzinfo=timezone.utc)
+    assert fechas.get_estadisticas()['memo'] == 1
+    print("✅ Memo correcto")
+
+def test_url_y_normalizacion():
+    """Fecha en la ruta de la URL y valor por defecto de normalizar_fecha"""
+    print("🧪 PROBANDO URL Y NORMALIZACIÓN")
+    assert fecha_en_url("https://www.1ta.cl/2025/07/28/audiencia/") == datetime(2025, 7, 28, tzinfo=timezone.utc)
+    assert fecha_en_url("https://www.pjud.cl/noticia?fecha=28-07-2025") == datetime(2025, 7, 28, tzinfo=timezone.utc)
+    assert fecha_en_url("https://www.pjud.cl/noticia/123") is None
+    assert fecha_en_url(None) is None
+
+    antes = datetime.now(timezone.utc)
+    assert normalizar_fecha("sin fecha") >= antes
+    assert normalizar_fecha("01/08/2025") == datetime(2025, 8, 1, tzinfo=timezone.utc)
+    print("✅ URL y normalización correctas")
+
+if __name__ == "__main__":
+    test_corpus()
+    test_memo_y_textos_largos()
+    test_url_y_normalizacion()
+
+    print(f"\n🎉 TODAS LAS PRUEBAS COMPLETADAS")
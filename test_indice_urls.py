@@ -0,0 +1,84 @@
+#!/usr/bin/env python3
+"""
+Script para probar el índice local de URLs (sin acceso a red)
+"""
+
+import sys
+import os
+import tempfile
+
+# Agregar el directorio del proyecto al path
+sys.path.append(os.path.dirname(__file__))
+
+from backend.scrapers.fuentes.indice_urls import IndiceURLs
+
+class SupabaseFalso:
+    """Devuelve filas de noticias como get_urls_conocidas"""
+
+    def __init__(self, filas):
+        self.filas = filas
+        self.consultas = []
+
+    def get_urls_conocidas(self, desde=None):
+        self.consultas.append(desde)
+        return [fila for fila in self.filas if desde is None or fila['created_at'] > desde]
+
+def test_filtrar_nuevas():
+    """Probar que se descartan las URLs registradas"""
+    print("🧪 PROBANDO FILTRADO DE URLs CONOCIDAS")
+    with tempfile.TemporaryDirectory() as directorio:
+        indice = IndiceURLs(os.path.join(directorio, 'indice.sqlite3'))
+        indice.registrar_lote([
+            {'url_origen': 'https://www.pjud.cl/a', 'fuente': 'poder_judicial', 'hash_contenido': 'h1'}
+        ])
+
+        links = [{'url': 'https://www.pjud.cl/a'}, {'url': 'https://www.pjud.cl/b'}]
+        assert indice.filtrar_nuevas(links) == [{'url': 'https://www.pjud.cl/b'}]
+        assert indice.filtrar_nuevas(['https://www.pjud.cl/a', 'https://www.pjud.cl/c']) == ['https://www.pjud.cl/c']
+        assert indice.get_hash('https://www.pjud.cl/a') == 'h1'
+        assert indice.estadisticas['omitidas'] == 2
+        indice.cerrar()
+    print("✅ URLs conocidas descartadas")
+
+def test_calentar_incremental():
+    """Probar que la sincronización solo pide lo creado desde la última vez"""
+    print("🧪 PROBANDO SINCRONIZACIÓN INCREMENTAL")
+    with tempfile.TemporaryDirectory() as directorio:
+        ruta = os.path.join(directorio, 'indice.sqlite3')
+        supabase = SupabaseFalso([
+            {'url_origen': 'https://www.cde.cl/1', 'fuente': 'cde', 'created_at': '2025-01-01T00:00:00+00:00'},
+            {'url_origen': 'https://www.cde.cl/2', 'fuente': 'cde', 'created_at': '2025-01-02T00:00:00+00:00'}
+        ])
+
+        indice = IndiceURLs(ruta)
+        assert indice.calentar(supabase) == 2
+        indice.cerrar()
+
+        # Persistido en disco: una nueva instancia continúa desde la última fecha
+        indice = IndiceURLs(ruta)
+        assert indice.total() == 2
+        assert indice.calentar(supabase) == 0
+        assert supabase.consultas == [None, '2025-01-02T00:00:00+00:00']
+        indice.cerrar()
+    print("✅ Sincronización incremental correcta")
+
+def test_calentar_sin_created_at():
+    """Filas sin created_at se registran sin mover la marca de sincronización"""
+    print("🧪 PROBANDO SINCRONIZACIÓN SIN created_at")
+    with tempfile.TemporaryDirectory() as directorio:
+        supabase = SupabaseFalso([{'url_origen': 'https://www.cde.cl/1', 'fuente': 'cde', 'created_at': None}])
+
+        indice = IndiceURLs(os.path.join(directorio, 'indice.sqlite3'))
+        assert indice.calentar(supabase) == 1
+        assert indice.filtrar_nuevas(['https://www.cde.cl/1']) == []
+        indice.calentar(supabase)
+        assert supabase.consultas == [None, None]
+        indice.cerrar()
+    print("✅ Marca de sincronización sin cambios")
+
+if __name__ == "__main__":
+    test_filtrar_nuevas()
+    test_calentar_incremental()
+    test_calentar_sin_created_at()
+
+    print(f"\n🎉 PRUEBA COMPLETADA")
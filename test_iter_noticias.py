@@ -0,0 +1,107 @@
+#!/usr/bin/env python3
+"""
+Script para probar que el orquestador guarda las noticias a medida que los scrapers las entregan (sin acceso a red)
+"""
+
+import sys
+import os
+import tempfile
+from datetime import datetime, timezone
+
+# Agregar el directorio del proyecto al path
+sys.path.append(os.path.dirname(__file__))
+
+# Estado incremental aislado: la prueba no toca .estado_scraping
+os.environ['NOTICIAS_DIRECTORIO_ESTADO'] = tempfile.mkdtemp(prefix='test_iter_noticias_')
+
+from backend.database.memoria_client import AlmacenamientoMemoria
+from backend.main import NoticiasJuridicasSystem
+from backend.scrapers.fuentes.data_schema import crear_noticia_estandarizada
+
+CUERPO = ("El tribunal acogió la reclamación presentada en contra de la resolución, ordenando "
+          "retrotraer el procedimiento a la etapa de participación ciudadana. ") * 3
+
+class ScraperDePrueba:
+    """Entrega noticias una a una y anota cuántas entregó antes de cada escritura"""
+
+    base_url = "https://ejemplo-fuente.cl"
+
+    def __init__(self, total: int, fallar_en: int = None):
+        self.total = total
+        self.fallar_en = fallar_en
+        self.entregadas = 0
+        self.cerrado = False
+
+    def iter_noticias(self, max_noticias: int = 10):
+        try:
+            for i in range(self.total):
+                if i == self.fallar_en:
+                    raise RuntimeError("sitio caído")
+                self.entregadas += 1
+                yield crear_noticia_estandarizada(
+                    titulo=f"Tribunal resuelve reclamación número {i}",
+                    cuerpo_completo=CUERPO,
+                    fecha_publicacion=datetime(2025, 7, i + 1, tzinfo=timezone.utc),
+                    fuente='tdlc',
+                    url_origen=f"{self.base_url}/noticias/{i}"
+                )
+        finally:
+            self.cerrado = True
+
+def sistema_en_memoria():
+    almacenamiento = AlmacenamientoMemoria()
+    sistema = NoticiasJuridicasSystem(almacenamiento=almacenamiento)
+    sistema.config['tamano_lote'] = 3
+    return sistema, almacenamiento
+
+def test_guardado_por_lotes():
+    """Cada lote se escribe antes de que el scraper entregue el siguiente"""
+    print("🧪 PROBANDO GUARDADO POR LOTES")
+    sistema, almacenamiento = sistema_en_memoria()
+    scraper = ScraperDePrueba(7)
+
+    entregadas_por_escritura = []
+    upsert_noticias = almacenamiento.upsert_noticias
+
+    def upsert_anotado(filas, *args, **kwargs):
+        entregadas_por_escritura.append((scraper.entregadas, len(filas)))
+        return upsert_noticias(filas, *args, **kwargs)
+
+    almacenamiento.upsert_noticias = upsert_anotado
+
+    resultado = sistema._procesar_fuente('prueba', scraper)
+    assert entregadas_por_escritura == [(3, 3), (6, 3), (7, 1)]
+    assert resultado['encontradas'] == 7 and resultado['nuevas'] == 7
+    assert len(almacenamiento.noticias) == 7
+    print("✅ Lotes escritos mientras el scraper avanza")
+
+def test_falla_a_mitad_de_fuente():
+    """Lo ya guardado se conserva si la fuente falla después, y el generador se cierra"""
+    print("🧪 PROBANDO FALLA A MITAD DE FUENTE")
+    sistema, almacenamiento = sistema_en_memoria()
+    scraper = ScraperDePrueba(7, fallar_en=4)
+
+    resultado = sistema._procesar_fuente('prueba', scraper)
+    assert len(almacenamiento.noticias) == 3
+    assert resultado['encontradas'] == 4 and len(resultado['errores']) == 1
+    assert scraper.cerrado
+    print("✅ Noticias guardadas antes de la falla conservadas")
+
+def test_fuente_sin_noticias():
+    """Una visita sin noticias también deja su log, con cero encontradas"""
+    print("🧪 PROBANDO FUENTE SIN NOTICIAS")
+    sistema, almacenamiento = sistema_en_memoria()
+    scraper = ScraperDePrueba(0)
+
+    resultado = sistema._procesar_fuente('prueba', scraper)
+    assert resultado['encontradas'] == 0 and not resultado['errores']
+    assert [(log['fuente_nombre'], log['noticias_encontradas']) for log in almacenamiento.logs] == [('prueba', 0)]
+    assert scraper.cerrado
+    print("✅ Visita vacía registrada en el log")
+
+if __name__ == "__main__":
+    test_guardado_por_lotes()
+    test_falla_a_mitad_de_fuente()
+    test_fuente_sin_noticias()
+
+    print(f"\n🎉 TODAS LAS PRUEBAS COMPLETADAS")
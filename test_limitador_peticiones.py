@@ -0,0 +1,211 @@
+#!/usr/bin/env python3
+"""
+Script para probar el limitador de peticiones por host (sin acceso a red)
+"""
+
+import sys
+import os
+import time
+import threading
+
+# Agregar el directorio del proyecto al path
+sys.path.append(os.path.dirname(__file__))
+
+from backend.scrapers.fuentes.limitador_peticiones import (
+    LimitadorHost,
+    PlazoAgotado,
+    RegistroLimitadores,
+    SesionLimitada,
+    iterar_en_paralelo,
+    normalizar_host,
+    obtener_en_paralelo
+)
+
+def test_normalizar_host():
+    """Probar normalización de hosts"""
+    print("🧪 PROBANDO NORMALIZACIÓN DE HOSTS")
+    assert normalizar_host("https://www.pjud.cl/prensa") == "pjud.cl"
+    assert normalizar_host("https://3ta.cl/category/noticias/") == "3ta.cl"
+    assert normalizar_host("HTTPS://WWW.SII.CL:443/x") == "sii.cl"
+    print("✅ Hosts normalizados correctamente")
+
+def test_token_bucket():
+    """Probar que la tasa sostenida se respeta"""
+    print("🧪 PROBANDO TOKEN BUCKET")
+    limitador = LimitadorHost("ejemplo.cl", por_segundo=20, rafaga=1, max_concurrentes=1)
+
+    inicio = time.monotonic()
+    for _ in range(6):
+        limitador.adquirir()
+        limitador.liberar(estado=200, latencia=0.01)
+    duracion = time.monotonic() - inicio
+
+    print(f"   6 peticiones a 20/s: {duracion:.3f}s")
+    assert duracion >= 0.2, "El limitador no espació las peticiones"
+    print("✅ Tasa respetada")
+
+def test_max_concurrentes():
+    """Probar el máximo de peticiones simultáneas"""
+    print("🧪 PROBANDO MÁXIMO DE CONCURRENCIA")
+    limitador = LimitadorHost("ejemplo.cl", por_segundo=1000, rafaga=10, max_concurrentes=2)
+    activos = []
+    maximo = [0]
+    lock = threading.Lock()
+
+    def tarea():
+        limitador.adquirir()
+        with lock:
+            activos.append(1)
+            maximo[0] = max(maximo[0], len(activos))
+        time.sleep(0.05)
+        with lock:
+            activos.pop()
+        limitador.liberar(estado=200, latencia=0.05)
+
+    hilos = [threading.Thread(target=tarea) for _ in range(6)]
+    for hilo in hilos:
+        hilo.start()
+    for hilo in hilos:
+        hilo.join()
+
+    print(f"   Máximo simultáneo observado: {maximo[0]}")
+    assert maximo[0] <= 2
+    print("✅ Concurrencia limitada")
+
+def test_retroceso_adaptativo():
+    """Probar retroceso ante 429/503 y Retry-After"""
+    print("🧪 PROBANDO RETROCESO ADAPTATIVO")
+    limitador = LimitadorHost("ejemplo.cl", por_segundo=4, rafaga=4, max_concurrentes=1)
+
+    limitador.adquirir()
+    limitador.liberar(estado=429, retry_after="0.3")
+    assert limitador.tasa == 2, "La tasa debe reducirse a la mitad"
+
+    inicio = time.monotonic()
+    limitador.adquirir()
+    espera = time.monotonic() - inicio
+    limitador.liberar(estado=200, latencia=0.01)
+    print(f"   Espera tras Retry-After: {espera:.3f}s, tasa: {limitador.tasa}")
+    assert espera >= 0.25, "Debe respetarse Retry-After"
+    assert limitador.tasa > 2, "La tasa debe recuperarse con respuestas sanas"
+
+    # Latencia creciente
+    limitador = LimitadorHost("ejemplo.cl", por_segundo=4, rafaga=4, max_concurrentes=1)
+    for latencia in [0.2, 0.2, 0.2, 3.0, 3.0]:
+        limitador.adquirir()
+        limitador.liberar(estado=200, latencia=latencia)
+    print(f"   Tasa tras latencia creciente: {limitador.tasa:.2f}")
+    assert limitador.tasa < 4
+    print("✅ Retroceso adaptativo correcto")
+
+def test_registro_desde_config():
+    """Probar que cada fuente toma su límite desde config.py"""
+    print("🧪 PROBANDO REGISTRO DESDE CONFIGURACIÓN")
+    registro = RegistroLimitadores()
+    pjud = registro.para_url("https://www.pjud.cl/prensa-y-comunicaciones")
+    tdlc = registro.para_url("https://www.tdlc.cl/noticias/")
+    desconocido = registro.para_url("https://ejemplo.org/")
+
+    assert pjud is registro.para_url("https://pjud.cl/otra")
+    assert pjud.max_concurrentes == 3
+    assert tdlc.tasa_objetivo == 0.5
+    assert desconocido.max_concurrentes == 1
+    print("✅ Límites por fuente cargados")
+
+def test_obtener_en_paralelo():
+    """Probar que se conserva el orden y se descartan errores"""
+    print("🧪 PROBANDO OBTENCIÓN EN PARALELO")
+    registro = RegistroLimitadores()
+
+    def funcion(item):
+        if item == 3:
+            raise ValueError("falla simulada")
+        return item * 10
+
+    resultados = obtener_en_paralelo([1, 2, 3, 4], funcion, "https://www.pjud.cl", registro)
+    assert resultados == [10, 20, 40]
+    print("✅ Orden conservado y errores descartados")
+
+def test_iterar_con_contrapresion():
+    """Probar que las descargas se pausan mientras el consumidor no pide más resultados"""
+    print("🧪 PROBANDO ITERACIÓN CON CONTRAPRESIÓN")
+    registro = RegistroLimitadores()
+    iniciados = []
+    lock = threading.Lock()
+
+    def funcion(item):
+        with lock:
+            iniciados.append(item)
+        return item * 10
+
+    # pjud.cl permite 3 peticiones simultáneas: con en_espera=1 la ventana es de 3 items
+    generador = iterar_en_paralelo(list(range(1, 21)), funcion, "https://www.pjud.cl", registro, en_espera=1)
+    assert next(generador) == 10
+    time.sleep(0.1)
+    assert len(iniciados) <= 4, f"Se descargaron {len(iniciados)} items sin que se pidieran"
+
+    assert list(generador) == [item * 10 for item in range(2, 21)]
+
+    # Cerrar el generador cancela lo que no empezó
+    iniciados.clear()
+    generador = iterar_en_paralelo(list(range(1, 21)), funcion, "https://www.pjud.cl", registro, en_espera=1)
+    next(generador)
+    generador.close()
+    assert len(iniciados) <= 4
+    print("✅ Descargas acotadas por el consumidor")
+
+def test_plazo_agotado_detiene_la_fuente():
+    """Un PlazoAgotado en un worker se propaga y cancela los items pendientes"""
+    print("🧪 PROBANDO PLAZO AGOTADO EN UN WORKER")
+    registro = RegistroLimitadores()
+    iniciados = []
+    lock = threading.Lock()
+
+    def funcion(item):
+        with lock:
+            iniciados.append(item)
+        if item == 2:
+            raise PlazoAgotado("franja vencida")
+        time.sleep(0.05)
+        return item * 10
+
+    entregados = []
+    try:
+        for resultado in iterar_en_paralelo(list(range(1, 21)), funcion, "https://www.pjud.cl", registro, en_espera=1):
+            entregados.append(resultado)
+        assert False, "el plazo agotado debía propagarse"
+    except PlazoAgotado:
+        pass
+    assert entregados == [10]
+    assert len(iniciados) <= 4, f"Se iniciaron {len(iniciados)} items tras agotarse el plazo"
+
+    # Con la sesión, ningún item empieza tras vencer la franja aunque `funcion` capture el error
+    sesion = SesionLimitada(registro)
+    sesion.plazo = time.time() - 1
+    iniciados.clear()
+
+    def funcion_que_captura(item):
+        with lock:
+            iniciados.append(item)
+        return item
+
+    try:
+        list(iterar_en_paralelo(list(range(1, 21)), funcion_que_captura, "https://www.pjud.cl", registro, sesion=sesion))
+        assert False, "el plazo agotado debía propagarse"
+    except PlazoAgotado:
+        pass
+    assert iniciados == []
+    sesion.close()
+    print("✅ Items pendientes cancelados al agotarse el plazo")
+
+if __name__ == "__main__":
+    test_normalizar_host()
+    test_token_bucket()
+    test_max_concurrentes()
+    test_retroceso_adaptativo()
+    test_registro_desde_config()
+    test_obtener_en_paralelo()
+    test_iterar_con_contrapresion()
+    test_plazo_agotado_detiene_la_fuente()
+
+    print(f"\n🎉 PRUEBA COMPLETADA")
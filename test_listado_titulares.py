@@ -0,0 +1,55 @@
+#!/usr/bin/env python3
+"""
+Script para probar el emparejamiento titular → enlace de los listados (sin acceso a red)
+"""
+
+import sys
+import os
+
+# Agregar el directorio del proyecto al path
+sys.path.append(os.path.dirname(__file__))
+
+from bs4 import BeautifulSoup
+
+from backend.scrapers.fuentes.listado_titulares import TITULARES, emparejar_titulares
+
+LISTADO = (
+    '<header><a href="https://www.tdpi.cl/">Inicio</a></header>'
+    '<article><h3>Tribunal confirma rechazo de marca</h3><div><p>Extracto</p><p>Más texto</p></div>'
+    '<a href="/2025/05/12/marca/">Seguir leyendo</a></article>'
+    '<article><h3><a href="/2025/05/10/patente/">Tribunal acoge apelación de patente</a></h3></article>'
+    '<aside><h3>Categorías</h3><ul><li>Sin enlaces</li></ul></aside>'
+    '<footer><a href="/2025/04/01/otra/">Noticia del pie de página sin titular propio</a></footer>'
+)
+
+def seguir_o_fecha(link):
+    return 'seguir' in link.get_text().lower() or '/2025/' in link['href']
+
+def test_cada_titular_con_su_enlace():
+    """Cada titular toma el primer enlace válido que lo sigue, una sola vez"""
+    print("🧪 PROBANDO EMPAREJAMIENTO")
+    soup = BeautifulSoup(LISTADO, 'html.parser')
+    pares = [(h3.get_text(strip=True), enlace['href']) for h3, enlace in emparejar_titulares(soup, seguir_o_fecha)]
+    assert pares == [
+        ("Tribunal confirma rechazo de marca", "/2025/05/12/marca/"),
+        ("Tribunal acoge apelación de patente", "/2025/05/10/patente/"),
+        # El titular de la barra lateral no tiene enlace propio y toma el siguiente
+        ("Categorías", "/2025/04/01/otra/"),
+    ]
+    print("✅ Emparejamiento correcto")
+
+def test_sin_consumir_titulares():
+    """Sin consumir, cada enlace válido aparece con el último titular visto"""
+    print("🧪 PROBANDO ENLACES CON EL ÚLTIMO TITULAR")
+    soup = BeautifulSoup('<a href="/2025/01/01/a/">Primera</a>' + LISTADO, 'html.parser')
+    pares = emparejar_titulares(soup, lambda link: '/2025/' in link['href'], titulares=TITULARES, consumir=False)
+    titulos = [h3.get_text(strip=True) if h3 else None for h3, _ in pares]
+    assert titulos == [None, "Tribunal confirma rechazo de marca", "Tribunal acoge apelación de patente", "Categorías"]
+    assert emparejar_titulares(BeautifulSoup('', 'html.parser'), seguir_o_fecha) == []
+    print("✅ Enlaces con titular correctos")
+
+if __name__ == "__main__":
+    test_cada_titular_con_su_enlace()
+    test_sin_consumir_titulares()
+
+    print(f"\n🎉 TODAS LAS PRUEBAS COMPLETADAS")
@@ -0,0 +1,66 @@
+#!/usr/bin/env python3
+"""
+Script para probar las marcas de agua por fuente (sin acceso a red)
+"""
+
+import sys
+import os
+import tempfile
+from datetime import datetime, timezone
+
+# Agregar el directorio del proyecto al path
+sys.path.append(os.path.dirname(__file__))
+
+from backend.scrapers.fuentes.marcas_agua import MarcasAgua
+
+FUENTE = "https://www.tdlc.cl"
+
+def listado(*nombres):
+    return [{'url': f"https://www.tdlc.cl/{nombre}"} for nombre in nombres]
+
+def test_corte_en_marca():
+    """Probar que el listado se corta en la última noticia ingerida"""
+    print("🧪 PROBANDO CORTE EN LA MARCA DE AGUA")
+    with tempfile.TemporaryDirectory() as directorio:
+        ruta = os.path.join(directorio, 'marcas.json')
+        marcas = MarcasAgua(ruta)
+
+        # Primera ejecución: sin marca se recorre todo
+        assert marcas.recortar(FUENTE, listado('c', 'b', 'a')) == listado('c', 'b', 'a')
+        marcas.confirmar(FUENTE, lambda urls: set(), fecha=datetime(2025, 5, 2, tzinfo=timezone.utc))
+        assert marcas.get(FUENTE) is None, "Sin nada almacenado la marca no avanza"
+
+        marcas.recortar(FUENTE, listado('c', 'b', 'a'))
+        marcas.confirmar(FUENTE, lambda urls: set(urls), fecha=datetime(2025, 5, 2, tzinfo=timezone.utc))
+        assert marcas.get(FUENTE)['url'] == "https://www.tdlc.cl/c"
+
+        # Nueva instancia (siguiente ejecución): solo lo publicado después
+        marcas = MarcasAgua(ruta)
+        assert marcas.recortar(FUENTE, listado('e', 'd', 'c', 'b')) == listado('e', 'd')
+        assert marcas.estadisticas['recortadas'] == 2
+        assert marcas.get(FUENTE)['fecha'].startswith('2025-05-02')
+
+        # Fuente sin novedades: nada que descargar
+        assert marcas.recortar(FUENTE, listado('c', 'b')) == []
+    print("✅ Listado cortado correctamente")
+
+def test_fallos_se_reintentan():
+    """Probar que la marca no pasa por encima de noticias que no se guardaron"""
+    print("🧪 PROBANDO REINTENTO DE NOTICIAS FALLIDAS")
+    with tempfile.TemporaryDirectory() as directorio:
+        marcas = MarcasAgua(os.path.join(directorio, 'marcas.json'))
+
+        marcas.recortar(FUENTE, listado('c', 'b', 'a'))
+        almacenadas = {"https://www.tdlc.cl/c", "https://www.tdlc.cl/a"}
+        marcas.confirmar(FUENTE, lambda urls: almacenadas & set(urls))
+
+        # 'b' falló: la marca queda en 'a' y 'b' se vuelve a recorrer
+        assert marcas.get(FUENTE)['url'] == "https://www.tdlc.cl/a"
+        assert marcas.recortar(FUENTE, listado('c', 'b', 'a')) == listado('c', 'b')
+    print("✅ Las noticias fallidas quedan antes de la marca")
+
+if __name__ == "__main__":
+    test_corte_en_marca()
+    test_fallos_se_reintentan()
+
+    print(f"\n🎉 PRUEBA COMPLETADA")
@@ -0,0 +1,92 @@
+#!/usr/bin/env python3
+"""
+Script para probar el modelo de boilerplate aprendido por fuente (sin acceso a red)
+"""
+
+import sys
+import os
+import tempfile
+
+# Agregar el directorio del proyecto al path
+sys.path.append(os.path.dirname(__file__))
+
+from backend.processors.modelo_boilerplate import ModeloBoilerplate, segmentar
+from backend.database.memoria_client import AlmacenamientoMemoria
+
+PIE = "Síguenos en redes sociales. Oficina de prensa: prensa@tribunal.cl."
+
+def cuerpo(numero: int) -> str:
+    return f"El tribunal resolvió la causa Rol {numero}-2025. La audiencia fue el día {numero}. {PIE}"
+
+def test_aprender_y_limpiar():
+    """Las frases repetidas en muchas páginas se eliminan y el resto se conserva"""
+    print("🧪 PROBANDO APRENDIZAJE Y LIMPIEZA")
+    with tempfile.TemporaryDirectory() as directorio:
+        modelo = ModeloBoilerplate(os.path.join(directorio, 'boilerplate.json'), min_documentos=5, proporcion_minima=0.5)
+
+        for numero in range(4):
+            assert modelo.aprender('TDLC', cuerpo(numero), f"https://www.tdlc.cl/{numero}")
+        assert modelo.limpiar(cuerpo(99), 'tdlc') == cuerpo(99), "Con pocos documentos no se aprende nada"
+
+        modelo.aprender('tdlc', cuerpo(4), "https://www.tdlc.cl/4")
+        assert modelo.limpiar(cuerpo(99), 'tdlc') == "El tribunal resolvió la causa Rol 99-2025. La audiencia fue el día 99."
+        assert modelo.limpiar(cuerpo(99), 'sii') == cuerpo(99), "El boilerplate es propio de cada fuente"
+        assert modelo.get_estadisticas()['frases_eliminadas'] == 2
+
+        # Nunca se deja una noticia vacía
+        assert modelo.limpiar(PIE, 'tdlc') == PIE
+    print("✅ Boilerplate eliminado")
+
+def test_persistencia_y_urls_repetidas():
+    """El modelo se recarga desde disco y cada URL cuenta una sola vez"""
+    print("🧪 PROBANDO PERSISTENCIA")
+    with tempfile.TemporaryDirectory() as directorio:
+        ruta = os.path.join(directorio, 'boilerplate.json')
+        modelo = ModeloBoilerplate(ruta, min_documentos=5, proporcion_minima=0.5)
+        for numero in range(5):
+            modelo.aprender('tdlc', cuerpo(numero), "https://www.tdlc.cl/misma")
+        assert modelo.boilerplate('tdlc') == set(), "La misma URL no debe contar cinco veces"
+
+        for numero in range(5):
+            modelo.aprender('tdlc', cuerpo(numero), f"https://www.tdlc.cl/{numero}")
+        modelo.guardar()
+
+        recargado = ModeloBoilerplate(ruta, min_documentos=5, proporcion_minima=0.5)
+        assert recargado.boilerplate('tdlc') == modelo.boilerplate('tdlc')
+        assert len(recargado.boilerplate('tdlc')) == 2
+        assert not recargado.aprender('tdlc', cuerpo(1), "https://www.tdlc.cl/1")
+    print("✅ Modelo persistido")
+
+def test_aprender_desde_almacenamiento():
+    """La sincronización incremental solo lee lo creado desde la última vez"""
+    print("🧪 PROBANDO SINCRONIZACIÓN INCREMENTAL")
+    almacenamiento = AlmacenamientoMemoria()
+    almacenamiento.upsert_noticias([
+        {'url_origen': f"https://3ta.cl/{numero}", 'fuente': '3ta', 'cuerpo_completo': cuerpo(numero),
+         'created_at': f"2025-05-0{numero + 1}T00:00:00+00:00"}
+        for numero in range(6)
+    ])
+
+    with tempfile.TemporaryDirectory() as directorio:
+        ruta = os.path.join(directorio, 'boilerplate.json')
+        modelo = ModeloBoilerplate(ruta, min_documentos=5, proporcion_minima=0.5)
+        assert modelo.aprender_desde(almacenamiento) == 6
+        assert modelo.limpiar(cuerpo(7), '3ta') == "El tribunal resolvió la causa Rol 7-2025. La audiencia fue el día 7."
+
+        recargado = ModeloBoilerplate(ruta, min_documentos=5, proporcion_minima=0.5)
+        assert recargado.aprender_desde(almacenamiento) == 0, "Lo ya sincronizado no se vuelve a leer"
+    print("✅ Sincronización incremental correcta")
+
+def test_segmentar():
+    """Las frases se separan por fin de oración y por saltos de línea"""
+    print("🧪 PROBANDO SEGMENTACIÓN")
+    assert segmentar("Uno. Dos!\n\nTres\n Cuatro?") == ["Uno.", "Dos!", "Tres", "Cuatro?"]
+    print("✅ Segmentación correcta")
+
+if __name__ == "__main__":
+    test_segmentar()
+    test_aprender_y_limpiar()
+    test_persistencia_y_urls_repetidas()
+    test_aprender_desde_almacenamiento()
+
+    print(f"\n🎉 TODAS LAS PRUEBAS COMPLETADAS")
@@ -0,0 +1,120 @@
+#!/usr/bin/env python3
+"""
+Script para probar el motor de limpieza precompilado de ContentProcessor
+"""
+
+import sys
+import os
+import re
+import random
+
+# Agregar el directorio del proyecto al path
+sys.path.append(os.path.dirname(__file__))
+
+from backend.processors.motor_limpieza import GrupoReglas, MotorLimpieza, literales_requeridos
+from backend.processors.content_processor import ContentProcessor, motor_contenido, motor_contenido_para
+from backend.processors.reglas_limpieza import GRUPOS_CONTENIDO
+from backend.scrapers.fuentes.config import FUENTES_CONFIG
+from backend.scrapers.fuentes.prevencion_texto_problematico import prevencion_texto
+
+FRAGMENTOS = [
+    "La Corte Suprema acogió el recurso de protección. ", "El tribunal resolvió la causa Rol 1234-2024. ",
+    "Acceder al expediente de la causaR-12-2024 ", "Morandé 360, Piso 8, Santiago", "(56 2) 2393 4100)",
+    "contacto@tribunalambiental.cl.", "Poder Judicial Radio", "Compartir", " Compartir ", "Volver", "Cerrar", "×",
+    "Los horarios de atención son de 8 a 14 horas.", "Atención por teléfonos 600 ", "12-05-2025 10:30", "10:30",
+    "Portal Unificado de Sentencias en línea", "Atención por Chat Messenger", "226748000", "Teléfono", "Contacto",
+    "https://www.pjud.cl/noticias", "www.pjud.cl", "Tabla Primera Sala", "Lunes a viernes", "horas", "\n\n",
+]
+
+def limpiar_secuencial(texto: str) -> str:
+    """Referencia: un re.sub por regla, en orden"""
+    for patron, flags in motor_contenido.patrones:
+        texto = re.sub(patron, '', texto, flags=flags)
+    texto = re.sub(r'\s+', ' ', texto).strip()
+    return texto if len(texto) > 3 and re.search(r'[a-zA-ZáéíóúñÁÉÍÓÚÑ]', texto) else ""
+
+def test_literales_requeridos():
+    """Probar la extracción de literales para el prefiltro"""
+    print("🧪 PROBANDO LITERALES REQUERIDOS")
+    assert literales_requeridos(r'Fiscalía.*?Compartir') == ('fiscalía', 'compartir')
+    assert literales_requeridos(r'Compartir\s*') == ('compartir',)
+    assert literales_requeridos(r'https?://[^\s]+') == ('http', '://')
+    assert literales_requeridos(r'www\.[^\s]+') == ('www.',)
+    assert literales_requeridos(r'\d{6,}') == ()
+    assert literales_requeridos(r'ab|cd') == ()
+    assert literales_requeridos(r'Rol (\d+)') == ('rol ',)
+    print("✅ Literales correctos")
+
+def test_equivalencia_con_limpieza_secuencial():
+    """El motor debe producir lo mismo que aplicar las reglas una por una"""
+    print("🧪 PROBANDO EQUIVALENCIA CON LA LIMPIEZA SECUENCIAL")
+    azar = random.Random(0)
+    procesador = ContentProcessor()
+    for _ in range(500):
+        texto = ''.join(azar.choice(FRAGMENTOS) for _ in range(azar.randint(1, 30)))
+        motor_contenido.vaciar_memo()
+        assert procesador._limpiar_contenido(texto) == limpiar_secuencial(texto), texto
+    print("✅ 500 documentos equivalentes")
+
+def test_prefiltro_y_memo():
+    """Solo corren los grupos cuyos literales están en el texto y cada cuerpo se limpia una vez"""
+    print("🧪 PROBANDO PREFILTRO Y MEMO")
+    motor = MotorLimpieza([
+        GrupoReglas('compartir', (r'Compartir\s*',), re.IGNORECASE),
+        GrupoReglas('fiscalia', (r'Fiscalía.*?Compartir',), re.IGNORECASE | re.DOTALL),
+    ], finalizar=str.strip)
+
+    assert motor.limpiar("Fiscalía informa Compartir hoy") == "Fiscalía informa hoy"
+    estadisticas = motor.get_estadisticas()
+    assert estadisticas['grupos_ejecutados'] == 1, "Sin 'Compartir' la regla de Fiscalía no debe correr"
+    assert estadisticas['grupos_omitidos'] == 1
+
+    motor.limpiar("Fiscalía informa Compartir hoy")
+    motor.limpiar("Fiscalía informa hoy")
+    estadisticas = motor.get_estadisticas()
+    assert estadisticas['documentos'] == 1
+    assert estadisticas['memo'] == 2, "El texto original y el limpio deben salir del memo"
+    print("✅ Prefiltro y memo correctos")
+
+def test_reglas_por_fuente():
+    """Cada fuente usa las reglas base más las suyas"""
+    print("🧪 PROBANDO REGLAS POR FUENTE")
+    for nombre, fuentes, _ in GRUPOS_CONTENIDO:
+        for fuente in fuentes:
+            assert fuente in FUENTES_CONFIG, f"{nombre}: fuente desconocida {fuente}"
+
+    procesador = ContentProcessor()
+    texto = "La resolución Contiene una síntesis de las principales sentencias del año. Compartir"
+    assert procesador._limpiar_contenido(texto, 'tdlc') == "La resolución Contiene una síntesis de las principales sentencias del año."
+    assert procesador._limpiar_contenido(texto, 'TDLC') == procesador._limpiar_contenido(texto, 'tdlc')
+    assert procesador._limpiar_contenido(texto, 'poder_judicial') == "La resolución del año."
+
+    pie = "Fallo dictado. Morandé 360, Piso 8, Santiago (56 2) contacto@tribunalambiental.cl."
+    assert procesador._limpiar_contenido(pie, '1ta') == "Fallo dictado."
+    assert procesador._limpiar_contenido(pie, 'cde') != "Fallo dictado."
+
+    grupos_todas = len(motor_contenido.grupos)
+    assert len(motor_contenido_para('tdlc').grupos) < grupos_todas
+    assert len(motor_contenido_para('poder_judicial').grupos) < grupos_todas
+
+    limpio = prevencion_texto.limpiar_contenido(pie, '3ta')
+    assert limpio == f"Fallo dictado. {prevencion_texto.texto_reemplazo}"
+    assert prevencion_texto.limpiar_contenido(pie, 'sii') == pie
+    print("✅ Reglas seleccionadas por fuente")
+
+def test_limpiar_titulo():
+    """Probar que la limpieza de títulos conserva su comportamiento"""
+    print("🧪 PROBANDO LIMPIEZA DE TÍTULOS")
+    procesador = ContentProcessor()
+    assert procesador._limpiar_titulo("Corte Suprema acoge recurso 01-08-2025 04:08") == "Corte Suprema acoge recurso"
+    assert procesador._limpiar_titulo("Fallo relevante del Juzgado Compartir") == "Fallo relevante del Juzgado"
+    print("✅ Títulos limpios")
+
+if __name__ == "__main__":
+    test_literales_requeridos()
+    test_equivalencia_con_limpieza_secuencial()
+    test_prefiltro_y_memo()
+    test_reglas_por_fuente()
+    test_limpiar_titulo()
+
+    print(f"\n🎉 TODAS LAS PRUEBAS COMPLETADAS")
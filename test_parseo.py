@@ -0,0 +1,65 @@
+#!/usr/bin/env python3
+"""
+Script para probar la capa de parseo de los scrapers (sin acceso a red)
+"""
+
+import sys
+import os
+
+# Agregar el directorio del proyecto al path
+sys.path.append(os.path.dirname(__file__))
+
+from bs4 import BeautifulSoup
+
+from backend.scrapers.fuentes.parseo import etiquetas_listado, parsear, parsear_listado
+
+LISTADO = (
+    '<html><head><script>var a = "<a href=x>";</script></head><body><nav><a href="/">Inicio</a></nav>'
+    '<div class="card"><h3><a href="/noticias/1">Corte Suprema acoge recurso de <b>protección</b></a></h3>'
+    '<span>01/05/2025</span></div>'
+    '<div class="card"><h3><a href="/noticias/2">Tribunal dicta sentencia</a></h3></div></body></html>'
+)
+
+def enlaces(soup):
+    return [(link.get('href'), link.get_text(strip=True)) for link in soup.find_all('a', href=True)]
+
+def test_modo_listado():
+    """El modo listado encuentra los mismos enlaces que el árbol completo"""
+    print("🧪 PROBANDO MODO LISTADO")
+    esperado = enlaces(BeautifulSoup(LISTADO, 'html.parser'))
+    assert enlaces(parsear(LISTADO)) == esperado
+    assert enlaces(parsear(LISTADO.encode('utf-8'), ('a',))) == esperado
+    assert parsear(LISTADO, ('a',)).find('div') is None, "Solo deben quedar los enlaces"
+
+    # Etiquetas anidadas: se conserva solo la más externa, sin duplicar
+    soup = parsear(LISTADO, ('h3', 'a'))
+    assert [h3.get_text(strip=True) for h3 in soup.find_all('h3')] == [
+        "Corte Suprema acoge recurso deprotección", "Tribunal dicta sentencia"
+    ]
+    assert len(soup.find_all('a')) == 3, "Cada enlace una sola vez (dos dentro de h3, uno suelto)"
+    print("✅ Modo listado correcto")
+
+def test_codificacion_y_vacios():
+    """Páginas en latin-1 y respuestas vacías"""
+    print("🧪 PROBANDO CODIFICACIÓN")
+    latin1 = '<html><head><meta charset="iso-8859-1"></head><body><a href="/n">Resolución Nº 5</a></body></html>'
+    assert enlaces(parsear(latin1.encode('latin-1'), ('a',))) == [('/n', 'Resolución Nº 5')]
+    assert enlaces(parsear(b'', ('a',))) == []
+    print("✅ Codificación correcta")
+
+def test_modo_por_fuente():
+    """Cada fuente elige su modo en FUENTES_CONFIG"""
+    print("🧪 PROBANDO MODO POR FUENTE")
+    assert etiquetas_listado('https://www.pjud.cl/prensa-y-comunicaciones') == ('a',)
+    assert etiquetas_listado('https://pjud.cl/') == ('a',)
+    assert etiquetas_listado('https://www.contraloria.cl/portalweb/web/cgr/noticias') is None
+    assert parsear_listado(LISTADO, 'https://www.contraloria.cl').find('div') is not None
+    assert parsear_listado(LISTADO, 'https://www.pjud.cl').find('div') is None
+    print("✅ Modo por fuente correcto")
+
+if __name__ == "__main__":
+    test_modo_listado()
+    test_codificacion_y_vacios()
+    test_modo_por_fuente()
+
+    print(f"\n🎉 TODAS LAS PRUEBAS COMPLETADAS")
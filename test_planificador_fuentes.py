@@ -0,0 +1,141 @@
+#!/usr/bin/env python3
+"""
+Script para probar la planificación de visitas por fuente (sin acceso a red)
+"""
+
+import sys
+import os
+import random
+import tempfile
+from datetime import datetime, timedelta, timezone
+
+# Agregar el directorio del proyecto al path
+sys.path.append(os.path.dirname(__file__))
+
+# Estado incremental aislado: la prueba no toca .estado_scraping
+os.environ['NOTICIAS_DIRECTORIO_ESTADO'] = tempfile.mkdtemp(prefix='test_planificador_')
+
+from backend.database.memoria_client import AlmacenamientoMemoria
+from backend.main import NoticiasJuridicasSystem
+from backend.scrapers.fuentes.registro_scrapers import RegistroScrapers
+from backend.scrapers.fuentes.indice_urls import IndiceURLs
+from backend.scrapers.fuentes.planificador_fuentes import PlanificadorFuentes
+
+AHORA = datetime(2025, 7, 31, 12, tzinfo=timezone.utc).timestamp()
+
+def planificador(directorio: str, **config) -> PlanificadorFuentes:
+    config = dict(intervalo_minimo=900, intervalo_maximo=21600, intervalo_sin_historial=3600,
+                  nuevas_por_visita=0.5, jitter=0.1, ventana_dias=60, dias_minimos=7, **config)
+    return PlanificadorFuentes(os.path.join(directorio, 'planificacion.json'), random.Random(1), **config)
+
+def test_intervalos_por_ritmo():
+    """Las fuentes activas se visitan a menudo y las tranquilas rara vez, dentro de los límites"""
+    print("🧪 PROBANDO INTERVALOS POR RITMO")
+    with tempfile.TemporaryDirectory() as directorio:
+        plan = planificador(directorio)
+        plan.aprender({
+            'poder_judicial': {'publicadas': 600, 'primera': '2024-01-01'},   # 10 por día
+            'contraloria': {'publicadas': 60, 'primera': '2024-01-01'},       # 1 por día
+            'tdlc': {'publicadas': 6, 'primera': '2024-01-01'},               # 0,1 por día
+            'tta': {'publicadas': 0, 'primera': '2024-01-01'},
+            'sii': {'publicadas': 14, 'primera': '2025-07-28'}                # historial corto: 14 en 7 días
+        }, AHORA)
+
+        assert plan.intervalo('poder_judicial') == 4320
+        assert plan.intervalo('contraloria') == 21600
+        assert plan.intervalo('tdlc') == 21600 and plan.intervalo('tta') == 21600
+        assert plan.intervalo('sii') == 21600
+        assert plan.intervalo('cde') == 3600
+
+        plan.config['nuevas_por_visita'] = 0.05
+        assert plan.intervalo('poder_judicial') == 900
+        assert plan.intervalo('sii') == 0.05 * 86400 / 2
+    print("✅ Intervalos acotados según el ritmo de cada fuente")
+
+def test_visitas_vencidas():
+    """Las visitas se agendan con jitter, se persisten y las fallidas se reintentan antes"""
+    print("🧪 PROBANDO VISITAS VENCIDAS")
+    with tempfile.TemporaryDirectory() as directorio:
+        plan = planificador(directorio)
+        plan.aprender({'poder_judicial': {'publicadas': 600, 'primera': '2024-01-01'}}, AHORA)
+        fuentes = ['poder_judicial', 'tdlc', 'cde']
+        assert plan.vencidas(fuentes, AHORA) == fuentes
+
+        proximas = plan.registrar_visitas([
+            {'fuente': 'poder_judicial', 'nuevas': 3, 'errores': []},
+            {'fuente': 'tdlc', 'nuevas': 0, 'errores': []},
+            {'fuente': 'cde', 'nuevas': 0, 'errores': ['sitio caído']}
+        ], AHORA)
+        assert 4320 * 0.9 <= proximas['poder_judicial'] - AHORA <= 4320 * 1.1
+        assert 3600 * 0.9 <= proximas['tdlc'] - AHORA <= 3600 * 1.1
+        assert proximas['cde'] - AHORA == 900
+
+        # El estado sobrevive a un reinicio
+        plan = planificador(directorio)
+        assert plan.vencidas(fuentes, AHORA + 600, holgura=0) == []
+        assert plan.vencidas(fuentes, AHORA + 600) == ['cde']
+        assert plan.vencidas(fuentes, AHORA + 5000) == fuentes
+        assert plan.segundos_hasta_proxima(fuentes, AHORA) == 900
+    print("✅ Visitas agendadas y persistidas")
+
+def test_aprender_desde_indice_y_logs():
+    """El ritmo sale del índice local; las fuentes sin noticias registradas, de los logs"""
+    print("🧪 PROBANDO APRENDIZAJE DESDE EL HISTORIAL")
+    with tempfile.TemporaryDirectory() as directorio:
+        indice = IndiceURLs(os.path.join(directorio, 'indice.sqlite3'))
+        hoy = datetime.fromtimestamp(AHORA, timezone.utc)
+        indice.registrar_lote(
+            [{'url_origen': f'https://pjud.cl/n{i}', 'fuente': 'poder_judicial',
+              'fecha_publicacion': (hoy - timedelta(hours=6 * i)).isoformat()} for i in range(240)] +
+            [{'url_origen': 'https://tdlc.cl/n1', 'fuente': 'TDLC', 'fecha_publicacion': '2024-01-05T10:00:00Z'},
+             {'url_origen': 'https://tdlc.cl/n2', 'fuente': 'tdlc', 'fecha_publicacion': 'sin fecha'}]
+        )
+
+        almacenamiento = AlmacenamientoMemoria()
+        for dias, nuevas in ((20, 3), (10, 4), (1, 7)):
+            almacenamiento.insert_log({'fuente_nombre': 'cde', 'noticias_nuevas': nuevas,
+                                       'created_at': (hoy - timedelta(days=dias)).isoformat()})
+
+        plan = planificador(directorio)
+        plan.aprender_desde(indice, almacenamiento, ['poder_judicial', 'tdlc', 'cde', 'sii'], AHORA)
+        assert round(plan.por_dia['poder_judicial'], 2) == 4.0
+        assert plan.por_dia['tdlc'] == 0
+        assert plan.por_dia['cde'] == 14 / 20.5
+        assert 'sii' not in plan.por_dia
+        indice.cerrar()
+    print("✅ Ritmos aprendidos del índice y de los logs")
+
+class ScraperVacio:
+    base_url = "https://ejemplo-fuente.cl"
+
+    def __init__(self, **argumentos):
+        self.visitas = 0
+
+    def iter_noticias(self, max_noticias: int = 10):
+        self.visitas += 1
+        return iter(())
+
+def test_ejecucion_de_fuentes_vencidas():
+    """El sistema recorre solo las fuentes pedidas y agenda su próxima visita"""
+    print("🧪 PROBANDO EJECUCIÓN DE FUENTES VENCIDAS")
+    with tempfile.TemporaryDirectory() as directorio:
+        sistema = NoticiasJuridicasSystem(almacenamiento=AlmacenamientoMemoria())
+        sistema.scrapers = RegistroScrapers(['tdlc', 'cde'], lambda codigo: ScraperVacio)
+        sistema.planificador = planificador(directorio)
+
+        resultados = sistema.run_scraping_completo(['cde'])
+        assert [resultado['fuente'] for resultado in resultados] == ['cde']
+        assert sistema.scrapers['cde'].visitas == 1 and sistema.scrapers['tdlc'].visitas == 0
+        assert sistema.planificador.proxima('cde') > 0 and sistema.planificador.proxima('tdlc') == 0
+
+        sistema.run_once(solo_vencidas=True)
+        assert sistema.scrapers['cde'].visitas == 1 and sistema.scrapers['tdlc'].visitas == 1
+    print("✅ Solo se recorrieron las fuentes vencidas")
+
+if __name__ == "__main__":
+    test_intervalos_por_ritmo()
+    test_visitas_vencidas()
+    test_aprender_desde_indice_y_logs()
+    test_ejecucion_de_fuentes_vencidas()
+
+    print(f"\n🎉 TODAS LAS PRUEBAS COMPLETADAS")
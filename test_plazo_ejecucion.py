@@ -0,0 +1,218 @@
+#!/usr/bin/env python3
+"""
+Script para probar el plazo de ejecución y las franjas por fuente contra un servidor local
+"""
+
+import sys
+import os
+import random
+import tempfile
+import threading
+import time
+from datetime import datetime, timezone
+from functools import partial
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import requests
+
+# Agregar el directorio del proyecto al path
+sys.path.append(os.path.dirname(__file__))
+
+# Estado incremental aislado: la prueba no toca .estado_scraping
+os.environ['NOTICIAS_DIRECTORIO_ESTADO'] = tempfile.mkdtemp(prefix='test_plazo_')
+
+from backend.database.memoria_client import AlmacenamientoMemoria
+from backend.main import NoticiasJuridicasSystem
+from backend.scrapers.fuentes.config import SCRAPING_CONFIG
+from backend.scrapers.fuentes.contexto_ejecucion import ContextoEjecucion
+from backend.scrapers.fuentes.data_schema import crear_noticia_estandarizada
+from backend.scrapers.fuentes.limitador_peticiones import (
+    LimitadorHost, PlazoAgotado, RegistroLimitadores, normalizar_host
+)
+from backend.scrapers.fuentes.planificador_fuentes import PlanificadorFuentes
+from backend.scrapers.fuentes.plazo_ejecucion import PlazoEjecucion, ordenar_fuentes
+from backend.scrapers.fuentes.registro_scrapers import RegistroScrapers
+
+CUERPO = ("El tribunal acogió la reclamación presentada en contra de la resolución, ordenando "
+          "retrotraer el procedimiento a la etapa de participación ciudadana. ") * 3
+
+class PaginaHandler(BaseHTTPRequestHandler):
+    """Responde de inmediato, salvo las rutas /colgada/, que tardan diez segundos"""
+
+    protocol_version = 'HTTP/1.1'
+
+    def do_GET(self):
+        if self.path.startswith('/colgada/'):
+            time.sleep(10)
+        cuerpo = b"<html><body><p>Noticia</p></body></html>"
+        try:
+            self.send_response(200)
+            self.send_header('Content-Length', str(len(cuerpo)))
+            self.end_headers()
+            self.wfile.write(cuerpo)
+        except OSError:
+            pass
+
+    def log_message(self, *args):
+        pass
+
+class RegistroRapido(RegistroLimitadores):
+    """Limitadores sin espera, para no alargar la prueba"""
+
+    def para_url(self, url: str) -> LimitadorHost:
+        host = normalizar_host(url)
+        with self._lock:
+            return self._limitadores.setdefault(
+                host, LimitadorHost(host, por_segundo=1000, rafaga=10, max_concurrentes=3)
+            )
+
+def iniciar_servidor():
+    servidor = ThreadingHTTPServer(('127.0.0.1', 0), PaginaHandler)
+    servidor.daemon_threads = True
+    threading.Thread(target=servidor.serve_forever, daemon=True).start()
+    return servidor, f"http://127.0.0.1:{servidor.server_address[1]}"
+
+class ScraperHTTP:
+    """Descarga una página por noticia; desde `colgar_desde` el sitio deja de responder"""
+
+    def __init__(self, codigo: str, base_url: str, colgar_desde: int = None, contexto=None, **argumentos):
+        self.codigo = codigo
+        self.base_url = base_url
+        self.colgar_desde = colgar_desde
+        self.session = contexto.nueva_sesion()
+        self.peticiones = 0
+
+    def iter_noticias(self, max_noticias: int = 10):
+        for i in range(max_noticias):
+            ruta = 'colgada' if self.colgar_desde is not None and i >= self.colgar_desde else 'noticias'
+            try:
+                self.peticiones += 1
+                self.session.get(f"{self.base_url}/{ruta}/{self.codigo}/{i}", timeout=30)
+            except requests.RequestException as e:
+                # Como los scrapers reales: el error de una noticia no detiene el listado
+                print(f"❌ Error descargando noticia {i} de {self.codigo}: {e}")
+                continue
+            yield crear_noticia_estandarizada(
+                titulo=f"Tribunal resuelve reclamación número {i} de {self.codigo}",
+                cuerpo_completo=CUERPO,
+                fecha_publicacion=datetime(2025, 7, i + 1, tzinfo=timezone.utc),
+                fuente=self.codigo,
+                url_origen=f"{self.base_url}/noticias/{self.codigo}/{i}"
+            )
+
+def test_orden_y_franjas():
+    """Las fuentes van por prioridad y costo; el tiempo se reparte según el costo esperado"""
+    print("🧪 PROBANDO ORDEN Y FRANJAS")
+    costos = {'cde': 30, 'tdlc': 200, 'poder_judicial': 50, 'sii': 10, 'desconocida': 1}
+    # poder_judicial y tdlc tienen prioridad 1, cde y sii prioridad 3
+    assert ordenar_fuentes(costos, costos) == ['poder_judicial', 'tdlc', 'sii', 'cde', 'desconocida']
+
+    plazo = PlazoEjecucion(1000, {'a': 100, 'b': 300, 'c': 100}, reserva=100, franja_minima=20, margen_costo=1)
+    assert plazo.asignar('a', 0) == 900 * 100 / 500
+    # `a` terminó a tiempo: lo que queda se reparte entre b y c
+    assert plazo.asignar('b', 100) == 100 + 800 * 300 / 400
+    assert plazo.asignar('c', 870) == 870 + 30
+    assert plazo.asignar('d', 890) is None and plazo.sin_tiempo == ['d']
+
+    # Con varios workers, cada franja puede ocupar más del tiempo restante repartido
+    plazo = PlazoEjecucion(1000, {'a': 100, 'b': 100}, workers=2, reserva=0, franja_minima=20)
+    assert plazo.asignar('a', 0) == 1000
+
+    # Si no alcanza para todas, la primera puede tardar el doble de su costo
+    plazo = PlazoEjecucion(1000, {'a': 300, 'b': 600, 'c': 600}, reserva=0, franja_minima=20, margen_costo=2)
+    assert plazo.asignar('a', 0) == 600
+    assert plazo.asignar('b', 600) == 1000
+    print("✅ Orden por prioridad y franjas proporcionales")
+
+def test_sesion_con_plazo():
+    """Una petición colgada se corta al vencer el plazo sin que el host retroceda"""
+    print("🧪 PROBANDO SESIÓN CON PLAZO")
+    servidor, url = iniciar_servidor()
+    registro = RegistroRapido()
+    contexto = ContextoEjecucion(registro=registro)
+    try:
+        sesion = contexto.nueva_sesion()
+        sesion.plazo = time.time() + 0.5
+        assert sesion.get(f"{url}/noticias/1", timeout=30).status_code == 200
+
+        inicio = time.time()
+        try:
+            sesion.get(f"{url}/colgada/1", timeout=30)
+            assert False, "la petición debía cortarse"
+        except PlazoAgotado:
+            pass
+        assert time.time() - inicio < 2
+
+        try:
+            sesion.get(f"{url}/noticias/2", timeout=30)
+            assert False, "la franja ya venció"
+        except PlazoAgotado:
+            pass
+
+        limitador = registro.para_url(url)
+        assert limitador.estadisticas['errores'] == 0 and limitador.estadisticas['retrocesos'] == 0
+
+        sesion.plazo = None
+        assert sesion.get(f"{url}/noticias/3", timeout=30).status_code == 200
+    finally:
+        contexto.conexiones.cerrar()
+        servidor.shutdown()
+    print("✅ Petición colgada cortada a tiempo")
+
+def test_ejecucion_con_plazo():
+    """Una fuente colgada se corta, guarda lo descargado y las demás alcanzan a correr"""
+    print("🧪 PROBANDO EJECUCIÓN CON PLAZO")
+    servidor, url = iniciar_servidor()
+    config_original = dict(SCRAPING_CONFIG['plazo'])
+    SCRAPING_CONFIG['plazo'].update(reserva=0.5, franja_minima=0.2, margen_costo=1, duracion_sin_historial=1)
+    try:
+        with tempfile.TemporaryDirectory() as directorio:
+            almacenamiento = AlmacenamientoMemoria()
+            sistema = NoticiasJuridicasSystem(almacenamiento=almacenamiento)
+            sistema.config.update(max_workers=1, tamano_lote=2, max_noticias_por_fuente=5, plazo_ejecucion=4)
+            sistema.planificador = PlanificadorFuentes(os.path.join(directorio, 'planificacion.json'), random.Random(1))
+
+            colgadas = {'tdlc': 2}
+            fabrica = lambda codigo: partial(ScraperHTTP, codigo, url, colgadas.get(codigo))
+            contexto = ContextoEjecucion(registro=RegistroRapido())
+            sistema.scrapers = RegistroScrapers(['cde', 'tdlc', 'sii', 'poder_judicial'], fabrica, contexto=contexto)
+
+            inicio = time.time()
+            resultados = sistema.run_scraping_completo()
+            assert time.time() - inicio < 4
+
+            # Prioridad 1 primero; sin historial, a igual prioridad se respeta el orden del sistema
+            assert [resultado['fuente'] for resultado in resultados] == ['tdlc', 'poder_judicial', 'cde', 'sii']
+            por_fuente = {resultado['fuente']: resultado for resultado in resultados}
+            assert por_fuente['tdlc']['truncada'] and por_fuente['tdlc']['nuevas'] == 2
+            for fuente in ('poder_judicial', 'cde', 'sii'):
+                assert not por_fuente[fuente]['truncada'] and por_fuente[fuente]['nuevas'] == 5, por_fuente[fuente]
+            assert len(almacenamiento.noticias) == 17
+            assert sistema.scrapers['tdlc'].session.plazo is None
+
+            estados = {log['fuente_nombre']: log['estado'] for log in almacenamiento.logs}
+            assert estados == {'tdlc': 'timeout', 'poder_judicial': 'completado', 'cde': 'completado', 'sii': 'completado'}
+
+            # La visita cortada se retoma pronto y su duración cuenta como mínima
+            plan = sistema.planificador
+            assert plan.proxima('tdlc') - time.time() <= SCRAPING_CONFIG['planificacion']['intervalo_minimo']
+            assert plan.duracion_esperada('tdlc') > plan.duracion_esperada('cde')
+
+            # En la siguiente ejecución la fuente lenta va al final de su prioridad
+            sistema.config['plazo_ejecucion'] = 1.2
+            resultados = sistema.run_scraping_completo(['tdlc', 'poder_judicial', 'cde', 'sii'])
+            orden = [resultado['fuente'] for resultado in resultados]
+            assert orden[:2] == ['poder_judicial', 'tdlc'], orden
+            sin_tiempo = [resultado['fuente'] for resultado in resultados if resultado.get('sin_tiempo')]
+            assert sin_tiempo and 'poder_judicial' not in sin_tiempo
+    finally:
+        SCRAPING_CONFIG['plazo'].update(config_original)
+        servidor.shutdown()
+    print("✅ Fuente colgada cortada sin dejar sin tiempo al resto")
+
+if __name__ == "__main__":
+    test_orden_y_franjas()
+    test_sesion_con_plazo()
+    test_ejecucion_con_plazo()
+
+    print(f"\n🎉 TODAS LAS PRUEBAS COMPLETADAS")
@@ -0,0 +1,80 @@
+#!/usr/bin/env python3
+"""
+Script para probar el registro diferido de scrapers (sin acceso a red)
+"""
+
+import sys
+import os
+import subprocess
+
+# Agregar el directorio del proyecto al path
+sys.path.append(os.path.dirname(__file__))
+
+from backend.scrapers.fuentes.registro_scrapers import RegistroScrapers
+
+RAIZ = os.path.dirname(os.path.abspath(__file__))
+
+class ScraperDePrueba:
+    construidos = []
+
+    def __init__(self, openai_api_key=None):
+        self.openai_api_key = openai_api_key
+        ScraperDePrueba.construidos.append(self)
+
+def test_construccion_a_pedido():
+    """Cada scraper se construye una vez, al pedirlo"""
+    print("🧪 PROBANDO CONSTRUCCIÓN A PEDIDO")
+    ScraperDePrueba.construidos = []
+    fabrica = lambda codigo: ScraperDePrueba if codigo != 'roto' else None
+    registro = RegistroScrapers(['pj', 'tdlc', 'cde', 'roto'], fabrica, openai_api_key='clave')
+
+    assert len(registro) == 4 and list(registro) == ['pj', 'tdlc', 'cde', 'roto']
+    assert 'tdlc' in registro and 'otra' not in registro
+    assert ScraperDePrueba.construidos == []
+
+    tdlc = registro['tdlc']
+    assert registro['tdlc'] is tdlc and tdlc.openai_api_key == 'clave'
+    assert registro.construidos() == ['tdlc'] and registro.construido('pj') is None
+
+    seleccion = registro.seleccionar(['cde', 'tdlc'])
+    assert list(seleccion) == ['cde', 'tdlc'] and seleccion['tdlc'] is tdlc
+    assert len(ScraperDePrueba.construidos) == 1 and seleccion.construido('cde') is None
+
+    for codigo, error in (('otra', KeyError), ('roto', KeyError)):
+        try:
+            registro[codigo]
+            assert False, f"{codigo} no debería construirse"
+        except error:
+            pass
+    try:
+        registro.seleccionar(['tdlc', 'otra'])
+        assert False, "Una fuente desconocida debe rechazarse"
+    except KeyError:
+        pass
+    print("✅ Scrapers construidos solo al pedirlos")
+
+def test_arranque_sin_importar_fuentes():
+    """Importar el sistema no carga los scrapers ni openai; pedir una fuente carga solo esa"""
+    print("🧪 PROBANDO IMPORTACIONES DIFERIDAS")
+    programa = (
+        "import sys, contextlib, io\n"
+        "with contextlib.redirect_stdout(io.StringIO()):\n"
+        "    from backend.main import NoticiasJuridicasSystem\n"
+        "    from backend.database.memoria_client import AlmacenamientoMemoria\n"
+        "    sistema = NoticiasJuridicasSystem(almacenamiento=AlmacenamientoMemoria())\n"
+        "    antes = [m for m in sys.modules if m.endswith('_scraper')]\n"
+        "    sistema.seleccionar_fuentes(['tdlc'])\n"
+        "    sistema.scrapers['tdlc']\n"
+        "    despues = sorted(m.rsplit('.', 1)[-1] for m in sys.modules if m.endswith('_scraper'))\n"
+        "print(antes, despues, 'openai' in sys.modules)\n"
+    )
+    proceso = subprocess.run([sys.executable, '-c', programa], cwd=RAIZ, capture_output=True, text=True, timeout=120)
+    assert proceso.returncode == 0, proceso.stderr
+    assert proceso.stdout.strip().splitlines()[-1] == "[] ['base_scraper', 'tdlc_scraper'] False", proceso.stdout
+    print("✅ Solo se importó la fuente pedida")
+
+if __name__ == "__main__":
+    test_construccion_a_pedido()
+    test_arranque_sin_importar_fuentes()
+
+    print(f"\n🎉 TODAS LAS PRUEBAS COMPLETADAS")
@@ -0,0 +1,269 @@
+#!/usr/bin/env python3
+"""
+Script para probar la salud de las fuentes y sus cortacircuitos contra un servidor local
+"""
+
+import sys
+import os
+import random
+import socket
+import tempfile
+import threading
+import time
+from collections import Counter
+from datetime import datetime, timezone
+from functools import partial
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import requests
+
+# Agregar el directorio del proyecto al path
+sys.path.append(os.path.dirname(__file__))
+
+# Estado incremental aislado: la prueba no toca .estado_scraping
+os.environ['NOTICIAS_DIRECTORIO_ESTADO'] = tempfile.mkdtemp(prefix='test_salud_')
+
+from backend.database.memoria_client import AlmacenamientoMemoria
+from backend.main import NoticiasJuridicasSystem
+from backend.scrapers.fuentes.contexto_ejecucion import ContextoEjecucion
+from backend.scrapers.fuentes.data_schema import crear_noticia_estandarizada
+from backend.scrapers.fuentes.limitador_peticiones import (
+    FuenteCaida, LimitadorHost, RegistroLimitadores, normalizar_host
+)
+from backend.scrapers.fuentes.planificador_fuentes import PlanificadorFuentes
+from backend.scrapers.fuentes.registro_scrapers import RegistroScrapers
+from backend.scrapers.fuentes.salud_fuentes import SaludFuentes, visita_fallida
+
+AHORA = datetime(2025, 7, 31, 12, tzinfo=timezone.utc).timestamp()
+
+CUERPO = ("El tribunal acogió la reclamación presentada en contra de la resolución, ordenando "
+          "retrotraer el procedimiento a la etapa de participación ciudadana. ") * 3
+
+class PaginaHandler(BaseHTTPRequestHandler):
+    """/caida/ responde 500; /intermitente/ responde 503 las dos primeras veces por ruta"""
+
+    protocol_version = 'HTTP/1.1'
+    visitas = Counter()
+
+    def do_GET(self):
+        PaginaHandler.visitas[self.path] += 1
+        estado = 200
+        if self.path.startswith('/caida/'):
+            estado = 500
+        elif self.path.startswith('/intermitente/') and PaginaHandler.visitas[self.path] <= 2:
+            estado = 503
+        cuerpo = b"<html><body><p>Noticia</p></body></html>"
+        self.send_response(estado)
+        self.send_header('Content-Length', str(len(cuerpo)))
+        self.end_headers()
+        self.wfile.write(cuerpo)
+
+    def log_message(self, *args):
+        pass
+
+class RegistroRapido(RegistroLimitadores):
+    """Limitadores sin espera, para no alargar la prueba"""
+
+    def para_url(self, url: str) -> LimitadorHost:
+        host = normalizar_host(url)
+        with self._lock:
+            return self._limitadores.setdefault(
+                host, LimitadorHost(host, por_segundo=1000, rafaga=10, max_concurrentes=3)
+            )
+
+def iniciar_servidor():
+    servidor = ThreadingHTTPServer(('127.0.0.1', 0), PaginaHandler)
+    threading.Thread(target=servidor.serve_forever, daemon=True).start()
+    return servidor, f"http://127.0.0.1:{servidor.server_address[1]}"
+
+def salud(directorio: str, **config) -> SaludFuentes:
+    config = dict(umbral_fallos=3, enfriamiento=3600, enfriamiento_maximo=4 * 3600, noticias_sonda=1,
+                  ventana_visitas=10, tasa_error_maxima=0.5, fuentes_prueba=2, latencia_maxima_rapida=1.0,
+                  **config)
+    return SaludFuentes(os.path.join(directorio, 'salud.json'), **config)
+
+def visita(fuente: str, ok: bool = True, latencia: float = 0.2) -> dict:
+    return {'fuente': fuente, 'encontradas': 3 if ok else 0, 'errores': [] if ok else ['sitio caído'],
+            'peticiones': {'errores': 0 if ok else 4, 'latencia_mediana': latencia}}
+
+def test_visita_fallida():
+    """Errores, o ninguna noticia con peticiones fallidas o sin tiempo, cuentan como falla"""
+    print("🧪 PROBANDO VISITAS FALLIDAS")
+    assert visita_fallida({'errores': ['x'], 'encontradas': 5})
+    assert not visita_fallida({'errores': [], 'encontradas': 2, 'peticiones': {'errores': 3}})
+    assert visita_fallida({'errores': [], 'encontradas': 0, 'peticiones': {'errores': 3}})
+    assert visita_fallida({'errores': [], 'encontradas': 0, 'truncada': True})
+    # Un listado sin novedades no es una falla
+    assert not visita_fallida({'errores': [], 'encontradas': 0, 'peticiones': {'errores': 0}})
+    print("✅ Visitas fallidas reconocidas")
+
+def test_cortacircuitos():
+    """Tres fallas seguidas abren el circuito; la visita de prueba lo cierra o duplica el enfriamiento"""
+    print("🧪 PROBANDO CORTACIRCUITOS")
+    with tempfile.TemporaryDirectory() as directorio:
+        registro = salud(directorio)
+        for i in range(2):
+            assert registro.registrar_visitas([visita('sii', ok=False)], AHORA + i) == {}
+        assert registro.estado('sii', AHORA) == 'cerrado'
+        assert registro.registrar_visitas([visita('sii', ok=False)], AHORA) == {'sii': 'abierto'}
+        assert registro.estado('sii', AHORA + 3599) == 'abierto'
+        assert registro.estado('sii', AHORA + 3600) == 'prueba'
+
+        # El estado sobrevive a un reinicio; la prueba fallida duplica el enfriamiento
+        registro = salud(directorio)
+        assert registro.registrar_visitas([visita('sii', ok=False)], AHORA + 3600) == {'sii': 'abierto'}
+        assert registro.estado('sii', AHORA + 3600 + 7199) == 'abierto'
+        assert registro.estado('sii', AHORA + 3600 + 7200) == 'prueba'
+        registro.registrar_visitas([visita('sii', ok=False)], AHORA + 10800)
+        registro.registrar_visitas([visita('sii', ok=False)], AHORA + 30000)
+        assert registro.resumen('sii', AHORA)['abierto_hasta'] == AHORA + 30000 + 4 * 3600
+
+        assert registro.registrar_visitas([visita('sii')], AHORA + 50000) == {'sii': 'cerrado'}
+        resumen = registro.resumen('sii', AHORA + 50000)
+        assert resumen['circuito'] == 'cerrado' and resumen['fallos_consecutivos'] == 0
+        assert resumen['visitas'] == 7 and resumen['tasa_error'] == 6 / 7
+    print("✅ Circuito abierto, en prueba y cerrado")
+
+def test_seleccion_por_salud():
+    """Cada modo elige las fuentes según circuito, tasa de error y latencia"""
+    print("🧪 PROBANDO SELECCIÓN POR SALUD")
+    with tempfile.TemporaryDirectory() as directorio:
+        registro = salud(directorio)
+        historial = {
+            'poder_judicial': [True] * 4,                   # sana y rápida
+            'cde': [True, True, True, False],               # sana, con una falla
+            'tdlc': [False, True, False, True, False, True],  # tasa de error 0,5
+            'dt': [True, False, False, True, False, False],   # tasa de error 0,67
+            'sii': [False] * 3,                             # circuito abierto
+            'inapi': [False] * 3                            # circuito en prueba
+        }
+        for fuente, visitas in historial.items():
+            for ok in visitas:
+                registro.registrar_visitas([visita(fuente, ok, latencia=2.0 if fuente == 'cde' else 0.2)],
+                                           AHORA - (3600 if fuente == 'inapi' else 0))
+        fuentes = list(historial) + ['tta']
+
+        assert registro.seleccionar(fuentes, 'todas', AHORA) == fuentes
+        assert registro.seleccionar(fuentes, 'completo', AHORA) == ['poder_judicial', 'cde', 'tdlc', 'dt', 'inapi', 'tta']
+        assert registro.seleccionar(fuentes, 'funcionando', AHORA) == ['poder_judicial', 'cde', 'tdlc', 'inapi', 'tta']
+        assert registro.seleccionar(fuentes, 'rapido', AHORA) == ['poder_judicial', 'tdlc', 'tta']
+        # cde falló en su última visita; las fuentes sin historial van después de las conocidas
+        assert registro.seleccionar(fuentes, 'prueba', AHORA) == ['poder_judicial', 'tdlc']
+        assert registro.seleccionar(['tta', 'cde', 'tdlc'], 'prueba', AHORA) == ['tdlc', 'tta']
+    print("✅ Fuentes seleccionadas por salud")
+
+def test_sesion_reintentos_y_caida():
+    """La sesión reintenta los 5xx, no reintenta un host que rechaza la conexión y da por caído un sitio"""
+    print("🧪 PROBANDO REINTENTOS DE LA SESIÓN")
+    servidor, url = iniciar_servidor()
+    contexto = ContextoEjecucion(registro=RegistroRapido())
+    try:
+        sesion = contexto.nueva_sesion()
+        assert sesion.max_reintentos == 3
+        assert sesion.get(f"{url}/intermitente/1", timeout=5).status_code == 200
+        estadisticas = sesion.get_estadisticas()
+        assert estadisticas['peticiones'] == 3 and estadisticas['errores'] == 2 and estadisticas['reintentos'] == 2
+        assert sesion.fallos_seguidos == 0 and estadisticas['latencia_mediana'] is not None
+
+        # Puerto sin servidor: se rechaza la conexión y no se reintenta
+        with socket.socket() as libre:
+            libre.bind(('127.0.0.1', 0))
+            cerrado = f"http://127.0.0.1:{libre.getsockname()[1]}"
+        sesion.reset_estadisticas()
+        try:
+            sesion.get(f"{cerrado}/noticias", timeout=5)
+            assert False, "la conexión debía rechazarse"
+        except requests.ConnectionError:
+            pass
+        assert sesion.get_estadisticas()['peticiones'] == 1
+
+        # Un sitio que siempre responde 500 se da por caído tras cinco fallos seguidos
+        sesion.reset_estadisticas()
+        assert sesion.get(f"{url}/caida/1", timeout=5).status_code == 500
+        assert sesion.get(f"{url}/caida/2", timeout=5).status_code == 500
+        try:
+            sesion.get(f"{url}/caida/3", timeout=5)
+            assert False, "el sitio debía darse por caído"
+        except FuenteCaida:
+            pass
+        assert sesion.get_estadisticas()['peticiones'] == 5
+    finally:
+        contexto.conexiones.cerrar()
+        servidor.shutdown()
+    print("✅ Reintentos acotados")
+
+class ScraperHTTP:
+    """Descarga una página por noticia, bajo la ruta `ruta` del servidor"""
+
+    def __init__(self, codigo: str, base_url: str, rutas: dict, contexto=None, **argumentos):
+        self.codigo = codigo
+        self.base_url = base_url
+        self.rutas = rutas
+        self.session = contexto.nueva_sesion()
+        self.visitas = []
+
+    def iter_noticias(self, max_noticias: int = 10):
+        self.visitas.append(max_noticias)
+        for i in range(max_noticias):
+            try:
+                respuesta = self.session.get(f"{self.base_url}/{self.rutas[self.codigo]}/{self.codigo}/{i}", timeout=5)
+            except requests.RequestException:
+                continue
+            if respuesta.status_code != 200:
+                continue
+            yield crear_noticia_estandarizada(
+                titulo=f"Tribunal resuelve reclamación número {i} de {self.codigo}",
+                cuerpo_completo=CUERPO,
+                fecha_publicacion=datetime(2025, 7, i + 1, tzinfo=timezone.utc),
+                fuente=self.codigo,
+                url_origen=f"{self.base_url}/noticias/{self.codigo}/{i}"
+            )
+
+def test_fuente_caida_en_ejecuciones():
+    """Una fuente caída deja de recorrerse, se agenda para su prueba y vuelve cuando responde"""
+    print("🧪 PROBANDO FUENTE CAÍDA ENTRE EJECUCIONES")
+    servidor, url = iniciar_servidor()
+    try:
+        with tempfile.TemporaryDirectory() as directorio:
+            sistema = NoticiasJuridicasSystem(almacenamiento=AlmacenamientoMemoria())
+            sistema.config.update(max_workers=1, max_noticias_por_fuente=3)
+            sistema.planificador = PlanificadorFuentes(os.path.join(directorio, 'planificacion.json'), random.Random(1))
+            sistema.salud = salud(directorio)
+
+            rutas = {'cde': 'noticias', 'sii': 'caida'}
+            contexto = ContextoEjecucion(registro=RegistroRapido())
+            sistema.scrapers = RegistroScrapers(
+                ['cde', 'sii'], lambda codigo: partial(ScraperHTTP, codigo, url, rutas), contexto=contexto
+            )
+
+            for _ in range(3):
+                sistema.run_once(modo='funcionando')
+            assert sistema.scrapers['sii'].visitas == [3, 3, 3]
+            assert sistema.salud.estado('sii') == 'abierto'
+
+            # Con el circuito abierto no se visita y su próxima visita pasa a ser la de prueba
+            sistema.run_once(modo='funcionando')
+            assert sistema.scrapers['sii'].visitas == [3, 3, 3] and len(sistema.scrapers['cde'].visitas) == 4
+            assert sistema.planificador.proxima('sii') == sistema.salud.resumen('sii')['abierto_hasta']
+            assert sistema.planificador.vencidas(['sii']) == []
+
+            # Vencido el enfriamiento, la visita de prueba trae una sola noticia y cierra el circuito
+            sistema.salud._cargar()['sii']['abierto_hasta'] = time.time() - 1
+            rutas['sii'] = 'noticias'
+            sistema.run_once(modo='funcionando')
+            assert sistema.scrapers['sii'].visitas[-1] == 1
+            assert sistema.salud.estado('sii') == 'cerrado'
+            sistema.run_once(modo='funcionando')
+            assert sistema.scrapers['sii'].visitas[-1] == 3
+    finally:
+        servidor.shutdown()
+    print("✅ Fuente caída omitida y recuperada")
+
+if __name__ == "__main__":
+    test_visita_fallida()
+    test_cortacircuitos()
+    test_seleccion_por_salud()
+    test_sesion_reintentos_y_caida()
+    test_fuente_caida_en_ejecuciones()
+
+    print(f"\n🎉 TODAS LAS PRUEBAS COMPLETADAS")
@@ -0,0 +1,228 @@
+#!/usr/bin/env python3
+"""
+Script para probar las consultas y escrituras en lote del cliente de Supabase con un transporte simulado (sin acceso a red)
+"""
+
+import sys
+import os
+import json
+
+import requests
+
+# Agregar el directorio del proyecto al path
+sys.path.append(os.path.dirname(__file__))
+
+from backend.database.supabase_client import SupabaseClient
+
+def respuesta(estado: int, cuerpo=None) -> requests.Response:
+    """Respuesta HTTP armada a mano"""
+    response = requests.Response()
+    response.status_code = estado
+    response._content = json.dumps(cuerpo).encode('utf-8') if cuerpo is not None else b''
+    return response
+
+class TransporteDePrueba:
+    """Anota cada petición y delega la respuesta en `responder(metodo, url, params, json)`"""
+
+    def __init__(self, responder):
+        self.responder = responder
+        self.peticiones = []
+
+    def get(self, url: str, headers=None, params=None, **kwargs):
+        self.peticiones.append(('GET', url, params, None))
+        return self.responder('GET', url, params, None)
+
+    def post(self, url: str, headers=None, params=None, json=None, **kwargs):
+        self.peticiones.append(('POST', url, params, json))
+        return self.responder('POST', url, params, json)
+
+def cliente(responder) -> SupabaseClient:
+    return SupabaseClient('https://ejemplo.supabase.co', 'clave', transporte=TransporteDePrueba(responder))
+
+def valores_in(filtro: str) -> list:
+    """Leer los valores de un filtro in.(...) como lo hace PostgREST (comillas y barras invertidas)"""
+    assert filtro.startswith('in.(') and filtro.endswith(')')
+    valores, actual, citado, escapado = [], '', False, False
+    for caracter in filtro[4:-1]:
+        if escapado:
+            actual += caracter
+            escapado = False
+        elif caracter == '\\' and citado:
+            escapado = True
+        elif caracter == '"':
+            citado = not citado
+        elif caracter == ',' and not citado:
+            valores.append(actual)
+            actual = ''
+        else:
+            actual += caracter
+    valores.append(actual)
+    return valores
+
+def test_quote_postgrest():
+    """Las URLs con comas, comillas, paréntesis o barras invertidas llegan intactas al filtro in.(...)"""
+    print("🧪 PROBANDO CITADO PARA POSTGREST")
+    urls = [
+        'https://www.pjud.cl/noticias?id=1,2',
+        'https://www.tdlc.cl/fallo-"rol"-123',
+        'https://www.sii.cl/noticias/(2025)/1.htm',
+        'https://ejemplo.cl/ruta\\con\\barras',
+        'https://ejemplo.cl/simple'
+    ]
+    assert SupabaseClient._quote_postgrest('https://ejemplo.cl/a') == '"https://ejemplo.cl/a"'
+    assert SupabaseClient._quote_postgrest('a"b') == '"a\\"b"'
+    assert SupabaseClient._quote_postgrest('a\\b') == '"a\\\\b"'
+    filtro = f'in.({",".join(SupabaseClient._quote_postgrest(url) for url in urls)})'
+    assert valores_in(filtro) == urls
+    print("✅ Valores citados correctamente")
+
+def test_urls_existentes_por_lotes():
+    """Las URLs se consultan sin repetir, en lotes de `tamano_lote`, y un fallo devuelve None"""
+    print("🧪 PROBANDO CONSULTA DE URLS POR LOTES")
+    urls = [f'https://ejemplo.cl/noticias/{i},{i}' for i in range(120)]
+    almacenadas = set(urls[::7])
+
+    def responder(metodo, url, params, datos):
+        pedidas = valores_in(params['url_origen'])
+        return respuesta(200, [{'id': str(urls.index(u)), 'url_origen': u} for u in pedidas if u in almacenadas])
+
+    supabase = cliente(responder)
+    existentes = supabase.get_noticias_by_urls(urls + urls[:10] + [None, ''], tamano_lote=50)
+    assert set(existentes) == almacenadas
+    assert existentes[urls[7]]['id'] == '7'
+
+    lotes = [valores_in(params['url_origen']) for _, _, params, _ in supabase.transporte.peticiones]
+    assert [len(lote) for lote in lotes] == [50, 50, 20]
+    assert sum(lotes, []) == urls
+    assert all(params['select'] == 'id,url_origen,fecha_publicacion,fecha_actualizacion'
+               for _, _, params, _ in supabase.transporte.peticiones)
+
+    # Sin URLs no hay consultas
+    supabase = cliente(responder)
+    assert supabase.get_noticias_by_urls([]) == {} and not supabase.transporte.peticiones
+
+    # Si un lote falla, el llamador vuelve a la consulta una a una
+    supabase = cliente(lambda *args: respuesta(500, {'message': 'caído'}))
+    assert supabase.get_noticias_by_urls(urls) is None
+    print("✅ URLs consultadas en lotes")
+
+def test_paginar_desde():
+    """Las páginas se piden en orden de creación hasta una incompleta, con el filtro `desde`"""
+    print("🧪 PROBANDO PAGINACIÓN")
+    filas = [{'url_origen': f'https://ejemplo.cl/{i}', 'created_at': f'2025-07-01T00:00:{i:02d}'} for i in range(25)]
+
+    def responder(metodo, url, params, datos):
+        return respuesta(200, filas[params['offset']:params['offset'] + params['limit']])
+
+    supabase = cliente(responder)
+    assert supabase._paginar_desde('url_origen,created_at', '2025-06-30T00:00:00', 10, 'prueba') == filas
+    pedidas = [params for _, _, params, _ in supabase.transporte.peticiones]
+    assert [params['offset'] for params in pedidas] == [0, 10, 20]
+    assert all(params['created_at'] == 'gt.2025-06-30T00:00:00' for params in pedidas)
+    assert all(params['order'] == 'created_at.asc,url_origen.asc' for params in pedidas)
+
+    # Una página justa obliga a pedir la siguiente, vacía
+    supabase = cliente(lambda metodo, url, params, datos: respuesta(200, filas[:10][params['offset']:params['offset'] + 10]))
+    assert len(supabase.get_urls_conocidas(tamano_pagina=10)) == 10
+    assert len(supabase.transporte.peticiones) == 2
+    assert 'created_at' not in supabase.transporte.peticiones[0][2]
+
+    supabase = cliente(lambda *args: respuesta(503))
+    assert supabase.get_cuerpos_noticias() is None
+    print("✅ Páginas recorridas hasta el final")
+
+class PostgRESTDePrueba:
+    """Simula los upserts de PostgREST: rechaza lotes con claves distintas o con una fila inválida"""
+
+    def __init__(self, sin_devolver=()):
+        self.sin_devolver = set(sin_devolver)
+        self.ids = {}
+        self.resumenes = []
+
+    def __call__(self, metodo, url, params, datos):
+        if url.endswith('/noticias_resumenes_juridicos'):
+            self.resumenes.extend(datos)
+            return respuesta(201)
+        assert params == {'on_conflict': 'url_origen', 'select': 'id,url_origen'}
+        if len({tuple(sorted(fila)) for fila in datos}) > 1:
+            return respuesta(400, {'message': 'All object keys must match'})
+        if any(not fila.get('titulo') for fila in datos):
+            return respuesta(400, {'message': 'null value in column "titulo"'})
+        devueltas = []
+        for fila in datos:
+            self.ids.setdefault(fila['url_origen'], f"id-{len(self.ids)}")
+            if fila['url_origen'] not in self.sin_devolver:
+                devueltas.append({'id': self.ids[fila['url_origen']], 'url_origen': fila['url_origen']})
+        return respuesta(201, devueltas)
+
+def fila(i: int, **extra) -> dict:
+    return dict({'titulo': f'Noticia {i}', 'url_origen': f'https://ejemplo.cl/{i}', 'fuente': 'tdlc'}, **extra)
+
+def test_upsert_por_grupos_y_lotes():
+    """Las filas se agrupan por claves y se envían en lotes de 50, con los ids devueltos"""
+    print("🧪 PROBANDO UPSERT POR GRUPOS Y LOTES")
+    servidor = PostgRESTDePrueba()
+    supabase = cliente(servidor)
+    # Las actualizaciones traen fecha_actualizacion: otro juego de claves, intercalado
+    filas = [fila(i) for i in range(60)] + [fila(i, fecha_actualizacion='2025-07-01') for i in range(60, 65)]
+    filas.insert(10, filas.pop())
+
+    resultados = supabase.upsert_noticias(filas)
+    lotes = [datos for _, _, _, datos in supabase.transporte.peticiones]
+    assert [len(lote) for lote in lotes] == [50, 10, 5]
+    assert all(len({tuple(sorted(f)) for f in lote}) == 1 for lote in lotes)
+    assert all(resultado['ok'] and resultado['error'] is None for resultado in resultados)
+    assert sorted(resultado['url_origen'] for resultado in resultados) == sorted(f['url_origen'] for f in filas)
+    assert all(resultado['id'] == servidor.ids[resultado['url_origen']] for resultado in resultados)
+    print("✅ Un request por grupo de claves y por lote")
+
+def test_upsert_con_lote_fallido():
+    """Un lote rechazado se reintenta fila a fila y solo la fila inválida queda con error"""
+    print("🧪 PROBANDO LOTE FALLIDO")
+    servidor = PostgRESTDePrueba(sin_devolver=['https://ejemplo.cl/4'])
+    supabase = cliente(servidor)
+    filas = [fila(i) for i in range(5)]
+    filas[2]['titulo'] = None
+    resumenes = {f['url_origen']: {'resumen_ejecutivo': f"Resumen {f['url_origen']}"} for f in filas}
+
+    resultados = {resultado['url_origen']: resultado for resultado in supabase.upsert_noticias(filas, resumenes)}
+    # Un lote completo más uno por fila
+    assert [len(datos) for metodo, url, _, datos in supabase.transporte.peticiones
+            if url.endswith('/noticias_juridicas')] == [5, 1, 1, 1, 1, 1]
+
+    assert not resultados['https://ejemplo.cl/2']['ok'] and '400' in resultados['https://ejemplo.cl/2']['error']
+    assert not resultados['https://ejemplo.cl/4']['ok'] and resultados['https://ejemplo.cl/4']['error'] == 'Sin fila devuelta'
+    for i in (0, 1, 3):
+        assert resultados[f'https://ejemplo.cl/{i}']['ok'] and resultados[f'https://ejemplo.cl/{i}']['resumen_ok']
+
+    # Los resúmenes de las noticias guardadas van en un solo request, con el id de su noticia
+    assert len([url for _, url, _, _ in supabase.transporte.peticiones if url.endswith('/noticias_resumenes_juridicos')]) == 1
+    assert sorted(resumen['noticia_id'] for resumen in servidor.resumenes) == sorted(
+        servidor.ids[f'https://ejemplo.cl/{i}'] for i in (0, 1, 3)
+    )
+    assert all(resumen['resumen_ejecutivo'] == f"Resumen {url}" for resumen in servidor.resumenes
+               for url, id_noticia in servidor.ids.items() if id_noticia == resumen['noticia_id'])
+    print("✅ Fila inválida aislada y resúmenes asociados a sus ids")
+
+def test_upsert_sin_conexion():
+    """Sin conexión, cada fila vuelve con su error y no se escriben resúmenes"""
+    print("🧪 PROBANDO UPSERT SIN CONEXIÓN")
+
+    def responder(metodo, url, params, datos):
+        raise requests.ConnectionError("sin conexión")
+
+    supabase = cliente(responder)
+    resultados = supabase.upsert_noticias([fila(0), fila(1)], {'https://ejemplo.cl/0': {'resumen_ejecutivo': 'x'}})
+    assert [(resultado['ok'], resultado['error']) for resultado in resultados] == [(False, 'sin conexión')] * 2
+    assert not any(url.endswith('/noticias_resumenes_juridicos') for _, url, _, _ in supabase.transporte.peticiones)
+    print("✅ Errores de conexión informados por fila")
+
+if __name__ == "__main__":
+    test_quote_postgrest()
+    test_urls_existentes_por_lotes()
+    test_paginar_desde()
+    test_upsert_por_grupos_y_lotes()
+    test_upsert_con_lote_fallido()
+    test_upsert_sin_conexion()
+
+    print(f"\n🎉 TODAS LAS PRUEBAS COMPLETADAS")
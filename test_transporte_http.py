@@ -0,0 +1,160 @@
+#!/usr/bin/env python3
+"""
+Script para probar la política de reintentos y los contadores del transporte de Supabase con una sesión simulada (sin acceso a red)
+"""
+
+import sys
+import os
+import random
+
+import requests
+
+# Agregar el directorio del proyecto al path
+sys.path.append(os.path.dirname(__file__))
+
+from backend.database import transporte_http
+from backend.database.transporte_http import TransporteSupabase
+
+URL = 'https://ejemplo.supabase.co/rest/v1/noticias_juridicas'
+
+def respuesta(estado: int, contenido: bytes = b'[]') -> requests.Response:
+    response = requests.Response()
+    response.status_code = estado
+    response._content = contenido
+    return response
+
+class SesionDePrueba:
+    """Entrega en orden las respuestas (o excepciones) indicadas y anota cada petición"""
+
+    def __init__(self, *salidas):
+        self.salidas = list(salidas)
+        self.peticiones = []
+
+    def request(self, metodo, url, headers=None, data=None, params=None, timeout=None):
+        self.peticiones.append((metodo, headers, data))
+        salida = self.salidas.pop(0)
+        if isinstance(salida, Exception):
+            raise salida
+        return salida
+
+class AzarAnotado(random.Random):
+    """Anota el tope de cada espera con jitter"""
+
+    def __init__(self):
+        super().__init__(1)
+        self.topes = []
+        self.esperas = []
+
+    def uniform(self, a, b):
+        self.topes.append(b)
+        self.esperas.append(super().uniform(a, b))
+        return self.esperas[-1]
+
+def transporte(*salidas, **opciones) -> TransporteSupabase:
+    opciones = dict({'max_reintentos': 3, 'espera_base': 0.001, 'espera_maxima': 0.003}, **opciones)
+    instancia = TransporteSupabase(**opciones)
+    instancia.session = SesionDePrueba(*salidas)
+    return instancia
+
+def test_post_no_idempotente():
+    """Un POST de inserción no se reintenta ante 5xx ni ante errores de conexión"""
+    print("🧪 PROBANDO POST NO IDEMPOTENTE")
+    cliente = transporte(respuesta(503), respuesta(201))
+    assert cliente.post(URL, json={'titulo': 'x'}).status_code == 503
+    assert len(cliente.session.peticiones) == 1
+
+    for error in (requests.ConnectionError("conexión cortada"), requests.Timeout("sin respuesta")):
+        cliente = transporte(error, respuesta(201))
+        try:
+            cliente.post(URL, json={'titulo': 'x'})
+            assert False, "el error debía propagarse sin reintentar"
+        except requests.RequestException as e:
+            assert e is error
+        assert len(cliente.session.peticiones) == 1
+    print("✅ Inserción enviada una sola vez")
+
+def test_reintentos_idempotentes():
+    """Los upserts (Prefer: resolution=) y los GET se reintentan ante 5xx, conexión y timeout"""
+    print("🧪 PROBANDO REINTENTOS IDEMPOTENTES")
+    upsert = {'Prefer': 'resolution=merge-duplicates,return=representation'}
+    cliente = transporte(respuesta(502), requests.ConnectionError("conexión cortada"), respuesta(201))
+    assert cliente.post(URL, headers=upsert, json=[{'url_origen': 'https://ejemplo.cl/1'}]).status_code == 201
+    assert len(cliente.session.peticiones) == 3
+    # El mismo cuerpo en cada intento
+    assert len({data for _, _, data in cliente.session.peticiones}) == 1
+
+    cliente = transporte(requests.Timeout("sin respuesta"), respuesta(200))
+    assert cliente.get(URL).status_code == 200
+    assert len(cliente.session.peticiones) == 2
+
+    # Un POST marcado como idempotente también se reintenta
+    cliente = transporte(respuesta(500), respuesta(201))
+    assert cliente.post(URL, json={'titulo': 'x'}, idempotente=True).status_code == 201
+
+    # Los 4xx no se reintentan
+    cliente = transporte(respuesta(409), respuesta(201))
+    assert cliente.post(URL, headers=upsert, json=[]).status_code == 409
+    assert len(cliente.session.peticiones) == 1
+
+    # Agotados los reintentos se devuelve el último 5xx, o se propaga el último error
+    cliente = transporte(*[respuesta(503)] * 4)
+    assert cliente.get(URL).status_code == 503 and len(cliente.session.peticiones) == 4
+    cliente = transporte(*[requests.ConnectionError("caído")] * 4)
+    try:
+        cliente.get(URL)
+        assert False, "el error debía propagarse"
+    except requests.ConnectionError:
+        pass
+    assert len(cliente.session.peticiones) == 4
+    print("✅ Reintentos solo donde repetir es seguro")
+
+def test_espera_con_jitter():
+    """Cada espera es aleatoria entre cero y un tope exponencial acotado por espera_maxima"""
+    print("🧪 PROBANDO ESPERA CON JITTER")
+    azar = AzarAnotado()
+    original = transporte_http.random
+    transporte_http.random = azar
+    try:
+        cliente = transporte(*[respuesta(503)] * 4)
+        cliente.get(URL)
+    finally:
+        transporte_http.random = original
+    assert azar.topes == [0.001, 0.002, 0.003]
+    assert all(0 <= espera <= tope for espera, tope in zip(azar.esperas, azar.topes))
+    assert len(set(azar.esperas)) == 3
+    print("✅ Backoff exponencial con jitter completo")
+
+def test_estadisticas_por_endpoint():
+    """Llamadas, errores, reintentos y bytes se acumulan por método y ruta"""
+    print("🧪 PROBANDO ESTADÍSTICAS POR ENDPOINT")
+    upsert = {'Prefer': 'resolution=merge-duplicates'}
+    cliente = transporte(
+        respuesta(503, b'{}'), respuesta(201, b'[{"id": 1}]'),
+        respuesta(200, b'[]'), requests.ConnectionError("cortada"), respuesta(200, b'[1]')
+    )
+    cliente.post(URL, headers=upsert, json=[{'titulo': 'x'}])
+    cliente.get(URL, params={'select': 'id'})
+    cliente.get(URL + '?limit=1')
+
+    estadisticas = cliente.get_estadisticas()
+    assert set(estadisticas) == {'POST /rest/v1/noticias_juridicas', 'GET /rest/v1/noticias_juridicas'}
+    post = estadisticas['POST /rest/v1/noticias_juridicas']
+    assert (post['llamadas'], post['errores'], post['reintentos']) == (2, 1, 1)
+    assert post['bytes_enviados'] == 2 * len(b'[{"titulo": "x"}]')
+    assert post['bytes_recibidos'] == len(b'{}') + len(b'[{"id": 1}]')
+    get = estadisticas['GET /rest/v1/noticias_juridicas']
+    assert (get['llamadas'], get['errores'], get['reintentos']) == (3, 1, 1)
+    assert get['bytes_enviados'] == 0 and get['bytes_recibidos'] == len(b'[]') + len(b'[1]')
+    assert get['latencia_media'] >= 0 and get['latencia_max'] >= get['latencia_media']
+
+    cliente.reset_estadisticas()
+    assert cliente.get_estadisticas() == {}
+    print("✅ Contadores por endpoint")
+
+if __name__ == "__main__":
+    test_post_no_idempotente()
+    test_reintentos_idempotentes()
+    test_espera_con_jitter()
+    test_estadisticas_por_endpoint()
+
+    print(f"\n🎉 TODAS LAS PRUEBAS COMPLETADAS")
@@ -0,0 +1,76 @@
+#!/usr/bin/env python3
+"""
+Script para probar las peticiones condicionales (ETag / Last-Modified) contra un servidor local
+"""
+
+import sys
+import os
+import tempfile
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+# Agregar el directorio del proyecto al path
+sys.path.append(os.path.dirname(__file__))
+
+from backend.scrapers.fuentes.limitador_peticiones import RegistroLimitadores, SesionLimitada
+from backend.scrapers.fuentes.validadores_http import CacheValidadores
+
+ETAG = '"listado-v1"'
+
+class ListadoHandler(BaseHTTPRequestHandler):
+    """Responde 304 cuando el cliente ya tiene la versión actual"""
+
+    def do_GET(self):
+        if self.headers.get('If-None-Match') == ETAG:
+            self.send_response(304)
+            self.end_headers()
+            return
+
+        cuerpo = b"<html><body><article><a href='/noticia-1'>Noticia</a></article></body></html>"
+        self.send_response(200)
+        self.send_header('ETag', ETAG)
+        self.send_header('Last-Modified', 'Wed, 01 Jan 2025 00:00:00 GMT')
+        self.send_header('Content-Length', str(len(cuerpo)))
+        self.end_headers()
+        self.wfile.write(cuerpo)
+
+    def log_message(self, *args):
+        pass
+
+def test_peticion_condicional():
+    """Probar 200 + validadores, y luego 304 tras confirmar"""
+    print("🧪 PROBANDO PETICIONES CONDICIONALES")
+    servidor = ThreadingHTTPServer(('127.0.0.1', 0), ListadoHandler)
+    threading.Thread(target=servidor.serve_forever, daemon=True).start()
+    url = f"http://127.0.0.1:{servidor.server_address[1]}/noticias"
+
+    try:
+        with tempfile.TemporaryDirectory() as directorio:
+            ruta = os.path.join(directorio, 'validadores.json')
+            sesion = SesionLimitada(RegistroLimitadores(), CacheValidadores(ruta))
+
+            response = sesion.get_condicional(url, timeout=5)
+            assert response.status_code == 200
+            assert sesion.validadores_pendientes[url]['etag'] == ETAG
+
+            # Sin confirmar, la siguiente ejecución vuelve a descargar
+            sesion.descartar_validadores()
+            assert sesion.get_condicional(url, timeout=5).status_code == 200
+
+            sesion.confirmar_validadores()
+
+            # Nueva ejecución: el estado se lee del archivo
+            validadores = CacheValidadores(ruta)
+            sesion = SesionLimitada(RegistroLimitadores(), validadores)
+            response = sesion.get_condicional(url, timeout=5)
+            print(f"   Segunda ejecución: HTTP {response.status_code}, {len(response.content)} bytes")
+            assert response.status_code == 304
+            assert validadores.estadisticas == {'sin_cambios': 1, 'con_cambios': 0}
+    finally:
+        servidor.shutdown()
+    print("✅ Listado sin cambios detectado con 304")
+
+if __name__ == "__main__":
+    test_peticion_condicional()
+
+    print(f"\n🎉 PRUEBA COMPLETADA")